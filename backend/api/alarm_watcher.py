@@ -0,0 +1,292 @@
+"""
+알람 워처 (백그라운드 Phase 1 사전 분석)
+
+운영자가 알람을 클릭하기 전에 새 알람(kpi_daily alarm_flag=1)을 감지하여
+Phase 1(Nodes 1→2→3→6, Claude 근본 원인 분석 포함)을 미리 실행해 둡니다.
+결과는 analysis_cache에 알람 키로 저장되어 /alarm/phase1 클릭 시 즉시 반환됩니다.
+
+- 폴링: 마지막으로 본 날짜 이후의 알람을 (date, eqp_id) 키셋으로 페이지 단위로 끝까지 조회
+  (첫 폴링은 가장 최근 한 페이지만)
+- 중복 제거: 이 워처가 완료한 알람 (캐시 만료와 무관, 크기 제한),
+  알람 키(phase1:날짜:장비:auto)가 캐시에 있거나 계산 중인 알람은 건너뜀
+- 동시 실행 제한: 전용 스레드 풀 크기만큼만 동시에 분석 (사용자 요청과 별도)
+
+환경 변수:
+    ALARM_WATCHER_ENABLED: 'true'(기본) | 'false'
+    ALARM_WATCHER_INTERVAL: 폴링 주기 (기본 60초)
+    ALARM_WATCHER_MAX_CONCURRENCY: 동시 사전 분석 수 (기본 1)
+    ALARM_WATCHER_BATCH: 한 번에 조회할 최근 알람 수 (페이지 크기, 기본 5)
+    ALARM_WATCHER_PROCESSED_MAX: 완료 기록으로 유지할 최대 알람 수 (기본 10000)
+"""
+
+import os
+import time
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Dict, Any, List, Callable, Tuple
+
+from backend.config.logging_config import get_logger, log_context
+
+logger = get_logger(__name__)
+
+
+class AlarmWatcher:
+    """
+    새 알람을 주기적으로 조회하여 Phase 1을 미리 계산하는 백그라운드 스케줄러
+    """
+
+    # 실패한 알람은 이 시간(초) 동안 다시 시도하지 않음 (Claude 호출 반복 방지)
+    RETRY_AFTER_SECONDS = 600
+
+    def __init__(
+        self,
+        interval_seconds: float = 60,
+        max_concurrency: int = 1,
+        batch_size: int = 5,
+        processed_limit: int = 10000,
+        fetch_alarms: Callable[..., List[Dict[str, Any]]] = None,
+        prepare_fn: Callable[..., dict] = None,
+        is_pending_fn: Callable[[str], bool] = None,
+        key_fn: Callable[..., str] = None,
+    ):
+        """
+        Args:
+            interval_seconds: 폴링 주기 (초)
+            max_concurrency: 동시에 실행할 사전 분석 수
+            batch_size: 한 번에 조회할 최근 알람 수 (페이지 크기)
+            processed_limit: 완료 기록으로 유지할 최대 알람 수
+            fetch_alarms / prepare_fn / is_pending_fn / key_fn:
+                알람 조회, Phase 1 준비, 중복 확인, 키 생성 함수 (None이면 기본 구현을 lazy import)
+        """
+        self.interval_seconds = interval_seconds
+        self.max_concurrency = max_concurrency
+        self.batch_size = batch_size
+        self.processed_limit = processed_limit
+
+        self._fetch_alarms = fetch_alarms
+        self._prepare = prepare_fn
+        self._is_pending = is_pending_fn
+        self._key = key_fn
+
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._running: Dict[str, float] = {}   # 키 → 시작 시각 (이 워처가 제출한 작업)
+        self._failed_at: Dict[str, float] = {}  # 키 → 마지막 실패 시각
+        # 이 워처가 완료한 (date, eqp_id) — 캐시가 만료/축출되어도 다시 제출하지 않음
+        self._processed: 'OrderedDict[Tuple[str, str], None]' = OrderedDict()
+        self.watermark: Optional[str] = None   # 마지막으로 본 알람 날짜
+
+        self.polls = 0
+        self.poll_errors = 0
+        self.submitted = 0
+        self.skipped = 0
+        self.completed = 0
+        self.failed = 0
+        self.last_poll: Optional[float] = None
+        self.last_error: Optional[str] = None
+
+    def _resolve_defaults(self) -> None:
+        """기본 구현 lazy import (워크플로우/DB 모듈 로딩을 서버 시작 이후로 미룸)"""
+        if self._fetch_alarms is None:
+            from backend.utils.data_utils import get_recent_alarms
+            self._fetch_alarms = get_recent_alarms
+        if self._prepare is None or self._is_pending is None or self._key is None:
+            from backend.graph.workflow import (
+                prepare_alarm_phase1, is_phase1_pending, phase1_result_key,
+            )
+            self._prepare = self._prepare or prepare_alarm_phase1
+            self._is_pending = self._is_pending or is_phase1_pending
+            self._key = self._key or phase1_result_key
+
+    # ──────────────────────────────────────────────────────────────
+    # 시작 / 종료
+    # ──────────────────────────────────────────────────────────────
+
+    def start(self) -> None:
+        """폴링 스레드 시작 (이미 실행 중이면 무시)"""
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._stop.clear()
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.max_concurrency, thread_name_prefix='alarm-watcher',
+            )
+            self._thread = threading.Thread(
+                target=self._loop, name='alarm-watcher-poll', daemon=True,
+            )
+            self._thread.start()
+        logger.info("[AlarmWatcher] 시작 (주기 %ss, 동시 %d)", self.interval_seconds, self.max_concurrency)
+
+    def stop(self) -> None:
+        """폴링 중지, 진행 중인 사전 분석은 기다리지 않음"""
+        self._stop.set()
+        with self._lock:
+            thread, executor = self._thread, self._executor
+            self._thread, self._executor = None, None
+        if thread is not None:
+            thread.join(timeout=5)
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+        logger.info("[AlarmWatcher] 중지")
+
+    def _loop(self) -> None:
+        while not self._stop.is_set():
+            self.poll_once()
+            self._stop.wait(self.interval_seconds)
+
+    # ──────────────────────────────────────────────────────────────
+    # 폴링
+    # ──────────────────────────────────────────────────────────────
+
+    def poll_once(self) -> int:
+        """
+        새 알람을 조회하고 사전 분석 작업을 제출합니다.
+
+        Returns:
+            int: 새로 제출한 작업 수
+        """
+        try:
+            self._resolve_defaults()
+        except Exception as e:
+            self.poll_errors += 1
+            self.last_error = str(e)
+            logger.warning("[AlarmWatcher] 알람 조회 실패: %s", e)
+            return 0
+
+        submitted = 0
+        deferred = False
+        newest: Optional[str] = None
+        after: Optional[Tuple[str, str]] = None
+
+        # 최신 알람부터 (운영자가 가장 먼저 클릭할 가능성이 높음)
+        # 건너뛴 알람이 페이지를 채워도 다음 알람을 놓치지 않도록 키셋으로 끝까지 이어 읽음
+        while True:
+            try:
+                alarms = self._fetch_alarms(since_date=self.watermark, limit=self.batch_size, after=after)
+            except Exception as e:
+                self.poll_errors += 1
+                self.last_error = str(e)
+                logger.warning("[AlarmWatcher] 알람 조회 실패: %s", e)
+                # 끝까지 확인하지 못했으므로 워터마크 유지
+                return submitted
+
+            for alarm in alarms:
+                date, eqp_id = str(alarm['date']), alarm['eqp_id']
+                newest = max(newest or date, date)
+                key = self._key(date, eqp_id)
+                with self._lock:
+                    failed_at = self._failed_at.get(key)
+                    recently_failed = (failed_at is not None
+                                       and time.monotonic() - failed_at < self.RETRY_AFTER_SECONDS)
+                    if ((date, eqp_id) in self._processed or key in self._running
+                            or recently_failed or self._is_pending(key)):
+                        self.skipped += 1
+                        continue
+                    if self._executor is None or len(self._running) >= self.max_concurrency:
+                        # 슬롯이 없으면 다음 폴링에서 다시 시도 (워터마크 유지)
+                        deferred = True
+                        break
+                    self._running[key] = time.monotonic()
+                    self.submitted += 1
+                    self._executor.submit(self._run, key, date, eqp_id)
+                submitted += 1
+
+            # 첫 폴링은 가장 최근 한 페이지만 (과거 알람 전체를 사전 분석하지 않음)
+            if deferred or len(alarms) < self.batch_size or self.watermark is None:
+                break
+            after = (str(alarms[-1]['date']), alarms[-1]['eqp_id'])
+
+        self.polls += 1
+        self.last_poll = time.monotonic()
+        if newest is not None and not deferred:
+            # 같은 날짜에 알람이 더 생길 수 있으므로 워터마크 날짜 자체는 다시 조회
+            if self.watermark is None or newest > self.watermark:
+                self.watermark = newest
+                self._prune()
+        return submitted
+
+    def _prune(self) -> None:
+        """워터마크 이전 날짜의 완료 기록과 재시도 대기가 끝난 실패 기록 정리"""
+        now = time.monotonic()
+        with self._lock:
+            for date_eqp in [k for k in self._processed if k[0] < self.watermark]:
+                del self._processed[date_eqp]
+            for key in [k for k, t in self._failed_at.items() if now - t >= self.RETRY_AFTER_SECONDS]:
+                del self._failed_at[key]
+
+    def _run(self, key: str, date: str, eqp_id: str) -> None:
+        """사전 분석 1건 실행 (스레드 풀에서 호출)"""
+        started = time.monotonic()
+        error = None
+        # 사전 분석 중 노드 로그를 알람 단위로 묶음
+        with log_context(job_id=f"watcher:{date}:{eqp_id}"):
+            logger.info("[AlarmWatcher] Phase 1 사전 분석 시작: %s %s", date, eqp_id)
+            try:
+                state = self._prepare(date, eqp_id)
+                error = state.get('error')
+            except Exception as e:
+                logger.exception("[AlarmWatcher] 사전 분석 예외: %s %s", date, eqp_id)
+                error = str(e)
+
+        with self._lock:
+            self._running.pop(key, None)
+            if error:
+                self.failed += 1
+                self.last_error = error
+                self._failed_at[key] = time.monotonic()
+            else:
+                self.completed += 1
+                self._failed_at.pop(key, None)
+                self._processed[(date, eqp_id)] = None
+                while len(self._processed) > self.processed_limit:
+                    self._processed.popitem(last=False)
+
+        if error:
+            logger.warning("[AlarmWatcher] 사전 분석 실패: %s %s — %s", date, eqp_id, error)
+        else:
+            logger.info("[AlarmWatcher] 사전 분석 완료: %s %s (%.1fs)",
+                        date, eqp_id, time.monotonic() - started)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        워처 통계
+
+        Returns:
+            워처 상태 정보
+        """
+        with self._lock:
+            running = list(self._running)
+            processed = len(self._processed)
+            alive = self._thread is not None and self._thread.is_alive()
+        return {
+            'running': alive,
+            'interval_seconds': self.interval_seconds,
+            'max_concurrency': self.max_concurrency,
+            'watermark': self.watermark,
+            'in_progress': running,
+            'processed': processed,
+            'polls': self.polls,
+            'poll_errors': self.poll_errors,
+            'submitted': self.submitted,
+            'skipped': self.skipped,
+            'completed': self.completed,
+            'failed': self.failed,
+            'seconds_since_poll': (
+                round(time.monotonic() - self.last_poll, 1) if self.last_poll else None
+            ),
+            'last_error': self.last_error,
+        }
+
+
+ALARM_WATCHER_ENABLED = os.getenv('ALARM_WATCHER_ENABLED', 'true').lower() == 'true'
+
+# 전역 알람 워처 인스턴스 (서버 lifespan에서 시작/중지)
+alarm_watcher = AlarmWatcher(
+    interval_seconds=float(os.getenv('ALARM_WATCHER_INTERVAL', '60')),
+    max_concurrency=int(os.getenv('ALARM_WATCHER_MAX_CONCURRENCY', '1')),
+    batch_size=int(os.getenv('ALARM_WATCHER_BATCH', '5')),
+    processed_limit=int(os.getenv('ALARM_WATCHER_PROCESSED_MAX', '10000')),
+)
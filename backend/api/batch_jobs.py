@@ -0,0 +1,307 @@
+"""
+알람 일괄 분석 작업 관리
+
+알람이 여러 건 발생한 날 운영자가 한 번의 요청으로 전체 알람의 Phase 1
+(근본 원인 후보)을 받을 수 있도록 합니다.
+
+1. KPI / 컨텍스트 데이터는 batch_analysis.prefetch_alarm_contexts로 소스별 1회 조회
+2. 알람별 Phase 1(Claude 호출 포함)은 전용 스레드 풀 크기만큼만 동시에 실행
+3. 알람 하나가 끝날 때마다 이벤트를 작업에 추가 → 폴링(GET) 또는 SSE로 바로 전달
+
+각 결과 이벤트에는 session_id가 포함되어 있어 원하는 알람만 /alarm/phase2로 리포트를 생성합니다.
+이미 분석된 알람(알람 워처 등)은 prepare_alarm_phase1의 캐시를 그대로 재사용합니다.
+
+환경 변수:
+    BATCH_ALARM_MAX_PARALLEL: 동시에 분석할 알람 수 (기본 3, 모든 작업 공유)
+    BATCH_ALARM_MAX_ITEMS: 작업 하나의 최대 알람 수 (기본 50)
+"""
+
+import os
+import time
+import uuid
+import threading
+import contextvars
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Optional, Dict, Any, List, Callable, Tuple
+
+from backend.config.logging_config import get_logger, log_context
+
+logger = get_logger(__name__)
+
+
+class BatchJob:
+    """
+    일괄 분석 작업 하나 (이벤트 목록 + 완료 대기)
+    """
+
+    def __init__(self, job_id: str, alarms: List[Dict[str, Any]]):
+        self.job_id = job_id
+        self.alarms = alarms
+        self.status = 'queued'   # queued → running → done
+        self.completed = 0
+        self.failed = 0
+        self.created_at = time.time()
+        self.finished_at: Optional[float] = None
+        self.events: List[Dict[str, Any]] = []
+        self._cond = threading.Condition()
+
+    def publish(self, event: Dict[str, Any]) -> None:
+        """이벤트 추가 후 대기 중인 구독자 깨움"""
+        with self._cond:
+            self.events.append(event)
+            self._cond.notify_all()
+
+    def finish(self) -> None:
+        with self._cond:
+            self.status = 'done'
+            self.finished_at = time.time()
+            self._cond.notify_all()
+
+    def wait_events(self, since: int = 0, timeout: float = 15.0) -> Tuple[List[Dict[str, Any]], bool]:
+        """
+        since 이후 이벤트가 생기거나 작업이 끝날 때까지 대기
+
+        Returns:
+            Tuple: (새 이벤트 목록, 작업 종료 여부)
+        """
+        with self._cond:
+            self._cond.wait_for(lambda: len(self.events) > since or self.status == 'done', timeout)
+            return self.events[since:], self.status == 'done'
+
+    def snapshot(self, since: int = 0) -> Dict[str, Any]:
+        """폴링 응답용 현재 상태"""
+        with self._cond:
+            return {
+                'job_id': self.job_id,
+                'status': self.status,
+                'total': len(self.alarms),
+                'completed': self.completed,
+                'failed': self.failed,
+                'events': self.events[since:],
+                'next_since': len(self.events),
+            }
+
+
+class BatchAnalysisManager:
+    """
+    일괄 분석 작업 등록 / 실행 / 조회
+    """
+
+    # 보관할 최대 작업 수 (초과 시 오래된 완료 작업부터 삭제)
+    MAX_JOBS = 50
+
+    def __init__(
+        self,
+        max_parallel: int = 3,
+        max_items: int = 50,
+        prefetch_fn: Callable[..., tuple] = None,
+        prepare_fn: Callable[..., dict] = None,
+        session_fn: Callable[[dict], str] = None,
+    ):
+        """
+        Args:
+            max_parallel: 동시에 분석할 알람 수 (Claude 동시 호출 상한)
+            max_items: 작업 하나의 최대 알람 수
+            prefetch_fn / prepare_fn / session_fn:
+                컨텍스트 사전 조회, Phase 1 준비, 세션 발급 함수 (None이면 기본 구현을 lazy import)
+        """
+        self.max_parallel = max_parallel
+        self.max_items = max_items
+        self._prefetch = prefetch_fn
+        self._prepare = prepare_fn
+        self._issue_session = session_fn
+
+        self._lock = threading.Lock()
+        self._jobs: 'OrderedDict[str, BatchJob]' = OrderedDict()
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+        self.jobs_submitted = 0
+        self.alarms_completed = 0
+        self.alarms_failed = 0
+
+    def _resolve_defaults(self) -> None:
+        """기본 구현 lazy import (워크플로우/DB 모듈 로딩을 첫 작업까지 미룸)"""
+        if self._prefetch is None:
+            from backend.graph.batch_analysis import prefetch_alarm_contexts
+            self._prefetch = prefetch_alarm_contexts
+        if self._prepare is None or self._issue_session is None:
+            from backend.graph.workflow import prepare_alarm_phase1, issue_phase1_session
+            self._prepare = self._prepare or prepare_alarm_phase1
+            self._issue_session = self._issue_session or issue_phase1_session
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_parallel, thread_name_prefix='alarm-batch',
+                )
+            return self._executor
+
+    # ──────────────────────────────────────────────────────────────
+    # 작업 제출 / 조회
+    # ──────────────────────────────────────────────────────────────
+
+    def submit(self, alarms: List[Dict[str, Any]]) -> BatchJob:
+        """
+        일괄 분석 작업을 등록하고 백그라운드에서 시작합니다.
+
+        Args:
+            alarms: [{alarm_date, alarm_eqp_id, alarm_kpi?}] (중복은 한 번만 분석)
+
+        Returns:
+            BatchJob: 등록된 작업
+
+        Raises:
+            ValueError: 알람이 없거나 최대 개수 초과
+        """
+        unique, seen = [], set()
+        for alarm in alarms:
+            key = (str(alarm['alarm_date']), alarm['alarm_eqp_id'], alarm.get('alarm_kpi'))
+            if key not in seen:
+                seen.add(key)
+                unique.append({'alarm_date': key[0], 'alarm_eqp_id': key[1], 'alarm_kpi': key[2]})
+        if not unique:
+            raise ValueError("분석할 알람이 없습니다")
+        if len(unique) > self.max_items:
+            raise ValueError(f"알람은 최대 {self.max_items}건까지 한 번에 분석할 수 있습니다")
+
+        self._resolve_defaults()
+        job = BatchJob(uuid.uuid4().hex, unique)
+        with self._lock:
+            self._jobs[job.job_id] = job
+            self.jobs_submitted += 1
+            self._evict()
+        threading.Thread(
+            target=self._run_job, args=(job,), name=f'alarm-batch-{job.job_id[:8]}', daemon=True,
+        ).start()
+        logger.info("[AlarmBatch] 작업 등록: %s (알람 %d건)", job.job_id, len(unique))
+        return job
+
+    def get(self, job_id: str) -> Optional[BatchJob]:
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def _evict(self) -> None:
+        """보관 한도 초과 시 오래된 완료 작업 삭제 (lock 보유 상태에서 호출)"""
+        for job_id in list(self._jobs):
+            if len(self._jobs) <= self.MAX_JOBS:
+                break
+            if self._jobs[job_id].status == 'done':
+                del self._jobs[job_id]
+
+    # ──────────────────────────────────────────────────────────────
+    # 실행
+    # ──────────────────────────────────────────────────────────────
+
+    def _run_job(self, job: BatchJob) -> None:
+        """사전 조회 후 알람별 Phase 1 제출, 끝나는 순서대로 이벤트 발행"""
+        with log_context(job_id=job.job_id):
+            self._run_job_events(job)
+
+    def _run_job_events(self, job: BatchJob) -> None:
+        started = time.monotonic()
+        job.status = 'running'
+
+        # 1. 컨텍스트 사전 조회 (실패하면 알람별 개별 조회로 진행)
+        contexts: Dict[tuple, Dict[str, Any]] = {}
+        try:
+            contexts, stats = self._prefetch(
+                [{'date': a['alarm_date'], 'eqp_id': a['alarm_eqp_id']} for a in job.alarms]
+            )
+            job.publish({'type': 'prefetch', **stats})
+        except Exception as e:
+            logger.warning("[AlarmBatch] 컨텍스트 사전 조회 실패, 알람별 조회로 진행: %s", e)
+            job.publish({'type': 'prefetch', 'error': str(e)})
+
+        # 2. 알람별 Phase 1 (공유 스레드 풀 → 전체 작업 합산 동시 실행 제한)
+        executor = self._get_executor()
+        # 풀 스레드에도 job_id 로그 컨텍스트 전달 (알람마다 컨텍스트 복사)
+        futures = {
+            executor.submit(
+                contextvars.copy_context().run, self._analyze_one, alarm,
+                contexts.get((alarm['alarm_date'], alarm['alarm_eqp_id'])),
+            ): index
+            for index, alarm in enumerate(job.alarms)
+        }
+        for future in as_completed(futures):
+            index = futures[future]
+            if future.cancelled():
+                alarm = job.alarms[index]
+                event = {'type': 'error', 'alarm_date': alarm['alarm_date'],
+                         'alarm_eqp_id': alarm['alarm_eqp_id'], 'error': '서버 종료로 취소됨'}
+            else:
+                event = future.result()
+            event['index'] = index
+            with self._lock:
+                if event['type'] == 'result':
+                    job.completed += 1
+                    self.alarms_completed += 1
+                else:
+                    job.failed += 1
+                    self.alarms_failed += 1
+            job.publish(event)
+
+        elapsed = round(time.monotonic() - started, 2)
+        job.publish({'type': 'done', 'completed': job.completed,
+                     'failed': job.failed, 'elapsed_s': elapsed})
+        job.finish()
+        logger.info("[AlarmBatch] 작업 완료: %s (성공 %d, 실패 %d, %ss)",
+                    job.job_id, job.completed, job.failed, elapsed)
+
+    def _analyze_one(self, alarm: Dict[str, Any], prefetched: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        """알람 하나의 Phase 1 실행 → 결과/에러 이벤트"""
+        started = time.monotonic()
+        base = {'alarm_date': alarm['alarm_date'], 'alarm_eqp_id': alarm['alarm_eqp_id']}
+        try:
+            state = self._prepare(alarm['alarm_date'], alarm['alarm_eqp_id'],
+                                  alarm.get('alarm_kpi'), prefetched=prefetched)
+            if 'error' in state:
+                return {'type': 'error', **base, 'error': state['error']}
+            session_id = self._issue_session(state)
+            return {
+                'type': 'result',
+                **base,
+                'alarm_kpi': state.get('alarm_kpi'),
+                'session_id': session_id,
+                'root_causes': state.get('root_causes', []),
+                'llm_calls': (state.get('metadata') or {}).get('llm_calls', 0),
+                'precomputed': state.get('precomputed', False),
+                'elapsed_s': round(time.monotonic() - started, 2),
+            }
+        except Exception as e:
+            logger.exception("[AlarmBatch] 알람 분석 실패: %s %s", alarm['alarm_date'], alarm['alarm_eqp_id'])
+            return {'type': 'error', **base, 'error': str(e)}
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        일괄 분석 통계
+
+        Returns:
+            작업/알람 처리 현황
+        """
+        with self._lock:
+            jobs = list(self._jobs.values())
+        return {
+            'max_parallel': self.max_parallel,
+            'max_items': self.max_items,
+            'jobs': len(jobs),
+            'running_jobs': sum(1 for j in jobs if j.status != 'done'),
+            'jobs_submitted': self.jobs_submitted,
+            'alarms_completed': self.alarms_completed,
+            'alarms_failed': self.alarms_failed,
+        }
+
+    def shutdown(self) -> None:
+        """서버 종료 시 대기 중인 알람 분석 취소"""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+
+# 전역 일괄 분석 관리자
+batch_manager = BatchAnalysisManager(
+    max_parallel=int(os.getenv('BATCH_ALARM_MAX_PARALLEL', '3')),
+    max_items=int(os.getenv('BATCH_ALARM_MAX_ITEMS', '50')),
+)
@@ -0,0 +1,192 @@
+"""
+워크플로우 실행용 스레드 풀 및 라우트별 동시 실행 제한
+
+run_alarm_analysis / run_question_answer 는 Bedrock, Supabase, RDS, ChromaDB를
+동기 방식으로 호출하므로 async 핸들러 안에서 직접 실행하면 이벤트 루프 전체가 멈춥니다.
+이 모듈은 워크플로우를 전용 스레드 풀에서 실행하고, 라우트 그룹마다
+동시에 실행 가능한 요청 수를 제한합니다.
+"""
+
+import os
+import json
+import asyncio
+import functools
+import contextvars
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, AsyncIterator, Callable, Dict, Iterator
+
+from fastapi import HTTPException
+from fastapi.responses import StreamingResponse
+
+from backend.config.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+# 워크플로우 전용 스레드 풀 (uvicorn 기본 스레드 풀과 분리)
+WORKFLOW_MAX_WORKERS = int(os.getenv('WORKFLOW_MAX_WORKERS', '8'))
+
+# 라우트 그룹별 최대 동시 실행 수
+ROUTE_LIMITS: Dict[str, int] = {
+    'alarm': int(os.getenv('ALARM_MAX_CONCURRENCY', '2')),
+    'question': int(os.getenv('QUESTION_MAX_CONCURRENCY', '4')),
+}
+
+# 실행 슬롯 대기 최대 시간 (초). 초과 시 503 반환
+QUEUE_TIMEOUT_SECONDS = float(os.getenv('WORKFLOW_QUEUE_TIMEOUT', '60'))
+
+_executor = ThreadPoolExecutor(
+    max_workers=WORKFLOW_MAX_WORKERS,
+    thread_name_prefix='workflow',
+)
+
+# 세마포어는 이벤트 루프 안에서 lazy 생성
+_semaphores: Dict[str, asyncio.Semaphore] = {}
+_stats: Dict[str, Dict[str, int]] = {
+    route: {'running': 0, 'waiting': 0, 'completed': 0, 'rejected': 0}
+    for route in ROUTE_LIMITS
+}
+
+
+def _get_semaphore(route: str) -> asyncio.Semaphore:
+    if route not in ROUTE_LIMITS:
+        raise ValueError(f"[ERROR] 알 수 없는 라우트 그룹: {route}")
+    if route not in _semaphores:
+        _semaphores[route] = asyncio.Semaphore(ROUTE_LIMITS[route])
+    return _semaphores[route]
+
+
+async def _acquire_slot(route: str) -> asyncio.Semaphore:
+    """라우트 그룹의 실행 슬롯을 얻습니다. (시간 초과 시 503)"""
+    semaphore = _get_semaphore(route)
+    stats = _stats[route]
+
+    stats['waiting'] += 1
+    try:
+        await asyncio.wait_for(semaphore.acquire(), timeout=QUEUE_TIMEOUT_SECONDS)
+    except asyncio.TimeoutError:
+        stats['rejected'] += 1
+        raise HTTPException(
+            status_code=503,
+            detail=f"요청이 많아 처리할 수 없습니다. 잠시 후 다시 시도해주세요. ({route})"
+        )
+    finally:
+        stats['waiting'] -= 1
+
+    stats['running'] += 1
+    return semaphore
+
+
+def _release_slot(route: str, semaphore: asyncio.Semaphore) -> None:
+    stats = _stats[route]
+    stats['running'] -= 1
+    stats['completed'] += 1
+    semaphore.release()
+
+
+async def run_workflow(route: str, fn: Callable[..., Any], *args, **kwargs) -> Any:
+    """
+    블로킹 워크플로우 함수를 스레드 풀에서 실행합니다.
+
+    Args:
+        route: 라우트 그룹 ('alarm' 또는 'question')
+        fn: 실행할 동기 함수 (예: run_alarm_analysis)
+        *args, **kwargs: fn에 전달할 인자
+
+    Returns:
+        fn의 반환값
+
+    Raises:
+        HTTPException(503): 실행 슬롯을 QUEUE_TIMEOUT_SECONDS 안에 얻지 못한 경우
+    """
+    semaphore = await _acquire_slot(route)
+    try:
+        loop = asyncio.get_running_loop()
+        # run_in_executor는 contextvars를 넘기지 않으므로 요청의 로그 컨텍스트(request_id)를 복사해 실행
+        ctx = contextvars.copy_context()
+        return await loop.run_in_executor(_executor, functools.partial(ctx.run, fn, *args, **kwargs))
+    finally:
+        _release_slot(route, semaphore)
+
+
+async def stream_workflow(
+    route: str, gen_fn: Callable[..., Iterator[Any]], *args, **kwargs
+) -> AsyncIterator[Any]:
+    """
+    동기 제너레이터(스트리밍 워크플로우)를 스레드 풀에서 한 단계씩 실행합니다.
+    스트림이 끝날 때까지 라우트 실행 슬롯을 점유합니다.
+
+    Args:
+        route: 라우트 그룹 ('alarm' 또는 'question')
+        gen_fn: 이벤트를 yield하는 동기 함수 (예: run_question_answer_stream)
+        *args, **kwargs: gen_fn에 전달할 인자
+
+    Yields:
+        gen_fn이 yield한 값
+    """
+    semaphore = await _acquire_slot(route)
+    try:
+        loop = asyncio.get_running_loop()
+        # 매 단계가 다른 스레드에서 실행되어도 같은 로그 컨텍스트를 쓰도록 하나의 Context에서 재개
+        ctx = contextvars.copy_context()
+        iterator = await loop.run_in_executor(_executor, functools.partial(ctx.run, gen_fn, *args, **kwargs))
+        done = object()
+        while True:
+            item = await loop.run_in_executor(_executor, ctx.run, next, iterator, done)
+            if item is done:
+                break
+            yield item
+    finally:
+        _release_slot(route, semaphore)
+
+
+def sse_response(route: str, gen_fn: Callable[..., Iterator[Dict[str, Any]]], *args, **kwargs) -> StreamingResponse:
+    """
+    스트리밍 워크플로우 이벤트를 Server-Sent Events 응답으로 변환합니다.
+
+    각 이벤트 dict는 `data: {json}` 한 줄로 전송됩니다.
+    응답 헤더가 이미 전송된 뒤의 실패(대기 시간 초과 포함)는 {'type': 'error'} 이벤트로 전달합니다.
+
+    Args:
+        route: 라우트 그룹 ('alarm' 또는 'question')
+        gen_fn: 이벤트 dict를 yield하는 동기 함수
+        *args, **kwargs: gen_fn에 전달할 인자
+
+    Returns:
+        StreamingResponse: text/event-stream 응답
+    """
+    async def _events():
+        try:
+            async for event in stream_workflow(route, gen_fn, *args, **kwargs):
+                yield f"data: {json.dumps(event, ensure_ascii=False, default=str)}\n\n"
+        except HTTPException as e:
+            yield f"data: {json.dumps({'type': 'error', 'error': e.detail}, ensure_ascii=False)}\n\n"
+        except Exception as e:
+            logger.exception("스트리밍 응답 오류: %s", e)
+            yield f"data: {json.dumps({'type': 'error', 'error': str(e)}, ensure_ascii=False)}\n\n"
+
+    return StreamingResponse(
+        _events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+def get_concurrency_stats() -> Dict[str, Any]:
+    """
+    라우트별 실행/대기 현황
+
+    Returns:
+        Dict: {route: {limit, running, waiting, completed, rejected}, ...}
+    """
+    return {
+        'max_workers': WORKFLOW_MAX_WORKERS,
+        'routes': {
+            route: {'limit': ROUTE_LIMITS[route], **_stats[route]}
+            for route in ROUTE_LIMITS
+        },
+    }
+
+
+def shutdown_executor() -> None:
+    """서버 종료 시 스레드 풀을 정리합니다."""
+    _executor.shutdown(wait=False, cancel_futures=True)
@@ -1,16 +1,23 @@
 """
 FastAPI 메인 애플리케이션
 """
+import time
+import uuid
+import logging
 from contextlib import asynccontextmanager
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, PlainTextResponse
 from datetime import datetime
 from pathlib import Path
 from pydantic import BaseModel
 from typing import List
 from dotenv import load_dotenv
-from backend.graph.workflow import run_alarm_analysis, run_question_answer
+from backend.config.logging_config import get_logger, log_context, get_logging_stats, flush_logging
+from backend.graph.workflow import run_alarm_analysis, run_question_answer, run_question_answer_stream
+from backend.api.concurrency import run_workflow, sse_response, shutdown_executor, get_concurrency_stats
+from backend.api.alarm_watcher import alarm_watcher, ALARM_WATCHER_ENABLED
+from backend.api.batch_jobs import batch_manager
 from backend.api.routes import alarm, question, system, reports, supabase, rds, chatlogs
 
 import sys
@@ -24,6 +31,11 @@ sys.path.insert(0, str(project_root))
 from backend.api.routes import alarm, question, system, reports
 from backend.api.models import HealthResponse, ErrorResponse
 
+logger = get_logger(__name__)
+
+# 접근 로그를 DEBUG로만 남기는 경로 (헬스체크/지표 수집)
+_QUIET_PATHS = {'/health', '/metrics'}
+
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
@@ -47,29 +59,42 @@ async def lifespan(app: FastAPI):
             return False
 
         def _reindex():
-            print("[ChromaDB] 컬렉션 초기화 후 PDF 재인덱싱")
+            logger.info("[ChromaDB] 컬렉션 초기화 후 PDF 재인덱싱")
             try:
                 chroma_config.client.delete_collection(chroma_config.collection_name)
                 chroma_config.collection = chroma_config._get_or_create_collection()
             except Exception as e:
-                print(f"[ChromaDB] 컬렉션 초기화 실패: {e}")
+                logger.warning("[ChromaDB] 컬렉션 초기화 실패: %s", e)
             load_reports_to_rag("backend/data/reports")
 
         count = chroma_config.count_reports()
 
         if count == 0:
-            print("[ChromaDB] 데이터 없음 → PDF에서 인덱싱")
+            logger.info("[ChromaDB] 데이터 없음 → PDF에서 인덱싱")
             load_reports_to_rag("backend/data/reports")
         elif not _has_kpi_metadata():
-            print("[ChromaDB] kpi 메타데이터 누락 감지 → 재인덱싱")
+            logger.info("[ChromaDB] kpi 메타데이터 누락 감지 → 재인덱싱")
             _reindex()
         else:
-            print(f"[ChromaDB] 정상 데이터 {count}개 (kpi 메타데이터 확인됨)")
+            logger.info("[ChromaDB] 정상 데이터 %d개 (kpi 메타데이터 확인됨)", count)
 
-        print(f"[ChromaDB] 최종 리포트 수: {chroma_config.count_reports()}개")
+        logger.info("[ChromaDB] 최종 리포트 수: %d개", chroma_config.count_reports())
     except Exception as e:
-        print(f"[WARN] ChromaDB 초기화 실패 (무시하고 시작): {e}")
+        logger.warning("ChromaDB 초기화 실패 (무시하고 시작): %s", e)
+
+    # 새 알람 Phase 1 사전 분석 (백그라운드)
+    if ALARM_WATCHER_ENABLED:
+        alarm_watcher.start()
     yield
+    alarm_watcher.stop()
+    batch_manager.shutdown()
+    shutdown_executor()
+    try:
+        from backend.utils.chromadb_s3_sync import flush_pending_sync
+        flush_pending_sync()
+    except Exception as e:
+        logger.warning("ChromaDB S3 백업 실패 (종료 계속): %s", e)
+    flush_logging()
 
 
 # FastAPI 앱 생성
@@ -91,6 +116,24 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+
+@app.middleware("http")
+async def request_context(request: Request, call_next):
+    """
+    요청마다 request_id를 발급(또는 X-Request-ID 헤더 사용)하여 모든 로그에 붙이고
+    응답 헤더로 돌려줍니다. (프론트/ALB 로그와 서버 로그 연결)
+    """
+    request_id = request.headers.get('x-request-id') or uuid.uuid4().hex[:16]
+    started = time.perf_counter()
+    with log_context(request_id=request_id):
+        response = await call_next(request)
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        level = logging.DEBUG if request.url.path in _QUIET_PATHS else logging.INFO
+        logger.log(level, "%s %s → %d (%.0fms)", request.method, request.url.path,
+                   response.status_code, elapsed_ms)
+    response.headers['X-Request-ID'] = request_id
+    return response
+
 # 라우터 등록
 app.include_router(alarm.router, prefix="/api")
 app.include_router(question.router, prefix="/api")
@@ -113,6 +156,7 @@ class ChatRequest(BaseModel):
     alarm_eqp_id: str = ""
     alarm_kpi: str = ""
     live_context: str = ""        # 프론트엔드 탭 현황 데이터
+    stream: bool = False          # True면 질문 모드 답변을 SSE로 스트리밍
 
 # 기존 /api/chat 엔드포인트 전체 교체
 @app.post("/api/chat")
@@ -120,8 +164,10 @@ async def chat(req: ChatRequest):
     try:
         # ── 알람 분석 모드 ──────────────────────────
         if req.mode == "alarm":
-            print(f"알람 분석 모드: {req.alarm_eqp_id} / {req.alarm_kpi}")
-            final_state = run_alarm_analysis(
+            logger.info("알람 분석 모드: %s / %s", req.alarm_eqp_id, req.alarm_kpi)
+            final_state = await run_workflow(
+                'alarm',
+                run_alarm_analysis,
                 alarm_date=req.alarm_date or None,
                 alarm_eqp_id=req.alarm_eqp_id or None,
                 alarm_kpi=req.alarm_kpi or None,
@@ -150,7 +196,7 @@ async def chat(req: ChatRequest):
                 (m.content for m in reversed(req.messages) if m.role == "user"),
                 ""
             )
-            print(f"질문 모드: {user_message[:50]}")
+            logger.info("질문 모드: %.50s", user_message)
 
             # 최근 3턴 대화 이력 추출 (멀티턴 컨텍스트)
             prior = req.messages[:-1]  # 현재 질문 제외
@@ -168,7 +214,15 @@ async def chat(req: ChatRequest):
                 history_lines = "\n".join([f"Q: {q}\nA: {a}" for q, a in turns])
                 live_context += f"\n\n## 이전 대화 (최근 {len(turns)}턴)\n{history_lines}"
 
-            final_state = run_question_answer(user_message, live_context=live_context)
+            # 스트리밍 모드: 생성되는 토큰을 SSE 이벤트로 바로 전달
+            if req.stream:
+                return sse_response(
+                    'question', run_question_answer_stream, user_message, live_context=live_context
+                )
+
+            final_state = await run_workflow(
+                'question', run_question_answer, user_message, live_context=live_context
+            )
 
             if final_state.get("error"):
                 return {"content": f"응답 오류: {final_state['error']}"}
@@ -179,11 +233,13 @@ async def chat(req: ChatRequest):
             }
 
     except Exception as e:
-        print(f"[ERROR] /api/chat 오류: {e}")
+        logger.exception("/api/chat 오류: %s", e)
         return {"content": f"서버 오류: {str(e)}"}
 
 @app.exception_handler(Exception)
 async def global_exception_handler(request: Request, exc: Exception):
+    logger.error("처리되지 않은 예외: %s %s", request.method, request.url.path,
+                 exc_info=(type(exc), exc, exc.__traceback__))
     return JSONResponse(
         status_code=500,
         content=ErrorResponse(
@@ -201,6 +257,41 @@ async def health_check():
         version="1.0.0"
     )
 
+@app.get("/metrics", response_class=PlainTextResponse, tags=["System"])
+def prometheus_metrics():
+    """
+    Prometheus 지표 (text format)
+
+    - 노드별 실행 시간 / 실행 수, Bedrock 호출 시간 / 토큰 / 재시도 / 캐시 적중 (backend.utils.tracing)
+    - 수집 시점 gauge: 응답 캐시 항목·히트·미스, 라우트별 실행/대기 요청 수, 로그 큐 적재량·유실 수,
+      Bedrock 게이트웨이 실행/대기 요청 수
+    """
+    from backend.utils.tracing import metrics
+    from backend.utils.cache import analysis_cache, qa_cache, phase1_cache
+    from backend.config.bedrock_gateway import bedrock_gateway
+
+    gauges = {'cache_items': [], 'cache_hits': [], 'cache_misses': [],
+              'workflow_running': [], 'workflow_waiting': [],
+              'log_queue_pending': [], 'log_dropped': [],
+              'bedrock_in_flight': [], 'bedrock_queue_depth': []}
+    for cache in (analysis_cache, qa_cache, phase1_cache):
+        stats = cache.get_stats()
+        labels = {'cache': stats['name']}
+        gauges['cache_items'].append((labels, stats['total_items']))
+        gauges['cache_hits'].append((labels, stats['hits']))
+        gauges['cache_misses'].append((labels, stats['misses']))
+    for route, stats in get_concurrency_stats()['routes'].items():
+        gauges['workflow_running'].append(({'route': route}, stats.get('running', 0)))
+        gauges['workflow_waiting'].append(({'route': route}, stats.get('waiting', 0)))
+    log_stats = get_logging_stats()
+    gauges['log_queue_pending'].append(({}, log_stats['queue_pending']))
+    gauges['log_dropped'].append(({}, log_stats['dropped']))
+    for lane, stats in bedrock_gateway.get_stats()['lanes'].items():
+        gauges['bedrock_in_flight'].append(({'lane': lane}, stats['in_flight']))
+        gauges['bedrock_queue_depth'].append(({'lane': lane}, stats['queue_depth']))
+
+    return PlainTextResponse(metrics.render(gauges), media_type="text/plain; version=0.0.4")
+
 @app.get("/", tags=["System"])
 async def root():
     return {
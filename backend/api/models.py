@@ -39,6 +39,10 @@ class QuestionRequest(BaseModel):
         min_length=5,
         max_length=500
     )
+    stream: bool = Field(
+        False,
+        description="True면 답변을 Server-Sent Events로 스트리밍 (token → done 이벤트)"
+    )
 
 
 # ========== 응답 모델 ==========
@@ -135,6 +139,38 @@ class AlarmPhase1Response(BaseModel):
     # 메타데이터
     llm_calls: int = Field(..., description="LLM 호출 횟수")
     processing_time: Optional[float] = Field(None, description="처리 시간 (초)")
+    precomputed: bool = Field(False, description="알람 워처가 미리 분석한 결과 재사용 여부")
+    trace: Optional[Dict[str, Any]] = Field(None, description="노드별 소요 시간 요약 (total_ms, llm_ms, nodes)")
+
+
+class AlarmBatchItem(BaseModel):
+    """일괄 분석 대상 알람"""
+
+    alarm_date: str = Field(..., description="알람 날짜 (YYYY-MM-DD)", example="2026-01-20")
+    alarm_eqp_id: str = Field(..., description="장비 ID", example="EQP01")
+    alarm_kpi: Optional[str] = Field(None, description="KPI 이름 (None이면 Node 2에서 판단)")
+
+
+class AlarmBatchRequest(BaseModel):
+    """알람 일괄 분석 요청 (Phase 1)"""
+
+    alarms: List[AlarmBatchItem] = Field(..., description="분석할 알람 목록")
+    stream: bool = Field(False, description="True면 알람별 결과를 SSE로 바로 전송")
+
+
+class AlarmBatchStatusResponse(BaseModel):
+    """알람 일괄 분석 작업 상태 (since 이후 이벤트 포함)"""
+
+    success: bool = Field(..., description="성공 여부")
+    job_id: str = Field(..., description="작업 ID")
+    status: str = Field(..., description="queued | running | done")
+    total: int = Field(..., description="전체 알람 수")
+    completed: int = Field(..., description="분석 완료 알람 수")
+    failed: int = Field(..., description="분석 실패 알람 수")
+    events: List[Dict[str, Any]] = Field(
+        ..., description="이벤트 (prefetch / result / error / done), result에 session_id 포함"
+    )
+    next_since: int = Field(..., description="다음 폴링 시 since 값")
 
 
 class AlarmSelectRequest(BaseModel):
@@ -166,6 +202,7 @@ class AlarmPhase2Response(BaseModel):
     # 메타데이터
     llm_calls: int = Field(..., description="LLM 호출 횟수")
     processing_time: Optional[float] = Field(None, description="처리 시간 (초)")
+    trace: Optional[Dict[str, Any]] = Field(None, description="노드별 소요 시간 요약 (total_ms, llm_ms, nodes)")
 
 
 class ErrorResponse(BaseModel):
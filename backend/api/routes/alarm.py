@@ -2,8 +2,11 @@
 알람 관련 API 엔드포인트
 """
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Query
+from fastapi.responses import StreamingResponse
 from datetime import datetime
+import asyncio
+import json
 import time
 
 from backend.api.models import (
@@ -12,12 +15,17 @@ from backend.api.models import (
     AlarmPhase1Response,
     AlarmSelectRequest,
     AlarmPhase2Response,
+    AlarmBatchRequest,
+    AlarmBatchStatusResponse,
     LatestAlarmResponse,
     ErrorResponse,
     RootCause
 )
 from backend.graph.workflow import run_alarm_analysis, run_alarm_analysis_phase1, run_alarm_analysis_phase2
 from backend.utils.data_utils import get_latest_alarm
+from backend.api.concurrency import run_workflow
+from backend.api.batch_jobs import batch_manager
+from backend.utils.tracing import summarize_trace
 
 router = APIRouter(prefix="/alarm", tags=["Alarm"])
 
@@ -41,7 +49,9 @@ async def analyze_alarm(request: AlarmAnalyzeRequest):
         start_time = time.time()
         
         # 워크플로우 실행
-        result = run_alarm_analysis(
+        result = await run_workflow(
+            'alarm',
+            run_alarm_analysis,
             alarm_date=request.alarm_date,
             alarm_eqp_id=request.alarm_eqp_id,
             alarm_kpi=request.alarm_kpi
@@ -86,7 +96,7 @@ async def analyze_alarm(request: AlarmAnalyzeRequest):
     summary="최신 알람 조회",
     description="가장 최근의 알람 정보를 조회합니다."
 )
-async def get_latest():
+def get_latest():
     """
     최신 알람 조회 API
     
@@ -133,7 +143,9 @@ async def analyze_phase1(request: AlarmAnalyzeRequest):
     try:
         start_time = time.time()
 
-        result = run_alarm_analysis_phase1(
+        result = await run_workflow(
+            'alarm',
+            run_alarm_analysis_phase1,
             alarm_date=request.alarm_date,
             alarm_eqp_id=request.alarm_eqp_id,
             alarm_kpi=request.alarm_kpi
@@ -153,7 +165,9 @@ async def analyze_phase1(request: AlarmAnalyzeRequest):
             alarm_kpi=result['alarm_kpi'],
             root_causes=[RootCause(**cause) for cause in result['root_causes']],
             llm_calls=result['metadata']['llm_calls'],
-            processing_time=processing_time
+            processing_time=processing_time,
+            precomputed=result.get('precomputed', False),
+            trace=summarize_trace(result['metadata']),
         )
 
     except HTTPException:
@@ -183,7 +197,9 @@ async def analyze_phase2(request: AlarmSelectRequest):
     try:
         start_time = time.time()
 
-        result = run_alarm_analysis_phase2(
+        result = await run_workflow(
+            'alarm',
+            run_alarm_analysis_phase2,
             session_id=request.session_id,
             selected_index=request.selected_index
         )
@@ -204,7 +220,8 @@ async def analyze_phase2(request: AlarmSelectRequest):
             report_id=result['report_id'],
             rag_saved=result.get('rag_saved', False),
             llm_calls=result['metadata']['llm_calls'],
-            processing_time=processing_time
+            processing_time=processing_time,
+            trace=summarize_trace(result['metadata'])
         )
 
     except HTTPException:
@@ -213,4 +230,81 @@ async def analyze_phase2(request: AlarmSelectRequest):
         raise HTTPException(
             status_code=500,
             detail=f"Phase 2 리포트 생성 실패: {str(e)}"
-        )
\ No newline at end of file
+        )
+
+
+def _batch_event_stream(job_id: str, since: int = 0) -> StreamingResponse:
+    """
+    일괄 분석 작업 이벤트를 SSE로 전송합니다.
+
+    알람 분석은 batch_manager 스레드 풀에서 실행되므로 alarm 라우트 슬롯을 점유하지 않고,
+    이벤트 대기만 스레드로 넘깁니다. 클라이언트가 끊어도 작업은 계속되며 GET으로 이어서 조회할 수 있습니다.
+    """
+    job = batch_manager.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="일괄 분석 작업을 찾을 수 없습니다")
+
+    async def _events():
+        cursor = since
+        yield f"data: {json.dumps({'type': 'job', 'job_id': job_id, 'total': len(job.alarms)})}\n\n"
+        while True:
+            events, finished = await asyncio.to_thread(job.wait_events, cursor, 15.0)
+            for event in events:
+                yield f"data: {json.dumps(event, ensure_ascii=False, default=str)}\n\n"
+            cursor += len(events)
+            if finished and not events:
+                break
+            if not events:
+                yield ": keep-alive\n\n"
+
+    return StreamingResponse(
+        _events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.post(
+    "/batch",
+    summary="알람 일괄 분석 (Phase 1)",
+    description="여러 알람의 근본 원인 후보를 한 번에 분석합니다. KPI/컨텍스트는 소스별 1회만 조회하고, "
+                "알람별 결과는 끝나는 대로 job_id 폴링 또는 SSE(stream=true)로 전달합니다."
+)
+def analyze_batch(request: AlarmBatchRequest):
+    """
+    알람 일괄 분석 API
+
+    - 알람 목록 전체의 KPI / 상태 이력을 한 번에 조회
+    - 알람별 Phase 1은 BATCH_ALARM_MAX_PARALLEL 만큼만 동시 실행
+    - 결과 이벤트의 session_id로 /phase2 호출
+    """
+    try:
+        job = batch_manager.submit([alarm.dict() for alarm in request.alarms])
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    if request.stream:
+        return _batch_event_stream(job.job_id)
+    return AlarmBatchStatusResponse(success=True, **job.snapshot())
+
+
+@router.get(
+    "/batch/{job_id}",
+    response_model=AlarmBatchStatusResponse,
+    summary="알람 일괄 분석 상태 조회",
+    description="since 이후 새 이벤트와 진행 현황을 반환합니다. 다음 폴링에는 next_since를 사용하세요."
+)
+def get_batch(job_id: str, since: int = Query(0, ge=0, description="이미 받은 이벤트 수")):
+    job = batch_manager.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="일괄 분석 작업을 찾을 수 없습니다")
+    return AlarmBatchStatusResponse(success=True, **job.snapshot(since))
+
+
+@router.get(
+    "/batch/{job_id}/stream",
+    summary="알람 일괄 분석 이벤트 스트림 (SSE)",
+    description="since 이후 이벤트를 SSE로 전송하고 작업이 끝나면 종료합니다."
+)
+def stream_batch(job_id: str, since: int = Query(0, ge=0, description="이미 받은 이벤트 수")):
+    return _batch_event_stream(job_id, since)
@@ -11,6 +11,10 @@ from pydantic import BaseModel
 from typing import List, Optional
 from datetime import datetime
 
+from backend.config.logging_config import get_logger
+
+logger = get_logger(__name__)
+
 router = APIRouter(prefix="/chatlogs", tags=["ChatLogs"])
 
 _S3_FOLDER = "chatlogs/"   # team4-bucket/ prefix 아래 chatlogs/
@@ -40,7 +44,7 @@ class SaveChatLogRequest(BaseModel):
 
 # ─── GET /api/chatlogs ───────────────────────────────────────────
 @router.get("")
-async def list_chatlogs():
+def list_chatlogs():
     """S3에서 전체 대화 기록 목록 반환"""
     try:
         s3, bucket, prefix = _s3_client()
@@ -69,7 +73,7 @@ async def list_chatlogs():
 
 # ─── POST /api/chatlogs ──────────────────────────────────────────
 @router.post("")
-async def save_chatlog(req: SaveChatLogRequest):
+def save_chatlog(req: SaveChatLogRequest):
     """대화 기록을 S3에 JSON으로 저장"""
     try:
         s3, bucket, prefix = _s3_client()
@@ -82,7 +86,7 @@ async def save_chatlog(req: SaveChatLogRequest):
             Body=json.dumps(payload, ensure_ascii=False),
             ContentType="application/json"
         )
-        print(f"[ChatLog] S3 저장 완료: {key}")
+        logger.info("[ChatLog] S3 저장 완료: %s", key)
         return {"success": True, "id": req.id}
 
     except Exception as e:
@@ -91,14 +95,14 @@ async def save_chatlog(req: SaveChatLogRequest):
 
 # ─── DELETE /api/chatlogs/{id} ───────────────────────────────────
 @router.delete("/{log_id}")
-async def delete_chatlog(log_id: str):
+def delete_chatlog(log_id: str):
     """S3에서 대화 기록 삭제"""
     try:
         s3, bucket, prefix = _s3_client()
         key = prefix + _S3_FOLDER + f"{log_id}.json"
 
         s3.delete_object(Bucket=bucket, Key=key)
-        print(f"[ChatLog] S3 삭제 완료: {key}")
+        logger.info("[ChatLog] S3 삭제 완료: %s", key)
         return {"success": True, "id": log_id}
 
     except Exception as e:
@@ -11,7 +11,8 @@ from backend.api.models import (
     SimilarReport,
     ErrorResponse
 )
-from backend.graph.workflow import run_question_answer
+from backend.graph.workflow import run_question_answer, run_question_answer_stream
+from backend.api.concurrency import run_workflow, sse_response
 
 router = APIRouter(prefix="/question", tags=["Question"])
 
@@ -29,13 +30,17 @@ async def answer_question(request: QuestionRequest):
     - RAG 기반 과거 리포트 검색
     - AI 기반 답변 생성
     - 유사 리포트 목록 제공
+    - stream=true: 답변 토큰을 SSE(text/event-stream)로 전달
     """
     
+    if request.stream:
+        return sse_response('question', run_question_answer_stream, request.question)
+    
     try:
         start_time = time.time()
         
         # 워크플로우 실행
-        result = run_question_answer(request.question)
+        result = await run_workflow('question', run_question_answer, request.question)
         
         # 에러 체크
         if 'error' in result:
@@ -4,16 +4,26 @@ Amazon RDS 데이터 확인 API
 - GET /api/rds/scenario-map     → scenario_map 테이블 조회
 - GET /api/rds/kpi-daily        → kpi_daily 테이블 조회
 - GET /api/rds/kpi-trend        → kpi_daily 날짜 범위 조회
-- GET /api/rds/lot-state        → lot_state 테이블 조회
-- GET /api/rds/eqp-state        → eqp_state 테이블 조회
+- GET /api/rds/dashboard-summary → 최신 KPI 행 + 알람 건수 (대시보드 카드)
+- GET /api/rds/kpi-scan         → kpi_daily 날짜 범위 알람 일괄 판단 (백필/스캔)
+- GET /api/rds/lot-state        → lot_state 테이블 페이지 조회 (키셋 커서)
+- GET /api/rds/eqp-state        → eqp_state 테이블 페이지 조회 (키셋 커서)
 - GET /api/rds/rcp-state        → rcp_state 테이블 조회
+- GET /api/rds/aggregates/kpi          → 일별/주별 KPI 롤업 (사전 집계)
+- GET /api/rds/aggregates/alarm-counts → KPI별 알람 건수 (사전 집계)
+- GET /api/rds/aggregates/downtime     → 장비별 다운타임 (사전 집계)
+- POST /api/rds/aggregates/refresh     → 사전 집계 갱신
 """
 
 from fastapi import APIRouter, HTTPException, Query
-from typing import Optional
+from typing import Optional, Literal, Dict, Any
 
 router = APIRouter(prefix="/rds", tags=["RDS"])
 
+# 페이지 크기 제한
+DEFAULT_PAGE_SIZE = 500
+MAX_PAGE_SIZE = 5000
+
 
 def _get_rds():
     """RDS 클라이언트를 lazy 로드합니다 (설정 오류 시 명확한 에러 반환)."""
@@ -26,7 +36,7 @@ def _get_rds():
 
 # ─── GET /api/rds/tables ─────────────────────────────────────────────────────
 @router.get("/tables", summary="RDS 테이블 목록 조회")
-async def list_tables(
+def list_tables(
     schema: str = Query("kpi_monitor", description="스키마 이름 (기본: kpi_monitor)"),
 ):
     """RDS 데이터베이스에 존재하는 모든 테이블 목록을 반환합니다."""
@@ -50,7 +60,7 @@ async def list_tables(
 
 # ─── GET /api/rds/test ────────────────────────────────────────────────────────
 @router.get("/test", summary="RDS 연결 테스트")
-async def test_rds_connection():
+def test_rds_connection():
     """RDS 데이터베이스 연결이 정상인지 확인합니다."""
     rds = _get_rds()
     ok = rds.test_connection()
@@ -69,17 +79,19 @@ async def test_rds_connection():
 
 # ─── GET /api/rds/scenario-map ───────────────────────────────────────────────
 @router.get("/scenario-map", summary="알람 시나리오 맵 조회")
-async def get_scenario_map(
+def get_scenario_map(
     date: Optional[str] = Query(None, description="날짜 필터 (YYYY-MM-DD)"),
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE, description="최대 행 수"),
 ):
     """
     scenario_map 테이블을 조회합니다.
 
     - **date**: 특정 날짜만 조회 (미입력 시 전체)
+    - **limit**: 최대 행 수
     """
     rds = _get_rds()
     try:
-        rows = rds.get_scenario_map(date=date)
+        rows = rds.get_scenario_map(date=date, limit=limit)
         return {"success": True, "count": len(rows), "data": rows}
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"조회 실패: {str(e)}")
@@ -87,7 +99,7 @@ async def get_scenario_map(
 
 # ─── GET /api/rds/kpi-daily ──────────────────────────────────────────────────
 @router.get("/kpi-daily", summary="일별 KPI 조회")
-async def get_kpi_daily(
+def get_kpi_daily(
     date: Optional[str] = Query(None, description="날짜 (YYYY-MM-DD)"),
     eqp_id: Optional[str] = Query(None, description="장비 ID (예: EQP01)"),
 ):
@@ -105,9 +117,29 @@ async def get_kpi_daily(
         raise HTTPException(status_code=500, detail=f"조회 실패: {str(e)}")
 
 
+# ─── GET /api/rds/dashboard-summary ──────────────────────────────────────────
+@router.get("/dashboard-summary", summary="대시보드 KPI 요약 조회")
+def get_dashboard_summary(
+    eqp_id: Optional[str] = Query(None, description="장비 ID (없으면 전체 기준)"),
+):
+    """
+    대시보드 상단 카드용 최신 KPI 행과 알람 건수를 조회합니다.
+
+    kpi_daily 전체를 내려받지 않고 메모리 요약(새 날짜분만 증분 반영)에서 응답하며,
+    요약을 만들 수 없으면 DB 집계 쿼리(ORDER BY ... LIMIT 1, count(*) FILTER)로 대체합니다.
+    """
+    _get_rds()
+    from backend.utils.dashboard_summary import rds_dashboard_summary
+    try:
+        summary = rds_dashboard_summary.get_summary(eqp_id=eqp_id)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"조회 실패: {str(e)}")
+    return {"success": summary['latest'] is not None, **summary}
+
+
 # ─── GET /api/rds/kpi-trend ──────────────────────────────────────────────────
 @router.get("/kpi-trend", summary="KPI 추세 (날짜 범위) 조회")
-async def get_kpi_trend(
+def get_kpi_trend(
     start_date: str = Query(..., description="시작 날짜 (YYYY-MM-DD)"),
     end_date: str = Query(..., description="종료 날짜 (YYYY-MM-DD)"),
     eqp_id: Optional[str] = Query(None, description="장비 ID (예: EQP01)"),
@@ -126,51 +158,141 @@ async def get_kpi_trend(
         raise HTTPException(status_code=500, detail=f"조회 실패: {str(e)}")
 
 
+# ─── GET /api/rds/kpi-scan ───────────────────────────────────────────────────
+@router.get("/kpi-scan", summary="KPI 알람 일괄 판단 (백필/스캔)")
+def scan_kpi_alarms(
+    start_date: str = Query(..., description="시작 날짜 (YYYY-MM-DD)"),
+    end_date: str = Query(..., description="종료 날짜 (YYYY-MM-DD)"),
+    eqp_id: Optional[str] = Query(None, description="장비 ID (미입력 시 전체 장비)"),
+    kpi: Optional[Literal["OEE", "THP", "TAT", "WIP"]] = Query(None, description="대표 알람 KPI 필터"),
+    min_deviation: float = Query(0.0, ge=0, description="대표 KPI 최소 이탈률 (0.1 = 10%)"),
+    include_normal: bool = Query(False, description="이탈 없는 행도 포함"),
+):
+    """
+    날짜 범위의 kpi_daily 전체에 대해 목표 이탈 / 알람 여부 / 대표 KPI를 한 번에 판단합니다.
+    (Node 2를 행마다 실행하지 않고 NumPy 배치로 계산)
+
+    - 예: 1분기 전체 장비 알람 → start_date=2026-01-01&end_date=2026-03-31
+    - **flag_mismatches**: 저장된 alarm_flag와 판단 결과가 다른 행 수 (백필 점검용)
+    """
+    rds = _get_rds()
+    from backend.utils.kpi_engine import scan_kpi_alarms as run_scan
+    try:
+        result = run_scan(
+            start_date=start_date, end_date=end_date, eqp_id=eqp_id, kpi=kpi,
+            min_deviation=min_deviation, include_normal=include_normal, rds=rds,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"조회 실패: {str(e)}")
+
+    rows = result.pop("rows")
+    return {"success": True, **result, "count": len(rows), "data": rows}
+
+
+def _table_page(
+    table: str,
+    columns: Optional[str],
+    cursor: Optional[str],
+    limit: int,
+    order: str,
+    include_count: bool,
+    filters: Dict[str, Any],
+) -> Dict[str, Any]:
+    """lot_state / eqp_state 공통 페이지 조회 (잘못된 컬럼/필터/커서는 400)"""
+    rds = _get_rds()
+    column_list = [c.strip() for c in columns.split(",") if c.strip()] if columns else None
+    try:
+        page = rds.get_table_page(
+            table,
+            columns=column_list,
+            filters=filters,
+            cursor=cursor,
+            limit=limit,
+            descending=(order == "desc"),
+        )
+        total_estimate = rds.estimate_count(table, filters) if include_count else None
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"조회 실패: {str(e)}")
+
+    return {
+        "success": True,
+        "count": len(page["rows"]),
+        "total_estimate": total_estimate,
+        "next_cursor": page["next_cursor"],
+        "has_more": page["has_more"],
+        "data": page["rows"],
+    }
+
+
 # ─── GET /api/rds/lot-state ──────────────────────────────────────────────────
-@router.get("/lot-state", summary="로트 상태 이력 조회")
-async def get_lot_state(
+@router.get("/lot-state", summary="로트 상태 이력 페이지 조회")
+def get_lot_state(
     start_time: Optional[str] = Query(None, description="시작 시간 (YYYY-MM-DD HH:MM)"),
     end_time: Optional[str] = Query(None, description="종료 시간 (YYYY-MM-DD HH:MM)"),
     eqp_id: Optional[str] = Query(None, description="장비 ID"),
+    lot_id: Optional[str] = Query(None, description="로트 ID"),
+    line_id: Optional[str] = Query(None, description="라인 ID"),
+    oper_id: Optional[str] = Query(None, description="공정 ID"),
+    lot_state: Optional[str] = Query(None, description="로트 상태 (RUN, HOLD, END 등)"),
+    columns: Optional[str] = Query(None, description="조회할 컬럼 (쉼표 구분, 미입력 시 전체)"),
+    cursor: Optional[str] = Query(None, description="이전 응답의 next_cursor"),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE, description="페이지 크기"),
+    order: Literal["asc", "desc"] = Query("asc", description="event_time 정렬 방향"),
+    include_count: bool = Query(True, description="추정 전체 행 수 포함 여부"),
 ):
     """
-    lot_state 테이블을 조회합니다.
+    lot_state 테이블을 (event_time, lot_id) 키셋 커서로 페이지 조회합니다.
 
     - **start_time** / **end_time**: 시간 범위 필터
-    - **eqp_id**: 장비 ID 필터
+    - **eqp_id** / **lot_id** / **line_id** / **oper_id** / **lot_state**: 동등 필터
+    - **cursor**: 다음 페이지 조회 시 이전 응답의 next_cursor 전달
+    - **total_estimate**: 통계 기반 추정 행 수 (정확한 COUNT 아님)
     """
-    rds = _get_rds()
-    try:
-        rows = rds.get_lot_state(start_time=start_time, end_time=end_time, eqp_id=eqp_id)
-        return {"success": True, "count": len(rows), "data": rows}
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"조회 실패: {str(e)}")
+    filters = {
+        "start_time": start_time, "end_time": end_time, "eqp_id": eqp_id,
+        "lot_id": lot_id, "line_id": line_id, "oper_id": oper_id, "lot_state": lot_state,
+    }
+    return _table_page("lot_state", columns, cursor, limit, order, include_count, filters)
 
 
 # ─── GET /api/rds/eqp-state ──────────────────────────────────────────────────
-@router.get("/eqp-state", summary="장비 상태 이력 조회")
-async def get_eqp_state(
+@router.get("/eqp-state", summary="장비 상태 이력 페이지 조회")
+def get_eqp_state(
     start_time: Optional[str] = Query(None, description="시작 시간 (YYYY-MM-DD HH:MM)"),
     end_time: Optional[str] = Query(None, description="종료 시간 (YYYY-MM-DD HH:MM)"),
     eqp_id: Optional[str] = Query(None, description="장비 ID"),
+    lot_id: Optional[str] = Query(None, description="로트 ID"),
+    line_id: Optional[str] = Query(None, description="라인 ID"),
+    oper_id: Optional[str] = Query(None, description="공정 ID"),
+    eqp_state: Optional[str] = Query(None, description="장비 상태 (RUN, DOWN, IDLE 등)"),
+    columns: Optional[str] = Query(None, description="조회할 컬럼 (쉼표 구분, 미입력 시 전체)"),
+    cursor: Optional[str] = Query(None, description="이전 응답의 next_cursor"),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE, description="페이지 크기"),
+    order: Literal["asc", "desc"] = Query("asc", description="event_time 정렬 방향"),
+    include_count: bool = Query(True, description="추정 전체 행 수 포함 여부"),
 ):
     """
-    eqp_state 테이블을 조회합니다.
+    eqp_state 테이블을 (event_time, eqp_id) 키셋 커서로 페이지 조회합니다.
 
     - **start_time** / **end_time**: 시간 범위 필터
-    - **eqp_id**: 장비 ID 필터
+    - **eqp_id** / **lot_id** / **line_id** / **oper_id** / **eqp_state**: 동등 필터
+    - **cursor**: 다음 페이지 조회 시 이전 응답의 next_cursor 전달
+    - **total_estimate**: 통계 기반 추정 행 수 (정확한 COUNT 아님)
     """
-    rds = _get_rds()
-    try:
-        rows = rds.get_eqp_state(start_time=start_time, end_time=end_time, eqp_id=eqp_id)
-        return {"success": True, "count": len(rows), "data": rows}
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"조회 실패: {str(e)}")
+    filters = {
+        "start_time": start_time, "end_time": end_time, "eqp_id": eqp_id,
+        "lot_id": lot_id, "line_id": line_id, "oper_id": oper_id, "eqp_state": eqp_state,
+    }
+    return _table_page("eqp_state", columns, cursor, limit, order, include_count, filters)
 
 
 # ─── GET /api/rds/rcp-state ──────────────────────────────────────────────────
 @router.get("/rcp-state", summary="레시피 상태 조회")
-async def get_rcp_state(
+def get_rcp_state(
     eqp_id: Optional[str] = Query(None, description="장비 ID"),
 ):
     """
@@ -184,3 +306,99 @@ async def get_rcp_state(
         return {"success": True, "count": len(rows), "data": rows}
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"조회 실패: {str(e)}")
+
+
+def _get_aggregates():
+    """KPI 집계 저장소를 lazy 로드합니다."""
+    _get_rds()
+    from backend.utils.kpi_aggregates import kpi_aggregates
+    return kpi_aggregates
+
+
+# ─── GET /api/rds/aggregates/kpi ─────────────────────────────────────────────
+@router.get("/aggregates/kpi", summary="일별/주별 KPI 롤업 조회")
+def get_kpi_aggregates(
+    period: Literal["day", "week"] = Query("day", description="집계 기간 단위"),
+    group_by: Literal["eqp", "line", "oper", "all"] = Query("eqp", description="그룹 기준"),
+    start_date: Optional[str] = Query(None, description="시작 날짜 (YYYY-MM-DD)"),
+    end_date: Optional[str] = Query(None, description="종료 날짜 (YYYY-MM-DD)"),
+    last: Optional[int] = Query(None, ge=1, le=366, description="최근 N개 기간 (마지막 데이터 날짜 기준)"),
+    eqp_id: Optional[str] = Query(None, description="장비 ID"),
+    line_id: Optional[str] = Query(None, description="라인 ID"),
+    oper_id: Optional[str] = Query(None, description="공정 ID"),
+):
+    """
+    사전 집계된 KPI 롤업을 조회합니다. (원본 kpi_daily 행 대신 버킷 단위)
+
+    - **period**: day | week (주는 월요일 시작)
+    - **group_by**: eqp | line | oper | all
+    - **last**: 최근 N일/N주 (start_date 대신 사용)
+    - 값 필드: {kpi}_v / {kpi}_t (평균), {kpi}_breach (목표 이탈 행 수), {kpi}_alarm (알람 행 중 이탈 수)
+    """
+    store = _get_aggregates()
+    try:
+        rows = store.kpi_rollup(
+            period=period, group_by=group_by, start_date=start_date, end_date=end_date,
+            last=last, eqp_id=eqp_id, line_id=line_id, oper_id=oper_id,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"조회 실패: {str(e)}")
+    return {"success": True, "count": len(rows), "watermark": store.kpi_watermark, "data": rows}
+
+
+# ─── GET /api/rds/aggregates/alarm-counts ────────────────────────────────────
+@router.get("/aggregates/alarm-counts", summary="KPI별 알람 건수 조회")
+def get_alarm_count_aggregates(
+    start_date: Optional[str] = Query(None, description="시작 날짜 (YYYY-MM-DD)"),
+    end_date: Optional[str] = Query(None, description="종료 날짜 (YYYY-MM-DD)"),
+    eqp_id: Optional[str] = Query(None, description="장비 ID"),
+):
+    """
+    alarm_flag=1 행 중 KPI별 목표 이탈 건수를 조회합니다.
+
+    - **total_alarms**: 기간 내 알람 행 수
+    - **data**: [{kpi, count, breach_days}]
+    """
+    store = _get_aggregates()
+    try:
+        result = store.alarm_counts(start_date=start_date, end_date=end_date, eqp_id=eqp_id)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"조회 실패: {str(e)}")
+    return {"success": True, "total_alarms": result["total_alarms"], "data": result["counts"]}
+
+
+# ─── GET /api/rds/aggregates/downtime ────────────────────────────────────────
+@router.get("/aggregates/downtime", summary="장비별 다운타임 조회")
+def get_downtime_aggregates(
+    start_date: Optional[str] = Query(None, description="시작 날짜 (YYYY-MM-DD)"),
+    end_date: Optional[str] = Query(None, description="종료 날짜 (YYYY-MM-DD)"),
+    eqp_id: Optional[str] = Query(None, description="장비 ID"),
+    period: Literal["total", "day"] = Query("total", description="total: 장비별 합계, day: 날짜·장비별"),
+):
+    """
+    eqp_state DOWN 구간의 다운타임(분)을 장비별로 조회합니다.
+    """
+    store = _get_aggregates()
+    try:
+        rows = store.downtime(start_date=start_date, end_date=end_date, eqp_id=eqp_id, period=period)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"조회 실패: {str(e)}")
+    return {"success": True, "count": len(rows), "data": rows}
+
+
+# ─── POST /api/rds/aggregates/refresh ────────────────────────────────────────
+@router.post("/aggregates/refresh", summary="KPI 사전 집계 갱신")
+def refresh_aggregates(
+    full: bool = Query(False, description="True면 전체 재집계 (기본: 워터마크 이후 증분)"),
+):
+    """사전 집계 버킷을 즉시 갱신하고 저장소 통계를 반환합니다."""
+    store = _get_aggregates()
+    try:
+        result = store.refresh(full=full)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"갱신 실패: {str(e)}")
+    return {"success": True, **result, "stats": store.get_stats()}
@@ -13,6 +13,10 @@ from pydantic import BaseModel
 from pathlib import Path
 from datetime import datetime
 
+from backend.config.logging_config import get_logger
+
+logger = get_logger(__name__)
+
 router = APIRouter(tags=["Reports"])
 
 # PDF 저장 폴더 경로
@@ -22,7 +26,7 @@ REPORTS_DIR.mkdir(parents=True, exist_ok=True)
 
 # ─── GET /api/reports ────────────────────────────────────────────
 @router.get("/reports")
-async def list_reports():
+def list_reports():
     """로컬 data/reports 폴더의 PDF 파일 목록 반환"""
     files = []
     for f in sorted(REPORTS_DIR.glob("*.pdf")):
@@ -43,7 +47,7 @@ class SaveReportRequest(BaseModel):
 
 
 @router.post("/reports/save")
-async def save_report(req: SaveReportRequest):
+def save_report(req: SaveReportRequest):
     """
     텍스트 내용을 PDF로 저장하고 S3에도 업로드합니다.
     - reportlab 설치 시: 실제 PDF 생성 (한글 지원)
@@ -68,7 +72,7 @@ async def save_report(req: SaveReportRequest):
         s3_uri = aws_config.upload_file_to_s3(str(filepath), req.filename)
     except Exception as e:
         s3_error = str(e)
-        print(f"[WARN] S3 업로드 실패 (로컬 저장은 완료): {e}")
+        logger.warning("S3 업로드 실패 (로컬 저장은 완료): %s", e)
 
     return {
         "success": True,
@@ -82,7 +86,7 @@ async def save_report(req: SaveReportRequest):
 
 # ─── DELETE /api/reports/{filename} ─────────────────────────────
 @router.delete("/reports/{filename}")
-async def delete_report(filename: str):
+def delete_report(filename: str):
     """
     PDF 파일 삭제 (로컬 + S3)
     초기화 시 사용
@@ -110,7 +114,7 @@ async def delete_report(filename: str):
         s3_deleted = True
     except Exception as e:
         s3_error = str(e)
-        print(f"[WARN] S3 삭제 실패 (로컬 삭제는 완료): {e}")
+        logger.warning("S3 삭제 실패 (로컬 삭제는 완료): %s", e)
 
     return {
         "success": True,
@@ -124,7 +128,7 @@ async def delete_report(filename: str):
 
 # ─── POST /api/reports/sync-s3 ───────────────────────────────────
 @router.post("/reports/sync-s3")
-async def sync_reports_to_s3():
+def sync_reports_to_s3():
     """
     data/reports 폴더의 모든 PDF를 S3에 업로드합니다.
     이미 S3에 존재하는 파일은 건너뜁니다.
@@ -148,14 +152,14 @@ async def sync_reports_to_s3():
             # S3에 이미 존재하면 스킵
             if aws_config.file_exists_in_s3(filename):
                 skipped.append(filename)
-                print(f"[S3 sync] 이미 존재, 스킵: {filename}")
+                logger.debug("[S3 sync] 이미 존재, 스킵: %s", filename)
                 continue
 
             s3_uri = aws_config.upload_file_to_s3(str(pdf_path), filename)
             uploaded.append({"filename": filename, "s3_uri": s3_uri})
         except Exception as e:
             errors.append({"filename": filename, "error": str(e)})
-            print(f"[S3 sync] 업로드 실패: {filename} - {e}")
+            logger.warning("[S3 sync] 업로드 실패: %s - %s", filename, e)
 
     return {
         "success": True,
@@ -168,7 +172,7 @@ async def sync_reports_to_s3():
 
 # ─── GET /api/reports/s3 ─────────────────────────────────────────
 @router.get("/reports/s3")
-async def list_s3_reports():
+def list_s3_reports():
     """S3에 저장된 PDF 파일 목록 반환"""
     try:
         from backend.config.aws_config import aws_config
@@ -2,16 +2,84 @@
 backend/api/routes/supabase.py
 Supabase 데이터 조회 API
 """
+import json
+from datetime import datetime
 from fastapi import APIRouter, Query
-from typing import Optional
-from datetime import date as date_type, timedelta
-from backend.config.supabase_config import supabase_config
+from fastapi.responses import StreamingResponse
+from typing import Optional, Literal
+from backend.config.supabase_config import supabase_config, PAGE_SIZE
+from backend.config.logging_config import get_logger
+from backend.utils.table_catalog import table_catalog
+from backend.utils.dashboard_summary import dashboard_summary
+
+logger = get_logger(__name__)
 
 router = APIRouter(tags=["Supabase"])
 
+# lot_state / eqp_state 페이지 크기 상한 (PostgREST 한 번 응답 한도보다 1 작게 — 다음 페이지 확인용)
+MAX_PAGE_SIZE = PAGE_SIZE - 1
+
+
+def _state_filters(eqp_id, date, start_time, end_time) -> dict:
+    """날짜(하루) 또는 시간 범위 + EQP 필터"""
+    if date:
+        start_time, end_time = f"{date} 00:00:00", f"{date} 23:59:59"
+    return {"start_time": start_time, "end_time": end_time, "eqp_id": eqp_id}
+
+
+def _state_page(table, eqp_id, date, start_time, end_time, cursor, limit, order, count):
+    """
+    lot_state / eqp_state 공통 페이지 조회
+
+    OFFSET + count='exact' 대신 (event_time, tiebreak) 키셋 커서로 읽어 깊은 페이지도 첫 페이지와 같은 비용.
+    전체 행 수는 count를 지정한 경우에만 계산 (보통 첫 페이지에서 planned/estimated 한 번)
+    """
+    try:
+        page = supabase_config.get_table_page(
+            table,
+            filters=_state_filters(eqp_id, date, start_time, end_time),
+            cursor=cursor,
+            limit=limit,
+            descending=(order == "desc"),
+            count=count,
+        )
+        return {
+            "success": True, "data": page["rows"], "count": len(page["rows"]),
+            "next_cursor": page["next_cursor"], "has_more": page["has_more"],
+            "total_count": page["total_count"], "count_method": count,
+        }
+    except Exception as e:
+        return {"success": False, "error": str(e), "data": []}
+
+
+def _state_export(table, eqp_id, date, start_time, end_time, max_rows) -> StreamingResponse:
+    """
+    lot_state / eqp_state 일괄 내보내기 (한 줄에 행 하나인 NDJSON)
+
+    키셋 페이지 단위로 읽는 대로 내보내므로 전체 결과를 메모리에 올리지 않습니다.
+    중간에 조회가 실패하면 마지막 줄에 {"error": ...}를 남깁니다.
+    """
+    filters = _state_filters(eqp_id, date, start_time, end_time)
+
+    def rows():
+        try:
+            for row in supabase_config.iter_table_rows(table, filters=filters, max_rows=max_rows):
+                yield json.dumps(row, ensure_ascii=False, default=str) + "\n"
+        except Exception as e:
+            logger.error("[Supabase] %s 내보내기 실패: %s", table, e)
+            yield json.dumps({"error": str(e)}, ensure_ascii=False) + "\n"
+
+    suffix = date or datetime.now().strftime('%Y%m%d')
+    return StreamingResponse(
+        rows(),
+        media_type="application/x-ndjson",
+        headers={"Content-Disposition": f'attachment; filename="{table}_{suffix}.ndjson"'},
+    )
+
+
 # KPI_DAILY 조회
 @router.get("/kpi-daily")
-async def get_kpi_daily(date: Optional[str] = None, eqp_id: Optional[str] = None):
+def get_kpi_daily(date: Optional[str] = None, eqp_id: Optional[str] = None):
     try:
         data = supabase_config.get_kpi_daily(date=date, eqp_id=eqp_id)
         return {"success": True, "data": data, "count": len(data)}
@@ -20,120 +88,84 @@ async def get_kpi_daily(date: Optional[str] = None, eqp_id: Optional[str] = None
 
 # SCENARIO_MAP 조회 (알람 목록)
 @router.get("/scenario-map")
-async def get_scenario_map(date: Optional[str] = None):
+def get_scenario_map(date: Optional[str] = None):
     try:
         data = supabase_config.get_scenario_map(date=date)
         return {"success": True, "data": data, "count": len(data)}
     except Exception as e:
         return {"success": False, "error": str(e), "data": []}
 
-# LOT_STATE 메타데이터 (전체 날짜·EQP 목록)
+# LOT_STATE 메타데이터 (데이터가 있는 날짜·EQP 목록, 날짜별 행 수)
 @router.get("/lot-state/meta")
-async def get_lot_state_meta():
+def get_lot_state_meta(eqp_id: Optional[str] = None):
     try:
-        min_r = supabase_config.client.table('lot_state').select('event_time').order('event_time').limit(1).execute()
-        max_r = supabase_config.client.table('lot_state').select('event_time').order('event_time', desc=True).limit(1).execute()
-        eqp_r = supabase_config.client.table('lot_state').select('eqp_id').execute()
-        dates = []
-        if min_r.data and max_r.data:
-            d0 = date_type.fromisoformat(min_r.data[0]['event_time'][:10])
-            d1 = date_type.fromisoformat(max_r.data[0]['event_time'][:10])
-            cur = d0
-            while cur <= d1:
-                dates.append(str(cur))
-                cur += timedelta(days=1)
-        eqps = sorted(set(r['eqp_id'] for r in eqp_r.data if r.get('eqp_id')))
-        return {"success": True, "dates": dates, "eqps": eqps}
+        # 메모리 카탈로그에서 응답 (테이블이 바뀐 경우에만 변경분 재집계)
+        return {"success": True, **table_catalog.get_meta('lot_state', eqp_id=eqp_id)}
     except Exception as e:
         return {"success": False, "error": str(e), "dates": [], "eqps": []}
 
-# LOT_STATE 조회 (페이징 + 날짜·EQP 필터 지원)
+# LOT_STATE 조회 (키셋 커서 페이징 + 날짜·EQP 필터 지원)
 @router.get("/lot-state")
-async def get_lot_state(
+def get_lot_state(
     eqp_id: Optional[str] = None,
     date: Optional[str] = None,
     start_time: Optional[str] = None,
     end_time: Optional[str] = None,
-    page: int = Query(default=1, ge=1),
-    page_size: int = Query(default=1000, ge=1, le=5000),
+    cursor: Optional[str] = None,
+    limit: int = Query(default=500, ge=1, le=MAX_PAGE_SIZE),
+    order: Literal["asc", "desc"] = "asc",
+    count: Optional[Literal["planned", "estimated", "exact"]] = None,
 ):
-    try:
-        offset = (page - 1) * page_size
-        query = supabase_config.client.table('lot_state').select('*', count='exact')
-        if date:
-            query = query.gte('event_time', f"{date} 00:00:00").lte('event_time', f"{date} 23:59:59")
-        else:
-            if start_time:
-                query = query.gte('event_time', start_time)
-            if end_time:
-                query = query.lte('event_time', end_time)
-        if eqp_id:
-            query = query.eq('eqp_id', eqp_id)
-        result = query.order('event_time').range(offset, offset + page_size - 1).execute()
-        total_count = result.count if result.count is not None else 0
-        total_pages = max(1, (total_count + page_size - 1) // page_size)
-        return {
-            "success": True, "data": result.data, "count": len(result.data),
-            "total_count": total_count, "page": page, "page_size": page_size, "total_pages": total_pages,
-        }
-    except Exception as e:
-        return {"success": False, "error": str(e), "data": []}
+    return _state_page('lot_state', eqp_id, date, start_time, end_time, cursor, limit, order, count)
 
-# EQP_STATE 메타데이터 (전체 날짜·EQP 목록)
+# LOT_STATE 일괄 내보내기 (NDJSON 스트리밍)
+@router.get("/lot-state/export")
+def export_lot_state(
+    eqp_id: Optional[str] = None,
+    date: Optional[str] = None,
+    start_time: Optional[str] = None,
+    end_time: Optional[str] = None,
+    max_rows: Optional[int] = Query(default=None, ge=1),
+):
+    return _state_export('lot_state', eqp_id, date, start_time, end_time, max_rows)
+
+# EQP_STATE 메타데이터 (데이터가 있는 날짜·EQP 목록, 날짜별 행 수)
 @router.get("/eqp-state/meta")
-async def get_eqp_state_meta():
+def get_eqp_state_meta(eqp_id: Optional[str] = None):
     try:
-        min_r = supabase_config.client.table('eqp_state').select('event_time').order('event_time').limit(1).execute()
-        max_r = supabase_config.client.table('eqp_state').select('event_time').order('event_time', desc=True).limit(1).execute()
-        eqp_r = supabase_config.client.table('eqp_state').select('eqp_id').execute()
-        dates = []
-        if min_r.data and max_r.data:
-            d0 = date_type.fromisoformat(min_r.data[0]['event_time'][:10])
-            d1 = date_type.fromisoformat(max_r.data[0]['event_time'][:10])
-            cur = d0
-            while cur <= d1:
-                dates.append(str(cur))
-                cur += timedelta(days=1)
-        eqps = sorted(set(r['eqp_id'] for r in eqp_r.data if r.get('eqp_id')))
-        return {"success": True, "dates": dates, "eqps": eqps}
+        # 메모리 카탈로그에서 응답 (테이블이 바뀐 경우에만 변경분 재집계)
+        return {"success": True, **table_catalog.get_meta('eqp_state', eqp_id=eqp_id)}
     except Exception as e:
         return {"success": False, "error": str(e), "dates": [], "eqps": []}
 
-# EQP_STATE 조회 (페이징 + 날짜·EQP 필터 지원)
+# EQP_STATE 조회 (키셋 커서 페이징 + 날짜·EQP 필터 지원)
 @router.get("/eqp-state")
-async def get_eqp_state(
+def get_eqp_state(
     eqp_id: Optional[str] = None,
     date: Optional[str] = None,
     start_time: Optional[str] = None,
     end_time: Optional[str] = None,
-    page: int = Query(default=1, ge=1),
-    page_size: int = Query(default=1000, ge=1, le=5000),
+    cursor: Optional[str] = None,
+    limit: int = Query(default=500, ge=1, le=MAX_PAGE_SIZE),
+    order: Literal["asc", "desc"] = "asc",
+    count: Optional[Literal["planned", "estimated", "exact"]] = None,
 ):
-    try:
-        offset = (page - 1) * page_size
-        query = supabase_config.client.table('eqp_state').select('*', count='exact')
-        if date:
-            query = query.gte('event_time', f"{date} 00:00:00").lte('event_time', f"{date} 23:59:59")
-        else:
-            if start_time:
-                query = query.gte('event_time', start_time)
-            if end_time:
-                query = query.lte('event_time', end_time)
-        if eqp_id:
-            query = query.eq('eqp_id', eqp_id)
-        result = query.order('event_time').range(offset, offset + page_size - 1).execute()
-        total_count = result.count if result.count is not None else 0
-        total_pages = max(1, (total_count + page_size - 1) // page_size)
-        return {
-            "success": True, "data": result.data, "count": len(result.data),
-            "total_count": total_count, "page": page, "page_size": page_size, "total_pages": total_pages,
-        }
-    except Exception as e:
-        return {"success": False, "error": str(e), "data": []}
+    return _state_page('eqp_state', eqp_id, date, start_time, end_time, cursor, limit, order, count)
+
+# EQP_STATE 일괄 내보내기 (NDJSON 스트리밍)
+@router.get("/eqp-state/export")
+def export_eqp_state(
+    eqp_id: Optional[str] = None,
+    date: Optional[str] = None,
+    start_time: Optional[str] = None,
+    end_time: Optional[str] = None,
+    max_rows: Optional[int] = Query(default=None, ge=1),
+):
+    return _state_export('eqp_state', eqp_id, date, start_time, end_time, max_rows)
 
 # RCP_STATE 조회
 @router.get("/rcp-state")
-async def get_rcp_state(eqp_id: Optional[str] = None):
+def get_rcp_state(eqp_id: Optional[str] = None):
     try:
         data = supabase_config.get_rcp_state(eqp_id=eqp_id)
         return {"success": True, "data": data, "count": len(data)}
@@ -142,41 +174,16 @@ async def get_rcp_state(eqp_id: Optional[str] = None):
 
 # 대시보드용 최신 KPI 요약
 @router.get("/dashboard-summary")
-async def get_dashboard_summary():
+def get_dashboard_summary(eqp_id: Optional[str] = None):
     """
     대시보드 상단 KPI 카드용 최신 데이터 반환
-    alarm_flag=1인 가장 최근 데이터 기준
+    가장 최근 날짜의 KPI 행과 전체 알람(alarm_flag=1) 건수 (eqp_id 지정 시 해당 장비 기준)
     """
     try:
-        # 전체 KPI 데이터 조회
-        all_kpi = supabase_config.get_kpi_daily()
-
-        if not all_kpi:
+        # 메모리 요약 엔진에서 응답 (새 날짜분만 증분 반영, 실패 시 DB 집계 쿼리)
+        summary = dashboard_summary.get_summary(eqp_id=eqp_id)
+        if not summary['latest']:
             return {"success": False, "error": "데이터 없음"}
-
-        # 가장 최근 날짜 데이터
-        latest = sorted(all_kpi, key=lambda x: x['date'], reverse=True)[0]
-
-        # 알람 발생 건수
-        alarm_count = sum(1 for k in all_kpi if k.get('alarm_flag') == 1)
-
-        return {
-            "success": True,
-            "latest": {
-                "date": latest['date'],
-                "eqp_id": latest['eqp_id'],
-                "oee_v": latest.get('oee_v'),
-                "oee_t": latest.get('oee_t'),
-                "thp_v": latest.get('thp_v'),
-                "thp_t": latest.get('thp_t'),
-                "tat_v": latest.get('tat_v'),
-                "tat_t": latest.get('tat_t'),
-                "wip_v": latest.get('wip_v'),
-                "wip_t": latest.get('wip_t'),
-                "alarm_flag": latest.get('alarm_flag'),
-            },
-            "alarm_count": alarm_count,
-            "total_count": len(all_kpi),
-        }
+        return {"success": True, **summary}
     except Exception as e:
         return {"success": False, "error": str(e)}
@@ -4,8 +4,19 @@
 
 from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel
-from backend.utils.cache import analysis_cache, qa_cache
+from backend.utils.cache import analysis_cache, qa_cache, phase1_cache
+from backend.utils.semantic_cache import semantic_qa_cache
+from backend.utils.embedding_cache import embedding_cache
+from backend.utils.kpi_aggregates import kpi_aggregates
+from backend.utils.table_catalog import table_catalog
+from backend.utils.dashboard_summary import dashboard_summary, rds_dashboard_summary
 from backend.config.rds_config import rds_config
+from backend.api.concurrency import get_concurrency_stats
+from backend.api.alarm_watcher import alarm_watcher
+from backend.config.logging_config import get_logger, get_logging_stats
+from backend.config.bedrock_gateway import bedrock_gateway
+
+logger = get_logger(__name__)
 
 router = APIRouter(prefix="/system", tags=["System"])
 
@@ -19,7 +30,7 @@ class TargetSettings(BaseModel):
 
 
 @router.put("/settings/targets")
-async def update_targets(settings: TargetSettings):
+def update_targets(settings: TargetSettings):
     """
     KPI 목표값(임계값)을 kpi_daily 테이블 전체에 업데이트합니다. (Amazon RDS)
 
@@ -34,7 +45,10 @@ async def update_targets(settings: TargetSettings):
             tat_t=float(settings.tat_max),
             wip_t=float(wip_t),
         )
-        print(f"[system] kpi_daily RDS 업데이트 결과: {updated_count}행 변경")
+        logger.info("[system] kpi_daily RDS 업데이트 결과: %d행 변경", updated_count)
+        # 목표값이 바뀌면 과거 날짜의 이탈 건수도 달라지므로 전체 재집계
+        kpi_aggregates.invalidate("목표값 변경")
+        rds_dashboard_summary.invalidate("목표값 변경")
 
         if updated_count == 0:
             raise HTTPException(
@@ -60,26 +74,111 @@ async def update_targets(settings: TargetSettings):
 
 
 @router.get("/cache/stats")
-async def get_cache_stats():
+def get_cache_stats():
     """
     캐시 통계 조회
     
-    알람 분석 캐시와 질문 답변 캐시의 상태를 확인합니다.
+    알람 분석 캐시, 질문 답변 캐시, Phase 1 세션 캐시, 임베딩 캐시의 상태
+    (항목 수, 추정 크기, 히트/미스/LRU 삭제 수)와 KPI 사전 집계 / 테이블 카탈로그 상태를 확인합니다.
     """
     
     return {
         "analysis_cache": analysis_cache.get_stats(),
         "qa_cache": qa_cache.get_stats(),
+        "phase1_cache": phase1_cache.get_stats(),
+        "semantic_qa_cache": semantic_qa_cache.get_stats() if semantic_qa_cache else None,
+        "embedding_cache": embedding_cache.get_stats(),
+        "kpi_aggregates": kpi_aggregates.get_stats(),
+        "table_catalog": table_catalog.get_stats(),
+        "dashboard_summary": {
+            "supabase": dashboard_summary.get_stats(),
+            "rds": rds_dashboard_summary.get_stats(),
+        },
+    }
+
+
+@router.get("/db/pool")
+async def get_db_pool_stats():
+    """
+    RDS 커넥션 풀 통계 조회
+
+    대여중(checked_out), 대기중(waiting), 누적 생성(created) 연결 수 등을 확인합니다.
+    """
+
+    return {
+        "rds_pool": rds_config.pool.get_stats(),
+    }
+
+
+@router.get("/concurrency")
+async def get_workflow_concurrency():
+    """
+    워크플로우 실행 현황 조회
+
+    라우트 그룹(alarm, question)별 동시 실행 제한과 실행/대기 중인 요청 수를 확인합니다.
+    """
+
+    return get_concurrency_stats()
+
+
+@router.get("/alarm-watcher")
+async def get_alarm_watcher_stats():
+    """
+    알람 워처(Phase 1 사전 분석) 상태 조회
+
+    폴링 횟수, 제출/완료/실패한 사전 분석 수, 진행 중인 알람 키를 확인합니다.
+    """
+
+    return alarm_watcher.get_stats()
+
+
+@router.get("/logging")
+async def get_logging_status():
+    """
+    로깅 상태 조회
+
+    로그 레벨/형식, DEBUG 샘플링 비율, 비동기 로그 큐 적재량과 유실(큐 가득 참) 수를 확인합니다.
+    """
+
+    return get_logging_stats()
+
+
+@router.get("/bedrock")
+async def get_bedrock_gateway_stats():
+    """
+    Bedrock 게이트웨이 상태 조회
+
+    Claude/임베딩별 RPM·동시 실행 한도, 실행/대기 중인 요청 수, 남은 토큰,
+    스로틀링·재시도·대기 초과·헤징 횟수를 확인합니다.
+    """
+
+    return bedrock_gateway.get_stats()
+
+
+@router.post("/alarm-watcher/poll")
+def poll_alarm_watcher():
+    """
+    알람 워처 즉시 폴링
+
+    다음 주기를 기다리지 않고 새 알람을 조회하여 사전 분석을 제출합니다.
+    """
+
+    submitted = alarm_watcher.poll_once()
+    return {
+        "success": True,
+        "submitted": submitted,
+        "stats": alarm_watcher.get_stats(),
     }
 
 
 @router.post("/cache/clear")
-async def clear_cache(cache_type: str = "all"):
+def clear_cache(cache_type: str = "all"):
     """
     캐시 초기화
     
     Args:
-        cache_type: 'analysis', 'qa', 또는 'all'
+        cache_type: 'analysis', 'qa', 'semantic', 'embedding', 또는 'all'
+            ('all'은 임베딩 캐시를 제외한 응답 캐시만 초기화)
     """
     
     if cache_type in ["analysis", "all"]:
@@ -87,6 +186,12 @@ async def clear_cache(cache_type: str = "all"):
     
     if cache_type in ["qa", "all"]:
         qa_cache.clear()
+
+    if cache_type in ["semantic", "qa", "all"] and semantic_qa_cache is not None:
+        semantic_qa_cache.invalidate("수동 초기화")
+
+    if cache_type == "embedding":
+        embedding_cache.clear()
     
     return {
         "success": True,
@@ -0,0 +1,210 @@
+"""
+알람 워처 / Phase 1 사전 분석 테스트
+(알람 조회와 노드 실행을 가짜 함수로 바꿔 중복 제거, 동시 실행 제한, 결과 재사용만 검증합니다)
+"""
+
+import sys
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+# 프로젝트 루트를 경로에 추가
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from backend.api.alarm_watcher import AlarmWatcher
+from backend.graph import workflow
+from backend.utils.cache import analysis_cache
+
+
+def test_alarm_watcher_dedupe():
+    """중복 제거 / 동시 실행 제한 / 워터마크 테스트"""
+
+    print("\n" + "=" * 60)
+    print("알람 워처 테스트")
+    print("=" * 60 + "\n")
+
+    alarms = [
+        {'date': '2026-01-31', 'eqp_id': 'EQP01'},
+        {'date': '2026-01-30', 'eqp_id': 'EQP02'},
+    ]
+    fetch_calls = []
+    done_keys = set()
+    release = threading.Event()
+    prepared = []
+
+    def fake_fetch(since_date=None, limit=5, after=None):
+        fetch_calls.append(since_date)
+        return [a for a in alarms if not since_date or a['date'] >= since_date]
+
+    def fake_prepare(date, eqp_id):
+        prepared.append((date, eqp_id))
+        release.wait(5)
+        done_keys.add(f"phase1:{date}:{eqp_id}:auto")
+        return {'root_causes': [{'cause': 'x'}]}
+
+    watcher = AlarmWatcher(
+        interval_seconds=3600, max_concurrency=1,
+        fetch_alarms=fake_fetch, prepare_fn=fake_prepare,
+        is_pending_fn=lambda key: key in done_keys,
+        key_fn=lambda date, eqp_id, kpi=None: f"phase1:{date}:{eqp_id}:{kpi or 'auto'}",
+    )
+    watcher.start()
+    try:
+        # 1. 동시 1건 제한: 최신 알람만 제출, 나머지는 다음 폴링으로 (워터마크 유지)
+        deadline = time.time() + 5
+        while not prepared and time.time() < deadline:
+            time.sleep(0.01)
+        assert prepared == [('2026-01-31', 'EQP01')]
+        assert watcher.watermark is None
+
+        # 2. 계산 중인 알람은 다시 제출하지 않음
+        assert watcher.poll_once() == 0
+        assert watcher.get_stats()['skipped'] >= 1
+
+        # 3. 완료 후 다음 알람 제출, 모두 처리되면 워터마크 전진
+        release.set()
+        deadline = time.time() + 5
+        while watcher.get_stats()['in_progress'] and time.time() < deadline:
+            time.sleep(0.01)
+        assert watcher.poll_once() == 1
+        deadline = time.time() + 5
+        while watcher.completed < 2 and time.time() < deadline:
+            time.sleep(0.01)
+        assert prepared[-1] == ('2026-01-30', 'EQP02')
+        assert watcher.poll_once() == 0
+        assert watcher.watermark == '2026-01-31' and fetch_calls[-1] == '2026-01-31'
+        print(f"   통계: {watcher.get_stats()}")
+    finally:
+        release.set()
+        watcher.stop()
+
+    print("\n알람 워처 테스트 통과!\n")
+
+
+def test_alarm_watcher_paging():
+    """같은 날짜 알람이 페이지보다 많을 때 / 캐시 만료 후 재제출 방지 테스트"""
+
+    print("=" * 60)
+    print("알람 워처 페이지 / 완료 기록 테스트")
+    print("=" * 60 + "\n")
+
+    alarms = [{'date': '2026-01-31', 'eqp_id': f"EQP{i:02d}"} for i in range(7)]
+    alarms.append({'date': '2026-01-30', 'eqp_id': 'EQP01'})
+    cached = set()
+    prepared = []
+
+    def fake_fetch(since_date=None, limit=5, after=None):
+        # (date, eqp_id) 내림차순 + 키셋 커서 (get_recent_alarms와 같은 순서)
+        rows = sorted((a for a in alarms if not since_date or a['date'] >= since_date),
+                      key=lambda a: (a['date'], a['eqp_id']), reverse=True)
+        if after:
+            rows = [a for a in rows if (a['date'], a['eqp_id']) < tuple(after)]
+        return rows[:limit]
+
+    def fake_prepare(date, eqp_id):
+        prepared.append((date, eqp_id))
+        cached.add(f"phase1:{date}:{eqp_id}:auto")
+        return {'root_causes': [{'cause': 'x'}]}
+
+    def wait_idle(watcher):
+        deadline = time.time() + 5
+        while watcher.get_stats()['in_progress'] and time.time() < deadline:
+            time.sleep(0.01)
+
+    watcher = AlarmWatcher(
+        interval_seconds=3600, max_concurrency=10, batch_size=2,
+        fetch_alarms=fake_fetch, prepare_fn=fake_prepare,
+        is_pending_fn=lambda key: key in cached,
+        key_fn=lambda date, eqp_id, kpi=None: f"phase1:{date}:{eqp_id}:{kpi or 'auto'}",
+    )
+    watcher._executor = ThreadPoolExecutor(max_workers=10)
+    try:
+        # 1. 첫 폴링은 가장 최근 한 페이지만, 워터마크 설정
+        assert watcher.poll_once() == 2
+        wait_idle(watcher)
+        assert watcher.watermark == '2026-01-31'
+
+        # 2. 이후 폴링은 완료된 알람을 건너뛰고 키셋으로 이어 읽어 나머지 5건 제출
+        assert watcher.poll_once() == 5
+        wait_idle(watcher)
+        assert sorted(prepared) == sorted((a['date'], a['eqp_id']) for a in alarms[:7])
+
+        # 3. 캐시가 만료되어도 완료된 알람은 다시 제출하지 않음
+        cached.clear()
+        assert watcher.poll_once() == 0
+        stats = watcher.get_stats()
+        print(f"   통계: {stats}")
+        assert stats['processed'] == 7 and len(prepared) == 7
+    finally:
+        watcher._executor.shutdown(wait=True)
+
+    print("\n알람 워처 페이지 / 완료 기록 테스트 통과!\n")
+
+
+def test_prepare_phase1_single_flight():
+    """같은 알람 동시 요청은 한 번만 계산하고, 이후 요청은 캐시 재사용"""
+
+    print("=" * 60)
+    print("Phase 1 단일 실행 테스트")
+    print("=" * 60 + "\n")
+
+    calls = []
+    started = threading.Event()
+
+    def fake_execute(alarm_date, alarm_eqp_id, alarm_kpi=None, prefetched=None):
+        calls.append((alarm_date, alarm_eqp_id))
+        started.set()
+        time.sleep(0.2)
+        return {'alarm_date': alarm_date, 'alarm_eqp_id': alarm_eqp_id, 'alarm_kpi': 'OEE',
+                'root_causes': [{'cause': 'x', 'probability': 60}],
+                'metadata': {'llm_calls': 1}}
+
+    key = workflow.phase1_result_key('2099-01-01', 'EQP99')
+    original = workflow._execute_phase1_nodes
+    workflow._execute_phase1_nodes = fake_execute
+    analysis_cache.delete(key)
+    try:
+        results = []
+        first = threading.Thread(
+            target=lambda: results.append(workflow.prepare_alarm_phase1('2099-01-01', 'EQP99'))
+        )
+        first.start()
+        started.wait(5)
+        assert workflow.is_phase1_pending(key)
+
+        # 계산 중에 들어온 요청은 기다렸다가 같은 결과 사용
+        waiting = workflow.prepare_alarm_phase1('2099-01-01', 'EQP99')
+        first.join()
+        assert len(calls) == 1
+        assert waiting['precomputed'] and waiting['root_causes'] == results[0]['root_causes']
+
+        # 이후 클릭은 캐시에서 바로 반환, metadata는 복사본
+        again = workflow.prepare_alarm_phase1('2099-01-01', 'EQP99')
+        again['metadata']['llm_calls'] += 1
+        assert len(calls) == 1
+        assert analysis_cache.get(key)['metadata']['llm_calls'] == 1
+    finally:
+        workflow._execute_phase1_nodes = original
+        analysis_cache.delete(key)
+
+    print("\nPhase 1 단일 실행 테스트 통과!\n")
+
+
+def main():
+    """모든 테스트 실행"""
+
+    print("\n알람 워처 테스트 시작\n")
+
+    test_alarm_watcher_dedupe()
+    test_alarm_watcher_paging()
+    test_prepare_phase1_single_flight()
+
+    print("=" * 60)
+    print("모든 테스트 완료!")
+    print("=" * 60 + "\n")
+
+
+if __name__ == "__main__":
+    main()
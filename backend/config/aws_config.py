@@ -3,15 +3,37 @@ AWS Bedrock 설정 및 클라이언트 초기화
 """
 
 import os
+import time
 import boto3
 import json
+import threading
+from botocore.config import Config
 from pathlib import Path
 from dotenv import load_dotenv
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Iterator
+
+from backend.config.logging_config import get_logger
+from backend.utils.tracing import record_llm_call
+from backend.config.bedrock_gateway import bedrock_gateway
 
 # .env 파일에서 환경 변수 로드
 load_dotenv()
 
+logger = get_logger(__name__)
+
+
+def _retry_attempts(response_or_error) -> int:
+    """botocore 응답/예외의 재시도 횟수 (ResponseMetadata.RetryAttempts)"""
+    meta = getattr(response_or_error, 'response', response_or_error)
+    if not isinstance(meta, dict):
+        return 0
+    return (meta.get('ResponseMetadata') or {}).get('RetryAttempts', 0) or 0
+
+
+def _total_retries(response_or_error, gateway_retries: int = 0) -> int:
+    """게이트웨이 재시도 + botocore 재시도 (botocore 재시도는 꺼 두었지만 설정으로 켤 수 있음)"""
+    return gateway_retries + _retry_attempts(response_or_error)
+
 class AWSConfig:
     """
     AWS Bedrock 설정 클래스
@@ -34,6 +56,11 @@ class AWSConfig:
             'amazon.titan-embed-text-v1'
         )
 
+        # Bedrock 클라이언트 (재시도는 bedrock_gateway가 담당하므로 botocore 재시도는 끔)
+        self._bedrock_client = None
+        self._client_lock = threading.Lock()
+        self.bedrock_max_attempts = int(os.getenv('BEDROCK_BOTOCORE_MAX_ATTEMPTS', '1'))
+
         # S3 설정 (.env에서 로드)
         self.s3_bucket = os.getenv('S3_BUCKET', 'ag-prod-s3-bucket')
         self.s3_prefix = os.getenv('S3_PREFIX', 'team4-bucket/')
@@ -51,16 +78,27 @@ class AWSConfig:
     def get_bedrock_runtime_client(self):
         """
         Bedrock Runtime 클라이언트를 반환합니다.
+
+        boto3 클라이언트는 스레드 안전하므로 한 번 만들어 재사용합니다.
+        (호출마다 만들면 자격 증명/엔드포인트 로딩과 TLS 연결이 매번 반복됨)
         
         Returns:
             boto3.client: Bedrock Runtime 클라이언트
         """
-        return boto3.client(
-            service_name='bedrock-runtime',
-            region_name=self.region,
-            aws_access_key_id=self.access_key_id,
-            aws_secret_access_key=self.secret_access_key
-        )
+        with self._client_lock:
+            if self._bedrock_client is None:
+                lanes = bedrock_gateway.get_stats()['lanes']
+                self._bedrock_client = boto3.client(
+                    service_name='bedrock-runtime',
+                    region_name=self.region,
+                    aws_access_key_id=self.access_key_id,
+                    aws_secret_access_key=self.secret_access_key,
+                    config=Config(
+                        retries={'max_attempts': self.bedrock_max_attempts, 'mode': 'standard'},
+                        max_pool_connections=sum(l['max_concurrency'] for l in lanes.values()) * 2,
+                    ),
+                )
+            return self._bedrock_client
     
     def invoke_claude(
         self, 
@@ -98,16 +136,109 @@ class AWSConfig:
         if system_prompt:
             body["system"] = system_prompt
         
-        # 모델 호출
-        response = client.invoke_model(
-            modelId=self.model_id,
-            body=json.dumps(body)
+        # 모델 호출 (게이트웨이: 속도/동시 실행 제한 + 스로틀링 재시도)
+        # 소요 시간 / usage / 재시도 횟수는 추적 span과 /metrics에 기록
+        started = time.perf_counter()
+        try:
+            response, gateway_retries = bedrock_gateway.invoke('completion', lambda: client.invoke_model(
+                modelId=self.model_id,
+                body=json.dumps(body)
+            ))
+            response_body = json.loads(response['body'].read())
+        except Exception as e:
+            record_llm_call('completion', self.model_id, time.perf_counter() - started,
+                            retries=_total_retries(e, getattr(e, 'gateway_retries', 0)), status='error')
+            raise
+
+        usage = response_body.get('usage') or {}
+        record_llm_call(
+            'completion', self.model_id, time.perf_counter() - started,
+            input_tokens=usage.get('input_tokens', 0),
+            output_tokens=usage.get('output_tokens', 0),
+            retries=_total_retries(response, gateway_retries),
+            cache_read_tokens=usage.get('cache_read_input_tokens', 0),
         )
-        
-        # 응답 파싱
-        response_body = json.loads(response['body'].read())
         return response_body['content'][0]['text']
     
+    def invoke_claude_stream(
+        self,
+        prompt: str,
+        max_tokens: int = 2000,
+        temperature: float = 0.7,
+        system_prompt: str = None,
+        trace_span=None
+    ) -> Iterator[str]:
+        """
+        Claude 모델을 스트리밍 방식으로 호출합니다.
+        응답이 생성되는 대로 텍스트 조각을 반환합니다.
+        
+        Args:
+            prompt: 사용자 프롬프트
+            max_tokens: 최대 생성 토큰 수 (기본: 2000)
+            temperature: 생성 다양성 0.0~1.0 (기본: 0.7)
+            system_prompt: 시스템 프롬프트 (선택)
+            trace_span: 호출을 기록할 tracing.Span (스트림은 여러 스레드에서 소비되므로 명시적으로 전달)
+        
+        Yields:
+            str: 생성된 텍스트 조각
+        """
+        client = self.get_bedrock_runtime_client()
+        
+        # 요청 본문 (invoke_claude와 동일)
+        body = {
+            "anthropic_version": "bedrock-2023-05-31",
+            "max_tokens": 2048,
+            "temperature": 0.7,
+            "messages": [{"role": "user", "content": prompt}]
+        }
+        
+        if system_prompt:
+            body["system"] = system_prompt
+        
+        # 스트리밍 모델 호출
+        # 게이트웨이 자리는 스트림을 다 읽을 때까지 점유, 재시도는 스트림 시작 호출만
+        # (텍스트를 이미 내보낸 뒤에는 다시 보낼 수 없음)
+        started = time.perf_counter()
+        usage = {'input_tokens': 0, 'output_tokens': 0}
+        retries, status = 0, 'error'
+        try:
+            with bedrock_gateway.slot('stream'):
+                response, gateway_retries = bedrock_gateway.retry(
+                    'stream', lambda: client.invoke_model_with_response_stream(
+                        modelId=self.model_id,
+                        body=json.dumps(body)
+                    ))
+                retries = _total_retries(response, gateway_retries)
+
+                # 이벤트 스트림 파싱: content_block_delta 이벤트의 텍스트만 반환
+                # (usage는 message_start / message_delta 이벤트에 나뉘어 옴)
+                for event in response['body']:
+                    chunk = event.get('chunk')
+                    if not chunk:
+                        continue
+                    payload = json.loads(chunk['bytes'])
+                    kind = payload.get('type')
+                    if kind == 'content_block_delta':
+                        text = payload.get('delta', {}).get('text')
+                        if text:
+                            yield text
+                    elif kind == 'message_start':
+                        usage['input_tokens'] = (payload.get('message', {}).get('usage') or {}) \
+                            .get('input_tokens', 0)
+                    elif kind == 'message_delta':
+                        usage['output_tokens'] = (payload.get('usage') or {}).get('output_tokens', 0)
+            status = 'ok'
+        except GeneratorExit:
+            # 클라이언트가 스트림을 중간에 닫음
+            status = 'cancelled'
+            raise
+        except Exception as e:
+            retries = retries or _total_retries(e, getattr(e, 'gateway_retries', 0))
+            raise
+        finally:
+            record_llm_call('stream', self.model_id, time.perf_counter() - started,
+                            retries=retries, status=status, span=trace_span, **usage)
+    
     def get_embeddings(self, text: str) -> List[float]:
         """
         텍스트를 임베딩 벡터로 변환합니다.
@@ -115,9 +246,20 @@ class AWSConfig:
         Args:
             text: 임베딩할 텍스트
         
+        동일 모델·동일 텍스트의 임베딩은 디스크 캐시(embedding_cache)에서 반환합니다.
+        
         Returns:
             List[float]: 임베딩 벡터 (1536차원)
         """
+        from backend.utils.embedding_cache import embedding_cache
+
+        started = time.perf_counter()
+        cached = embedding_cache.get(self.embedding_model_id, text)
+        if cached is not None:
+            record_llm_call('embedding', self.embedding_model_id,
+                            time.perf_counter() - started, cache_hit=True)
+            return cached
+
         client = self.get_bedrock_runtime_client()
         
         # 요청 본문
@@ -125,15 +267,29 @@ class AWSConfig:
             "inputText": text
         })
         
-        # 모델 호출
-        response = client.invoke_model(
-            modelId=self.embedding_model_id,
-            body=body
-        )
-        
+        # 모델 호출 (멱등이므로 느린 요청은 게이트웨이가 헤징)
+        def call():
+            response = client.invoke_model(
+                modelId=self.embedding_model_id,
+                body=body
+            )
+            return response, json.loads(response['body'].read())
+
+        try:
+            (response, response_body), gateway_retries = bedrock_gateway.invoke_hedged('embedding', call)
+        except Exception as e:
+            record_llm_call('embedding', self.embedding_model_id, time.perf_counter() - started,
+                            retries=_total_retries(e, getattr(e, 'gateway_retries', 0)), status='error')
+            raise
+
         # 응답 파싱
-        response_body = json.loads(response['body'].read())
-        return response_body['embedding']
+        embedding = response_body['embedding']
+        record_llm_call('embedding', self.embedding_model_id, time.perf_counter() - started,
+                        input_tokens=response_body.get('inputTextTokenCount', 0),
+                        retries=_total_retries(response, gateway_retries))
+
+        embedding_cache.set(self.embedding_model_id, text, embedding)
+        return embedding
 
     # ──────────────────────────────────────────────────────────────
     # S3 관련 메서드
@@ -167,7 +323,7 @@ class AWSConfig:
         client = self.get_s3_client()
         client.upload_file(str(local_path), self.s3_bucket, s3_key)
         uri = f"s3://{self.s3_bucket}/{s3_key}"
-        print(f"[S3] 업로드 완료: {uri}")
+        logger.info("[S3] 업로드 완료: %s", uri)
         return uri
 
     def delete_file_from_s3(self, filename: str) -> bool:
@@ -183,7 +339,7 @@ class AWSConfig:
         s3_key = self._s3_key(filename)
         client = self.get_s3_client()
         client.delete_object(Bucket=self.s3_bucket, Key=s3_key)
-        print(f"[S3] 삭제 완료: s3://{self.s3_bucket}/{s3_key}")
+        logger.info("[S3] 삭제 완료: s3://%s/%s", self.s3_bucket, s3_key)
         return True
 
     def list_files_in_s3(self) -> List[Dict[str, Any]]:
@@ -210,7 +366,7 @@ class AWSConfig:
                     'size': obj['Size'],
                     'last_modified': obj['LastModified'].isoformat()
                 })
-        print(f"[S3] 파일 목록 조회: {len(files)}개")
+        logger.debug("[S3] 파일 목록 조회: %d개", len(files))
         return files
 
     def file_exists_in_s3(self, filename: str) -> bool:
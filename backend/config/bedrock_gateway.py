@@ -0,0 +1,423 @@
+"""
+Bedrock 호출 게이트웨이 (속도 제한 / 동시 실행 제한 / 재시도 / 임베딩 헤징)
+
+여러 운영자가 동시에 분석하면 Claude 호출이 계정 할당량(RPM)을 넘어
+ThrottlingException으로 Node 6/8이 통째로 실패합니다. 모든 invoke_model 호출을
+이 게이트웨이로 보내서 할당량 안에서 줄을 세우고, 일시적 오류는 재시도합니다.
+
+- 토큰 버킷: 모델 종류(completion/embedding)별 분당 요청 수(RPM)만큼 토큰 보충
+- 동시 실행 제한: 종류별 세마포어, 자리가 날 때까지 대기(대기 중인 요청 수 = 큐 깊이)
+- 재시도: 스로틀링/일시적 오류만, full jitter 지수 백오프 (botocore 재시도는 끔 → 중복 재시도 방지)
+  스로틀링을 받으면 버킷을 잠시 비워 다른 요청도 같이 물러섬
+- 헤징(임베딩만): 첫 요청이 BEDROCK_EMBED_HEDGE_MS 안에 안 끝나면 토큰이 남아 있을 때만
+  같은 요청을 한 번 더 보내고 먼저 끝난 결과 사용 (임베딩은 멱등)
+
+환경 변수:
+    BEDROCK_CLAUDE_RPM / BEDROCK_EMBED_RPM: 분당 요청 수 (기본 60 / 600)
+    BEDROCK_CLAUDE_MAX_CONCURRENCY / BEDROCK_EMBED_MAX_CONCURRENCY: 동시 호출 수 (기본 4 / 8)
+    BEDROCK_MAX_RETRIES: 최대 재시도 횟수 (기본 4)
+    BEDROCK_BACKOFF_BASE / BEDROCK_BACKOFF_MAX: 백오프 기준 / 최대 (초, 기본 0.5 / 20)
+    BEDROCK_QUEUE_TIMEOUT: 자리/토큰 대기 최대 시간 (초, 기본 60)
+    BEDROCK_EMBED_HEDGE_MS: 임베딩 헤징 지연 (ms, 기본 1500, 0이면 끔)
+"""
+
+import os
+import time
+import random
+import threading
+import contextvars
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from typing import Any, Callable, Dict, Iterator, Optional, Tuple
+
+from backend.config.logging_config import get_logger
+from backend.utils.tracing import metrics
+
+logger = get_logger(__name__)
+
+# 재시도할 오류 코드 (botocore ClientError의 Error.Code)
+THROTTLE_CODES = {'ThrottlingException', 'TooManyRequestsException', 'ServiceQuotaExceededException'}
+TRANSIENT_CODES = {'ServiceUnavailableException', 'ModelNotReadyException',
+                   'InternalServerException', 'ModelTimeoutException'}
+# 네트워크 계열 예외 (botocore.exceptions, 이름으로 판별 → botocore import 불필요)
+TRANSIENT_EXCEPTIONS = {'EndpointConnectionError', 'ConnectionClosedError',
+                        'ReadTimeoutError', 'ConnectTimeoutError'}
+
+
+class BedrockThrottledError(RuntimeError):
+    """게이트웨이 대기 시간 초과 (할당량/동시 실행 한도로 QUEUE_TIMEOUT 안에 보내지 못함)"""
+
+
+def classify_error(error: Exception) -> Optional[str]:
+    """
+    재시도 여부 판별
+
+    Returns:
+        'throttle' | 'transient' | None(재시도하지 않음)
+    """
+    response = getattr(error, 'response', None)
+    if isinstance(response, dict):
+        code = (response.get('Error') or {}).get('Code')
+        status = (response.get('ResponseMetadata') or {}).get('HTTPStatusCode')
+        if code in THROTTLE_CODES or status == 429:
+            return 'throttle'
+        if code in TRANSIENT_CODES or (status is not None and status >= 500):
+            return 'transient'
+    if type(error).__name__ in TRANSIENT_EXCEPTIONS:
+        return 'transient'
+    return None
+
+
+class TokenBucket:
+    """
+    분당 요청 수 토큰 버킷 (스레드 안전)
+    """
+
+    def __init__(self, rate_per_minute: float, burst: Optional[float] = None):
+        """
+        Args:
+            rate_per_minute: 분당 보충 토큰 수 (0 이하면 제한 없음)
+            burst: 최대 적립 토큰 수 (None이면 1초분, 최소 1)
+        """
+        self.rate = max(rate_per_minute, 0) / 60.0
+        self.capacity = burst if burst is not None else max(1.0, self.rate)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float) -> None:
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def try_acquire(self) -> float:
+        """
+        토큰 하나를 가져옵니다.
+
+        Returns:
+            float: 0이면 획득, 양수면 다음 토큰까지 기다려야 할 시간(초)
+        """
+        if self.rate <= 0:
+            return 0.0
+        with self._lock:
+            now = time.monotonic()
+            if now < self._paused_until:
+                return self._paused_until - now
+            self._refill(now)
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return 0.0
+            return (1 - self._tokens) / self.rate
+
+    def acquire(self, deadline: float) -> bool:
+        """deadline(monotonic)까지 토큰을 기다립니다. 시간 안에 못 얻으면 False"""
+        while True:
+            wait_s = self.try_acquire()
+            if wait_s <= 0:
+                return True
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return False
+            time.sleep(min(wait_s, remaining))
+
+    def pause(self, seconds: float) -> None:
+        """스로틀링 응답 후 버킷을 비우고 seconds 동안 토큰 발급 중지"""
+        with self._lock:
+            self._tokens = 0.0
+            self._updated = time.monotonic()
+            self._paused_until = max(self._paused_until, self._updated + seconds)
+
+    @property
+    def available(self) -> float:
+        if self.rate <= 0:
+            return float('inf')
+        with self._lock:
+            self._refill(time.monotonic())
+            return round(self._tokens, 2)
+
+
+class _Lane:
+    """모델 종류 하나(completion 또는 embedding)의 버킷 + 동시 실행 제한 + 통계"""
+
+    def __init__(self, name: str, rpm: float, max_concurrency: int):
+        self.name = name
+        self.rpm = rpm
+        self.max_concurrency = max_concurrency
+        self.bucket = TokenBucket(rpm)
+        self.slots = threading.BoundedSemaphore(max_concurrency)
+        self.waiting = 0
+        self.in_flight = 0
+        self.stats = {'calls': 0, 'retries': 0, 'throttled': 0, 'transient_errors': 0,
+                      'rejected': 0, 'failed': 0, 'hedges': 0, 'hedge_wins': 0,
+                      'wait_seconds': 0.0}
+
+
+class BedrockGateway:
+    """
+    Bedrock invoke_model 호출 관문
+    """
+
+    def __init__(
+        self,
+        claude_rpm: float = 60,
+        embed_rpm: float = 600,
+        claude_max_concurrency: int = 4,
+        embed_max_concurrency: int = 8,
+        max_retries: int = 4,
+        backoff_base: float = 0.5,
+        backoff_max: float = 20.0,
+        queue_timeout: float = 60.0,
+        embed_hedge_ms: float = 1500,
+    ):
+        """
+        Args:
+            claude_rpm / embed_rpm: 분당 요청 수 (계정 할당량보다 약간 낮게)
+            claude_max_concurrency / embed_max_concurrency: 동시 호출 수
+            max_retries: 스로틀링/일시적 오류 최대 재시도 횟수
+            backoff_base / backoff_max: 지수 백오프 기준 / 최대 대기 (초)
+            queue_timeout: 자리/토큰 대기 최대 시간 (초)
+            embed_hedge_ms: 임베딩 헤징 지연 (ms, 0이면 헤징 안 함)
+        """
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.queue_timeout = queue_timeout
+        self.embed_hedge_ms = embed_hedge_ms
+        self._lanes = {
+            'completion': _Lane('completion', claude_rpm, claude_max_concurrency),
+            'embedding': _Lane('embedding', embed_rpm, embed_max_concurrency),
+        }
+        self._lock = threading.Lock()
+        self._hedge_executor: Optional[ThreadPoolExecutor] = None
+
+    def _lane(self, operation: str) -> _Lane:
+        # stream은 completion과 같은 할당량을 씀
+        return self._lanes['embedding' if operation == 'embedding' else 'completion']
+
+    def backoff_delay(self, attempt: int) -> float:
+        """full jitter 지수 백오프: U(0, min(max, base * 2^attempt))"""
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * (2 ** attempt)))
+
+    # ──────────────────────────────────────────────────────────────
+    # 자리 / 토큰
+    # ──────────────────────────────────────────────────────────────
+
+    @contextmanager
+    def slot(self, operation: str) -> Iterator[None]:
+        """
+        동시 실행 자리와 속도 제한 토큰을 얻은 뒤 블록을 실행합니다.
+        (스트리밍은 응답을 다 읽을 때까지 자리를 점유)
+
+        Raises:
+            BedrockThrottledError: queue_timeout 안에 자리/토큰을 얻지 못함
+        """
+        lane = self._lane(operation)
+        started = time.monotonic()
+        deadline = started + self.queue_timeout
+        with self._lock:
+            lane.waiting += 1
+        acquired = False
+        try:
+            acquired = lane.slots.acquire(timeout=self.queue_timeout)
+            if acquired and not lane.bucket.acquire(deadline):
+                lane.slots.release()
+                acquired = False
+        finally:
+            with self._lock:
+                lane.waiting -= 1
+                lane.stats['wait_seconds'] += time.monotonic() - started
+                if acquired:
+                    lane.in_flight += 1
+                else:
+                    lane.stats['rejected'] += 1
+        if not acquired:
+            metrics.inc('bedrock_rejected_total', lane=lane.name)
+            raise BedrockThrottledError(
+                f"Bedrock {lane.name} 요청 대기 시간 초과 ({self.queue_timeout:.0f}초, "
+                f"한도 {lane.rpm:g} RPM / 동시 {lane.max_concurrency})"
+            )
+        try:
+            yield
+        finally:
+            with self._lock:
+                lane.in_flight -= 1
+            lane.slots.release()
+
+    # ──────────────────────────────────────────────────────────────
+    # 호출
+    # ──────────────────────────────────────────────────────────────
+
+    def retry(self, operation: str, fn: Callable[[], Any]) -> Tuple[Any, int]:
+        """
+        스로틀링/일시적 오류를 백오프하며 재시도합니다. (자리/토큰은 호출자가 관리)
+
+        Returns:
+            Tuple: (fn 결과, 재시도 횟수)
+
+        Raises:
+            마지막 시도의 예외 (gateway_retries 속성에 재시도 횟수 기록)
+        """
+        return self._run(operation, fn, use_slot=False)
+
+    def invoke(self, operation: str, fn: Callable[[], Any]) -> Tuple[Any, int]:
+        """
+        시도마다 자리/토큰을 얻어 fn을 실행하고, 재시도 가능한 오류는 백오프 후 다시 시도합니다.
+
+        Args:
+            operation: completion | stream | embedding
+            fn: Bedrock 호출 (인자 없는 함수)
+
+        Returns:
+            Tuple: (fn 결과, 재시도 횟수)
+        """
+        return self._run(operation, fn, use_slot=True)
+
+    def _run(self, operation: str, fn: Callable[[], Any], use_slot: bool) -> Tuple[Any, int]:
+        lane = self._lane(operation)
+        attempt = 0
+        while True:
+            try:
+                if use_slot:
+                    with self.slot(operation):
+                        result = fn()
+                else:
+                    result = fn()
+                with self._lock:
+                    lane.stats['calls'] += 1
+                    lane.stats['retries'] += attempt
+                return result, attempt
+            except BedrockThrottledError:
+                raise
+            except Exception as e:
+                kind = classify_error(e)
+                if kind == 'throttle':
+                    with self._lock:
+                        lane.stats['throttled'] += 1
+                    metrics.inc('bedrock_throttled_total', lane=lane.name)
+                elif kind == 'transient':
+                    with self._lock:
+                        lane.stats['transient_errors'] += 1
+                if kind is None or attempt >= self.max_retries:
+                    with self._lock:
+                        lane.stats['failed'] += 1
+                        lane.stats['retries'] += attempt
+                    e.gateway_retries = attempt
+                    raise
+                delay = self.backoff_delay(attempt)
+                if kind == 'throttle':
+                    # 같은 할당량을 쓰는 다른 요청도 함께 물러서도록 버킷 일시 정지
+                    lane.bucket.pause(delay)
+                metrics.inc('bedrock_retries_total', lane=lane.name, reason=kind)
+                logger.warning("Bedrock %s %s, %.2fs 후 재시도 (%d/%d): %s",
+                               operation, kind, delay, attempt + 1, self.max_retries, e)
+                time.sleep(delay)
+                attempt += 1
+                if not use_slot and not lane.bucket.acquire(time.monotonic() + self.queue_timeout):
+                    # 자리는 호출자가 잡고 있으므로 재시도분 토큰만 다시 얻음
+                    e.gateway_retries = attempt
+                    raise
+
+    def invoke_hedged(self, operation: str, fn: Callable[[], Any]) -> Tuple[Any, int]:
+        """
+        멱등 호출(임베딩)용 헤징: 첫 요청이 embed_hedge_ms 안에 끝나지 않으면
+        토큰이 바로 있을 때만 같은 요청을 한 번 더 보내고 먼저 성공한 결과를 반환합니다.
+
+        Returns:
+            Tuple: (fn 결과, 재시도 횟수)
+        """
+        if self.embed_hedge_ms <= 0:
+            return self.invoke(operation, fn)
+        lane = self._lane(operation)
+        executor = self._get_hedge_executor()
+        primary = executor.submit(contextvars.copy_context().run, self.invoke, operation, fn)
+        done, _ = wait([primary], timeout=self.embed_hedge_ms / 1000)
+        if done:
+            return primary.result()
+
+        # 스로틀링 중이거나 자리가 없으면 헤징하지 않음 (부하만 키움)
+        if lane.in_flight >= lane.max_concurrency or lane.bucket.try_acquire() > 0:
+            return primary.result()
+        with self._lock:
+            lane.stats['hedges'] += 1
+        metrics.inc('bedrock_hedges_total', lane=lane.name)
+        hedge = executor.submit(contextvars.copy_context().run, self._run_hedge, operation, fn)
+
+        pending = {primary, hedge}
+        error: Optional[BaseException] = None
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is None:
+                    if future is hedge:
+                        with self._lock:
+                            lane.stats['hedge_wins'] += 1
+                    return future.result()
+                error = error or future.exception()
+        raise error
+
+    def _run_hedge(self, operation: str, fn: Callable[[], Any]) -> Tuple[Any, int]:
+        """헤지 요청 1회 (토큰은 invoke_hedged에서 이미 사용, 재시도 없음)"""
+        lane = self._lane(operation)
+        if not lane.slots.acquire(blocking=False):
+            raise BedrockThrottledError("헤지 요청 자리 없음")
+        with self._lock:
+            lane.in_flight += 1
+        try:
+            return fn(), 0
+        finally:
+            with self._lock:
+                lane.in_flight -= 1
+            lane.slots.release()
+
+    def _get_hedge_executor(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._hedge_executor is None:
+                workers = self._lanes['embedding'].max_concurrency * 2
+                self._hedge_executor = ThreadPoolExecutor(max_workers=workers,
+                                                          thread_name_prefix='bedrock-hedge')
+            return self._hedge_executor
+
+    # ──────────────────────────────────────────────────────────────
+    # 통계
+    # ──────────────────────────────────────────────────────────────
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        게이트웨이 통계
+
+        Returns:
+            종류별 {rpm, max_concurrency, in_flight, queue_depth, tokens_available, 누적 카운터}
+        """
+        with self._lock:
+            lanes = {
+                name: {
+                    'rpm': lane.rpm,
+                    'max_concurrency': lane.max_concurrency,
+                    'in_flight': lane.in_flight,
+                    'queue_depth': lane.waiting,
+                    **{k: (round(v, 3) if isinstance(v, float) else v) for k, v in lane.stats.items()},
+                }
+                for name, lane in self._lanes.items()
+            }
+        for name, lane in self._lanes.items():
+            lanes[name]['tokens_available'] = lane.bucket.available
+        return {
+            'max_retries': self.max_retries,
+            'queue_timeout': self.queue_timeout,
+            'embed_hedge_ms': self.embed_hedge_ms,
+            'lanes': lanes,
+        }
+
+
+# 전역 Bedrock 게이트웨이 (파드 단위 — 레플리카 수만큼 나눠 RPM 설정)
+bedrock_gateway = BedrockGateway(
+    claude_rpm=float(os.getenv('BEDROCK_CLAUDE_RPM', '60')),
+    embed_rpm=float(os.getenv('BEDROCK_EMBED_RPM', '600')),
+    claude_max_concurrency=int(os.getenv('BEDROCK_CLAUDE_MAX_CONCURRENCY', '4')),
+    embed_max_concurrency=int(os.getenv('BEDROCK_EMBED_MAX_CONCURRENCY', '8')),
+    max_retries=int(os.getenv('BEDROCK_MAX_RETRIES', '4')),
+    backoff_base=float(os.getenv('BEDROCK_BACKOFF_BASE', '0.5')),
+    backoff_max=float(os.getenv('BEDROCK_BACKOFF_MAX', '20')),
+    queue_timeout=float(os.getenv('BEDROCK_QUEUE_TIMEOUT', '60')),
+    embed_hedge_ms=float(os.getenv('BEDROCK_EMBED_HEDGE_MS', '1500')),
+)
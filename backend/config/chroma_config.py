@@ -4,14 +4,19 @@ ChromaDB Vector Database 설정 및 연결
 
 import os
 import chromadb
+from concurrent.futures import ThreadPoolExecutor
 from chromadb.config import Settings
 from dotenv import load_dotenv
 from typing import List, Dict, Any
 from datetime import datetime
 
+from backend.config.logging_config import get_logger
+
 # 환경 변수 로드
 load_dotenv()
 
+logger = get_logger(__name__)
+
 class ChromaDBConfig:
     """ChromaDB 설정 및 관리 클래스"""
     
@@ -35,13 +40,13 @@ class ChromaDBConfig:
         # 컬렉션 생성 또는 가져오기
         self.collection = self._get_or_create_collection()
         
-        print(f"ChromaDB 초기화 완료: {self.db_path}")
+        logger.info("ChromaDB 초기화 완료: %s", self.db_path)
     
     def _get_or_create_collection(self):
         """컬렉션을 가져오거나 없으면 생성합니다."""
         try:
             collection = self.client.get_collection(name=self.collection_name)
-            print(f"기존 컬렉션 로드: {self.collection_name}")
+            logger.info("기존 컬렉션 로드: %s", self.collection_name)
         except Exception:
             collection = self.client.create_collection(
                 name=self.collection_name,
@@ -50,7 +55,7 @@ class ChromaDBConfig:
                     "created_at": datetime.now().isoformat()
                 }
             )
-            print(f"새 컬렉션 생성: {self.collection_name}")
+            logger.info("새 컬렉션 생성: %s", self.collection_name)
         
         return collection
     
@@ -58,7 +63,7 @@ class ChromaDBConfig:
         try:
             existing = self.collection.get(ids=[report_id])
             if existing['ids']:
-                print(f"[WARN] 이미 존재: {report_id} (건너뜀)")
+                logger.warning("이미 존재: %s (건너뜀)", report_id)
                 return True
             from .aws_config import aws_config
             embedding = aws_config.get_embeddings(report_text)
@@ -68,25 +73,113 @@ class ChromaDBConfig:
                 metadatas=[metadata],
                 ids=[report_id]
             )
-            print(f"저장 완료: {report_id}")
-            # ChromaDB → S3 백업
+            logger.info("ChromaDB 저장 완료: %s", report_id)
+            # ChromaDB → S3 백업 (백그라운드, 변경 파일만)
             try:
-                from backend.utils.chromadb_s3_sync import sync_to_s3
-                sync_to_s3()
+                from backend.utils.chromadb_s3_sync import schedule_sync_to_s3
+                schedule_sync_to_s3()
             except Exception as se:
-                print(f"[WARN] S3 백업 실패 (ChromaDB 저장은 완료): {se}")
+                logger.warning("S3 백업 실패 (ChromaDB 저장은 완료): %s", se)
             return True
         except Exception as e:
-            print(f"[ERROR] 저장 실패: {str(e)}")
+            logger.error("ChromaDB 저장 실패: %s", e)
             return False
-            
-           
+
+    def add_reports_bulk(
+        self,
+        reports: List[Dict[str, Any]],
+        max_workers: int = 4,
+        sync_s3: bool = True
+    ) -> Dict[str, Any]:
+        """
+        여러 리포트를 한 번에 저장합니다. (대량 인덱싱용)
+
+        - 기존 ID 확인: collection.get 1회
+        - 임베딩: 최대 max_workers개 동시 Bedrock 호출
+        - 저장: collection.add 1회
+        - S3 백업: 마지막에 1회
+
+        Args:
+            reports: [{report_id, report_text, metadata}, ...]
+            max_workers: 임베딩 동시 호출 수
+            sync_s3: 저장 후 S3 백업 여부
+
+        Returns:
+            Dict: {added: 저장 ID 리스트, skipped: 기존 ID 리스트, failed: 실패 ID 리스트}
+        """
+        result = {'added': [], 'skipped': [], 'failed': []}
+        if not reports:
+            return result
+
+        # 1. 중복 제거 (배치 내 중복 + 이미 저장된 ID)
+        unique: Dict[str, Dict[str, Any]] = {}
+        for report in reports:
+            unique.setdefault(report['report_id'], report)
+
+        try:
+            existing = set(self.collection.get(ids=list(unique), include=[])['ids'])
+        except Exception as e:
+            logger.error("기존 리포트 확인 실패: %s", e)
+            result['failed'] = list(unique)
+            return result
+
+        result['skipped'] = [rid for rid in unique if rid in existing]
+        pending = [r for rid, r in unique.items() if rid not in existing]
+        if result['skipped']:
+            logger.warning("이미 존재: %d개 (건너뜀)", len(result['skipped']))
+        if not pending:
+            return result
+
+        # 2. 임베딩 (동시 호출 수 제한)
+        from .aws_config import aws_config
+
+        def _embed(report):
+            try:
+                return aws_config.get_embeddings(report['report_text'])
+            except Exception as e:
+                logger.error("임베딩 실패: %s (%s)", report['report_id'], e)
+                return None
+
+        logger.info("임베딩 생성 중: %d개 (동시 %d개)", len(pending), max_workers)
+        with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='embed') as executor:
+            embeddings = list(executor.map(_embed, pending))
+
+        ready = [(r, emb) for r, emb in zip(pending, embeddings) if emb is not None]
+        result['failed'] = [r['report_id'] for r, emb in zip(pending, embeddings) if emb is None]
+        if not ready:
+            return result
+
+        # 3. 한 번에 저장
+        try:
+            self.collection.add(
+                documents=[r['report_text'] for r, _ in ready],
+                embeddings=[emb for _, emb in ready],
+                metadatas=[r['metadata'] for r, _ in ready],
+                ids=[r['report_id'] for r, _ in ready]
+            )
+        except Exception as e:
+            logger.error("일괄 저장 실패: %s", e)
+            result['failed'] += [r['report_id'] for r, _ in ready]
+            return result
+
+        result['added'] = [r['report_id'] for r, _ in ready]
+        logger.info("일괄 저장 완료: %d개", len(result['added']))
+
+        # 4. ChromaDB → S3 백업 (1회)
+        if sync_s3:
+            try:
+                from backend.utils.chromadb_s3_sync import sync_to_s3
+                sync_to_s3()
+            except Exception as se:
+                logger.warning("S3 백업 실패 (ChromaDB 저장은 완료): %s", se)
+
+        return result
+
     def search_similar_reports(self, query_text: str, n_results: int = 5, filter_metadata: Dict[str, Any] = None) -> List[Dict[str, Any]]:
         """유사한 과거 리포트를 검색합니다."""
         try:
             from .aws_config import aws_config
             
-            print(f"유사 리포트 검색 중...")
             query_embedding = aws_config.get_embeddings(query_text)
             
             results = self.collection.query(
@@ -106,14 +199,14 @@ class ChromaDBConfig:
                         'distance': results['distances'][0][i] if 'distances' in results else None
                     })
                 
-                print(f"{len(formatted_results)}개의 유사 리포트 발견")
+                logger.debug("%d개의 유사 리포트 발견", len(formatted_results))
             else:
-                print(f"[WARN] 유사 리포트를 찾지 못했습니다")
+                logger.debug("유사 리포트를 찾지 못했습니다")
             
             return formatted_results
             
         except Exception as e:
-            print(f"[ERROR] 검색 실패: {str(e)}")
+            logger.error("유사 리포트 검색 실패: %s", e)
             return []
     
     def get_report_by_id(self, report_id: str) -> Dict[str, Any]:
@@ -131,7 +224,7 @@ class ChromaDBConfig:
                 return None
                 
         except Exception as e:
-            print(f"[ERROR] 조회 실패: {str(e)}")
+            logger.error("리포트 조회 실패: %s", e)
             return None
     
     def count_reports(self) -> int:
@@ -149,7 +242,7 @@ class ChromaDBConfig:
             )
 
             if result['ids'] and len(result['ids']) > 0:
-                print(f"   날짜 {date_str} 리포트 발견: {result['ids'][0]}")
+                logger.debug("날짜 %s 리포트 발견: %s", date_str, result['ids'][0])
                 return {
                     'id': result['ids'][0],
                     'document': result['documents'][0],
@@ -157,11 +250,11 @@ class ChromaDBConfig:
                     'distance': 0.0  # 정확 매칭
                 }
             else:
-                print(f"   [ERROR] {date_str} 날짜 리포트 없음")
+                logger.debug("%s 날짜 리포트 없음", date_str)
                 return None
 
         except Exception as e:
-            print(f"[ERROR] 날짜 검색 실패: {str(e)}")
+            logger.error("날짜 검색 실패: %s", e)
             return None
     def get_all_reports(self) -> list:
         """
@@ -183,26 +276,26 @@ class ChromaDBConfig:
                     'distance': 0.0
                 })
             
-            print(f"   전체 {len(formatted)}개 리포트 로드")
+            logger.debug("전체 %d개 리포트 로드", len(formatted))
             return formatted
         except Exception as e:
-            print(f"[ERROR] 전체 조회 실패: {str(e)}")
+            logger.error("전체 조회 실패: %s", e)
             return []
         
     def delete_report(self, report_id: str) -> bool:
         """특정 리포트를 삭제합니다."""
         try:
             self.collection.delete(ids=[report_id])
-            print(f"리포트 삭제 완료: {report_id}")
-            # ChromaDB → S3 백업
+            logger.info("리포트 삭제 완료: %s", report_id)
+            # ChromaDB → S3 백업 (백그라운드, 변경 파일만)
             try:
-                from backend.utils.chromadb_s3_sync import sync_to_s3
-                sync_to_s3()
+                from backend.utils.chromadb_s3_sync import schedule_sync_to_s3
+                schedule_sync_to_s3()
             except Exception as se:
-                print(f"[WARN] S3 백업 실패 (삭제는 완료): {se}")
+                logger.warning("S3 백업 실패 (삭제는 완료): %s", se)
             return True
         except Exception as e:
-            print(f"[ERROR] 삭제 실패: {str(e)}")
+            logger.error("리포트 삭제 실패: %s", e)
             return False
     
     def reset_collection(self) -> bool:
@@ -210,10 +303,10 @@ class ChromaDBConfig:
         try:
             self.client.delete_collection(name=self.collection_name)
             self.collection = self._get_or_create_collection()
-            print(f"컬렉션 초기화 완료")
+            logger.info("컬렉션 초기화 완료")
             return True
         except Exception as e:
-            print(f"[ERROR] 초기화 실패: {str(e)}")
+            logger.error("컬렉션 초기화 실패: %s", e)
             return False
 
 
@@ -0,0 +1,216 @@
+"""
+구조화 로깅 설정
+
+노드/설정 클래스의 print() 진단 출력을 레벨이 있는 로거로 바꾸고,
+stdout 쓰기는 백그라운드 스레드(QueueListener)가 처리하여 요청 스레드를 막지 않습니다.
+
+- 레벨: LOG_LEVEL (기본 INFO) — DEBUG가 꺼져 있으면 logger.debug(...)는 인자 포맷팅 없이 바로 반환
+- 출력 형식: LOG_FORMAT=json (기본, k8s 로그 수집용) | text (로컬 개발용)
+- 상관관계 ID: request_id / session_id / job_id (contextvars) → 모든 로그 레코드에 포함
+- 샘플링: LOG_DEBUG_SAMPLE_RATE (기본 1.0) — 요청 단위로 DEBUG 출력 여부를 한 번 정하므로
+  샘플된 요청은 DEBUG 로그가 빠짐없이 남음
+- 큐가 가득 차면(LOG_QUEUE_SIZE) 요청 스레드를 기다리게 하지 않고 레코드를 버리고 개수만 셉니다.
+
+사용 예:
+    >>> from backend.config.logging_config import get_logger, log_context
+    >>> logger = get_logger(__name__)
+    >>> with log_context(session_id=session_id):
+    ...     logger.info("Phase 2 시작 (선택: %s번)", selected_index)
+"""
+
+import os
+import sys
+import json
+import queue
+import atexit
+import random
+import logging
+import threading
+import logging.handlers
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from typing import Optional, Dict, Any, Iterator
+from dotenv import load_dotenv
+
+# 환경 변수 로드 (다른 설정 모듈보다 먼저 import될 수 있으므로 여기서도 로드)
+load_dotenv()
+
+LOG_LEVEL = os.getenv('LOG_LEVEL', 'INFO').upper()
+LOG_FORMAT = os.getenv('LOG_FORMAT', 'json').lower()
+LOG_DEBUG_SAMPLE_RATE = float(os.getenv('LOG_DEBUG_SAMPLE_RATE', '1.0'))
+LOG_QUEUE_SIZE = int(os.getenv('LOG_QUEUE_SIZE', '10000'))
+
+# 애플리케이션 로거 루트 (backend.* 모듈 로거가 모두 이 아래에 붙음)
+ROOT_LOGGER = 'backend'
+
+# 상관관계 ID
+_request_id: ContextVar[Optional[str]] = ContextVar('log_request_id', default=None)
+_session_id: ContextVar[Optional[str]] = ContextVar('log_session_id', default=None)
+_job_id: ContextVar[Optional[str]] = ContextVar('log_job_id', default=None)
+_debug_sampled: ContextVar[Optional[bool]] = ContextVar('log_debug_sampled', default=None)
+_CONTEXT_VARS = {'request_id': _request_id, 'session_id': _session_id, 'job_id': _job_id}
+
+
+@contextmanager
+def log_context(**ids: Optional[str]) -> Iterator[None]:
+    """
+    블록 안의 로그에 상관관계 ID를 붙입니다. (request_id / session_id / job_id)
+
+    request_id를 새로 지정하면 DEBUG 샘플링 여부도 이 시점에 한 번 정합니다.
+    """
+    tokens = []
+    for name, value in ids.items():
+        if name in _CONTEXT_VARS and value is not None:
+            tokens.append((_CONTEXT_VARS[name], _CONTEXT_VARS[name].set(str(value))))
+    if ids.get('request_id') is not None:
+        tokens.append((_debug_sampled, _debug_sampled.set(random.random() < LOG_DEBUG_SAMPLE_RATE)))
+    try:
+        yield
+    finally:
+        for var, token in reversed(tokens):
+            var.reset(token)
+
+
+def current_ids() -> Dict[str, str]:
+    """현재 컨텍스트의 상관관계 ID (값이 있는 것만)"""
+    return {name: var.get() for name, var in _CONTEXT_VARS.items() if var.get()}
+
+
+class _ContextFilter(logging.Filter):
+    """레코드에 상관관계 ID를 붙이고, 샘플되지 않은 요청의 DEBUG 레코드는 제외"""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno <= logging.DEBUG and _debug_sampled.get() is False:
+            return False
+        for name, var in _CONTEXT_VARS.items():
+            setattr(record, name, var.get())
+        return True
+
+
+class JsonFormatter(logging.Formatter):
+    """한 줄 JSON (k8s 로그 수집기에서 필드 단위로 검색)"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry: Dict[str, Any] = {
+            'ts': datetime.fromtimestamp(record.created, tz=timezone.utc).isoformat(timespec='milliseconds'),
+            'level': record.levelname,
+            'logger': record.name,
+            'msg': record.getMessage(),
+        }
+        for name in _CONTEXT_VARS:
+            value = getattr(record, name, None)
+            if value:
+                entry[name] = value
+        if record.exc_info:
+            entry['exc'] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+class TextFormatter(logging.Formatter):
+    """로컬 개발용 사람이 읽는 형식"""
+
+    def __init__(self):
+        super().__init__('%(asctime)s %(levelname)-7s %(name)s%(ids)s: %(message)s', '%H:%M:%S')
+
+    def format(self, record: logging.LogRecord) -> str:
+        ids = [str(getattr(record, name)) for name in _CONTEXT_VARS if getattr(record, name, None)]
+        record.ids = f" [{' '.join(ids)}]" if ids else ''
+        return super().format(record)
+
+
+class _DroppingQueueHandler(logging.handlers.QueueHandler):
+    """큐가 가득 차면 기다리지 않고 버림 (로그 때문에 요청이 느려지지 않도록)"""
+
+    dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # 포맷은 리스너 스레드에서 하므로 메시지 인자만 확정해 둠 (객체 변경 영향 방지)
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            _DroppingQueueHandler.dropped += 1
+
+
+_setup_lock = threading.Lock()
+_listener: Optional[logging.handlers.QueueListener] = None
+
+
+def setup_logging(level: str = None, fmt: str = None, stream=None) -> None:
+    """
+    애플리케이션 로거 설정 (여러 번 호출해도 한 번만 적용, 인자를 주면 다시 설정)
+
+    Args:
+        level: 로그 레벨 (None이면 LOG_LEVEL)
+        fmt: 'json' | 'text' (None이면 LOG_FORMAT)
+        stream: 출력 스트림 (None이면 stdout)
+    """
+    global _listener
+    with _setup_lock:
+        if _listener is not None and level is None and fmt is None and stream is None:
+            return
+        if _listener is not None:
+            _listener.stop()
+
+        output = logging.StreamHandler(stream or sys.stdout)
+        output.setFormatter(JsonFormatter() if (fmt or LOG_FORMAT) == 'json' else TextFormatter())
+
+        handler = _DroppingQueueHandler(queue.Queue(maxsize=LOG_QUEUE_SIZE))
+        handler.addFilter(_ContextFilter())
+
+        logger = logging.getLogger(ROOT_LOGGER)
+        for old in list(logger.handlers):
+            logger.removeHandler(old)
+        logger.addHandler(handler)
+        logger.setLevel(level or LOG_LEVEL)
+        logger.propagate = False
+
+        _listener = logging.handlers.QueueListener(handler.queue, output, respect_handler_level=False)
+        _listener.start()
+
+
+def flush_logging() -> None:
+    """큐에 남은 로그를 모두 출력 (서버 종료 / 테스트용)"""
+    global _listener
+    with _setup_lock:
+        if _listener is not None:
+            _listener.stop()
+            _listener.start()
+
+
+def get_logging_stats() -> Dict[str, Any]:
+    """로깅 상태 (레벨, 큐 적재량, 버려진 레코드 수)"""
+    logger = logging.getLogger(ROOT_LOGGER)
+    pending = sum(h.queue.qsize() for h in logger.handlers if isinstance(h, _DroppingQueueHandler))
+    return {
+        'level': logging.getLevelName(logger.level),
+        'format': LOG_FORMAT,
+        'debug_sample_rate': LOG_DEBUG_SAMPLE_RATE,
+        'queue_pending': pending,
+        'queue_size': LOG_QUEUE_SIZE,
+        'dropped': _DroppingQueueHandler.dropped,
+    }
+
+
+def get_logger(name: str) -> logging.Logger:
+    """
+    모듈 로거 (처음 호출 시 로깅 설정 적용)
+
+    Args:
+        name: 보통 __name__ (backend.nodes.node_3_context_fetch 등)
+    """
+    setup_logging()
+    if not name.startswith(ROOT_LOGGER):
+        name = f"{ROOT_LOGGER}.{name}"
+    return logging.getLogger(name)
+
+
+@atexit.register
+def _stop_listener() -> None:
+    if _listener is not None:
+        _listener.stop()
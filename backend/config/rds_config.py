@@ -4,14 +4,234 @@ Amazon RDS (PostgreSQL) 설정 및 연결
 """
 
 import os
+import time
+import threading
+from collections import deque
+from contextlib import contextmanager
 import psycopg2
 import psycopg2.extras
+import psycopg2.extensions
 from dotenv import load_dotenv
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Callable
+
+from backend.config.logging_config import get_logger
+from backend.utils.paging import TABLE_COLUMNS, PAGED_TABLES, encode_cursor, decode_cursor
 
 # 환경 변수 로드
 load_dotenv()
 
+logger = get_logger(__name__)
+
+
+class RDSConnectionPool:
+    """
+    스레드 안전한 고정 크기 psycopg2 커넥션 풀
+
+    - 최대 max_size개까지 연결을 생성하고, 초과 요청은 acquire_timeout 동안 대기
+    - 일정 시간 이상 유휴 상태였던 연결은 대여 전에 SELECT 1로 상태 확인
+    - max_idle_seconds 이상 사용되지 않은 연결은 정리(eviction)
+    """
+
+    def __init__(
+        self,
+        connect_fn: Callable[[], Any],
+        max_size: int = 10,
+        max_idle_seconds: float = 300,
+        acquire_timeout: float = 10,
+        health_check_interval: float = 30,
+    ):
+        """
+        Args:
+            connect_fn: 새 연결을 생성하는 함수
+            max_size: 최대 연결 수
+            max_idle_seconds: 유휴 연결 최대 보관 시간 (초)
+            acquire_timeout: 연결 대기 최대 시간 (초)
+            health_check_interval: 이 시간(초) 이상 유휴였던 연결은 대여 전 상태 확인
+        """
+        self._connect = connect_fn
+        self.max_size = max_size
+        self.max_idle_seconds = max_idle_seconds
+        self.acquire_timeout = acquire_timeout
+        self.health_check_interval = health_check_interval
+
+        self._cond = threading.Condition()
+        self._idle: deque = deque()  # (conn, last_used) — 오른쪽이 가장 최근
+        self._size = 0               # 현재 열려 있는 연결 수 (유휴 + 대여중)
+        self._checked_out = 0
+        self._waiting = 0
+        self._created = 0
+        self._evicted = 0
+        self._discarded = 0
+        self._timeouts = 0
+
+    def _close_quietly(self, conn) -> None:
+        try:
+            conn.close()
+        except Exception:
+            pass
+
+    def _evict_idle_locked(self) -> None:
+        """max_idle_seconds를 넘긴 유휴 연결을 닫습니다. (락 보유 상태에서 호출)"""
+        now = time.monotonic()
+        # 왼쪽이 가장 오래된 연결
+        while self._idle and now - self._idle[0][1] > self.max_idle_seconds:
+            conn, _ = self._idle.popleft()
+            self._close_quietly(conn)
+            self._size -= 1
+            self._evicted += 1
+
+    def _is_healthy(self, conn, idle_for: float) -> bool:
+        """대여 전 연결 상태를 확인합니다."""
+        if conn.closed:
+            return False
+        if idle_for < self.health_check_interval:
+            return True
+        try:
+            cur = conn.cursor()
+            cur.execute("SELECT 1")
+            cur.close()
+            conn.rollback()
+            return True
+        except Exception:
+            return False
+
+    def acquire(self):
+        """
+        풀에서 연결을 대여합니다.
+
+        Returns:
+            psycopg2.connection: 데이터베이스 연결 객체
+
+        Raises:
+            TimeoutError: acquire_timeout 안에 연결을 얻지 못한 경우
+        """
+        deadline = time.monotonic() + self.acquire_timeout
+
+        while True:
+            conn, last_used = None, None
+            with self._cond:
+                self._evict_idle_locked()
+                while not self._idle and self._size >= self.max_size:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        self._timeouts += 1
+                        raise TimeoutError(
+                            f"[ERROR] RDS 커넥션 풀 대기 시간 초과 ({self.acquire_timeout}초)"
+                        )
+                    self._waiting += 1
+                    try:
+                        self._cond.wait(remaining)
+                    finally:
+                        self._waiting -= 1
+                if self._idle:
+                    conn, last_used = self._idle.pop()  # LIFO: 가장 최근 연결 재사용
+                else:
+                    self._size += 1  # 새 연결 슬롯 예약
+
+            if conn is None:
+                try:
+                    conn = self._connect()
+                except Exception:
+                    with self._cond:
+                        self._size -= 1
+                        self._cond.notify()
+                    raise
+                with self._cond:
+                    self._created += 1
+                    self._checked_out += 1
+                return conn
+
+            if self._is_healthy(conn, time.monotonic() - last_used):
+                with self._cond:
+                    self._checked_out += 1
+                return conn
+
+            # 끊어진 연결은 버리고 다시 시도
+            self._close_quietly(conn)
+            with self._cond:
+                self._size -= 1
+                self._discarded += 1
+                self._cond.notify()
+
+    def release(self, conn, discard: bool = False) -> None:
+        """
+        대여한 연결을 풀에 반환합니다.
+
+        Args:
+            conn: acquire()로 받은 연결
+            discard: True면 재사용하지 않고 닫음 (오류가 난 연결 등)
+        """
+        if not discard and not conn.closed:
+            try:
+                # 열린 트랜잭션이 남아 있으면 정리 후 반환
+                if conn.get_transaction_status() != psycopg2.extensions.TRANSACTION_STATUS_IDLE:
+                    conn.rollback()
+            except Exception:
+                discard = True
+
+        with self._cond:
+            self._checked_out -= 1
+            if discard or conn.closed:
+                self._close_quietly(conn)
+                self._size -= 1
+                self._discarded += 1
+            else:
+                self._idle.append((conn, time.monotonic()))
+            self._evict_idle_locked()
+            self._cond.notify()
+
+    @contextmanager
+    def connection(self):
+        """
+        with 블록 동안 연결을 대여합니다.
+
+        Examples:
+            >>> with pool.connection() as conn:
+            ...     conn.cursor().execute("SELECT 1")
+        """
+        conn = self.acquire()
+        try:
+            yield conn
+        except (psycopg2.OperationalError, psycopg2.InterfaceError):
+            # 네트워크/연결 오류는 연결 자체를 폐기
+            self.release(conn, discard=True)
+            raise
+        except Exception:
+            self.release(conn)
+            raise
+        else:
+            self.release(conn)
+
+    def close_all(self) -> None:
+        """유휴 연결을 모두 닫습니다. (대여중인 연결은 반환 시 정리)"""
+        with self._cond:
+            while self._idle:
+                conn, _ = self._idle.popleft()
+                self._close_quietly(conn)
+                self._size -= 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        풀 상태 통계
+
+        Returns:
+            Dict: checked_out, waiting, created 등 풀 지표
+        """
+        with self._cond:
+            self._evict_idle_locked()
+            return {
+                'max_size': self.max_size,
+                'open': self._size,
+                'idle': len(self._idle),
+                'checked_out': self._checked_out,
+                'waiting': self._waiting,
+                'created': self._created,
+                'evicted_idle': self._evicted,
+                'discarded': self._discarded,
+                'timeouts': self._timeouts,
+                'max_idle_seconds': self.max_idle_seconds,
+            }
+
 
 class RDSConfig:
     """
@@ -27,9 +247,22 @@ class RDSConfig:
         self.password = os.getenv('RDS_PASSWORD')
         self.schema = os.getenv('RDS_SCHEMA', 'kpi_monitor')
 
+        # 커넥션 풀 설정
+        self.pool_max_size = int(os.getenv('RDS_POOL_MAX_SIZE', '10'))
+        self.pool_max_idle_seconds = float(os.getenv('RDS_POOL_MAX_IDLE_SECONDS', '300'))
+        self.pool_acquire_timeout = float(os.getenv('RDS_POOL_ACQUIRE_TIMEOUT', '10'))
+
         # 설정 유효성 검사
         self._validate_config()
 
+        # 커넥션 풀 (첫 쿼리 시 연결 생성)
+        self.pool = RDSConnectionPool(
+            connect_fn=self.get_connection,
+            max_size=self.pool_max_size,
+            max_idle_seconds=self.pool_max_idle_seconds,
+            acquire_timeout=self.pool_acquire_timeout,
+        )
+
     def _validate_config(self):
         """필수 설정 값이 있는지 확인합니다."""
         if not self.host:
@@ -43,7 +276,8 @@ class RDSConfig:
 
     def get_connection(self):
         """
-        psycopg2 데이터베이스 연결을 반환합니다.
+        새 psycopg2 데이터베이스 연결을 반환합니다.
+        쿼리 실행에는 self.pool을 통해 재사용되는 연결을 사용합니다.
 
         Returns:
             psycopg2.connection: 데이터베이스 연결 객체
@@ -65,14 +299,13 @@ class RDSConfig:
             bool: 연결 성공 여부
         """
         try:
-            conn = self.get_connection()
-            cur = conn.cursor()
-            cur.execute("SELECT 1")
-            cur.close()
-            conn.close()
+            with self.pool.connection() as conn:
+                cur = conn.cursor()
+                cur.execute("SELECT 1")
+                cur.close()
             return True
         except Exception as e:
-            print(f"[ERROR] RDS 연결 실패: {str(e)}")
+            logger.error("RDS 연결 실패: %s", e)
             return False
 
     def _execute_query(
@@ -88,42 +321,75 @@ class RDSConfig:
         Returns:
             List[Dict]: 조회 결과
         """
-        conn = self.get_connection()
-        try:
+        with self.pool.connection() as conn:
             cur = conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor)
             cur.execute(query, params)
             rows = [dict(row) for row in cur.fetchall()]
             cur.close()
             return rows
-        finally:
-            conn.close()
+
+    @staticmethod
+    def _select_clause(table: str, columns: Optional[List[str]]) -> str:
+        """
+        SELECT 컬럼 목록 (None이면 *)
+
+        Raises:
+            ValueError: 테이블에 없는 컬럼을 요청한 경우
+        """
+        if not columns:
+            return "*"
+        unknown = [c for c in columns if c not in TABLE_COLUMNS[table]]
+        if unknown:
+            raise ValueError(f"{table}에 없는 컬럼: {', '.join(unknown)}")
+        return ", ".join(columns)
+
+    @staticmethod
+    def _order_limit(sort_key: str, order: str, limit: Optional[int], params: list) -> str:
+        """ORDER BY / LIMIT 절 (limit 값은 params에 추가)"""
+        direction = "DESC" if order == "desc" else "ASC"
+        clause = f"ORDER BY {sort_key} {direction}"
+        if limit:
+            clause += " LIMIT %s"
+            params.append(limit)
+        return clause
 
     # ──────────────────────────────────────────────────────────────
     # 테이블 조회 메서드 (Supabase와 동일한 인터페이스)
+    # columns / limit / order를 지정하면 프로젝션과 LIMIT을 SQL에서 처리합니다.
     # ──────────────────────────────────────────────────────────────
 
-    def get_scenario_map(self, date: str = None) -> List[Dict[str, Any]]:
+    def get_scenario_map(self, date: str = None, limit: int = None) -> List[Dict[str, Any]]:
         """
         scenario_map 테이블에서 알람 데이터 조회
 
         Args:
             date: 특정 날짜 (YYYY-MM-DD), None이면 전체 조회
+            limit: 최대 행 수 (None이면 제한 없음)
 
         Returns:
             List[Dict]: 알람 데이터 리스트
         """
         s = self.schema
+        where, params = "", []
         if date:
-            return self._execute_query(
-                f"SELECT * FROM {s}.scenario_map WHERE date = %s ORDER BY date",
-                (date,),
-            )
-        return self._execute_query(f"SELECT * FROM {s}.scenario_map ORDER BY date")
+            where = "WHERE date = %s"
+            params.append(date)
+        limit_sql = ""
+        if limit:
+            limit_sql = "LIMIT %s"
+            params.append(limit)
+        return self._execute_query(
+            f"SELECT * FROM {s}.scenario_map {where} ORDER BY date {limit_sql}",
+            tuple(params) or None,
+        )
 
     def get_kpi_daily(
         self,
         date: str = None,
         eqp_id: str = None,
+        columns: List[str] = None,
+        limit: int = None,
+        order: str = "asc",
     ) -> List[Dict[str, Any]]:
         """
         kpi_daily 테이블에서 일별 KPI 데이터 조회
@@ -131,6 +397,9 @@ class RDSConfig:
         Args:
             date: 특정 날짜 (YYYY-MM-DD)
             eqp_id: 장비 ID (예: EQP01)
+            columns: 조회할 컬럼 (None이면 전체)
+            limit: 최대 행 수 (None이면 제한 없음)
+            order: 날짜 정렬 방향 ('asc' | 'desc')
 
         Returns:
             List[Dict]: KPI 데이터 리스트
@@ -145,16 +414,88 @@ class RDSConfig:
             params.append(eqp_id)
 
         where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        select = self._select_clause('kpi_daily', columns)
+        order_limit = self._order_limit('date', order, limit, params)
         return self._execute_query(
-            f"SELECT * FROM {s}.kpi_daily {where} ORDER BY date",
+            f"SELECT {select} FROM {s}.kpi_daily {where} {order_limit}",
             tuple(params) or None,
         )
 
+    def get_kpi_daily_since(self, since_date: str = None) -> List[Dict[str, Any]]:
+        """
+        대시보드 요약 적재용 kpi_daily 조회 (요약 컬럼만)
+
+        Args:
+            since_date: 이 날짜(YYYY-MM-DD, 포함) 이후만 (None이면 전체)
+
+        Returns:
+            List[Dict]: {date, eqp_id, {kpi}_v, {kpi}_t, alarm_flag} (날짜, 장비 오름차순)
+        """
+        where, params = "", []
+        if since_date:
+            where = "WHERE date >= %s"
+            params.append(since_date)
+        return self._execute_query(
+            f"""
+            SELECT date::text AS date, eqp_id, oee_v, oee_t, thp_v, thp_t,
+                   tat_v, tat_t, wip_v, wip_t, alarm_flag
+            FROM {self.schema}.kpi_daily
+            {where}
+            ORDER BY date, eqp_id
+            """,
+            tuple(params) or None,
+        )
+
+    def get_kpi_summary(self, eqp_id: str = None) -> Dict[str, Any]:
+        """
+        대시보드 요약을 쿼리 한 번으로 계산
+        (ORDER BY date DESC LIMIT 1 + count(*) FILTER, 권장 인덱스: kpi_daily (date, eqp_id))
+
+        Args:
+            eqp_id: 장비 ID (None이면 전체)
+
+        Returns:
+            Dict: {'latest': 최신 행 또는 None, 'total_count', 'alarm_count'}
+        """
+        where, params = "", []
+        if eqp_id:
+            where = "WHERE eqp_id = %s"
+            params = [eqp_id, eqp_id]
+        rows = self._execute_query(
+            f"""
+            SELECT counts.total_count, counts.alarm_count, row_to_json(latest) AS latest
+            FROM (
+                SELECT COUNT(*) AS total_count,
+                       COUNT(*) FILTER (WHERE alarm_flag = 1) AS alarm_count
+                FROM {self.schema}.kpi_daily
+                {where}
+            ) counts
+            LEFT JOIN LATERAL (
+                SELECT date::text AS date, eqp_id, oee_v, oee_t, thp_v, thp_t,
+                       tat_v, tat_t, wip_v, wip_t, alarm_flag
+                FROM {self.schema}.kpi_daily
+                {where}
+                ORDER BY date DESC, eqp_id
+                LIMIT 1
+            ) latest ON TRUE
+            """,
+            tuple(params) or None,
+        )
+        row = rows[0]
+        return {
+            'latest': row['latest'],
+            'total_count': int(row['total_count']),
+            'alarm_count': int(row['alarm_count']),
+        }
+
     def get_kpi_trend(
         self,
         start_date: str,
         end_date: str,
         eqp_id: str = None,
+        columns: List[str] = None,
+        limit: int = None,
+        order: str = "asc",
     ) -> List[Dict[str, Any]]:
         """
         kpi_daily 테이블에서 날짜 범위의 KPI 추세 데이터 조회
@@ -163,9 +504,12 @@ class RDSConfig:
             start_date: 시작 날짜 (YYYY-MM-DD, 포함)
             end_date: 종료 날짜 (YYYY-MM-DD, 포함)
             eqp_id: 장비 ID
+            columns: 조회할 컬럼 (None이면 전체)
+            limit: 최대 행 수 (None이면 제한 없음)
+            order: 날짜 정렬 방향 ('asc' | 'desc')
 
         Returns:
-            List[Dict]: KPI 데이터 리스트 (날짜 오름차순)
+            List[Dict]: KPI 데이터 리스트 (기본 날짜 오름차순)
         """
         s = self.schema
         conditions = ["date >= %s", "date <= %s"]
@@ -175,8 +519,10 @@ class RDSConfig:
             params.append(eqp_id)
 
         where = f"WHERE {' AND '.join(conditions)}"
+        select = self._select_clause('kpi_daily', columns)
+        order_limit = self._order_limit('date', order, limit, params)
         return self._execute_query(
-            f"SELECT * FROM {s}.kpi_daily {where} ORDER BY date ASC",
+            f"SELECT {select} FROM {s}.kpi_daily {where} {order_limit}",
             tuple(params),
         )
 
@@ -185,6 +531,9 @@ class RDSConfig:
         start_time: str = None,
         end_time: str = None,
         eqp_id: str = None,
+        columns: List[str] = None,
+        limit: int = None,
+        order: str = "asc",
     ) -> List[Dict[str, Any]]:
         """
         lot_state 테이블에서 로트 상태 이력 조회
@@ -193,6 +542,9 @@ class RDSConfig:
             start_time: 시작 시간 (YYYY-MM-DD HH:MM)
             end_time: 종료 시간 (YYYY-MM-DD HH:MM)
             eqp_id: 장비 ID
+            columns: 조회할 컬럼 (None이면 전체)
+            limit: 최대 행 수 (None이면 제한 없음)
+            order: event_time 정렬 방향 ('asc' | 'desc')
 
         Returns:
             List[Dict]: 로트 상태 데이터
@@ -210,8 +562,10 @@ class RDSConfig:
             params.append(eqp_id)
 
         where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        select = self._select_clause('lot_state', columns)
+        order_limit = self._order_limit('event_time', order, limit, params)
         return self._execute_query(
-            f"SELECT * FROM {s}.lot_state {where} ORDER BY event_time",
+            f"SELECT {select} FROM {s}.lot_state {where} {order_limit}",
             tuple(params) or None,
         )
 
@@ -220,6 +574,9 @@ class RDSConfig:
         start_time: str = None,
         end_time: str = None,
         eqp_id: str = None,
+        columns: List[str] = None,
+        limit: int = None,
+        order: str = "asc",
     ) -> List[Dict[str, Any]]:
         """
         eqp_state 테이블에서 장비 상태 이력 조회
@@ -228,6 +585,9 @@ class RDSConfig:
             start_time: 시작 시간
             end_time: 종료 시간
             eqp_id: 장비 ID
+            columns: 조회할 컬럼 (None이면 전체)
+            limit: 최대 행 수 (None이면 제한 없음)
+            order: event_time 정렬 방향 ('asc' | 'desc')
 
         Returns:
             List[Dict]: 장비 상태 데이터
@@ -245,28 +605,329 @@ class RDSConfig:
             params.append(eqp_id)
 
         where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        select = self._select_clause('eqp_state', columns)
+        order_limit = self._order_limit('event_time', order, limit, params)
         return self._execute_query(
-            f"SELECT * FROM {s}.eqp_state {where} ORDER BY event_time",
+            f"SELECT {select} FROM {s}.eqp_state {where} {order_limit}",
             tuple(params) or None,
         )
 
-    def get_rcp_state(self, eqp_id: str = None) -> List[Dict[str, Any]]:
+    def get_rcp_state(self, eqp_id: str = None, columns: List[str] = None) -> List[Dict[str, Any]]:
         """
         rcp_state 테이블에서 레시피 정보 조회
 
         Args:
             eqp_id: 장비 ID
+            columns: 조회할 컬럼 (None이면 전체)
 
         Returns:
             List[Dict]: 레시피 데이터
         """
         s = self.schema
+        select = self._select_clause('rcp_state', columns)
         if eqp_id:
             return self._execute_query(
-                f"SELECT * FROM {s}.rcp_state WHERE eqp_id = %s",
+                f"SELECT {select} FROM {s}.rcp_state WHERE eqp_id = %s",
                 (eqp_id,),
             )
-        return self._execute_query(f"SELECT * FROM {s}.rcp_state")
+        return self._execute_query(f"SELECT {select} FROM {s}.rcp_state")
+
+    # ──────────────────────────────────────────────────────────────
+    # 집계 조회 (원본 행 대신 요약 데이터)
+    # ──────────────────────────────────────────────────────────────
+
+    @staticmethod
+    def _time_conditions(start_time: str, end_time: str, eqp_id: str) -> tuple:
+        conditions, params = [], []
+        if start_time:
+            conditions.append("event_time >= %s")
+            params.append(start_time)
+        if end_time:
+            conditions.append("event_time <= %s")
+            params.append(end_time)
+        if eqp_id:
+            conditions.append("eqp_id = %s")
+            params.append(eqp_id)
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        return where, params
+
+    def get_lot_daily_counts(
+        self,
+        start_time: str = None,
+        end_time: str = None,
+        eqp_id: str = None,
+        group_by_eqp: bool = True,
+    ) -> List[Dict[str, Any]]:
+        """
+        lot_state 일별(·장비별) 집계
+
+        Args:
+            start_time: 시작 시간 (YYYY-MM-DD HH:MM:SS)
+            end_time: 종료 시간
+            eqp_id: 장비 ID
+            group_by_eqp: False면 날짜별로만 집계 (eqp_id는 'ALL')
+
+        Returns:
+            List[Dict]: {date, eqp_id, events, lots, hold_events, in_cnt, hold_cnt, scrap_cnt}
+                        (날짜, 장비 오름차순)
+        """
+        where, params = self._time_conditions(start_time, end_time, eqp_id)
+        eqp_expr = "eqp_id" if group_by_eqp else "'ALL'"
+        return self._execute_query(
+            f"""
+            SELECT (event_time::timestamp)::date::text AS date,
+                   {eqp_expr} AS eqp_id,
+                   COUNT(*) AS events,
+                   COUNT(DISTINCT lot_id) AS lots,
+                   COUNT(*) FILTER (WHERE lot_state = 'HOLD') AS hold_events,
+                   COALESCE(SUM(in_cnt), 0) AS in_cnt,
+                   COALESCE(SUM(hold_cnt), 0) AS hold_cnt,
+                   COALESCE(SUM(scrap_cnt), 0) AS scrap_cnt
+            FROM {self.schema}.lot_state
+            {where}
+            GROUP BY 1, 2
+            ORDER BY 1, 2
+            """,
+            tuple(params) or None,
+        )
+
+    def get_eqp_state_summary(
+        self,
+        start_time: str = None,
+        end_time: str = None,
+        eqp_id: str = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        eqp_state 장비·상태별 집계 (다운타임 합계 포함)
+
+        Args:
+            start_time: 시작 시간 (YYYY-MM-DD HH:MM:SS)
+            end_time: 종료 시간
+            eqp_id: 장비 ID
+
+        Returns:
+            List[Dict]: {eqp_id, eqp_state, events, total_hours, last_event_time}
+                        (장비, 상태 오름차순)
+        """
+        where, params = self._time_conditions(start_time, end_time, eqp_id)
+        return self._execute_query(
+            f"""
+            SELECT eqp_id,
+                   eqp_state,
+                   COUNT(*) AS events,
+                   ROUND(COALESCE(SUM(
+                       EXTRACT(EPOCH FROM (end_time::timestamp - event_time::timestamp))
+                   ), 0)::numeric / 3600, 2) AS total_hours,
+                   MAX(event_time)::text AS last_event_time
+            FROM {self.schema}.eqp_state
+            {where}
+            GROUP BY eqp_id, eqp_state
+            ORDER BY eqp_id, eqp_state
+            """,
+            tuple(params) or None,
+        )
+
+    def get_kpi_daily_rollup(self, since_date: str = None) -> List[Dict[str, Any]]:
+        """
+        kpi_daily 날짜·장비·라인·공정별 합계 (KPI 집계 저장소 갱신용)
+
+        평균은 합계/행 수로 계산할 수 있도록 합계로 반환하고,
+        목표 이탈 판단은 Node 2와 같은 방향(OEE/THP는 미달, TAT/WIP는 초과)을 사용합니다.
+
+        Args:
+            since_date: 이 날짜(YYYY-MM-DD, 포함) 이후만 집계 (None이면 전체)
+
+        Returns:
+            List[Dict]: {date, eqp_id, line_id, oper_id, rows, alarm_rows,
+                         {kpi}_v_sum, {kpi}_t_sum, {kpi}_breach, {kpi}_alarm}
+        """
+        where, params = "", []
+        if since_date:
+            where = "WHERE date >= %s"
+            params.append(since_date)
+        return self._execute_query(
+            f"""
+            SELECT date::text AS date, eqp_id, line_id, oper_id,
+                   COUNT(*) AS rows,
+                   COUNT(*) FILTER (WHERE alarm_flag = 1) AS alarm_rows,
+                   COALESCE(SUM(oee_v), 0) AS oee_v_sum, COALESCE(SUM(oee_t), 0) AS oee_t_sum,
+                   COALESCE(SUM(thp_v), 0) AS thp_v_sum, COALESCE(SUM(thp_t), 0) AS thp_t_sum,
+                   COALESCE(SUM(tat_v), 0) AS tat_v_sum, COALESCE(SUM(tat_t), 0) AS tat_t_sum,
+                   COALESCE(SUM(wip_v), 0) AS wip_v_sum, COALESCE(SUM(wip_t), 0) AS wip_t_sum,
+                   COUNT(*) FILTER (WHERE oee_v < oee_t) AS oee_breach,
+                   COUNT(*) FILTER (WHERE thp_v < thp_t) AS thp_breach,
+                   COUNT(*) FILTER (WHERE tat_v > tat_t) AS tat_breach,
+                   COUNT(*) FILTER (WHERE wip_v > wip_t) AS wip_breach,
+                   COUNT(*) FILTER (WHERE alarm_flag = 1 AND oee_v < oee_t) AS oee_alarm,
+                   COUNT(*) FILTER (WHERE alarm_flag = 1 AND thp_v < thp_t) AS thp_alarm,
+                   COUNT(*) FILTER (WHERE alarm_flag = 1 AND tat_v > tat_t) AS tat_alarm,
+                   COUNT(*) FILTER (WHERE alarm_flag = 1 AND wip_v > wip_t) AS wip_alarm
+            FROM {self.schema}.kpi_daily
+            {where}
+            GROUP BY 1, 2, 3, 4
+            ORDER BY 1, 2
+            """,
+            tuple(params) or None,
+        )
+
+    def get_downtime_daily(self, since_time: str = None) -> List[Dict[str, Any]]:
+        """
+        eqp_state DOWN 구간의 날짜·장비별 다운타임 합계 (KPI 집계 저장소 갱신용)
+        여러 날에 걸친 DOWN 구간은 시작 날짜에 합산합니다.
+
+        Args:
+            since_time: 이 시간(포함) 이후 시작한 구간만 집계 (None이면 전체)
+
+        Returns:
+            List[Dict]: {date, eqp_id, events, minutes, last_event_time}
+        """
+        conditions, params = ["eqp_state = 'DOWN'"], []
+        if since_time:
+            conditions.append("event_time >= %s")
+            params.append(since_time)
+        return self._execute_query(
+            f"""
+            SELECT (event_time::timestamp)::date::text AS date,
+                   eqp_id,
+                   COUNT(*) AS events,
+                   ROUND(COALESCE(SUM(
+                       EXTRACT(EPOCH FROM (end_time::timestamp - event_time::timestamp))
+                   ), 0)::numeric / 60, 1) AS minutes,
+                   MAX(event_time)::text AS last_event_time
+            FROM {self.schema}.eqp_state
+            WHERE {' AND '.join(conditions)}
+            GROUP BY 1, 2
+            ORDER BY 1, 2
+            """,
+            tuple(params) or None,
+        )
+
+    # ──────────────────────────────────────────────────────────────
+    # 페이지 단위 조회 (키셋 페이지네이션)
+    # ──────────────────────────────────────────────────────────────
+
+    def _build_filters(
+        self, table: str, filters: Optional[Dict[str, Any]]
+    ) -> tuple:
+        """
+        필터 dict를 WHERE 조건 목록과 파라미터로 변환합니다.
+
+        지원 키: start_time, end_time (정렬 키 범위), 그 외 허용 컬럼은 동등 비교
+
+        Raises:
+            ValueError: 허용되지 않은 컬럼으로 필터링한 경우
+        """
+        spec = PAGED_TABLES[table]
+        conditions, params = [], []
+        for key, value in (filters or {}).items():
+            if value is None or value == '':
+                continue
+            if key == 'start_time':
+                conditions.append(f"{spec['sort_key']} >= %s")
+            elif key == 'end_time':
+                conditions.append(f"{spec['sort_key']} <= %s")
+            elif key in spec['columns']:
+                conditions.append(f"{key} = %s")
+            else:
+                raise ValueError(f"{table}에서 지원하지 않는 필터: {key}")
+            params.append(value)
+        return conditions, params
+
+    def get_table_page(
+        self,
+        table: str,
+        columns: Optional[List[str]] = None,
+        filters: Optional[Dict[str, Any]] = None,
+        cursor: Optional[str] = None,
+        limit: int = 500,
+        descending: bool = False,
+    ) -> Dict[str, Any]:
+        """
+        (정렬 키, tiebreak) 키셋 기준으로 한 페이지를 조회합니다.
+        OFFSET 없이 마지막 행 다음부터 읽으므로 페이지 깊이와 관계없이 일정한 비용입니다.
+
+        Args:
+            table: 'lot_state' 또는 'eqp_state'
+            columns: 조회할 컬럼 (None이면 전체, 커서 컬럼은 항상 포함)
+            filters: 필터 (start_time, end_time, eqp_id, lot_id 등)
+            cursor: 이전 페이지의 next_cursor (None이면 첫 페이지)
+            limit: 페이지 크기
+            descending: True면 최신순
+
+        Returns:
+            Dict: {'rows', 'next_cursor', 'has_more'}
+
+        Raises:
+            ValueError: 지원하지 않는 테이블/컬럼/필터 또는 잘못된 커서
+        """
+        if table not in PAGED_TABLES:
+            raise ValueError(f"페이지 조회를 지원하지 않는 테이블: {table}")
+        spec = PAGED_TABLES[table]
+        sort_key, tiebreak = spec['sort_key'], spec['tiebreak']
+
+        if columns:
+            unknown = [c for c in columns if c not in spec['columns']]
+            if unknown:
+                raise ValueError(f"{table}에 없는 컬럼: {', '.join(unknown)}")
+            selected = [sort_key, tiebreak] + [c for c in columns if c not in (sort_key, tiebreak)]
+        else:
+            selected = list(spec['columns'])
+
+        conditions, params = self._build_filters(table, filters)
+        if cursor:
+            last_sort, last_tiebreak = decode_cursor(cursor)
+            op = '<' if descending else '>'
+            conditions.append(f"({sort_key}, {tiebreak}) {op} (%s, %s)")
+            params.extend([last_sort, last_tiebreak])
+
+        direction = 'DESC' if descending else 'ASC'
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        rows = self._execute_query(
+            f"SELECT {', '.join(selected)} FROM {self.schema}.{table} {where} "
+            f"ORDER BY {sort_key} {direction}, {tiebreak} {direction} LIMIT %s",
+            tuple(params) + (limit + 1,),
+        )
+
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+        next_cursor = (
+            encode_cursor(rows[-1][sort_key], rows[-1][tiebreak]) if has_more and rows else None
+        )
+        return {'rows': rows, 'next_cursor': next_cursor, 'has_more': has_more}
+
+    def estimate_count(self, table: str, filters: Optional[Dict[str, Any]] = None) -> int:
+        """
+        테이블 행 수 추정 (COUNT(*) 전체 스캔 없이)
+
+        - 필터 없음: pg_class.reltuples (통계 기준 행 수)
+        - 필터 있음: 플래너의 예상 행 수 (EXPLAIN)
+
+        Args:
+            table: 'lot_state' 또는 'eqp_state'
+            filters: get_table_page()와 같은 필터
+
+        Returns:
+            int: 추정 행 수
+        """
+        if table not in PAGED_TABLES:
+            raise ValueError(f"행 수 추정을 지원하지 않는 테이블: {table}")
+
+        conditions, params = self._build_filters(table, filters)
+        if not conditions:
+            rows = self._execute_query(
+                "SELECT reltuples::bigint AS estimate FROM pg_class WHERE oid = %s::regclass",
+                (f"{self.schema}.{table}",),
+            )
+            # ANALYZE 전에는 -1 (또는 0)이므로 플래너 추정으로 대체
+            if rows and rows[0]['estimate'] > 0:
+                return int(rows[0]['estimate'])
+
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        plan = self._execute_query(
+            f"EXPLAIN (FORMAT JSON) SELECT 1 FROM {self.schema}.{table} {where}",
+            tuple(params) or None,
+        )
+        return int(plan[0]['QUERY PLAN'][0]['Plan']['Plan Rows'])
 
     def _execute_update(self, query: str, params: tuple = None) -> int:
         """
@@ -275,19 +936,17 @@ class RDSConfig:
         Returns:
             int: 변경된 행 수
         """
-        conn = self.get_connection()
-        try:
-            cur = conn.cursor()
-            cur.execute(query, params)
-            affected = cur.rowcount
-            conn.commit()
-            cur.close()
-            return affected
-        except Exception:
-            conn.rollback()
-            raise
-        finally:
-            conn.close()
+        with self.pool.connection() as conn:
+            try:
+                cur = conn.cursor()
+                cur.execute(query, params)
+                affected = cur.rowcount
+                conn.commit()
+                cur.close()
+                return affected
+            except Exception:
+                conn.rollback()
+                raise
 
     def update_kpi_targets(
         self,
@@ -5,11 +5,109 @@ Supabase 데이터베이스 설정 및 연결
 import os
 from supabase import create_client, Client
 from dotenv import load_dotenv
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional, Iterator, Tuple
+
+from backend.config.logging_config import get_logger
+from backend.utils.paging import PAGED_TABLES, PagedReader, PagedRows, encode_cursor, decode_cursor
 
 # 환경 변수 로드
 load_dotenv()
 
+logger = get_logger(__name__)
+
+# 카탈로그(날짜·장비별 행 수) 집계 대상 테이블
+CATALOG_TABLES = ('lot_state', 'eqp_state')
+
+# 날짜·장비별 집계를 DB에서 수행하는 Supabase SQL 함수 (SQL Editor에서 한 번 생성)
+# 함수가 없으면 (event_time, eqp_id) 두 컬럼만 페이지 단위로 읽어 Python에서 집계합니다.
+CATALOG_RPC = 'table_daily_catalog'
+CATALOG_RPC_SQL = """
+create or replace function table_daily_catalog(p_table text, p_since date default null)
+returns table(date text, eqp_id text, row_count bigint, first_event_time text, last_event_time text)
+language plpgsql stable as $$
+begin
+  if p_table not in ('lot_state', 'eqp_state') then
+    raise exception 'unsupported table: %', p_table;
+  end if;
+  return query execute format(
+    'select (event_time::timestamp)::date::text, eqp_id::text, count(*),
+            min(event_time)::text, max(event_time)::text
+       from %I
+      where $1 is null or event_time::timestamp >= $1
+      group by 1, 2
+      order by 1, 2', p_table) using p_since;
+end $$;
+"""
+
+# 알람 하나의 분석 컨텍스트(Node 2 KPI + Node 3 소스 4종)를 한 번에 JSON으로 돌려주는 SQL 함수
+# 함수가 없으면 Node 2/3이 소스별로 따로 조회합니다 (왕복 5회).
+ALARM_CONTEXT_RPC = 'alarm_context'
+ALARM_CONTEXT_RPC_SQL = """
+create or replace function alarm_context(
+  p_date text, p_eqp_id text, p_start_time text, p_end_time text,
+  p_trend_start text, p_trend_end text, p_max_rows int default null)
+returns jsonb
+language sql stable as $$
+  with kpi as (
+    select * from kpi_daily
+     where date::date = p_date::date and eqp_id = p_eqp_id
+     limit 1),
+  lot as (
+    select * from lot_state
+     where eqp_id = p_eqp_id
+       and event_time::timestamp between p_start_time::timestamp and p_end_time::timestamp
+     order by event_time, lot_id
+     limit p_max_rows + 1),
+  eqp as (
+    select * from eqp_state
+     where eqp_id = p_eqp_id
+       and event_time::timestamp between p_start_time::timestamp and p_end_time::timestamp
+     order by event_time, eqp_id
+     limit p_max_rows + 1),
+  rcp as (
+    select * from rcp_state where eqp_id = p_eqp_id limit p_max_rows + 1),
+  trend as (
+    select * from kpi_daily
+     where eqp_id = p_eqp_id and date::date between p_trend_start::date and p_trend_end::date
+     order by date, eqp_id
+     limit p_max_rows + 1)
+  select jsonb_build_object(
+    'kpi_data',  (select to_jsonb(k) from kpi k),
+    'lot_state', coalesce((select jsonb_agg(to_jsonb(l) order by l.event_time, l.lot_id) from lot l), '[]'),
+    'eqp_state', coalesce((select jsonb_agg(to_jsonb(e) order by e.event_time, e.eqp_id) from eqp e), '[]'),
+    'rcp_state', coalesce((select jsonb_agg(to_jsonb(r)) from rcp r), '[]'),
+    'kpi_trend', coalesce((select jsonb_agg(to_jsonb(t) order by t.date) from trend t), '[]'));
+$$;
+"""
+
+# 묶음 조회 결과의 컨텍스트 소스 (node_3_context_fetch.CONTEXT_SOURCES와 같은 이름)
+ALARM_CONTEXT_SOURCES = ('lot_state', 'eqp_state', 'rcp_state', 'kpi_trend')
+
+# PostgREST 한 번 응답의 최대 행 수 (db-max-rows 기본값)
+PAGE_SIZE = 1000
+
+# 페이지 조회 행 수 계산 방식 (PostgREST Prefer: count=...)
+#   planned: 플래너 추정 (가장 빠름) / estimated: 작은 결과는 정확, 큰 결과는 추정 / exact: COUNT(*)
+COUNT_METHODS = ('planned', 'estimated', 'exact')
+
+# get_lot_state / get_eqp_state / get_kpi_* 한 번 조회의 기본 최대 행 수 (0이면 제한 없음)
+DEFAULT_MAX_ROWS = int(os.getenv('SUPABASE_MAX_ROWS', '20000'))
+
+
+def _is_missing_function(error: Exception) -> bool:
+    """SQL 함수가 없어서 난 오류인지 (PostgREST PGRST202 / SQLSTATE 42883), 그 외는 일시 오류로 취급"""
+    code = str(getattr(error, 'code', '') or '')
+    return code in ('PGRST202', '42883') or 'PGRST202' in str(error) or '42883' in str(error)
+
+
+def _quote(value: Any) -> str:
+    """PostgREST 논리 필터(or=...) 안의 값 인용 (공백·쉼표·괄호가 있어도 안전)"""
+    return '"' + str(value).replace('\\', '\\\\').replace('"', '\\"') + '"'
+
+
+# 대시보드 요약 카드에 필요한 kpi_daily 컬럼
+KPI_SUMMARY_COLUMNS = 'date,eqp_id,oee_v,oee_t,thp_v,thp_t,tat_v,tat_t,wip_v,wip_t,alarm_flag'
+
 class SupabaseConfig:
     """
     Supabase 설정 클래스
@@ -26,6 +124,14 @@ class SupabaseConfig:
         
         # Supabase 클라이언트 생성
         self.client: Client = create_client(self.url, self.key)
+
+        # 카탈로그 SQL 함수 존재 여부 (None: 아직 모름)
+        self._catalog_rpc_available: Optional[bool] = None
+        # 알람 컨텍스트 SQL 함수 존재 여부 (None: 아직 모름)
+        self._alarm_context_rpc_available: Optional[bool] = None
+
+        # 목록 조회 기본 최대 행 수 (0이면 제한 없음)
+        self.max_rows = DEFAULT_MAX_ROWS
     
     def _validate_config(self):
         """필수 설정 값이 있는지 확인합니다."""
@@ -47,7 +153,7 @@ class SupabaseConfig:
             response = self.client.table('scenario_map').select('*').limit(1).execute()
             return True
         except Exception as e:
-            print(f"[ERROR] 연결 실패: {str(e)}")
+            logger.error("Supabase 연결 실패: %s", e)
             return False
     
     def get_scenario_map(self, date: str = None) -> List[Dict[str, Any]]:
@@ -68,10 +174,59 @@ class SupabaseConfig:
         response = query.execute()
         return response.data
     
+    def reader(
+        self,
+        table: str,
+        order: Tuple[str, ...],
+        columns: str = '*',
+        eq: Dict[str, Any] = None,
+        gte: Dict[str, Any] = None,
+        lte: Dict[str, Any] = None,
+        in_: Dict[str, List[Any]] = None,
+    ) -> PagedReader:
+        """
+        PAGE_SIZE 단위로 이어 읽는 리더 (다음 페이지 미리 요청)
+
+        한 번의 select는 PostgREST 응답 상한(PAGE_SIZE)에서 조용히 잘리므로,
+        목록 조회는 이 리더로 끝까지 / max_rows까지 이어 읽습니다.
+        값이 None인 필터는 건너뜁니다.
+
+        Args:
+            table: 테이블 이름
+            order: 정렬 컬럼 (페이지 사이 순서가 바뀌지 않도록 고유 키까지 포함)
+            columns: 조회 컬럼
+            eq / gte / lte / in_: {컬럼: 값} 필터
+
+        Returns:
+            PagedReader: 스트리밍(for row in reader) 또는 reader.collect(max_rows)
+        """
+        def fetch_page(offset: int, limit: int) -> List[Dict[str, Any]]:
+            # 빌더는 호출마다 상태가 쌓이므로 페이지마다 새로 구성
+            query = self.client.table(table).select(columns)
+            for method, conditions in (('eq', eq), ('gte', gte), ('lte', lte), ('in_', in_)):
+                for column, value in (conditions or {}).items():
+                    if value is not None:
+                        query = getattr(query, method)(column, value)
+            for column in order:
+                query = query.order(column)
+            return query.range(offset, offset + limit - 1).execute().data or []
+
+        return PagedReader(fetch_page, page_size=PAGE_SIZE)
+
+    def _collect(self, reader: PagedReader, name: str, max_rows: Optional[int]) -> PagedRows:
+        """max_rows(None이면 self.max_rows, 0이면 제한 없음)까지 모으고 잘리면 경고"""
+        if max_rows is None:
+            max_rows = getattr(self, 'max_rows', DEFAULT_MAX_ROWS)
+        rows = reader.collect(max_rows or None)
+        if rows.truncated:
+            logger.warning("%s 조회가 최대 행 수(%d)에서 잘렸습니다 (%d페이지)", name, max_rows, rows.pages)
+        return rows
+
     def get_kpi_daily(
         self, 
         date: str = None, 
-        eqp_id: str = None
+        eqp_id: str = None,
+        max_rows: int = None
     ) -> List[Dict[str, Any]]:
         """
         KPI_DAILY 테이블에서 일별 KPI 데이터 조회
@@ -79,25 +234,69 @@ class SupabaseConfig:
         Args:
             date: 특정 날짜 (YYYY-MM-DD)
             eqp_id: 장비 ID (예: EQP01)
+            max_rows: 최대 행 수 (None이면 SUPABASE_MAX_ROWS)
         
         Returns:
-            List[Dict]: KPI 데이터 리스트
+            List[Dict]: KPI 데이터 리스트 (PagedRows, 상한 초과 시 truncated=True)
         """
-        query = self.client.table('kpi_daily').select('*')
-        
-        if date:
-            query = query.eq('date', date)
-        if eqp_id:
-            query = query.eq('eqp_id', eqp_id)
-        
-        response = query.execute()
-        return response.data
+        return self._collect(
+            self.reader('kpi_daily', order=('date', 'eqp_id'), eq={'date': date, 'eqp_id': eqp_id}),
+            'kpi_daily', max_rows,
+        )
+
+    def get_kpi_daily_since(self, since_date: str = None) -> List[Dict[str, Any]]:
+        """
+        대시보드 요약 적재용 kpi_daily 조회 (요약 컬럼만, PAGE_SIZE 단위로 나눠 받음)
+
+        Args:
+            since_date: 이 날짜(YYYY-MM-DD, 포함) 이후만 (None이면 전체)
+
+        Returns:
+            List[Dict]: {date, eqp_id, {kpi}_v, {kpi}_t, alarm_flag} (날짜, 장비 오름차순)
+        """
+        result, offset = [], 0
+        while True:
+            query = self.client.table('kpi_daily').select(KPI_SUMMARY_COLUMNS)
+            if since_date:
+                query = query.gte('date', since_date)
+            page = query.order('date').order('eqp_id') \
+                .range(offset, offset + PAGE_SIZE - 1).execute().data or []
+            result.extend(page)
+            if len(page) < PAGE_SIZE:
+                return result
+            offset += PAGE_SIZE
+
+    def get_kpi_summary(self, eqp_id: str = None) -> Dict[str, Any]:
+        """
+        대시보드 요약을 DB에서 바로 계산 (최신 1행 + 건수, 행 전체를 가져오지 않음)
+
+        Args:
+            eqp_id: 장비 ID (None이면 전체)
+
+        Returns:
+            Dict: {'latest': 최신 행 또는 None, 'total_count', 'alarm_count'}
+        """
+        def base(columns: str, **kwargs):
+            query = self.client.table('kpi_daily').select(columns, **kwargs)
+            return query.eq('eqp_id', eqp_id) if eqp_id else query
+
+        latest = base(KPI_SUMMARY_COLUMNS).order('date', desc=True).order('eqp_id') \
+            .limit(1).execute().data
+        total = base('date', count='exact', head=True).execute().count
+        alarms = base('date', count='exact', head=True).eq('alarm_flag', 1).execute().count
+        return {
+            'latest': latest[0] if latest else None,
+            'total_count': total or 0,
+            'alarm_count': alarms or 0,
+        }
 
     def get_kpi_trend(
         self,
         start_date: str,
         end_date: str,
-        eqp_id: str = None
+        eqp_id: str = None,
+        eqp_ids: List[str] = None,
+        max_rows: int = None
     ) -> List[Dict[str, Any]]:
         """
         KPI_DAILY 테이블에서 날짜 범위의 KPI 추세 데이터 조회
@@ -106,26 +305,26 @@ class SupabaseConfig:
             start_date: 시작 날짜 (YYYY-MM-DD, 포함)
             end_date: 종료 날짜 (YYYY-MM-DD, 포함)
             eqp_id: 장비 ID
+            eqp_ids: 여러 장비 ID (IN 조건, 일괄 분석용)
+            max_rows: 최대 행 수 (None이면 SUPABASE_MAX_ROWS)
 
         Returns:
-            List[Dict]: KPI 데이터 리스트 (날짜 오름차순)
+            List[Dict]: KPI 데이터 리스트 (날짜 오름차순, PagedRows)
         """
-        query = self.client.table('kpi_daily').select('*') \
-            .gte('date', start_date) \
-            .lte('date', end_date) \
-            .order('date', desc=False)
-
-        if eqp_id:
-            query = query.eq('eqp_id', eqp_id)
-
-        response = query.execute()
-        return response.data
+        return self._collect(
+            self.reader('kpi_daily', order=('date', 'eqp_id'),
+                        gte={'date': start_date}, lte={'date': end_date},
+                        eq={'eqp_id': eqp_id}, in_={'eqp_id': eqp_ids}),
+            'kpi_trend', max_rows,
+        )
 
     def get_lot_state(
         self,
         start_time: str = None,
         end_time: str = None,
-        eqp_id: str = None
+        eqp_id: str = None,
+        eqp_ids: List[str] = None,
+        max_rows: int = None
     ) -> List[Dict[str, Any]]:
         """
         LOT_STATE 테이블에서 로트 상태 이력 조회
@@ -134,27 +333,26 @@ class SupabaseConfig:
             start_time: 시작 시간 (YYYY-MM-DD HH:MM)
             end_time: 종료 시간 (YYYY-MM-DD HH:MM)
             eqp_id: 장비 ID
+            eqp_ids: 여러 장비 ID (IN 조건, 일괄 분석용)
+            max_rows: 최대 행 수 (None이면 SUPABASE_MAX_ROWS)
         
         Returns:
             List[Dict]: 로트 상태 데이터
         """
-        query = self.client.table('lot_state').select('*')
-        
-        if start_time:
-            query = query.gte('event_time', start_time)
-        if end_time:
-            query = query.lte('event_time', end_time)
-        if eqp_id:
-            query = query.eq('eqp_id', eqp_id)
-        
-        response = query.execute()
-        return response.data
+        return self._collect(
+            self.reader('lot_state', order=('event_time', 'lot_id'),
+                        gte={'event_time': start_time}, lte={'event_time': end_time},
+                        eq={'eqp_id': eqp_id}, in_={'eqp_id': eqp_ids}),
+            'lot_state', max_rows,
+        )
     
     def get_eqp_state(
         self,
         start_time: str = None,
         end_time: str = None,
-        eqp_id: str = None
+        eqp_id: str = None,
+        eqp_ids: List[str] = None,
+        max_rows: int = None
     ) -> List[Dict[str, Any]]:
         """
         EQP_STATE 테이블에서 장비 상태 이력 조회
@@ -163,28 +361,26 @@ class SupabaseConfig:
             start_time: 시작 시간
             end_time: 종료 시간
             eqp_id: 장비 ID
+            eqp_ids: 여러 장비 ID (IN 조건, 일괄 분석용)
+            max_rows: 최대 행 수 (None이면 SUPABASE_MAX_ROWS)
         
         Returns:
             List[Dict]: 장비 상태 데이터
         """
-        query = self.client.table('eqp_state').select('*')
-        
-        if start_time:
-            query = query.gte('event_time', start_time)
-        if end_time:
-            query = query.lte('event_time', end_time)
-        if eqp_id:
-            query = query.eq('eqp_id', eqp_id)
-        
-        response = query.execute()
-        return response.data
+        return self._collect(
+            self.reader('eqp_state', order=('event_time', 'eqp_id'),
+                        gte={'event_time': start_time}, lte={'event_time': end_time},
+                        eq={'eqp_id': eqp_id}, in_={'eqp_id': eqp_ids}),
+            'eqp_state', max_rows,
+        )
     
-    def get_rcp_state(self, eqp_id: str = None) -> List[Dict[str, Any]]:
+    def get_rcp_state(self, eqp_id: str = None, eqp_ids: List[str] = None) -> List[Dict[str, Any]]:
         """
         RCP_STATE 테이블에서 레시피 정보 조회
         
         Args:
             eqp_id: 장비 ID
+            eqp_ids: 여러 장비 ID (IN 조건, 일괄 분석용)
         
         Returns:
             List[Dict]: 레시피 데이터
@@ -193,9 +389,295 @@ class SupabaseConfig:
         
         if eqp_id:
             query = query.eq('eqp_id', eqp_id)
+        if eqp_ids:
+            query = query.in_('eqp_id', eqp_ids)
         
         response = query.execute()
         return response.data
 
+    def get_alarm_context(
+        self,
+        alarm_date: str,
+        eqp_id: str,
+        start_time: str,
+        end_time: str,
+        trend_start: str,
+        trend_end: str,
+        max_rows: int = None
+    ) -> Optional[Dict[str, Any]]:
+        """
+        알람 하나의 분석 컨텍스트를 DB 호출 한 번으로 조회 (alarm_context SQL 함수)
+
+        Node 2의 알람 당일 KPI와 Node 3의 소스 4종을 따로 조회하면 왕복이 5번 필요하므로,
+        ALARM_CONTEXT_RPC_SQL 함수가 있으면 JSON 묶음 하나로 받습니다.
+
+        Args:
+            alarm_date: 알람 날짜 (YYYY-MM-DD)
+            eqp_id: 장비 ID
+            start_time / end_time: 로트·장비 상태 이력 범위
+            trend_start / trend_end: KPI 추세 날짜 범위 (포함)
+            max_rows: 소스별 최대 행 수 (None이면 self.max_rows, 0이면 제한 없음)
+
+        Returns:
+            Optional[Dict]: {'kpi_data': 알람 당일 KPI 행 또는 None,
+                             소스: 행 목록(PagedRows), 'truncated': [잘린 소스]}
+                            함수가 없거나 호출이 실패하면 None (호출 측에서 소스별 조회로 대체)
+        """
+        if self._alarm_context_rpc_available is False:
+            return None
+        if max_rows is None:
+            max_rows = getattr(self, 'max_rows', DEFAULT_MAX_ROWS)
+
+        try:
+            bundle = self.client.rpc(ALARM_CONTEXT_RPC, {
+                'p_date': alarm_date,
+                'p_eqp_id': eqp_id,
+                'p_start_time': start_time,
+                'p_end_time': end_time,
+                'p_trend_start': trend_start,
+                'p_trend_end': trend_end,
+                'p_max_rows': max_rows or None,
+            }).execute().data
+            self._alarm_context_rpc_available = True
+        except Exception as e:
+            if _is_missing_function(e):
+                self._alarm_context_rpc_available = False
+                logger.warning("Supabase 함수 %s 사용 불가, 소스별로 조회합니다 "
+                               "(ALARM_CONTEXT_RPC_SQL로 생성 권장): %s", ALARM_CONTEXT_RPC, e)
+            else:
+                # 일시 오류는 이번 알람만 소스별 조회로 대체 (다음 알람에서 함수 다시 사용)
+                logger.warning("Supabase 함수 %s 호출 실패, 이번 알람은 소스별로 조회합니다: %s",
+                               ALARM_CONTEXT_RPC, e)
+            return None
+
+        bundle = bundle or {}
+        context: Dict[str, Any] = {'kpi_data': bundle.get('kpi_data'), 'truncated': []}
+        for name in ALARM_CONTEXT_SOURCES:
+            # 함수는 상한 + 1행까지 돌려주므로 넘친 경우만 잘림으로 표시
+            rows = PagedRows(bundle.get(name) or [])
+            rows.pages = 1
+            if max_rows and len(rows) > max_rows:
+                del rows[max_rows:]
+                rows.truncated = True
+                context['truncated'].append(name)
+            context[name] = rows
+        if context['truncated']:
+            logger.warning("알람 컨텍스트(%s %s)가 최대 행 수(%d)에서 잘렸습니다: %s",
+                           alarm_date, eqp_id, max_rows, ', '.join(context['truncated']))
+        return context
+
+    # ──────────────────────────────────────────────────────────────
+    # 페이지 단위 조회 (키셋 페이지네이션)
+    # ──────────────────────────────────────────────────────────────
+
+    def get_table_page(
+        self,
+        table: str,
+        columns: Optional[List[str]] = None,
+        filters: Optional[Dict[str, Any]] = None,
+        cursor: Optional[str] = None,
+        limit: int = 500,
+        descending: bool = False,
+        count: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """
+        (정렬 키, tiebreak) 키셋 기준으로 PAGED_TABLES 테이블 한 페이지를 조회합니다.
+        OFFSET 대신 마지막 행 다음부터 읽으므로 N번째 페이지도 첫 페이지와 같은 비용입니다.
+        (커서 형식은 rds_config.get_table_page와 같음)
+
+        Args:
+            table: 'lot_state', 'eqp_state' 또는 'kpi_daily'
+            columns: 조회할 컬럼 (None이면 전체, 커서 컬럼은 항상 포함)
+            filters: start_time, end_time (정렬 키 범위), 그 외 허용 컬럼은 동등 비교
+            cursor: 이전 페이지의 next_cursor (None이면 첫 페이지)
+            limit: 페이지 크기 (PAGE_SIZE 이하)
+            descending: True면 최신순
+            count: 전체 행 수 계산 방식 (None | 'planned' | 'estimated' | 'exact')
+
+        Returns:
+            Dict: {'rows', 'next_cursor', 'has_more', 'total_count'(count 미지정 시 None)}
+
+        Raises:
+            ValueError: 지원하지 않는 테이블/컬럼/필터/count 또는 잘못된 커서
+        """
+        if table not in PAGED_TABLES:
+            raise ValueError(f"페이지 조회를 지원하지 않는 테이블: {table}")
+        if count is not None and count not in COUNT_METHODS:
+            raise ValueError(f"지원하지 않는 count 방식: {count}")
+        spec = PAGED_TABLES[table]
+        sort_key, tiebreak = spec['sort_key'], spec['tiebreak']
+
+        if columns:
+            unknown = [c for c in columns if c not in spec['columns']]
+            if unknown:
+                raise ValueError(f"{table}에 없는 컬럼: {', '.join(unknown)}")
+            selected = [sort_key, tiebreak] + [c for c in columns if c not in (sort_key, tiebreak)]
+        else:
+            selected = ['*']
+
+        query = self.client.table(table).select(','.join(selected), count=count)
+        for key, value in (filters or {}).items():
+            if value is None or value == '':
+                continue
+            if key == 'start_time':
+                query = query.gte(sort_key, value)
+            elif key == 'end_time':
+                query = query.lte(sort_key, value)
+            elif key in spec['columns']:
+                query = query.eq(key, value)
+            else:
+                raise ValueError(f"{table}에서 지원하지 않는 필터: {key}")
+
+        if cursor:
+            last_sort, last_tiebreak = decode_cursor(cursor)
+            op = 'lt' if descending else 'gt'
+            query = query.or_(
+                f"{sort_key}.{op}.{_quote(last_sort)},"
+                f"and({sort_key}.eq.{_quote(last_sort)},{tiebreak}.{op}.{_quote(last_tiebreak)})"
+            )
+
+        # 한 행 더 읽어 다음 페이지 존재 여부 판단
+        limit = max(1, min(limit, PAGE_SIZE - 1))
+        response = query.order(sort_key, desc=descending).order(tiebreak, desc=descending) \
+            .limit(limit + 1).execute()
+        rows = response.data or []
+
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+        next_cursor = (
+            encode_cursor(rows[-1][sort_key], rows[-1][tiebreak]) if has_more and rows else None
+        )
+        return {
+            'rows': rows,
+            'next_cursor': next_cursor,
+            'has_more': has_more,
+            'total_count': response.count if count else None,
+        }
+
+    def iter_table_rows(
+        self,
+        table: str,
+        columns: Optional[List[str]] = None,
+        filters: Optional[Dict[str, Any]] = None,
+        descending: bool = False,
+        max_rows: Optional[int] = None,
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        lot_state / eqp_state 행을 키셋 페이지 단위로 이어 읽는 제너레이터 (일괄 내보내기용)
+
+        Args:
+            table / columns / filters / descending: get_table_page와 같음
+            max_rows: 최대 행 수 (None이면 끝까지)
+
+        Yields:
+            Dict: 행 (정렬 순서대로)
+        """
+        cursor, emitted = None, 0
+        while True:
+            page = self.get_table_page(table, columns=columns, filters=filters, cursor=cursor,
+                                       limit=PAGE_SIZE - 1, descending=descending)
+            for row in page['rows']:
+                if max_rows is not None and emitted >= max_rows:
+                    return
+                yield row
+                emitted += 1
+            if not page['has_more']:
+                return
+            cursor = page['next_cursor']
+
+    # ──────────────────────────────────────────────────────────────
+    # 카탈로그 (날짜·장비별 행 수, 변경 감지)
+    # ──────────────────────────────────────────────────────────────
+
+    def get_table_daily_catalog(self, table: str, since_date: str = None) -> List[Dict[str, Any]]:
+        """
+        lot_state / eqp_state 날짜·장비별 행 수 (테이블 카탈로그 갱신용)
+
+        table_daily_catalog SQL 함수(CATALOG_RPC_SQL)가 있으면 DB에서 GROUP BY로 집계하고,
+        없으면 (event_time, eqp_id) 컬럼만 페이지 단위로 읽어 집계합니다.
+
+        Args:
+            table: 'lot_state' 또는 'eqp_state'
+            since_date: 이 날짜(YYYY-MM-DD, 포함) 이후만 집계 (None이면 전체)
+
+        Returns:
+            List[Dict]: {date, eqp_id, rows, first_event_time, last_event_time}
+        """
+        if table not in CATALOG_TABLES:
+            raise ValueError(f"카탈로그를 지원하지 않는 테이블: {table}")
+
+        if self._catalog_rpc_available is not False:
+            try:
+                rows = self._rpc_daily_catalog(table, since_date)
+                self._catalog_rpc_available = True
+                return rows
+            except Exception as e:
+                if _is_missing_function(e):
+                    self._catalog_rpc_available = False
+                    logger.warning("Supabase 함수 %s 사용 불가, 컬럼 스캔으로 집계합니다 "
+                                   "(CATALOG_RPC_SQL로 생성 권장): %s", CATALOG_RPC, e)
+                else:
+                    # 일시 오류는 이번 호출만 컬럼 스캔으로 대체 (다음 갱신에서 함수 다시 사용)
+                    logger.warning("Supabase 함수 %s 호출 실패, 이번 갱신은 컬럼 스캔으로 집계합니다: %s",
+                                   CATALOG_RPC, e)
+        return self._scan_daily_catalog(table, since_date)
+
+    def _rpc_daily_catalog(self, table: str, since_date: Optional[str]) -> List[Dict[str, Any]]:
+        """SQL 함수로 집계 (결과도 PAGE_SIZE 단위로 나눠 받음)"""
+        result, offset = [], 0
+        while True:
+            response = self.client.rpc(CATALOG_RPC, {'p_table': table, 'p_since': since_date}) \
+                .range(offset, offset + PAGE_SIZE - 1).execute()
+            page = response.data or []
+            result.extend({
+                'date': r['date'],
+                'eqp_id': r.get('eqp_id') or '',
+                'rows': int(r.get('row_count') or 0),
+                'first_event_time': r.get('first_event_time'),
+                'last_event_time': r.get('last_event_time'),
+            } for r in page)
+            if len(page) < PAGE_SIZE:
+                return result
+            offset += PAGE_SIZE
+
+    def _scan_daily_catalog(self, table: str, since_date: Optional[str]) -> List[Dict[str, Any]]:
+        """(event_time, eqp_id) 컬럼만 페이지 단위로 읽어 날짜·장비별 집계"""
+        buckets: Dict[tuple, Dict[str, Any]] = {}
+        # event_time만으로는 순서가 고정되지 않아 페이지 사이에서 행이 중복/누락되므로 고유 키까지 정렬
+        reader = self.reader(
+            table, order=('event_time', PAGED_TABLES[table]['tiebreak']), columns='event_time,eqp_id',
+            gte={'event_time': f"{since_date} 00:00:00" if since_date else None},
+        )
+        for row in reader:
+            event_time = str(row['event_time'])
+            key = (event_time[:10], row.get('eqp_id') or '')
+            bucket = buckets.get(key)
+            if bucket is None:
+                buckets[key] = {'date': key[0], 'eqp_id': key[1], 'rows': 1,
+                                'first_event_time': event_time, 'last_event_time': event_time}
+            else:
+                bucket['rows'] += 1
+                bucket['last_event_time'] = event_time  # event_time 오름차순
+        return list(buckets.values())
+
+    def get_table_signature(self, table: str) -> Dict[str, Any]:
+        """
+        테이블 변경 감지용 서명 (최신 event_time + 추정 행 수, 요청 1회)
+
+        Args:
+            table: 'lot_state' 또는 'eqp_state'
+
+        Returns:
+            Dict: {'max_event_time', 'row_estimate'}
+        """
+        if table not in CATALOG_TABLES:
+            raise ValueError(f"카탈로그를 지원하지 않는 테이블: {table}")
+        response = self.client.table(table).select('event_time', count='estimated') \
+            .order('event_time', desc=True).limit(1).execute()
+        return {
+            'max_event_time': str(response.data[0]['event_time']) if response.data else None,
+            'row_estimate': response.count,
+        }
+
 # 싱글톤 패턴으로 전역 설정 객체 생성
 supabase_config = SupabaseConfig()
\ No newline at end of file
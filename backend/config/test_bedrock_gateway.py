@@ -0,0 +1,146 @@
+"""
+Bedrock 게이트웨이 테스트
+(실제 Bedrock 없이 가짜 호출 함수로 속도 제한 / 재시도 / 헤징만 검증합니다)
+"""
+
+import sys
+import time
+import threading
+from pathlib import Path
+
+# 프로젝트 루트를 경로에 추가
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from backend.config.bedrock_gateway import BedrockGateway, BedrockThrottledError, TokenBucket
+
+
+class FakeClientError(Exception):
+    """botocore ClientError를 흉내내는 테스트용 예외"""
+
+    def __init__(self, code: str, status: int = 400):
+        super().__init__(code)
+        self.response = {'Error': {'Code': code}, 'ResponseMetadata': {'HTTPStatusCode': status}}
+
+
+def test_retry_on_throttle():
+    """스로틀링 재시도 / 재시도 불가 오류 즉시 실패 테스트"""
+
+    print("=" * 60)
+    print("스로틀링 재시도 테스트")
+    print("=" * 60 + "\n")
+
+    gateway = BedrockGateway(claude_rpm=0, max_retries=3, backoff_base=0.01, backoff_max=0.02)
+    calls = {'n': 0}
+
+    def flaky():
+        calls['n'] += 1
+        if calls['n'] <= 2:
+            raise FakeClientError('ThrottlingException')
+        return 'ok'
+
+    result, retries = gateway.invoke('completion', flaky)
+    print(f"   결과: {result}, 재시도 {retries}회")
+    assert result == 'ok' and retries == 2
+
+    # 재시도할 수 없는 오류 (잘못된 요청)는 바로 실패
+    try:
+        gateway.invoke('completion', lambda: (_ for _ in ()).throw(FakeClientError('ValidationException')))
+        assert False, "ValidationException이 발생해야 합니다"
+    except FakeClientError as e:
+        assert e.gateway_retries == 0
+
+    stats = gateway.get_stats()['lanes']['completion']
+    print(f"   통계: {stats}")
+    assert stats['throttled'] == 2
+    assert stats['retries'] == 2
+    assert stats['failed'] == 1
+
+    print("\n스로틀링 재시도 테스트 통과!\n")
+
+
+def test_rate_and_concurrency_limit():
+    """토큰 버킷 / 동시 실행 제한 / 대기 초과 테스트"""
+
+    print("=" * 60)
+    print("속도 / 동시 실행 제한 테스트")
+    print("=" * 60 + "\n")
+
+    # 1. 분당 600회 = 초당 10회, 버스트 1 → 3번째 토큰까지 약 0.2초
+    bucket = TokenBucket(600, burst=1)
+    started = time.monotonic()
+    for _ in range(3):
+        assert bucket.acquire(time.monotonic() + 1)
+    elapsed = time.monotonic() - started
+    print(f"   토큰 3개 획득: {elapsed:.2f}s")
+    assert 0.15 <= elapsed < 0.6
+
+    # 2. 동시 실행 1 → 두 번째 요청은 대기 후 타임아웃
+    gateway = BedrockGateway(claude_rpm=0, claude_max_concurrency=1, queue_timeout=0.1)
+    release = threading.Event()
+    holder = threading.Thread(target=gateway.invoke, args=('completion', release.wait))
+    holder.start()
+    time.sleep(0.05)
+    try:
+        gateway.invoke('stream', lambda: 'never')
+        assert False, "대기 시간 초과가 발생해야 합니다"
+    except BedrockThrottledError as e:
+        print(f"   예상된 대기 초과: {e}")
+    release.set()
+    holder.join()
+
+    stats = gateway.get_stats()['lanes']['completion']
+    print(f"   통계: {stats}")
+    assert stats['rejected'] == 1
+    assert stats['in_flight'] == 0 and stats['queue_depth'] == 0
+
+    print("\n속도 / 동시 실행 제한 테스트 통과!\n")
+
+
+def test_embedding_hedge():
+    """느린 임베딩 요청 헤징 테스트"""
+
+    print("=" * 60)
+    print("임베딩 헤징 테스트")
+    print("=" * 60 + "\n")
+
+    gateway = BedrockGateway(embed_rpm=0, embed_hedge_ms=50)
+    calls = {'n': 0}
+    lock = threading.Lock()
+
+    def embed():
+        with lock:
+            calls['n'] += 1
+            first = calls['n'] == 1
+        time.sleep(0.5 if first else 0.01)
+        return 'slow' if first else 'fast'
+
+    started = time.monotonic()
+    result, _ = gateway.invoke_hedged('embedding', embed)
+    elapsed = time.monotonic() - started
+    print(f"   결과: {result} ({elapsed:.2f}s)")
+    assert result == 'fast' and elapsed < 0.4
+
+    stats = gateway.get_stats()['lanes']['embedding']
+    print(f"   통계: {stats}")
+    assert stats['hedges'] == 1 and stats['hedge_wins'] == 1
+
+    print("\n임베딩 헤징 테스트 통과!\n")
+
+
+def main():
+    """모든 테스트 실행"""
+
+    print("\nBedrock 게이트웨이 테스트 시작\n")
+
+    test_retry_on_throttle()
+    test_rate_and_concurrency_limit()
+    test_embedding_hedge()
+
+    print("=" * 60)
+    print("모든 테스트 완료!")
+    print("=" * 60 + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,151 @@
+"""
+RDS 키셋 페이지네이션 / 쿼리 조건 SQL 처리 테스트
+(실제 DB 없이 쿼리 실행 함수를 가짜로 바꿔 SQL 구성과 커서 처리만 검증합니다)
+"""
+
+import sys
+from pathlib import Path
+
+# 프로젝트 루트를 경로에 추가
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from backend.config.rds_config import rds_config, encode_cursor, decode_cursor
+
+
+class FakeQuery:
+    """_execute_query 대체: 호출된 SQL을 기록하고 정해진 행을 반환"""
+
+    def __init__(self, rows):
+        self.rows = rows
+        self.calls = []
+
+    def __call__(self, query, params=None):
+        self.calls.append((" ".join(query.split()), params))
+        return self.rows
+
+
+def test_cursor_roundtrip():
+    """커서 인코딩/디코딩 테스트"""
+
+    print("\n" + "=" * 60)
+    print("커서 인코딩 테스트")
+    print("=" * 60 + "\n")
+
+    cursor = encode_cursor("2026-01-20 08:00:00", "LOT_이름")
+    assert decode_cursor(cursor) == ("2026-01-20 08:00:00", "LOT_이름")
+
+    try:
+        decode_cursor("not-a-cursor")
+        assert False, "잘못된 커서는 ValueError가 발생해야 합니다"
+    except ValueError as e:
+        print(f"   예상된 오류: {e}")
+
+    print("\n커서 인코딩 테스트 통과!\n")
+
+
+def test_table_page():
+    """페이지 조회 SQL 구성 테스트"""
+
+    print("=" * 60)
+    print("키셋 페이지 조회 테스트")
+    print("=" * 60 + "\n")
+
+    rows = [
+        {'event_time': f"2026-01-20 0{i}:00:00", 'lot_id': f"LOT{i}", 'eqp_id': 'EQP01'}
+        for i in range(3)
+    ]
+    fake = FakeQuery(rows)
+    original = rds_config._execute_query
+    rds_config._execute_query = fake
+    try:
+        # 1. 첫 페이지: limit + 1개를 읽어 다음 페이지 존재 여부 판단
+        page = rds_config.get_table_page(
+            'lot_state', columns=['eqp_id'], filters={'eqp_id': 'EQP01'}, limit=2
+        )
+        query, params = fake.calls[-1]
+        print(f"   SQL: {query}")
+        assert query.startswith("SELECT event_time, lot_id, eqp_id FROM")
+        assert "ORDER BY event_time ASC, lot_id ASC LIMIT %s" in query
+        assert params == ('EQP01', 3)
+        assert len(page['rows']) == 2 and page['has_more']
+        assert decode_cursor(page['next_cursor']) == ("2026-01-20 01:00:00", "LOT1")
+
+        # 2. 다음 페이지: 커서 이후 행만 조회
+        rds_config.get_table_page('lot_state', cursor=page['next_cursor'], limit=5)
+        query, params = fake.calls[-1]
+        assert "(event_time, lot_id) > (%s, %s)" in query
+        assert params == ("2026-01-20 01:00:00", "LOT1", 6)
+
+        # 3. 허용되지 않은 컬럼은 거부
+        for bad in (dict(columns=['password']), dict(filters={'1=1; --': 'x'})):
+            try:
+                rds_config.get_table_page('lot_state', **bad)
+                assert False, "ValueError가 발생해야 합니다"
+            except ValueError as e:
+                print(f"   예상된 오류: {e}")
+    finally:
+        rds_config._execute_query = original
+
+    print("\n키셋 페이지 조회 테스트 통과!\n")
+
+
+def test_query_pushdown():
+    """컬럼/정렬/LIMIT이 SQL에 반영되는지 테스트"""
+
+    print("=" * 60)
+    print("쿼리 조건 SQL 처리 테스트")
+    print("=" * 60 + "\n")
+
+    fake = FakeQuery([])
+    original = rds_config._execute_query
+    rds_config._execute_query = fake
+    try:
+        rds_config.get_lot_state(
+            start_time="2026-01-01 00:00:00", eqp_id="EQP01",
+            columns=['event_time', 'lot_id'], limit=20, order="desc",
+        )
+        query, params = fake.calls[-1]
+        print(f"   SQL: {query}")
+        assert query.startswith("SELECT event_time, lot_id FROM")
+        assert query.endswith("ORDER BY event_time DESC LIMIT %s")
+        assert params == ("2026-01-01 00:00:00", "EQP01", 20)
+
+        # 인자를 주지 않으면 기존과 동일 (전체 컬럼, 오름차순, 제한 없음)
+        rds_config.get_kpi_trend("2026-01-01", "2026-01-31")
+        query, params = fake.calls[-1]
+        assert query.startswith("SELECT * FROM") and query.endswith("ORDER BY date ASC")
+        assert params == ("2026-01-01", "2026-01-31")
+
+        # 집계 쿼리
+        rds_config.get_lot_daily_counts(start_time="2026-01-01 00:00:00", group_by_eqp=False)
+        query, _ = fake.calls[-1]
+        assert "'ALL' AS eqp_id" in query and "GROUP BY 1, 2" in query
+
+        try:
+            rds_config.get_eqp_state(columns=['event_time; DROP TABLE x'])
+            assert False, "ValueError가 발생해야 합니다"
+        except ValueError as e:
+            print(f"   예상된 오류: {e}")
+    finally:
+        rds_config._execute_query = original
+
+    print("\n쿼리 조건 SQL 처리 테스트 통과!\n")
+
+
+def main():
+    """모든 테스트 실행"""
+
+    print("\nRDS 페이지네이션 테스트 시작\n")
+
+    test_cursor_roundtrip()
+    test_table_page()
+    test_query_pushdown()
+
+    print("=" * 60)
+    print("모든 테스트 완료!")
+    print("=" * 60 + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,149 @@
+"""
+RDS 커넥션 풀 테스트
+(실제 DB 없이 가짜 연결 객체로 풀 동작만 검증합니다)
+"""
+
+import sys
+import time
+import threading
+from pathlib import Path
+
+# 프로젝트 루트를 경로에 추가
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+import psycopg2.extensions
+from backend.config.rds_config import RDSConnectionPool
+
+
+class FakeConnection:
+    """psycopg2 연결을 흉내내는 테스트용 객체"""
+
+    def __init__(self):
+        self.closed = 0
+
+    def cursor(self):
+        return self
+
+    def execute(self, query, params=None):
+        if self.closed:
+            raise psycopg2.InterfaceError("connection already closed")
+
+    def rollback(self):
+        pass
+
+    def get_transaction_status(self):
+        return psycopg2.extensions.TRANSACTION_STATUS_IDLE
+
+    def close(self):
+        self.closed = 1
+
+
+def test_reuse_connection():
+    """반환된 연결이 재사용되는지 테스트"""
+
+    print("\n" + "=" * 60)
+    print("커넥션 재사용 테스트")
+    print("=" * 60 + "\n")
+
+    pool = RDSConnectionPool(connect_fn=FakeConnection, max_size=2)
+
+    with pool.connection() as conn1:
+        pass
+    with pool.connection() as conn2:
+        pass
+
+    stats = pool.get_stats()
+    print(f"   통계: {stats}")
+
+    assert conn1 is conn2, "연결이 재사용되지 않음"
+    assert stats['created'] == 1
+    assert stats['checked_out'] == 0
+
+    print("\n커넥션 재사용 테스트 통과!\n")
+
+
+def test_bounded_wait():
+    """최대 연결 수 초과 시 대기 후 타임아웃 테스트"""
+
+    print("=" * 60)
+    print("최대 연결 수 제한 테스트")
+    print("=" * 60 + "\n")
+
+    pool = RDSConnectionPool(connect_fn=FakeConnection, max_size=1, acquire_timeout=0.2)
+    conn = pool.acquire()
+
+    try:
+        pool.acquire()
+        assert False, "타임아웃이 발생해야 합니다"
+    except TimeoutError as e:
+        print(f"   예상된 타임아웃: {e}")
+
+    # 다른 스레드에서 반환하면 대기 중인 요청이 연결을 받음
+    threading.Timer(0.05, pool.release, args=(conn,)).start()
+    pool.acquire_timeout = 1
+    conn_again = pool.acquire()
+    assert conn_again is conn
+
+    stats = pool.get_stats()
+    print(f"   통계: {stats}")
+    assert stats['timeouts'] == 1
+    assert stats['created'] == 1
+
+    print("\n최대 연결 수 제한 테스트 통과!\n")
+
+
+def test_evict_and_health_check():
+    """유휴 연결 정리 및 끊어진 연결 폐기 테스트"""
+
+    print("=" * 60)
+    print("유휴 연결 정리 / 상태 확인 테스트")
+    print("=" * 60 + "\n")
+
+    pool = RDSConnectionPool(
+        connect_fn=FakeConnection,
+        max_size=2,
+        max_idle_seconds=0.05,
+        health_check_interval=0,
+    )
+
+    # 1. 유휴 시간 초과 연결 정리
+    with pool.connection():
+        pass
+    time.sleep(0.1)
+    stats = pool.get_stats()
+    print(f"   정리 후: {stats}")
+    assert stats['idle'] == 0
+    assert stats['evicted_idle'] == 1
+
+    # 2. 끊어진 연결은 새 연결로 교체
+    pool.max_idle_seconds = 300
+    with pool.connection() as conn:
+        pass
+    conn.closed = 1
+    with pool.connection() as new_conn:
+        assert new_conn is not conn
+
+    stats = pool.get_stats()
+    print(f"   교체 후: {stats}")
+    assert stats['discarded'] == 1
+
+    print("\n유휴 연결 정리 / 상태 확인 테스트 통과!\n")
+
+
+def main():
+    """모든 테스트 실행"""
+
+    print("\nRDS 커넥션 풀 테스트 시작\n")
+
+    test_reuse_connection()
+    test_bounded_wait()
+    test_evict_and_health_check()
+
+    print("=" * 60)
+    print("모든 테스트 완료!")
+    print("=" * 60 + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,313 @@
+"""
+Supabase 키셋 페이지네이션 테스트
+(실제 Supabase 없이 가짜 PostgREST 빌더로 요청 구성과 커서 처리만 검증합니다)
+"""
+
+import sys
+import threading
+from pathlib import Path
+
+# 프로젝트 루트를 경로에 추가
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from backend.config.supabase_config import SupabaseConfig
+from backend.utils.paging import PagedReader, decode_cursor
+
+
+class FakeResponse:
+    def __init__(self, data, count=None):
+        self.data = data
+        self.count = count
+
+
+class FakeTableQuery:
+    """PostgREST 빌더 흉내: 호출을 기록하고 (event_time, lot_id) 키셋 조건을 직접 적용"""
+
+    def __init__(self, rows, calls):
+        self.rows = rows
+        self.calls = calls
+        self.after = None
+        self.n = None
+        self.count = None
+
+    def select(self, columns, count=None):
+        self.calls.append(('select', columns, count))
+        self.count = count
+        return self
+
+    def gte(self, column, value):
+        self.calls.append(('gte', column, value))
+        return self
+
+    def lte(self, column, value):
+        self.calls.append(('lte', column, value))
+        return self
+
+    def eq(self, column, value):
+        self.calls.append(('eq', column, value))
+        return self
+
+    def or_(self, expr):
+        self.calls.append(('or', expr))
+        # event_time.gt."T",and(event_time.eq."T",lot_id.gt."L") → (T, L)
+        values = [part.split('"')[1] for part in expr.split(',') if '"' in part]
+        self.after = (values[0], values[2])
+        return self
+
+    def order(self, column, desc=False):
+        return self
+
+    def limit(self, n):
+        self.n = n
+        return self
+
+    def execute(self):
+        rows = [r for r in self.rows
+                if self.after is None or (r['event_time'], r['lot_id']) > self.after]
+        return FakeResponse(rows[:self.n], count=len(self.rows) if self.count else None)
+
+
+class FakeClient:
+    def __init__(self, rows):
+        self.rows = rows
+        self.calls = []
+
+    def table(self, name):
+        return FakeTableQuery(self.rows, self.calls)
+
+
+def _fake_config(rows):
+    config = SupabaseConfig.__new__(SupabaseConfig)
+    config.client = FakeClient(rows)
+    return config
+
+
+def test_table_page():
+    """키셋 페이지 조회 테스트"""
+
+    print("=" * 60)
+    print("Supabase 키셋 페이지 조회 테스트")
+    print("=" * 60 + "\n")
+
+    rows = [{'event_time': '2026-01-20 08:00:00', 'lot_id': f"LOT{i}", 'eqp_id': 'EQP01'}
+            for i in range(5)]
+    config = _fake_config(rows)
+
+    # 1. 첫 페이지: count 요청 시에만 전체 건수, 다음 커서는 마지막 행 기준
+    page = config.get_table_page('lot_state', filters={'eqp_id': 'EQP01'}, limit=2, count='estimated')
+    print(f"   1페이지: {[r['lot_id'] for r in page['rows']]}, total={page['total_count']}")
+    assert [r['lot_id'] for r in page['rows']] == ['LOT0', 'LOT1']
+    assert page['has_more'] and page['total_count'] == 5
+    assert decode_cursor(page['next_cursor']) == ('2026-01-20 08:00:00', 'LOT1')
+    assert ('eq', 'eqp_id', 'EQP01') in config.client.calls
+
+    # 2. 다음 페이지: 같은 event_time이어도 tiebreak로 이어서 읽음 (OFFSET 없음)
+    page = config.get_table_page('lot_state', cursor=page['next_cursor'], limit=2)
+    or_calls = [c for c in config.client.calls if c[0] == 'or']
+    print(f"   키셋 조건: {or_calls[-1][1]}")
+    assert [r['lot_id'] for r in page['rows']] == ['LOT2', 'LOT3']
+    assert page['total_count'] is None
+
+    # 3. 잘못된 필터 / count 방식
+    for kwargs in ({'filters': {'unknown': 1}}, {'count': 'everything'}):
+        try:
+            config.get_table_page('lot_state', **kwargs)
+            assert False, "ValueError가 발생해야 합니다"
+        except ValueError as e:
+            print(f"   예상된 오류: {e}")
+
+    # 4. 내보내기용 제너레이터: 페이지를 이어 끝까지 / max_rows까지
+    assert [r['lot_id'] for r in config.iter_table_rows('lot_state')] == [f"LOT{i}" for i in range(5)]
+    assert len(list(config.iter_table_rows('lot_state', max_rows=3))) == 3
+
+    print("\nSupabase 키셋 페이지 조회 테스트 통과!\n")
+
+
+def test_paged_reader():
+    """페이지 리더 (미리 읽기 / 스트리밍 / 상한 잘림) 테스트"""
+
+    print("=" * 60)
+    print("페이지 리더 테스트")
+    print("=" * 60 + "\n")
+
+    rows = [{'id': i} for i in range(25)]
+    requested = []
+    first_page_threads = []
+    second_page_requested = threading.Event()
+
+    def fetch_page(offset, limit):
+        requested.append(offset)
+        if offset == 0:
+            first_page_threads.append(threading.current_thread())
+        if offset == 10:
+            second_page_requested.set()
+        return rows[offset:offset + limit]
+
+    # 1. 스트리밍: 첫 페이지를 소비하기 전에 다음 페이지가 이미 요청됨
+    reader = PagedReader(fetch_page, page_size=10)
+    iterator = iter(reader)
+    assert next(iterator) == {'id': 0}
+    assert second_page_requested.wait(1), "다음 페이지를 미리 요청해야 합니다"
+    streamed = [{'id': 0}] + list(iterator)
+    print(f"   스트리밍: {len(streamed)}행, 요청 offset {sorted(requested)}")
+    assert streamed == rows
+    assert sorted(requested) == [0, 10, 20]
+    # 첫 페이지는 미리 읽기 풀을 거치지 않고 호출한 스레드에서 조회
+    assert first_page_threads == [threading.current_thread()]
+
+    # 2. 상한까지 모으기: 더 남은 행이 있을 때만 truncated
+    collected = PagedReader(fetch_page, page_size=10).collect(max_rows=15)
+    print(f"   collect(15): {len(collected)}행, truncated={collected.truncated}, {collected.pages}페이지")
+    assert len(collected) == 15 and collected.truncated
+    assert not PagedReader(fetch_page, page_size=10).collect(max_rows=25).truncated
+    assert len(PagedReader(fetch_page, page_size=10, prefetch=False).collect()) == 25
+
+    # 3. SupabaseConfig 목록 조회: 고정 정렬 + range로 페이지마다 새 쿼리
+    config = _fake_config([])
+    calls = []
+
+    class RangeQuery(FakeTableQuery):
+        def order(self, column, desc=False):
+            calls.append(('order', column))
+            return self
+
+        def range(self, start, end):
+            calls.append(('range', start, end))
+            return self
+
+    config.client.table = lambda name: RangeQuery([], calls)
+    config.max_rows = 100
+    result = config.get_lot_state(eqp_id='EQP01')
+    assert result == [] and not result.truncated
+    assert ('order', 'event_time') in calls and ('order', 'lot_id') in calls
+    assert ('range', 0, 999) in calls and ('eq', 'eqp_id', 'EQP01') in calls
+
+    print("\n페이지 리더 테스트 통과!\n")
+
+
+def test_alarm_context():
+    """알람 컨텍스트 묶음 조회 (SQL 함수 1회 / 함수 없으면 None) 테스트"""
+
+    print("=" * 60)
+    print("알람 컨텍스트 묶음 조회 테스트")
+    print("=" * 60 + "\n")
+
+    calls = []
+    bundle = {
+        'kpi_data': {'date': '2026-01-20', 'eqp_id': 'EQP01', 'oee_v': 70.0},
+        'lot_state': [{'lot_id': f"LOT{i}"} for i in range(4)],
+        'eqp_state': [{'eqp_state': 'RUN'}],
+        'rcp_state': [],
+        'kpi_trend': None,
+    }
+
+    class FakeRpc:
+        def __init__(self, name, params):
+            calls.append((name, params))
+            self.name = name
+
+        def execute(self):
+            if self.name == 'missing':
+                raise Exception("PGRST202: Could not find the function")
+            if self.name == 'timeout':
+                raise TimeoutError("read timed out")
+            return FakeResponse(bundle)
+
+    # 1. 함수가 있으면 한 번의 호출로 KPI + 소스 4종, 상한 + 1행이 오면 잘림 표시
+    config = _fake_config([])
+    config.client.rpc = FakeRpc
+    config._alarm_context_rpc_available = None
+    context = config.get_alarm_context('2026-01-20', 'EQP01', '2026-01-20 00:00:00',
+                                       '2026-01-21 00:00:00', '2026-01-13', '2026-01-19', max_rows=3)
+    print(f"   호출 {len(calls)}회, 잘린 소스 {context['truncated']}")
+    assert len(calls) == 1 and calls[0][1]['p_max_rows'] == 3
+    assert context['kpi_data']['oee_v'] == 70.0
+    assert len(context['lot_state']) == 3 and context['lot_state'].truncated
+    assert context['truncated'] == ['lot_state']
+    assert context['kpi_trend'] == [] and not context['eqp_state'].truncated
+
+    # 2. 일시 오류는 이번 호출만 None (함수를 이미 사용한 뒤에도 예외 대신 소스별 조회로 대체)
+    config.client.rpc = lambda name, params: FakeRpc('timeout', params)
+    assert config.get_alarm_context('2026-01-20', 'EQP01', '', '', '', '') is None
+    assert config._alarm_context_rpc_available is True
+
+    # 3. 함수가 없으면 None (이후에는 호출하지 않음)
+    config.client.rpc = lambda name, params: FakeRpc('missing', params)
+    assert config.get_alarm_context('2026-01-20', 'EQP01', '', '', '', '') is None
+    assert config.get_alarm_context('2026-01-20', 'EQP01', '', '', '', '') is None
+    assert len(calls) == 3 and config._alarm_context_rpc_available is False
+
+    print("\n알람 컨텍스트 묶음 조회 테스트 통과!\n")
+
+
+def test_daily_catalog_fallback():
+    """카탈로그 SQL 함수 오류 처리 (함수 없음만 고정) / 컬럼 스캔 정렬 테스트"""
+
+    print("=" * 60)
+    print("카탈로그 함수 대체 테스트")
+    print("=" * 60 + "\n")
+
+    calls = []
+    rows = [{'event_time': '2026-01-20 08:00:00', 'eqp_id': 'EQP01'},
+            {'event_time': '2026-01-20 09:00:00', 'eqp_id': 'EQP01'}]
+
+    class ScanQuery(FakeTableQuery):
+        def order(self, column, desc=False):
+            calls.append(('order', column))
+            return self
+
+        def range(self, start, end):
+            self.n = end - start + 1
+            return self
+
+    class FailingRpc:
+        def __init__(self, error):
+            self.error = error
+
+        def range(self, start, end):
+            return self
+
+        def execute(self):
+            raise self.error
+
+    config = _fake_config(rows)
+    config.client.table = lambda name: ScanQuery(rows, calls)
+    config._catalog_rpc_available = None
+
+    # 1. 일시 오류: 이번 호출만 컬럼 스캔, 함수 사용 가능 여부는 그대로
+    config.client.rpc = lambda name, params: FailingRpc(Exception("502 Bad Gateway"))
+    catalog = config.get_table_daily_catalog('lot_state')
+    assert catalog == [{'date': '2026-01-20', 'eqp_id': 'EQP01', 'rows': 2,
+                        'first_event_time': '2026-01-20 08:00:00',
+                        'last_event_time': '2026-01-20 09:00:00'}]
+    assert config._catalog_rpc_available is None
+    # 스캔은 고유 키까지 정렬 (event_time만으로는 페이지 사이 중복/누락)
+    assert [c for c in calls if c[0] == 'order'][:2] == [('order', 'event_time'), ('order', 'lot_id')]
+
+    # 2. 함수 없음(PGRST202): 이후 호출은 함수를 시도하지 않음
+    config.client.rpc = lambda name, params: FailingRpc(Exception("PGRST202: Could not find the function"))
+    config.get_table_daily_catalog('lot_state')
+    assert config._catalog_rpc_available is False
+    print(f"   함수 사용 가능: {config._catalog_rpc_available}")
+
+    print("\n카탈로그 함수 대체 테스트 통과!\n")
+
+
+def main():
+    """모든 테스트 실행"""
+
+    print("\nSupabase 페이지네이션 테스트 시작\n")
+
+    test_table_page()
+    test_paged_reader()
+    test_alarm_context()
+    test_daily_catalog_fallback()
+
+    print("=" * 60)
+    print("모든 테스트 완료!")
+    print("=" * 60 + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -7,6 +7,7 @@ from .workflow import (
     get_workflow_app,
     run_alarm_analysis,
     run_question_answer,
+    run_question_answer_stream,
     create_workflow
 )
 
@@ -20,5 +21,6 @@ __all__ = [
     'get_workflow_app',
     'run_alarm_analysis',
     'run_question_answer',
+    'run_question_answer_stream',
     'create_workflow',
 ]
\ No newline at end of file
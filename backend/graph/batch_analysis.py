@@ -0,0 +1,128 @@
+"""
+다중 알람 일괄 분석용 컨텍스트 사전 조회
+
+알람이 여러 건 발생한 날 알람마다 Node 2/3을 따로 실행하면 같은 테이블을
+알람 수 × 4번 조회합니다. 일괄 분석은 같은 날짜 알람의 장비를 묶어
+날짜별·소스별로 한 번씩만 조회한 뒤, 메모리에서 알람별로 나눠 Phase 1에 넘깁니다.
+
+- kpi_daily: 알람 날짜별 (추세 시작 ~ 알람 날짜) × 그 날짜의 장비 → 날짜당 1회
+- lot_state / eqp_state: 알람 날짜별 (윈도우 시작 ~ 윈도우 종료) × 그 날짜의 장비 → 날짜당 각 1회
+- rcp_state: 대상 장비 전체 → 1회
+
+날짜가 멀리 떨어진 알람을 한 범위로 합치지 않으므로 사이 기간의 행은 읽지 않습니다.
+
+알람별 범위는 Node 3의 alarm_context_window와 같으므로 단건 분석과 결과가 같습니다.
+"""
+
+import sys
+import time
+from pathlib import Path
+from typing import List, Dict, Any, Tuple
+
+# 프로젝트 루트 경로 추가
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from backend.config.logging_config import get_logger
+from backend.nodes.node_3_context_fetch import alarm_context_window
+
+logger = get_logger(__name__)
+
+
+def _event_time(row: Dict[str, Any]) -> str:
+    """event_time을 윈도우 문자열과 비교 가능한 'YYYY-MM-DD HH:MM:SS' 형식으로"""
+    return str(row.get('event_time') or '')[:19].replace('T', ' ')
+
+
+def prefetch_alarm_contexts(
+    alarms: List[Dict[str, Any]],
+    client=None,
+) -> Tuple[Dict[Tuple[str, str], Dict[str, Any]], Dict[str, Any]]:
+    """
+    알람 목록 전체의 KPI / 컨텍스트 데이터를 알람 날짜별·소스별 1회 조회로 미리 가져옵니다.
+
+    Args:
+        alarms: [{date, eqp_id}] 알람 목록
+        client: SupabaseConfig (None이면 전역 supabase_config)
+
+    Returns:
+        Tuple:
+            - {(date, eqp_id): {'kpi_data': 알람 당일 KPI 행 또는 None,
+                                'prefetched_context': {소스: 행 목록, 'truncated': [잘린 소스]}}}
+            - 조회 통계 {'queries', 'elapsed_ms', 'rows': {소스: 행 수}, 'truncated': [잘린 소스]}
+    """
+    if client is None:
+        from backend.config.supabase_config import supabase_config as client
+
+    keys = sorted({(str(a['date']), a['eqp_id']) for a in alarms})
+    if not keys:
+        return {}, {'queries': 0, 'elapsed_ms': 0.0, 'rows': {}, 'truncated': []}
+
+    # 알람 날짜마다 조회 범위가 같으므로 날짜별로 묶어 조회
+    # (날짜가 멀리 떨어진 알람을 한 범위로 합치면 사이 기간 전체 행을 읽고, 최대 행 수에서 잘림)
+    eqps_by_date: Dict[str, List[str]] = {}
+    for date, eqp_id in keys:
+        eqps_by_date.setdefault(date, []).append(eqp_id)
+    eqp_ids = sorted({eqp_id for _, eqp_id in keys})
+    started = time.perf_counter()
+
+    def by_eqp(rows):
+        grouped: Dict[str, List[Dict[str, Any]]] = {}
+        for row in rows or []:
+            grouped.setdefault(row.get('eqp_id'), []).append(row)
+        return grouped
+
+    rcp_rows = client.get_rcp_state(eqp_ids=eqp_ids)
+    rcp_by_eqp = by_eqp(rcp_rows)
+    queries = 1
+    rows_total = {'kpi_daily': 0, 'lot_state': 0, 'eqp_state': 0, 'rcp_state': len(rcp_rows or [])}
+    truncated_all = {'rcp_state'} if getattr(rcp_rows, 'truncated', False) else set()
+
+    contexts = {}
+    for date, date_eqp_ids in eqps_by_date.items():
+        start_time, end_time, trend_start, trend_end = alarm_context_window(date)
+        kpi_rows = client.get_kpi_trend(start_date=trend_start, end_date=date, eqp_ids=date_eqp_ids)
+        lot_rows = client.get_lot_state(start_time=start_time, end_time=end_time, eqp_ids=date_eqp_ids)
+        eqp_rows = client.get_eqp_state(start_time=start_time, end_time=end_time, eqp_ids=date_eqp_ids)
+        queries += 3
+        rows_total['kpi_daily'] += len(kpi_rows or [])
+        rows_total['lot_state'] += len(lot_rows or [])
+        rows_total['eqp_state'] += len(eqp_rows or [])
+
+        # 최대 행 수에서 잘린 소스 (해당 날짜 알람은 데이터가 일부 빠졌을 수 있음)
+        truncated = [name for name, rows in (('kpi_trend', kpi_rows), ('lot_state', lot_rows),
+                                             ('eqp_state', eqp_rows), ('rcp_state', rcp_rows))
+                     if getattr(rows, 'truncated', False)]
+        truncated_all.update(truncated)
+
+        kpi_by_eqp, lot_by_eqp, eqp_by_eqp = by_eqp(kpi_rows), by_eqp(lot_rows), by_eqp(eqp_rows)
+        for eqp_id in date_eqp_ids:
+            kpi_for_eqp = kpi_by_eqp.get(eqp_id, [])
+            alarm_day = [r for r in kpi_for_eqp if str(r.get('date')) == date]
+            contexts[(date, eqp_id)] = {
+                'kpi_data': alarm_day[0] if alarm_day else None,
+                'prefetched_context': {
+                    'lot_state': [r for r in lot_by_eqp.get(eqp_id, [])
+                                  if start_time <= _event_time(r) <= end_time],
+                    'eqp_state': [r for r in eqp_by_eqp.get(eqp_id, [])
+                                  if start_time <= _event_time(r) <= end_time],
+                    'rcp_state': list(rcp_by_eqp.get(eqp_id, [])),
+                    'kpi_trend': [r for r in kpi_for_eqp
+                                  if trend_start <= str(r.get('date')) <= trend_end],
+                    'truncated': truncated,
+                },
+            }
+
+    elapsed_ms = round((time.perf_counter() - started) * 1000, 1)
+    logger.info("[BatchAnalysis] 알람 %d건 컨텍스트 사전 조회 완료 (장비 %d개, 날짜 %d개, %d회 조회, %sms)",
+                len(keys), len(eqp_ids), len(eqps_by_date), queries, elapsed_ms)
+    if truncated_all:
+        logger.warning("[BatchAnalysis] 사전 조회가 최대 행 수에서 잘림: %s", ', '.join(sorted(truncated_all)))
+
+    stats = {
+        'queries': queries,
+        'elapsed_ms': elapsed_ms,
+        'rows': rows_total,
+        'truncated': sorted(truncated_all),
+    }
+    return contexts, stats
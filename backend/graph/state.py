@@ -58,6 +58,12 @@ class AgentState(TypedDict, total=False):
 
     context_text: Optional[str]
     """LLM에 제공할 포맷팅된 컨텍스트 텍스트"""
+
+    prefetched_context: Optional[Dict[str, Any]]
+    """일괄 분석 / Node 2 묶음 조회(alarm_context 함수)로 미리 받은 Node 3 소스별 데이터"""
+
+    context_truncated: Optional[List[str]]
+    """최대 행 수(SUPABASE_MAX_ROWS)에서 잘려 일부만 조회된 컨텍스트 소스 이름"""
     
     # ========== RAG 관련 ==========
     report_exists: Optional[bool]
@@ -0,0 +1,171 @@
+"""
+알람 일괄 분석 테스트
+(가짜 DB 클라이언트와 가짜 Phase 1 함수로 소스별 1회 조회, 알람별 분할, 작업 이벤트만 검증합니다)
+"""
+
+import sys
+import time
+from pathlib import Path
+
+# 프로젝트 루트를 경로에 추가
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from backend.graph.batch_analysis import prefetch_alarm_contexts
+from backend.api.batch_jobs import BatchAnalysisManager
+
+
+class FakeSupabase:
+    """조회 호출을 기록하고 eqp_ids / 범위 조건을 흉내내는 가짜 클라이언트"""
+
+    def __init__(self):
+        self.calls = []
+        self.kpi = [
+            {'date': f'2026-01-{d:02d}', 'eqp_id': eqp, 'oee_v': 70 + d}
+            for d in range(10, 21) for eqp in ('EQP01', 'EQP02', 'EQP03')
+        ]
+        self.lot = [
+            {'event_time': '2026-01-19T23:00:00+00:00', 'eqp_id': 'EQP01', 'lot_id': 'L0'},
+            {'event_time': '2026-01-20T23:30:00+00:00', 'eqp_id': 'EQP01', 'lot_id': 'L1'},
+            {'event_time': '2026-01-20T08:00:00', 'eqp_id': 'EQP01', 'lot_id': 'L2'},
+            {'event_time': '2026-01-20T08:00:00', 'eqp_id': 'EQP02', 'lot_id': 'L3'},
+            {'event_time': '2026-01-18T08:00:00', 'eqp_id': 'EQP02', 'lot_id': 'L4'},
+        ]
+
+    def get_kpi_trend(self, start_date, end_date, eqp_id=None, eqp_ids=None):
+        self.calls.append(('kpi_trend', start_date, end_date, tuple(eqp_ids)))
+        return [r for r in self.kpi
+                if start_date <= r['date'] <= end_date and r['eqp_id'] in eqp_ids]
+
+    def get_lot_state(self, start_time=None, end_time=None, eqp_id=None, eqp_ids=None):
+        self.calls.append(('lot_state', start_time, end_time, tuple(eqp_ids)))
+        return [r for r in self.lot if r['eqp_id'] in eqp_ids]
+
+    def get_eqp_state(self, start_time=None, end_time=None, eqp_id=None, eqp_ids=None):
+        self.calls.append(('eqp_state', start_time, end_time, tuple(eqp_ids)))
+        return []
+
+    def get_rcp_state(self, eqp_id=None, eqp_ids=None):
+        self.calls.append(('rcp_state', tuple(eqp_ids)))
+        return [{'eqp_id': eqp, 'rcp_id': f'R-{eqp}'} for eqp in eqp_ids]
+
+
+def test_prefetch_alarm_contexts():
+    """알람 여러 건 → 날짜별·소스별 1회 조회, 알람별 범위로 분할"""
+
+    print("\n" + "=" * 60)
+    print("일괄 분석 사전 조회 테스트")
+    print("=" * 60 + "\n")
+
+    client = FakeSupabase()
+    alarms = [
+        {'date': '2026-01-20', 'eqp_id': 'EQP01'},
+        {'date': '2026-01-18', 'eqp_id': 'EQP02'},
+        {'date': '2026-01-20', 'eqp_id': 'EQP01'},  # 중복
+    ]
+    contexts, stats = prefetch_alarm_contexts(alarms, client=client)
+
+    # 1. 레시피는 1회, 나머지는 알람 날짜별 1회 (그 날짜의 장비만 IN 조건, 사이 기간은 읽지 않음)
+    assert [c[0] for c in client.calls] == ['rcp_state'] + ['kpi_trend', 'lot_state', 'eqp_state'] * 2
+    assert client.calls[0] == ('rcp_state', ('EQP01', 'EQP02'))
+    assert client.calls[1] == ('kpi_trend', '2026-01-11', '2026-01-18', ('EQP02',))
+    assert client.calls[2][1:] == ('2026-01-18 00:00:00', '2026-01-19 00:00:00', ('EQP02',))
+    assert client.calls[4] == ('kpi_trend', '2026-01-13', '2026-01-20', ('EQP01',))
+    assert client.calls[5][1:3] == ('2026-01-20 00:00:00', '2026-01-21 00:00:00')
+    assert stats['queries'] == 7 and set(contexts) == {('2026-01-20', 'EQP01'), ('2026-01-18', 'EQP02')}
+
+    # 2. 알람 당일 KPI, 직전 7일 추세 (당일 제외)
+    eqp01 = contexts[('2026-01-20', 'EQP01')]
+    assert eqp01['kpi_data']['date'] == '2026-01-20' and eqp01['kpi_data']['eqp_id'] == 'EQP01'
+    trend_dates = [r['date'] for r in eqp01['prefetched_context']['kpi_trend']]
+    assert trend_dates == [f'2026-01-{d}' for d in range(13, 20)]
+
+    # 3. 상태 이력은 알람별 ±12시간 윈도우 (ISO / 타임존 표기 포함)
+    assert [r['lot_id'] for r in eqp01['prefetched_context']['lot_state']] == ['L1', 'L2']
+    eqp02 = contexts[('2026-01-18', 'EQP02')]
+    assert [r['lot_id'] for r in eqp02['prefetched_context']['lot_state']] == ['L4']
+    assert eqp02['prefetched_context']['rcp_state'] == [{'eqp_id': 'EQP02', 'rcp_id': 'R-EQP02'}]
+    print(f"   통계: {stats}")
+
+    print("\n일괄 분석 사전 조회 테스트 통과!\n")
+
+
+def test_batch_manager_events():
+    """작업 이벤트: prefetch → 알람별 result/error → done, 동시 실행 제한"""
+
+    print("=" * 60)
+    print("일괄 분석 작업 테스트")
+    print("=" * 60 + "\n")
+
+    running, peak, prepared = [0], [0], []
+
+    def fake_prefetch(alarms):
+        return ({(a['date'], a['eqp_id']): {'kpi_data': {'eqp_id': a['eqp_id']}} for a in alarms},
+                {'queries': 4, 'elapsed_ms': 1.0, 'rows': {}})
+
+    def fake_prepare(date, eqp_id, kpi=None, prefetched=None):
+        running[0] += 1
+        peak[0] = max(peak[0], running[0])
+        prepared.append((eqp_id, prefetched))
+        time.sleep(0.05)
+        running[0] -= 1
+        if eqp_id == 'BAD':
+            return {'error': 'KPI 데이터 없음'}
+        return {'alarm_kpi': 'OEE', 'root_causes': [{'cause': eqp_id}], 'metadata': {'llm_calls': 1}}
+
+    manager = BatchAnalysisManager(
+        max_parallel=2, max_items=10, prefetch_fn=fake_prefetch,
+        prepare_fn=fake_prepare, session_fn=lambda state: f"s-{state['root_causes'][0]['cause']}",
+    )
+    try:
+        job = manager.submit([
+            {'alarm_date': '2026-01-20', 'alarm_eqp_id': eqp}
+            for eqp in ('EQP01', 'EQP02', 'EQP03', 'BAD', 'EQP01')
+        ])
+        events, cursor, finished = [], 0, False
+        deadline = time.time() + 5
+        while not finished and time.time() < deadline:
+            new, finished = job.wait_events(cursor, timeout=1)
+            events += new
+            cursor += len(new)
+
+        types = [e['type'] for e in events]
+        assert types[0] == 'prefetch' and types[-1] == 'done'
+        assert types.count('result') == 3 and types.count('error') == 1
+        assert peak[0] <= 2 and len(prepared) == 4
+        assert all(p == {'kpi_data': {'eqp_id': eqp}} for eqp, p in prepared)
+
+        result = next(e for e in events if e.get('alarm_eqp_id') == 'EQP02')
+        assert result['session_id'] == 's-EQP02' and result['llm_calls'] == 1
+
+        snapshot = job.snapshot(since=cursor)
+        assert snapshot['status'] == 'done' and snapshot['events'] == []
+        assert (snapshot['completed'], snapshot['failed']) == (3, 1)
+
+        try:
+            manager.submit([])
+            assert False, "빈 목록은 ValueError"
+        except ValueError:
+            pass
+        print(f"   통계: {manager.get_stats()}")
+    finally:
+        manager.shutdown()
+
+    print("\n일괄 분석 작업 테스트 통과!\n")
+
+
+def main():
+    """모든 테스트 실행"""
+
+    print("\n알람 일괄 분석 테스트 시작\n")
+
+    test_prefetch_alarm_contexts()
+    test_batch_manager_events()
+
+    print("=" * 60)
+    print("모든 테스트 완료!")
+    print("=" * 60 + "\n")
+
+
+if __name__ == "__main__":
+    main()
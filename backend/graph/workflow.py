@@ -6,10 +6,13 @@ LangGraph 워크플로우 정의
 2. 질문 답변: 1 → 4 → 5
 """
 
+import os
 import sys
 import uuid
+import hashlib
+import threading
 from pathlib import Path
-from typing import Literal
+from typing import Literal, Optional, Iterator, Dict, Any, List, Tuple
 
 # 프로젝트 루트 경로 추가
 project_root = Path(__file__).parent.parent.parent
@@ -17,7 +20,12 @@ sys.path.insert(0, str(project_root))
 
 from langgraph.graph import StateGraph, END
 from backend.graph.state import AgentState
-from backend.utils.cache import analysis_cache, qa_cache, SimpleCache
+from backend.config.aws_config import aws_config
+from backend.config.logging_config import get_logger, log_context
+from backend.utils.cache import analysis_cache, qa_cache, phase1_cache
+from backend.utils.semantic_cache import semantic_qa_cache
+from backend.utils.data_utils import get_latest_alarm
+from backend.utils.tracing import Span, traced_node, attach_span
 
 # 각 노드 함수 개별 import
 from backend.nodes.node_1_input_router import node_1_input_router
@@ -26,14 +34,27 @@ from backend.nodes.node_3_context_fetch import node_3_context_fetch
 from backend.nodes.node_4_report_lookup import node_4_report_lookup
 from backend.nodes.node_4b_classifier import node_4b_classifier
 from backend.nodes.node_4c_db_query import node_4c_db_query
-from backend.nodes.node_5_rag_answer import node_5_rag_answer
+from backend.nodes.node_5_rag_answer import node_5_rag_answer, prepare_rag_answer
 from backend.nodes.node_6_root_cause_analysis import node_6_root_cause_analysis
 from backend.nodes.node_7_human_choice import node_7_human_choice
 from backend.nodes.node_8_report_writer import node_8_report_writer
 from backend.nodes.node_9_persist_report import node_9_persist_report
 
-# Phase 1 중간 상태 캐시 (30분 유효)
-phase1_cache = SimpleCache(ttl_seconds=1800)
+logger = get_logger(__name__)
+
+# 모든 실행 경로(LangGraph / Phase 1·2 수동 실행 / 스트리밍)에서 같은 추적 래퍼 사용
+# → 노드별 실행 시간, Bedrock 호출/토큰이 metadata['trace']와 /metrics에 기록됨
+node_1_input_router = traced_node('node_1', node_1_input_router)
+node_2_load_alarm_kpi = traced_node('node_2', node_2_load_alarm_kpi)
+node_3_context_fetch = traced_node('node_3', node_3_context_fetch)
+node_4_report_lookup = traced_node('node_4', node_4_report_lookup)
+node_4b_classifier = traced_node('node_4b', node_4b_classifier)
+node_4c_db_query = traced_node('node_4c', node_4c_db_query)
+node_5_rag_answer = traced_node('node_5', node_5_rag_answer)
+node_6_root_cause_analysis = traced_node('node_6', node_6_root_cause_analysis)
+node_7_human_choice = traced_node('node_7', node_7_human_choice)
+node_8_report_writer = traced_node('node_8', node_8_report_writer)
+node_9_persist_report = traced_node('node_9', node_9_persist_report)
 
 
 def route_after_input(state: AgentState) -> Literal["alarm_path", "question_path"]:
@@ -54,6 +75,24 @@ def route_after_input(state: AgentState) -> Literal["alarm_path", "question_path
         return "question_path"
 
 
+def route_question(state: AgentState) -> Literal["db", "rag", "live_only"]:
+    """
+    Node 4B 이후 질문 경로 결정
+
+    Args:
+        state: 현재 State
+
+    Returns:
+        "db" (DB 조회 → RAG → LLM), "rag" (RAG → LLM), "live_only" (바로 LLM)
+    """
+    route = state.get("qa_route", "rag")
+    if route == "live_only":
+        return "live_only"
+    if state.get("needs_db"):
+        return "db"
+    return "rag"
+
+
 def create_workflow() -> StateGraph:
     """
     LangGraph 워크플로우를 생성합니다.
@@ -108,14 +147,6 @@ def create_workflow() -> StateGraph:
     workflow.add_edge("node_9", END)
 
     # 질문 경로: 4b → 3-way 분기 → 5 → END
-    def route_question(s: AgentState) -> str:
-        route = s.get("qa_route", "rag")
-        if route == "live_only":
-            return "live_only"
-        if s.get("needs_db"):
-            return "db"
-        return "rag"
-
     workflow.add_conditional_edges(
         "node_4b",
         route_question,
@@ -162,10 +193,8 @@ def run_alarm_analysis(alarm_date: str = None, alarm_eqp_id: str = None, alarm_k
         AgentState: 최종 State
     """
     
-    print("\n" + "=" * 60)
-    print("알람 분석 워크플로우 시작")
-    print("=" * 60 + "\n")
-    
+    logger.info("알람 분석 워크플로우 시작 (%s %s %s)", alarm_date, alarm_eqp_id, alarm_kpi)
+
     # 1. 캐시 키 생성
     if alarm_date and alarm_eqp_id and alarm_kpi:
         cache_key = analysis_cache.generate_key('alarm', alarm_date, alarm_eqp_id, alarm_kpi)
@@ -177,8 +206,7 @@ def run_alarm_analysis(alarm_date: str = None, alarm_eqp_id: str = None, alarm_k
     if cache_key:
         cached_result = analysis_cache.get(cache_key)
         if cached_result:
-            print("캐시된 분석 결과 사용 (LLM 호출 생략)")
-            print("=" * 60 + "\n")
+            logger.info("캐시된 분석 결과 사용 (LLM 호출 생략)")
             return cached_result
     
     # 3. 초기 State
@@ -201,10 +229,8 @@ def run_alarm_analysis(alarm_date: str = None, alarm_eqp_id: str = None, alarm_k
     if cache_key and 'error' not in final_state and final_state.get('rag_saved'):
         analysis_cache.set(cache_key, final_state)
     
-    print("\n" + "=" * 60)
-    print("알람 분석 워크플로우 완료")
-    print("=" * 60 + "\n")
-    
+    logger.info("알람 분석 워크플로우 완료")
+
     return final_state
 
 
@@ -222,25 +248,25 @@ def run_question_answer(question: str, live_context: str = "") -> AgentState:
         AgentState: 최종 State
     """
 
-    print("\n" + "=" * 60)
-    print("질문 답변 워크플로우 시작")
-    print("=" * 60 + "\n")
+    logger.info("질문 답변 워크플로우 시작")
 
     # 1. 캐시 키 생성 (live_context가 있으면 캐싱 안 함)
-    import hashlib
-    cache_key = None
-    if not live_context:
-        question_hash = hashlib.md5(question.lower().strip().encode()).hexdigest()
-        cache_key = qa_cache.generate_key('question', question_hash)
+    cache_key = _question_cache_key(question, live_context)
 
     # 2. 캐시 확인
     if cache_key:
         cached_result = qa_cache.get(cache_key)
         if cached_result:
-            print("캐시된 답변 사용 (LLM 호출 생략)")
-            print("=" * 60 + "\n")
+            logger.info("캐시된 답변 사용 (LLM 호출 생략)")
             return cached_result
 
+    # 2-1. 의미 캐시 확인 (표현만 다른 같은 질문)
+    embedding, cached_result = _semantic_lookup(question, cache_key)
+    if cached_result:
+        qa_cache.set(cache_key, cached_result)
+        logger.info("유사 질문의 답변 사용 (검색/LLM 호출 생략)")
+        return cached_result
+
     # 3. 초기 State
     initial_state = {
         'input_type': 'question',
@@ -256,56 +282,299 @@ def run_question_answer(question: str, live_context: str = "") -> AgentState:
     # 5. 결과 캐싱 (에러가 없고 live_context가 없는 경우만)
     if cache_key and 'error' not in final_state and final_state.get('final_answer'):
         qa_cache.set(cache_key, final_state)
+        if embedding is not None:
+            semantic_qa_cache.add(question, embedding, final_state)
 
-    print("\n" + "=" * 60)
-    print("질문 답변 워크플로우 완료")
-    print("=" * 60 + "\n")
+    logger.info("질문 답변 워크플로우 완료")
 
     return final_state
 
 
-def run_alarm_analysis_phase1(alarm_date: str = None, alarm_eqp_id: str = None, alarm_kpi: str = None) -> dict:
+def _question_cache_key(question: str, live_context: str = "") -> Optional[str]:
+    """질문 캐시 키 (live_context가 있으면 None = 캐싱 안 함)"""
+    if live_context:
+        return None
+    question_hash = hashlib.md5(question.lower().strip().encode()).hexdigest()
+    return qa_cache.generate_key('question', question_hash)
+
+
+def _semantic_lookup(question: str, cache_key: Optional[str]) -> Tuple[Optional[List[float]], Optional[dict]]:
     """
-    알람 분석 Phase 1: Nodes 1→2→3→6 실행.
-    근본 원인 후보를 반환하고 중간 상태를 세션으로 캐싱합니다.
+    의미 캐시 조회
+
+    Returns:
+        (질문 임베딩, 캐시된 State) — 캐싱 대상이 아니거나 임베딩 실패 시 (None, None)
+    """
+    if not cache_key or semantic_qa_cache is None:
+        return None, None
+    try:
+        embedding = aws_config.get_embeddings(question)
+    except Exception as e:
+        logger.warning("질문 임베딩 실패 (의미 캐시 생략): %s", e)
+        return None, None
+    return embedding, semantic_qa_cache.lookup(question, embedding)
+
+
+def run_question_answer_stream(question: str, live_context: str = "") -> Iterator[Dict[str, Any]]:
+    """
+    질문 답변 워크플로우를 스트리밍 방식으로 실행합니다.
+
+    Nodes 1 → 4B → (4C) → (4)를 실행한 뒤, Node 5의 Claude 호출을
+    Bedrock 스트리밍 API로 수행하여 생성되는 텍스트를 바로 전달합니다.
+    스트림이 끝나면 전체 답변을 qa_cache에 저장합니다.
 
     Args:
-        alarm_date: 알람 날짜 (None이면 최신 알람)
-        alarm_eqp_id: 장비 ID
-        alarm_kpi: KPI
+        question: 사용자 질문
+        live_context: 프론트엔드 탭 현황 데이터
 
-    Returns:
-        dict: root_causes, session_id 포함 상태
+    Yields:
+        dict: 스트림 이벤트
+            - {'type': 'token', 'text': 텍스트 조각}
+            - {'type': 'done', 'final_answer', 'similar_reports', 'cached'}
+            - {'type': 'error', 'error': 에러 메시지}
     """
 
-    print("\n" + "=" * 60)
-    print("알람 분석 Phase 1 시작 (Nodes 1→2→3→6)")
-    print("=" * 60 + "\n")
+    logger.info("질문 답변 워크플로우 시작 (스트리밍)")
 
-    # 초기 상태
-    state: dict = {'input_type': 'alarm', 'metadata': {'llm_calls': 0}}
-    if alarm_date and alarm_eqp_id and alarm_kpi:
-        state['alarm_date'] = alarm_date
-        state['alarm_eqp_id'] = alarm_eqp_id
+    # 1. 캐시 확인 (정확히 같은 질문 → 유사 질문 순서, 히트 시 전체 답변을 한 번에 전달)
+    cache_key = _question_cache_key(question, live_context)
+    cached_result = qa_cache.get(cache_key) if cache_key else None
+    embedding = None
+    if not cached_result:
+        embedding, cached_result = _semantic_lookup(question, cache_key)
+        if cached_result:
+            qa_cache.set(cache_key, cached_result)
+    if cached_result:
+        logger.info("캐시된 답변 사용 (LLM 호출 생략)")
+        yield {'type': 'token', 'text': cached_result['final_answer']}
+        yield {
+            'type': 'done',
+            'final_answer': cached_result['final_answer'],
+            'similar_reports': cached_result.get('similar_reports', []),
+            'cached': True,
+        }
+        return
+
+    # 2. Node 1 → 4B → (4C → 4 | 4) 순차 실행
+    state: dict = {
+        'input_type': 'question',
+        'input_data': question,
+        'live_context': live_context,
+        'metadata': {'llm_calls': 0}
+    }
+    pre_nodes = [node_1_input_router, node_4b_classifier]
+    for node_fn in pre_nodes:
+        state.update(node_fn(state))
+        if 'error' in state:
+            yield {'type': 'error', 'error': state['error']}
+            return
+
+    route = route_question(state)
+    route_nodes = {
+        'db': [node_4c_db_query, node_4_report_lookup],
+        'rag': [node_4_report_lookup],
+        'live_only': [],
+    }[route]
+    for node_fn in route_nodes:
+        state.update(node_fn(state))
+        if 'error' in state:
+            yield {'type': 'error', 'error': state['error']}
+            return
+
+    # 3. Node 5: 프롬프트 생성 후 스트리밍 호출
+    #    (제너레이터는 요청 스레드 풀의 여러 스레드에서 재개되므로 span을 명시적으로 전달)
+    span = Span('node_5_stream')
+    with span.activate():
+        prepared = prepare_rag_answer(state)
+    if 'error' in prepared:
+        yield {'type': 'error', 'error': prepared['error']}
+        return
+
+    chunks = []
+    try:
+        for text in aws_config.invoke_claude_stream(prepared['prompt'], trace_span=span):
+            chunks.append(text)
+            yield {'type': 'token', 'text': text}
+    except Exception as e:
+        error_msg = f"LLM 호출 실패: {str(e)}"
+        logger.error("[Node 5] %s", error_msg)
+        span.finish('error', error_msg)
+        yield {'type': 'error', 'error': error_msg}
+        return
+
+    answer = ''.join(chunks)
+    state.update({
+        'final_answer': answer,
+        'similar_reports': prepared['similar_reports'],
+        'metadata': attach_span(state.get('metadata'), span.finish('ok')),
+    })
+
+    # 4. 전체 답변 캐싱
+    if cache_key and answer:
+        qa_cache.set(cache_key, state)
+        if embedding is not None:
+            semantic_qa_cache.add(question, embedding, state)
+
+    logger.info("질문 답변 워크플로우 완료 (스트리밍, %d자)", len(answer))
+
+    yield {
+        'type': 'done',
+        'final_answer': answer,
+        'similar_reports': prepared['similar_reports'],
+        'cached': False,
+    }
+
+
+# Phase 1 결과를 알람 단위로 재사용 (알람 워처가 미리 계산, 클릭 시 즉시 반환)
+# 같은 알람을 동시에 계산하지 않도록 진행 중인 계산은 키별 Event로 공유합니다.
+PHASE1_WAIT_TIMEOUT = float(os.getenv('PHASE1_WAIT_TIMEOUT', '180'))
+_phase1_inflight: Dict[str, threading.Event] = {}
+_phase1_inflight_lock = threading.Lock()
+
+
+def phase1_result_key(alarm_date: str, alarm_eqp_id: str, alarm_kpi: str = None) -> str:
+    """알람별 Phase 1 결과 캐시 키 (alarm_kpi 미지정 시 Node 2 자동 판단 결과)"""
+    return analysis_cache.generate_key('phase1', alarm_date, alarm_eqp_id, alarm_kpi or 'auto')
+
+
+def is_phase1_pending(key: str) -> bool:
+    """해당 키의 Phase 1 결과가 이미 있거나 계산 중인지 여부"""
+    with _phase1_inflight_lock:
+        if key in _phase1_inflight:
+            return True
+    return analysis_cache.get(key) is not None
+
+
+def _reuse_phase1(cached: dict) -> dict:
+    """캐시된 Phase 1 상태 복사 (Phase 2 노드가 metadata를 수정해도 캐시 원본 유지)"""
+    state = dict(cached, precomputed=True)
+    state['metadata'] = dict(cached.get('metadata') or {})
+    return state
+
+
+def _execute_phase1_nodes(alarm_date: str, alarm_eqp_id: str, alarm_kpi: str = None,
+                          prefetched: dict = None) -> dict:
+    """
+    Nodes 1→2→3→6 실행 (세션 발급 없음)
+
+    prefetched: 일괄 분석에서 미리 조회한 {'kpi_data', 'prefetched_context'}
+                (있으면 Node 2/3이 DB를 다시 조회하지 않음)
+    """
+    state: dict = {
+        'input_type': 'alarm',
+        'alarm_date': alarm_date,
+        'alarm_eqp_id': alarm_eqp_id,
+        'metadata': {'llm_calls': 0},
+    }
+    if alarm_kpi:
         state['alarm_kpi'] = alarm_kpi
+    if prefetched:
+        if prefetched.get('kpi_data'):
+            state['kpi_data'] = prefetched['kpi_data']
+        state['prefetched_context'] = prefetched.get('prefetched_context')
 
-    # 노드 순차 실행
     for node_fn in [node_1_input_router, node_2_load_alarm_kpi,
                     node_3_context_fetch, node_6_root_cause_analysis]:
         result = node_fn(state)
         state.update(result)
         if 'error' in state:
-            print(f"[ERROR] Phase 1 실패: {state['error']}")
-            return state
+            logger.error("Phase 1 실패 (%s %s): %s", alarm_date, alarm_eqp_id, state['error'])
+            break
+    # 원본 조회 결과는 Node 3이 정리한 컨텍스트로 대체되었으므로 캐시/세션에 싣지 않음
+    state.pop('prefetched_context', None)
+    return state
+
+
+def prepare_alarm_phase1(alarm_date: str, alarm_eqp_id: str, alarm_kpi: str = None,
+                         prefetched: dict = None) -> dict:
+    """
+    알람 하나의 Phase 1 결과를 준비합니다. (캐시 → 진행 중인 계산 대기 → 직접 계산)
 
-    # 세션 ID 발급 및 중간 상태 캐싱
+    성공한 결과는 analysis_cache에 알람 키로 저장되어 이후 클릭/워처가 재사용합니다.
+
+    Args:
+        alarm_date: 알람 날짜
+        alarm_eqp_id: 장비 ID
+        alarm_kpi: KPI (None이면 Node 2에서 판단)
+        prefetched: 일괄 분석에서 미리 조회한 KPI/컨텍스트 (선택)
+
+    Returns:
+        dict: Phase 1 상태 (session_id 없음, 캐시 재사용 시 'precomputed': True)
+    """
+    key = phase1_result_key(alarm_date, alarm_eqp_id, alarm_kpi)
+
+    cached = analysis_cache.get(key)
+    if cached:
+        logger.info("Phase 1 사전 분석 결과 사용: %s", key)
+        return _reuse_phase1(cached)
+
+    with _phase1_inflight_lock:
+        event = _phase1_inflight.get(key)
+        owner = event is None
+        if owner:
+            event = _phase1_inflight[key] = threading.Event()
+
+    if not owner:
+        # 다른 요청(알람 워처 등)이 같은 알람을 계산 중 → 끝날 때까지 대기 후 재사용
+        logger.info("Phase 1 계산 진행 중, 대기: %s", key)
+        event.wait(PHASE1_WAIT_TIMEOUT)
+        cached = analysis_cache.get(key)
+        if cached:
+            return _reuse_phase1(cached)
+        # 먼저 시작한 계산이 실패/시간 초과 → 직접 계산
+        return _execute_phase1_nodes(alarm_date, alarm_eqp_id, alarm_kpi, prefetched)
+
+    try:
+        state = _execute_phase1_nodes(alarm_date, alarm_eqp_id, alarm_kpi, prefetched)
+        if 'error' not in state and state.get('root_causes'):
+            analysis_cache.set(key, dict(state, metadata=dict(state.get('metadata') or {})))
+        return state
+    finally:
+        with _phase1_inflight_lock:
+            _phase1_inflight.pop(key, None)
+        event.set()
+
+
+def issue_phase1_session(state: dict) -> str:
+    """Phase 1 상태를 세션으로 캐싱하고 state에 session_id를 기록합니다. (Phase 2 입력)"""
     session_id = str(uuid.uuid4())
     phase1_cache.set(session_id, dict(state))
     state['session_id'] = session_id
+    return session_id
 
-    print("\n" + "=" * 60)
-    print(f"알람 분석 Phase 1 완료 (session_id: {session_id})")
-    print("=" * 60 + "\n")
+
+def run_alarm_analysis_phase1(alarm_date: str = None, alarm_eqp_id: str = None, alarm_kpi: str = None) -> dict:
+    """
+    알람 분석 Phase 1: Nodes 1→2→3→6 실행.
+    근본 원인 후보를 반환하고 중간 상태를 세션으로 캐싱합니다.
+    알람 워처가 미리 분석해 둔 알람이면 노드 실행 없이 바로 반환합니다.
+
+    Args:
+        alarm_date: 알람 날짜 (None이면 최신 알람)
+        alarm_eqp_id: 장비 ID
+        alarm_kpi: KPI
+
+    Returns:
+        dict: root_causes, session_id 포함 상태
+    """
+
+    # 대상 알람 확정 (미지정 시 최신 알람 — 사전 분석 결과와 같은 키를 쓰기 위해 먼저 조회)
+    if not (alarm_date and alarm_eqp_id):
+        latest = get_latest_alarm()
+        if not latest:
+            return {'error': 'No alarm found'}
+        alarm_date, alarm_eqp_id, alarm_kpi = latest['date'], latest['eqp_id'], None
+
+    logger.info("알람 분석 Phase 1 시작 (Nodes 1→2→3→6): %s %s", alarm_date, alarm_eqp_id)
+    state = prepare_alarm_phase1(alarm_date, alarm_eqp_id, alarm_kpi)
+    if 'error' in state:
+        return state
+
+    # 세션 ID 발급 및 중간 상태 캐싱 (사전 분석 결과도 요청마다 새 세션)
+    session_id = issue_phase1_session(state)
+
+    with log_context(session_id=session_id):
+        logger.info("알람 분석 Phase 1 완료%s", ' (사전 분석)' if state.get('precomputed') else '')
 
     return state
 
@@ -322,31 +591,27 @@ def run_alarm_analysis_phase2(session_id: str, selected_index: int) -> dict:
         dict: selected_cause, final_report, report_id 등 포함 상태
     """
 
-    print("\n" + "=" * 60)
-    print(f"알람 분석 Phase 2 시작 (session_id: {session_id}, 선택: {selected_index}번)")
-    print("=" * 60 + "\n")
-
     # 캐시된 Phase 1 상태 복원
     cached_state = phase1_cache.get(session_id)
     if not cached_state:
+        logger.warning("Phase 2 세션 없음: %s", session_id)
         return {'error': '세션을 찾을 수 없습니다. Phase 1을 다시 실행해주세요.'}
 
     state = dict(cached_state)
     state['selected_cause_index'] = selected_index
 
-    # 노드 순차 실행
-    for node_fn in [node_7_human_choice, node_8_report_writer, node_9_persist_report]:
-        result = node_fn(state)
-        state.update(result)
-        if 'error' in state:
-            print(f"[ERROR] Phase 2 실패: {state['error']}")
-            return state
+    # 노드 순차 실행 (Phase 1과 같은 session_id로 로그를 묶음)
+    with log_context(session_id=session_id):
+        logger.info("알람 분석 Phase 2 시작 (선택: %s번)", selected_index)
+        for node_fn in [node_7_human_choice, node_8_report_writer, node_9_persist_report]:
+            result = node_fn(state)
+            state.update(result)
+            if 'error' in state:
+                logger.error("Phase 2 실패: %s", state['error'])
+                return state
+        logger.info("알람 분석 Phase 2 완료")
 
     # 사용 완료 후 세션 캐시 삭제
     phase1_cache.delete(session_id)
 
-    print("\n" + "=" * 60)
-    print("알람 분석 Phase 2 완료")
-    print("=" * 60 + "\n")
-
     return state
\ No newline at end of file
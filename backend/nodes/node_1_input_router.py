@@ -13,8 +13,11 @@ from pathlib import Path
 project_root = Path(__file__).parent.parent.parent
 sys.path.insert(0, str(project_root))
 
+from backend.config.logging_config import get_logger
 from backend.utils.data_utils import get_latest_alarm
 
+logger = get_logger(__name__)
+
 def node_1_input_router(state: dict) -> dict:
     """
     입력 타입에 따라 초기 설정을 수행합니다.
@@ -28,46 +31,45 @@ def node_1_input_router(state: dict) -> dict:
         dict: 업데이트할 State
     
     알람 경로:
-        - 최신 알람 정보를 자동으로 로드
+        - alarm_date / alarm_eqp_id가 이미 있으면 그대로 사용
+        - 없으면 최신 알람 정보를 자동으로 로드
         - alarm_date, alarm_eqp_id, alarm_kpi 설정
     
     질문 경로:
         - question_text 설정
     """
     
-    print("\n" + "=" * 60)
-    print("[Node 1] Input Router 실행")
-    print("=" * 60)
-    
+    logger.debug("[Node 1] Input Router 실행")
+
     input_type = state.get('input_type')
     
     # 타입 검증
     if input_type not in ['alarm', 'question']:
-        print(f"- 잘못된 입력 타입: {input_type}")
+        logger.warning("[Node 1] 잘못된 입력 타입: %s", input_type)
         return {
             'input_type': 'question',
             'error': f'Invalid input_type: {input_type}'
         }
     
-    print(f"- 입력 타입: {input_type}")
-    
     # === 알람 경로 ===
     if input_type == 'alarm':
-        print("\n알람 경로 선택")
+
+        # 특정 알람이 지정된 경우 (알람 워처 사전 분석 등) 그대로 사용
+        if state.get('alarm_date') and state.get('alarm_eqp_id'):
+            logger.info("[Node 1] 지정된 알람 사용: %s %s", state['alarm_date'], state['alarm_eqp_id'])
+            return {}
         
         # 최신 알람 정보 조회
         latest_alarm = get_latest_alarm()
         
         if not latest_alarm:
-            print("- 알람 정보를 찾을 수 없습니다")
+            logger.warning("[Node 1] 알람 정보를 찾을 수 없습니다")
             return {
                 'error': 'No alarm found'
             }
         
-        print(f"- 최신 알람 로드:")
-        print(f"   - 날짜: {latest_alarm['date']}")
-        print(f"   - 장비: {latest_alarm['eqp_id']}")
-        print(f"   - KPI: Node 2에서 판단")
+        logger.info("[Node 1] 최신 알람 로드: %s %s (KPI는 Node 2에서 판단)",
+                    latest_alarm['date'], latest_alarm['eqp_id'])
 
         # State 업데이트 (alarm_kpi는 Node 2에서 kpi_daily 데이터로 판단)
         update = {
@@ -77,16 +79,12 @@ def node_1_input_router(state: dict) -> dict:
     
     # === 질문 경로 ===
     else:  # question
-        print("\n질문 경로 선택")
-        
         input_data = state.get('input_data', '')
-        print(f"  - 질문: {input_data[:100]}...")
+        logger.info("[Node 1] 질문 경로: %.100s", input_data)
         
         # State 업데이트 - question_text 필드 설정
         update = {
             'question_text': input_data
         }
-    
-    print("=" * 60 + "\n")
-    
+
     return update
\ No newline at end of file
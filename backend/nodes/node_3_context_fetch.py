@@ -2,28 +2,69 @@
 Node 3: Context Fetch
 알람 분석에 필요한 모든 컨텍스트 데이터를 조회합니다.
 
-조회 데이터:
+조회 데이터 (병렬 조회):
 1. LOT_STATE: 로트 상태 이력
 2. EQP_STATE: 장비 상태 이력 (다운타임)
 3. RCP_STATE: 레시피 정보
+4. KPI_DAILY: 직전 7일 KPI 추세
 
 출력:
 - lot_data: 로트 상태 데이터 리스트
 - eqp_data: 장비 상태 데이터 리스트
 - rcp_data: 레시피 정보 리스트
-- context_text: LLM에 제공할 포맷팅된 텍스트
+- context_text: LLM에 제공할 포맷팅된 텍스트 (이벤트 요약, 토큰 예산 적용)
+- metadata['context_fetch']: 소스별 조회 상태/소요 시간
+- metadata['context_tokens']: 컨텍스트 추정 토큰 수 / 예산 / 제외된 섹션
+- context_truncated: 최대 행 수에서 잘려 일부만 조회된 소스 (없으면 빈 리스트)
 """
 
+import os
 import sys
+import time
+import logging
+import contextvars
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FuturesTimeoutError
 from pathlib import Path
+from typing import Any, Callable, Dict, List, Tuple
 
 # 프로젝트 루트 경로 추가
 project_root = Path(__file__).parent.parent.parent
 sys.path.insert(0, str(project_root))
 
+from backend.config.logging_config import get_logger
 from backend.config.supabase_config import supabase_config
 from backend.utils.date_utils import get_time_window, get_date_range
-from backend.utils.data_utils import format_context_data
+from backend.utils.data_utils import build_alarm_context
+
+logger = get_logger(__name__)
+
+# 소스별 조회 타임아웃 (초)
+FETCH_TIMEOUT_SECONDS = float(os.getenv('CONTEXT_FETCH_TIMEOUT', '10'))
+
+# 컨텍스트 조회 전용 스레드 풀 (요청마다 생성하지 않고 재사용)
+_executor = ThreadPoolExecutor(max_workers=8, thread_name_prefix='context_fetch')
+
+# 컨텍스트 소스 이름 (state['prefetched_context']의 키)
+CONTEXT_SOURCES = ('lot_state', 'eqp_state', 'rcp_state', 'kpi_trend')
+
+
+def alarm_context_window(alarm_date: str) -> Tuple[str, str, str, str]:
+    """
+    알람 날짜의 컨텍스트 조회 범위
+
+    Returns:
+        Tuple: (상태 이력 시작, 상태 이력 종료, KPI 추세 시작, KPI 추세 종료)
+            - 상태 이력: 알람 날짜 정오 기준 전후 12시간
+            - KPI 추세: 직전 7일 (알람 당일은 kpi_data에 있으므로 전날까지)
+    """
+    start_time, end_time = get_time_window(
+        center_time=f"{alarm_date} 12:00:00",
+        hours_before=12,
+        hours_after=12
+    )
+    trend_start, _ = get_date_range(alarm_date, days_before=7, days_after=0)
+    trend_end_excl = get_date_range(alarm_date, days_before=1, days_after=0)[0]
+    return start_time, end_time, trend_start, trend_end_excl
 
 
 def node_3_context_fetch(state: dict) -> dict:
@@ -38,6 +79,7 @@ def node_3_context_fetch(state: dict) -> dict:
             - alarm_date: 알람 날짜
             - alarm_eqp_id: 장비 ID
             - kpi_data: KPI 데이터
+            - prefetched_context: 일괄 분석 / Node 2 묶음 조회에서 미리 받은 소스별 데이터 (선택)
 
     Returns:
         dict: 업데이트할 State
@@ -45,13 +87,11 @@ def node_3_context_fetch(state: dict) -> dict:
             - eqp_data: 장비 상태 데이터
             - rcp_data: 레시피 정보
             - context_text: 포맷팅된 컨텍스트
+            - context_truncated: 최대 행 수에서 잘린 소스 목록
+            - metadata: context_fetch (소스별 조회 시간) 추가
             - error: 에러 메시지 (실패 시)
     """
 
-    print("\n" + "=" * 60)
-    print("[Node 3] Context Fetch 실행")
-    print("=" * 60)
-
     # 1. State에서 필요한 정보 가져오기
     alarm_date = state.get('alarm_date')
     alarm_eqp_id = state.get('alarm_eqp_id')
@@ -59,122 +99,181 @@ def node_3_context_fetch(state: dict) -> dict:
 
     if not alarm_date or not alarm_eqp_id or not kpi_data:
         error_msg = "필수 정보 누락 (alarm_date, alarm_eqp_id, kpi_data)"
-        print(f"[ERROR] {error_msg}")
+        logger.error("[Node 3] %s", error_msg)
         return {'error': error_msg}
 
-    print(f"알람 날짜: {alarm_date}")
-    print(f"장비 ID: {alarm_eqp_id}")
-
     # 2. 시간 윈도우 계산
     # 알람 날짜의 정오(12:00)를 중심으로 전후 12시간
-    center_time = f"{alarm_date} 12:00:00"
-    start_time, end_time = get_time_window(
-        center_time=center_time,
-        hours_before=12,
-        hours_after=12
-    )
+    start_time, end_time, trend_start, trend_end_excl = alarm_context_window(alarm_date)
 
-    print(f"조회 시간 범위: {start_time} ~ {end_time}")
+    logger.debug("[Node 3] Context Fetch 실행: %s %s (조회 범위 %s ~ %s, KPI 추세 %s ~ %s)",
+                 alarm_date, alarm_eqp_id, start_time, end_time, trend_start, trend_end_excl)
 
-    # 3. LOT_STATE 조회
-    print(f"\nLOT_STATE 조회 중...")
-    try:
-        lot_data = supabase_config.get_lot_state(
-            start_time=start_time,
-            end_time=end_time,
-            eqp_id=alarm_eqp_id
-        )
-        print(f"   {len(lot_data)}개 로트 이벤트 조회")
-
-    except Exception as e:
-        print(f"   [WARN] LOT_STATE 조회 실패: {e}")
-        lot_data = []
+    # 3. 일괄 분석 / Node 2 묶음 조회로 미리 받은 컨텍스트가 있으면 재사용 (알람별 DB 조회 생략)
+    prefetched = state.get('prefetched_context')
+    if prefetched is not None:
+        logger.debug("[Node 3] 사전 조회 데이터 사용 (%s)",
+                     ', '.join(n for n in CONTEXT_SOURCES if n in prefetched))
+        results = {name: prefetched.get(name) or [] for name in CONTEXT_SOURCES}
+        prefetched_truncated = prefetched.get('truncated') or []
+        fetch_timings = {
+            name: {'status': 'prefetched', 'elapsed_ms': 0.0, 'rows': len(results[name]),
+                   'truncated': name in prefetched_truncated}
+            for name in CONTEXT_SOURCES
+        }
+    else:
+        # LOT_STATE / EQP_STATE / RCP_STATE / KPI 추세 병렬 조회
+        # 서로 의존성이 없으므로 동시에 실행 → 전체 지연 = 가장 느린 조회
+        # 실패하거나 시간 초과된 소스는 빈 리스트로 대체 (부분 결과로 계속 진행)
+        fetchers = {
+            'lot_state': lambda: supabase_config.get_lot_state(
+                start_time=start_time,
+                end_time=end_time,
+                eqp_id=alarm_eqp_id
+            ),
+            'eqp_state': lambda: supabase_config.get_eqp_state(
+                start_time=start_time,
+                end_time=end_time,
+                eqp_id=alarm_eqp_id
+            ),
+            'rcp_state': lambda: supabase_config.get_rcp_state(eqp_id=alarm_eqp_id),
+            'kpi_trend': lambda: supabase_config.get_kpi_trend(
+                start_date=trend_start,
+                end_date=trend_end_excl,
+                eqp_id=alarm_eqp_id
+            ),
+        }
 
-    # 4. EQP_STATE 조회
-    print(f"EQP_STATE 조회 중...")
-    try:
-        eqp_data = supabase_config.get_eqp_state(
-            start_time=start_time,
-            end_time=end_time,
-            eqp_id=alarm_eqp_id
-        )
-        print(f"   {len(eqp_data)}개 장비 상태 이벤트 조회")
+        results, fetch_timings = _fetch_parallel(fetchers, FETCH_TIMEOUT_SECONDS)
 
-        # 다운타임 정보 출력
-        downtime_count = sum(1 for e in eqp_data if e.get('eqp_state') == 'DOWN')
-        if downtime_count > 0:
-            print(f"   [WARN] 다운타임 발생: {downtime_count}회")
+    lot_data = results['lot_state']
+    eqp_data = results['eqp_state']
+    rcp_data = results['rcp_state']
+    trend_data = results['kpi_trend']
 
-    except Exception as e:
-        print(f"   [WARN] EQP_STATE 조회 실패: {e}")
-        eqp_data = []
+    for name, timing in fetch_timings.items():
+        if timing['status'] in ('ok', 'prefetched'):
+            logger.debug("[Node 3] %s: %s건 (%sms)", name, timing['rows'], timing['elapsed_ms'])
+        else:
+            logger.warning("[Node 3] %s 조회 실패 (%s): %s", name, timing['status'], timing.get('error', ''))
 
-    # 5. RCP_STATE 조회
-    print(f"RCP_STATE 조회 중...")
-    try:
-        rcp_data = supabase_config.get_rcp_state(eqp_id=alarm_eqp_id)
-        print(f"   {len(rcp_data)}개 레시피 정보 조회")
+    # 최대 행 수에서 잘린 소스 (LLM과 리포트가 일부 데이터만 봤다는 것을 알 수 있도록 표시)
+    context_truncated = [name for name, timing in fetch_timings.items() if timing.get('truncated')]
+    if context_truncated:
+        logger.warning("[Node 3] 최대 행 수에서 잘린 컨텍스트: %s", ', '.join(context_truncated))
 
-        # 복잡도 정보 출력
+    # 다운타임 / 복잡도 정보 출력 (디버깅)
+    if logger.isEnabledFor(logging.DEBUG):
+        downtime_count = sum(1 for e in eqp_data if e.get('eqp_state') == 'DOWN')
+        if downtime_count > 0:
+            logger.debug("[Node 3] 다운타임 발생: %d회", downtime_count)
         if rcp_data:
             complexities = [r.get('complex_level', 0) for r in rcp_data]
-            avg_complexity = sum(complexities) / len(complexities)
-            max_complexity = max(complexities)
-            print(f"   레시피 복잡도: 평균 {avg_complexity:.1f}, 최대 {max_complexity}")
-
-    except Exception as e:
-        print(f"   [WARN] RCP_STATE 조회 실패: {e}")
-        rcp_data = []
-
-    # 6. KPI 추세 데이터 조회 (직전 7일)
-    print(f"KPI 추세 조회 중 (직전 7일)...")
-    try:
-        trend_start, trend_end = get_date_range(alarm_date, days_before=7, days_after=0)
-        # alarm_date 당일은 이미 kpi_data에 있으므로 전날까지만
-        trend_end_excl = get_date_range(alarm_date, days_before=1, days_after=0)[0]
-        trend_data = supabase_config.get_kpi_trend(
-            start_date=trend_start,
-            end_date=trend_end_excl,
-            eqp_id=alarm_eqp_id
-        )
-        print(f"   {len(trend_data)}일치 추세 데이터 조회 ({trend_start} ~ {trend_end_excl})")
-
-    except Exception as e:
-        print(f"   [WARN] KPI 추세 조회 실패: {e}")
-        trend_data = []
+            logger.debug("[Node 3] 레시피 복잡도: 평균 %.1f, 최대 %s",
+                         sum(complexities) / len(complexities), max(complexities))
 
     # 7. 컨텍스트 텍스트 생성
-    print(f"\n컨텍스트 텍스트 생성 중...")
     try:
-        context_text = format_context_data(
+        # 이벤트는 요약하고, 토큰 예산을 넘으면 중요도 낮은 섹션부터 제외
+        context_text, budget_info = build_alarm_context(
             kpi_data=kpi_data,
             lot_data=lot_data,
             eqp_data=eqp_data,
             rcp_data=rcp_data,
             trend_data=trend_data
         )
-        print(f"   컨텍스트 생성 완료 ({len(context_text)}자)")
+        if budget_info['dropped'] or budget_info['truncated']:
+            logger.warning("[Node 3] 토큰 예산 초과로 제외: %s%s", budget_info['dropped'] or '-',
+                           ', 마지막 섹션 잘림' if budget_info['truncated'] else '')
+        if context_truncated:
+            context_text += (f"\n\n※ 조회 행 수 상한으로 일부 데이터만 포함됨: "
+                             f"{', '.join(context_truncated)}")
 
     except Exception as e:
         error_msg = f"컨텍스트 생성 실패: {e}"
-        print(f"   [ERROR] {error_msg}")
+        logger.exception("[Node 3] %s", error_msg)
         return {'error': error_msg}
 
     # 8. 요약 정보 출력
-    print(f"\n수집 데이터 요약:")
-    print(f"   - 로트 이벤트: {len(lot_data)}개")
-    print(f"   - 장비 상태 변경: {len(eqp_data)}개")
-    print(f"   - 레시피 정보: {len(rcp_data)}개")
-    print(f"   - KPI 추세: {len(trend_data)}일치")
-    print(f"   - 컨텍스트 크기: {len(context_text)}자")
+    logger.info("[Node 3] 컨텍스트 수집 완료: 로트 %d, 장비 상태 %d, 레시피 %d, KPI 추세 %d일 "
+                "(%d자, 약 %s토큰 / 예산 %s)", len(lot_data), len(eqp_data), len(rcp_data),
+                len(trend_data), len(context_text), budget_info['tokens'], budget_info['budget'])
 
-    print("=" * 60 + "\n")
+    # 9. 소스별 조회 시간 / 컨텍스트 토큰 수 기록
+    metadata = state.get('metadata', {})
+    metadata['context_fetch'] = fetch_timings
+    metadata['context_tokens'] = budget_info
 
-    # 9. State 업데이트
-    return {
+    # 10. State 업데이트
+    update = {
         'lot_data': lot_data,
         'eqp_data': eqp_data,
         'rcp_data': rcp_data,
         'trend_data': trend_data,
-        'context_text': context_text
+        'context_text': context_text,
+        'context_truncated': context_truncated,
+        'metadata': metadata
     }
+    if prefetched is not None:
+        # 원본 조회 결과는 위 컨텍스트로 정리되었으므로 이후 State에 싣지 않음
+        update['prefetched_context'] = None
+    return update
+
+
+def _fetch_parallel(
+    fetchers: Dict[str, Callable[[], List[Dict[str, Any]]]],
+    timeout: float
+) -> Tuple[Dict[str, List[Dict[str, Any]]], Dict[str, Dict[str, Any]]]:
+    """
+    여러 조회 함수를 동시에 실행하고 소스별 결과와 소요 시간을 반환합니다.
+
+    Args:
+        fetchers: {소스 이름: 조회 함수}
+        timeout: 소스별 최대 대기 시간 (초, 모든 조회가 동시에 시작되므로 공통 기준)
+
+    Returns:
+        Tuple[Dict, Dict]: (소스별 결과 리스트, 소스별 {status, elapsed_ms, rows, truncated | error})
+            - 실패/시간 초과 소스의 결과는 빈 리스트
+    """
+    def _timed(fn):
+        t0 = time.perf_counter()
+        rows = fn()
+        return rows, (time.perf_counter() - t0) * 1000
+
+    started = time.perf_counter()
+    deadline = started + timeout
+    # 조회 스레드에도 요청의 로그 컨텍스트(request_id 등) 전달
+    futures = {
+        name: _executor.submit(contextvars.copy_context().run, _timed, fn)
+        for name, fn in fetchers.items()
+    }
+
+    results: Dict[str, List[Dict[str, Any]]] = {}
+    timings: Dict[str, Dict[str, Any]] = {}
+
+    for name, future in futures.items():
+        try:
+            rows, elapsed_ms = future.result(timeout=max(0.0, deadline - time.perf_counter()))
+            rows = rows or []
+            results[name] = rows
+            timings[name] = {'status': 'ok', 'elapsed_ms': round(elapsed_ms, 1), 'rows': len(rows),
+                             'truncated': getattr(rows, 'truncated', False)}
+        except FuturesTimeoutError:
+            future.cancel()
+            results[name] = []
+            timings[name] = {
+                'status': 'timeout',
+                'elapsed_ms': round((time.perf_counter() - started) * 1000, 1),
+                'rows': 0,
+                'error': f'{timeout}초 초과',
+            }
+        except Exception as e:
+            results[name] = []
+            timings[name] = {
+                'status': 'error',
+                'elapsed_ms': round((time.perf_counter() - started) * 1000, 1),
+                'rows': 0,
+                'error': str(e),
+            }
+
+    return results, timings
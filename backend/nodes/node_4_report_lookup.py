@@ -7,38 +7,34 @@ project_root = Path(__file__).parent.parent.parent
 sys.path.insert(0, str(project_root))
 
 from backend.config.chroma_config import chroma_config
+from backend.config.logging_config import get_logger
 
+logger = get_logger(__name__)
 
-def node_4_report_lookup(state: dict) -> dict:
-
-    print("\n" + "=" * 60)
-    print("[Node 4] Report Lookup 실행")
-    print("=" * 60)
 
+def node_4_report_lookup(state: dict) -> dict:
     question = state.get('input_data', '')
     if not question:
         return {'report_exists': False, 'question_text': ''}
 
-    print(f"사용자 질문: {question}\n")
+    logger.debug("[Node 4] Report Lookup 실행: %s", question)
 
     # ── 1. 날짜 추출 시도 ──────────────────────────────
     date_str = _extract_date(question)
 
     if date_str:
-        print(f"날짜 감지: {date_str} → 메타데이터 직접 검색")
         result = chroma_config.get_report_by_date(date_str)
         if result:
-            print(f"   날짜 매칭 리포트 발견: {result['id']}")
+            logger.info("[Node 4] 날짜 %s 매칭 리포트 발견: %s", date_str, result['id'])
             return {
                 'report_exists': True,
                 'question_text': question,
                 'similar_reports': [result]
             }
         else:
-            print(f"   [ERROR] {date_str} 날짜의 리포트 없음")
+            logger.info("[Node 4] %s 날짜의 리포트 없음 → 유사도 검색", date_str)
 
     # ── 2. 의미론적 유사도 검색 ────────────────────────
-    print("ChromaDB에서 관련 리포트 검색 중...")
     try:
         results = chroma_config.search_similar_reports(
             query_text=question,
@@ -49,26 +45,23 @@ def node_4_report_lookup(state: dict) -> dict:
         if results and len(results) > 0:
             for r in results:
                 distance = r['distance']
-                print(f"   리포트 ID: {r['id']} | 유사도 거리: {distance:.4f}")
+                logger.debug("[Node 4] 리포트 ID: %s | 유사도 거리: %.4f", r['id'], distance)
                 if distance < 1.0:
                     similar_reports.append(r)
 
             if similar_reports:
                 report_exists = True
-                print(f"   관련성 있음 ({len(similar_reports)}개)")
             else:
                 report_exists = False
-                print(f"   [WARN] 관련성 낮음 (임계값 1.0 초과)")
         else:
             report_exists = False
 
     except Exception as e:
-        print(f"   [ERROR] 검색 실패: {e}")
+        logger.error("[Node 4] 검색 실패: %s", e)
         report_exists = False
         similar_reports = []
 
-    print(f"\n결과: {'과거 리포트 있음' if report_exists else '과거 리포트 없음'}")
-    print("=" * 60 + "\n")
+    logger.info("[Node 4] 관련 과거 리포트 %d개", len(similar_reports))
 
     return {
         'report_exists': report_exists,
@@ -19,6 +19,9 @@ from datetime import datetime, timedelta
 project_root = Path(__file__).parent.parent.parent
 sys.path.insert(0, str(project_root))
 
+from backend.config.logging_config import get_logger
+
+logger = get_logger(__name__)
 
 # ── 테이블별 키워드 ────────────────────────────────────────────
 TABLE_KEYWORDS = {
@@ -127,10 +130,6 @@ def node_4b_classifier(state: dict) -> dict:
             - needed_tables: 조회할 테이블 목록
             - query_filters: {date, eqp_id, start_date, end_date}
     """
-    print("\n" + "=" * 60)
-    print("[Node 4B] Question Classifier 실행")
-    print("=" * 60)
-
     question = state.get('input_data', '')
     q_lower = question.lower()
 
@@ -142,13 +141,10 @@ def node_4b_classifier(state: dict) -> dict:
     query_filters = {}
     if specific_date:
         query_filters['date'] = specific_date
-        print(f"   날짜 추출: {specific_date}")
     if eqp_id:
         query_filters['eqp_id'] = eqp_id
-        print(f"   장비 추출: {eqp_id}")
     if date_range:
         query_filters['start_date'], query_filters['end_date'] = date_range
-        print(f"   날짜 범위: {date_range[0]} ~ {date_range[1]}")
 
     # ── 2. 필요한 테이블 결정 ─────────────────────────────────
     needed_tables = []
@@ -183,8 +179,7 @@ def node_4b_classifier(state: dict) -> dict:
         needs_rag = False
         needed_tables = []
         route = 'live_only'
-        print(f"   경로: live_only (live_context만 참조)")
-        print("=" * 60 + "\n")
+        logger.info("[Node 4B] 경로: live_only (live_context만 참조)")
         return {
             'needs_db': False,
             'needs_rag': False,
@@ -207,12 +202,8 @@ def node_4b_classifier(state: dict) -> dict:
     route = 'db' if needs_db else 'rag'
 
     # ── 5. 결과 출력 ──────────────────────────────────────────
-    print(f"   경로: {route}")
-    print(f"   DB 조회: {'필요' if needs_db else '불필요'}")
-    if needed_tables:
-        print(f"   테이블: {', '.join(needed_tables)}")
-    print(f"   RAG 검색: {'필요' if needs_rag else '불필요'}")
-    print("=" * 60 + "\n")
+    logger.info("[Node 4B] 경로: %s (DB: %s, RAG: %s, 필터: %s)",
+                route, ', '.join(needed_tables) or '불필요', '필요' if needs_rag else '불필요', query_filters)
 
     return {
         'needs_db': needs_db,
@@ -3,25 +3,53 @@ Node 4C: DB Query
 Node 4B의 분류 결과를 바탕으로 RDS에서 필요한 데이터만 조회합니다.
 
 스마트 데이터 페칭 전략:
-- 특정 날짜 있음 → 해당 날짜만 조회
-- 날짜 범위 있음 → 해당 범위 조회
+- 특정 날짜 있음 → 해당 날짜 원본 행 (SQL LIMIT)
+- 날짜 범위 있음 → 일별/장비별 집계 + 최근 원본 행 일부
+                   (kpi_daily는 KPI 집계 저장소의 주별 롤업 / 알람 건수 사용)
 - 특정 장비 있음 → 해당 장비 필터
-- 필터 없음     → 최근 30일 + LIMIT 50
+- 필터 없음     → 최근 30일 범위로 처리
+
+모든 조회는 포맷 함수가 사용하는 컬럼만 SELECT 하고, LIMIT/정렬을 SQL에서 처리합니다.
+특정 날짜의 상태 이력은 원본 행 앞에 상태별 지속시간 / HOLD 로트 요약을 붙이고,
+결과 텍스트가 토큰 예산(DB_CONTEXT_MAX_TOKENS)을 넘으면 원본 행 → 레시피 순으로 제외합니다.
 """
 
+import os
 import sys
 from pathlib import Path
 from datetime import datetime, timedelta
-from typing import List, Dict, Any
+from typing import List, Dict
 
 project_root = Path(__file__).parent.parent.parent
 sys.path.insert(0, str(project_root))
 
+from backend.config.logging_config import get_logger
 from backend.config.rds_config import rds_config
+from backend.utils.kpi_aggregates import kpi_aggregates
+from backend.utils.context_budget import ContextSection, build_budgeted_context
+from backend.utils.data_utils import summarize_eqp_states, summarize_lot_events
+
+logger = get_logger(__name__)
 
 # 필터 없을 때 기본 조회 범위
 DEFAULT_DAYS = 30
 DEFAULT_LIMIT = 50
+# 날짜 범위 조회 시 집계와 함께 보여줄 최근 원본 행 수
+RECENT_SAMPLE_LIMIT = 20
+# DB 컨텍스트 토큰 예산 (0이면 제한 없음)
+DB_CONTEXT_MAX_TOKENS = int(os.getenv('DB_CONTEXT_MAX_TOKENS', '3000'))
+
+# 섹션 중요도 (클수록 예산 초과 시 먼저 제외)
+PRIORITY_SUMMARY = 1
+PRIORITY_ROWS = 2
+PRIORITY_RCP = 3
+
+# 포맷 함수별 조회 컬럼
+KPI_COLUMNS = ['date', 'eqp_id', 'oee_t', 'oee_v', 'thp_t', 'thp_v',
+               'tat_t', 'tat_v', 'wip_t', 'wip_v']
+EQP_COLUMNS = ['event_time', 'end_time', 'eqp_id', 'eqp_state', 'lot_id']
+LOT_COLUMNS = ['event_time', 'eqp_id', 'lot_id', 'lot_state', 'rcp_id']
+RCP_COLUMNS = ['rcp_id', 'eqp_id', 'complex_level']
 
 
 def _format_kpi_daily(rows: List[Dict]) -> str:
@@ -41,17 +69,27 @@ def _format_kpi_daily(rows: List[Dict]) -> str:
     return "\n".join(lines)
 
 
+def _duration_min(row: Dict) -> str:
+    """event_time ~ end_time 지속시간(분), 계산할 수 없으면 빈 문자열"""
+    try:
+        start = datetime.fromisoformat(str(row.get('event_time'))[:19])
+        end = datetime.fromisoformat(str(row.get('end_time'))[:19])
+        return f"{(end - start).total_seconds() / 60:.0f}"
+    except (TypeError, ValueError):
+        return ""
+
+
 def _format_eqp_state(rows: List[Dict]) -> str:
     if not rows:
         return ""
     lines = ["[EQP_STATE — 장비 상태 이력]"]
-    lines.append("이벤트 시간          | 장비  | 상태  | 이전상태 | 지속시간(분)")
-    lines.append("-" * 65)
+    lines.append("이벤트 시간          | 장비  | 상태  | LOT ID     | 지속시간(분)")
+    lines.append("-" * 70)
     for r in rows:
         lines.append(
             f"{str(r.get('event_time',''))[:19]:19} | {r.get('eqp_id',''):5} | "
-            f"{r.get('state',''):5} | {r.get('prev_state',''):8} | "
-            f"{r.get('duration_min',''):>12}"
+            f"{r.get('eqp_state') or '':5} | {r.get('lot_id') or '':10} | "
+            f"{_duration_min(r):>12}"
         )
     return "\n".join(lines)
 
@@ -65,7 +103,7 @@ def _format_lot_state(rows: List[Dict]) -> str:
     for r in rows:
         lines.append(
             f"{str(r.get('event_time',''))[:19]:19} | {r.get('eqp_id',''):5} | "
-            f"{r.get('lot_id',''):10} | {r.get('state',''):5} | {r.get('rcp_id','')}"
+            f"{r.get('lot_id',''):10} | {r.get('lot_state') or '':5} | {r.get('rcp_id','')}"
         )
     return "\n".join(lines)
 
@@ -74,16 +112,95 @@ def _format_rcp_state(rows: List[Dict]) -> str:
     if not rows:
         return ""
     lines = ["[RCP_STATE — 레시피 정보]"]
-    lines.append("RCP ID    | 장비  | 복잡도 | 처리시간(분)")
-    lines.append("-" * 45)
+    lines.append("RCP ID    | 장비  | 복잡도")
+    lines.append("-" * 30)
     for r in rows:
         lines.append(
             f"{r.get('rcp_id',''):10} | {r.get('eqp_id',''):5} | "
-            f"{r.get('complexity',''):>6} | {r.get('process_time_min',''):>12}"
+            f"{r.get('complex_level',''):>6}"
+        )
+    return "\n".join(lines)
+
+
+def _format_lot_daily_counts(rows: List[Dict]) -> str:
+    if not rows:
+        return ""
+    lines = ["[LOT_STATE 일별 집계]"]
+    lines.append("날짜       | 장비  | 이벤트 | LOT수 | HOLD이벤트 | 투입 | HOLD수량 | SCRAP")
+    lines.append("-" * 75)
+    for r in rows:
+        lines.append(
+            f"{r.get('date','')} | {r.get('eqp_id',''):5} | {r.get('events',0):>6} | "
+            f"{r.get('lots',0):>5} | {r.get('hold_events',0):>10} | {r.get('in_cnt',0):>4} | "
+            f"{r.get('hold_cnt',0):>8} | {r.get('scrap_cnt',0):>5}"
         )
     return "\n".join(lines)
 
 
+def _format_eqp_state_summary(rows: List[Dict]) -> str:
+    if not rows:
+        return ""
+    lines = ["[EQP_STATE 장비·상태별 집계 (DOWN = 다운타임)]"]
+    lines.append("장비  | 상태  | 이벤트 | 누적시간(h) | 마지막 이벤트")
+    lines.append("-" * 60)
+    for r in rows:
+        lines.append(
+            f"{r.get('eqp_id',''):5} | {r.get('eqp_state') or '':5} | {r.get('events',0):>6} | "
+            f"{r.get('total_hours',0):>11} | {str(r.get('last_event_time',''))[:19]}"
+        )
+    return "\n".join(lines)
+
+
+def _format_kpi_weekly(rows: List[Dict], alarm_counts: Dict) -> str:
+    if not rows:
+        return ""
+    lines = ["[KPI_DAILY 주별 집계 (평균, 주 시작일 기준)]"]
+    lines.append("주 시작     | 장비  | 일수 | 알람 | OEE평균 | THP평균 | TAT평균 | WIP평균")
+    lines.append("-" * 80)
+    for r in rows:
+        lines.append(
+            f"{r.get('period','')} | {r.get('group',''):5} | {r.get('rows',0):>4} | "
+            f"{r.get('alarm_rows',0):>4} | {r.get('oee_v',''):>7} | {r.get('thp_v',''):>7} | "
+            f"{r.get('tat_v',''):>7} | {r.get('wip_v',''):>7}"
+        )
+    if alarm_counts and alarm_counts.get('total_alarms'):
+        counts = ", ".join(f"{c['kpi']} {c['count']}건" for c in alarm_counts['counts'])
+        lines.append(f"알람 {alarm_counts['total_alarms']}건 중 KPI별 목표 이탈: {counts}")
+    return "\n".join(lines)
+
+
+def _format_eqp_rows_summary(rows: List[Dict]) -> str:
+    """원본 장비 상태 행을 상태별 누적 시간 / 가장 긴 DOWN으로 요약"""
+    summary = summarize_eqp_states(rows)
+    if not summary['state_hours']:
+        return ""
+    lines = ["[EQP_STATE 요약 — 상태별 누적]"]
+    lines.append(", ".join(f"{state} {v['count']}회/{v['hours']}h"
+                           for state, v in sorted(summary['state_hours'].items())))
+    for d in summary['longest_down']:
+        lines.append(f"DOWN {d['start_time']} ~ {d['end_time']} ({d['hours']}h)")
+    return "\n".join(lines)
+
+
+def _format_lot_rows_summary(rows: List[Dict]) -> str:
+    """원본 로트 행을 상태 분포 / HOLD 많은 로트로 요약"""
+    summary = summarize_lot_events(rows)
+    if not summary['total_lots']:
+        return ""
+    lines = ["[LOT_STATE 요약 — 상태 분포]"]
+    lines.append(f"이벤트 {summary['total_lots']}건, 로트 {summary['unique_lots']}개, "
+                 f"상태별 {summary['state_counts']}")
+    if summary['hold_lots']:
+        lines.append("HOLD 많은 로트: " + ", ".join(
+            f"{h['lot_id']}({h['holds']}회)" for h in summary['hold_lots']))
+    return "\n".join(lines)
+
+
+def _recent_rows(fetch, **kwargs) -> List[Dict]:
+    """최근 행을 DESC + LIMIT으로 조회한 뒤 시간순으로 되돌립니다."""
+    return list(reversed(fetch(order="desc", **kwargs)))
+
+
 def node_4c_db_query(state: dict) -> dict:
     """
     필요한 RDS 테이블을 스마트하게 조회합니다.
@@ -96,17 +213,13 @@ def node_4c_db_query(state: dict) -> dict:
     Returns:
         dict: 업데이트할 State
             - db_context: 포맷된 DB 조회 결과 텍스트
+            - metadata['db_context_tokens']: 추정 토큰 수 / 예산 / 제외된 섹션
     """
-    print("\n" + "=" * 60)
-    print("[Node 4C] DB Query 실행")
-    print("=" * 60)
-
     needed_tables = state.get('needed_tables', [])
     filters = state.get('query_filters', {})
 
     if not needed_tables:
-        print("   조회할 테이블 없음 — 스킵")
-        print("=" * 60 + "\n")
+        logger.debug("[Node 4C] 조회할 테이블 없음 — 스킵")
         return {'db_context': ''}
 
     # 필터 출력
@@ -115,15 +228,8 @@ def node_4c_db_query(state: dict) -> dict:
     start_date = filters.get('start_date')
     end_date = filters.get('end_date')
 
-    print(f"   테이블: {', '.join(needed_tables)}")
-    if specific_date:
-        print(f"   날짜 필터: {specific_date}")
-    elif start_date:
-        print(f"   날짜 범위: {start_date} ~ {end_date}")
-    else:
-        print(f"   필터 없음 → 최근 {DEFAULT_DAYS}일 (최대 {DEFAULT_LIMIT}행)")
-    if eqp_id:
-        print(f"   장비 필터: {eqp_id}")
+    logger.debug("[Node 4C] DB Query 실행: %s (날짜 %s, 범위 %s ~ %s, 장비 %s)",
+                 ', '.join(needed_tables), specific_date, start_date, end_date, eqp_id)
 
     # 필터 없을 때 기본 날짜 범위 설정
     if not specific_date and not start_date:
@@ -132,69 +238,105 @@ def node_4c_db_query(state: dict) -> dict:
         start_date = (BASE_DATE - timedelta(days=DEFAULT_DAYS)).strftime('%Y-%m-%d')
 
     sections = []
+    is_range = not specific_date
+    time_start = f"{specific_date or start_date} 00:00:00"
+    time_end = f"{specific_date or end_date} 23:59:59" if (specific_date or end_date) else None
 
     try:
         # ── kpi_daily ──────────────────────────────────────────
         if 'kpi_daily' in needed_tables:
-            print(f"\n   kpi_daily 조회 중...")
             if specific_date:
-                rows = rds_config.get_kpi_daily(date=specific_date, eqp_id=eqp_id)
+                rows = rds_config.get_kpi_daily(
+                    date=specific_date, eqp_id=eqp_id,
+                    columns=KPI_COLUMNS, limit=DEFAULT_LIMIT,
+                )
             else:
-                rows = rds_config.get_kpi_trend(
-                    start_date=start_date,
-                    end_date=end_date,
-                    eqp_id=eqp_id,
+                try:
+                    weekly = kpi_aggregates.kpi_rollup(
+                        period='week', group_by='eqp',
+                        start_date=start_date, end_date=end_date, eqp_id=eqp_id,
+                    )
+                    alarms = kpi_aggregates.alarm_counts(
+                        start_date=start_date, end_date=end_date, eqp_id=eqp_id,
+                    )
+                    if weekly:
+                        sections.append(ContextSection(
+                            'kpi_weekly', _format_kpi_weekly(weekly, alarms), PRIORITY_SUMMARY))
+                except Exception as e:
+                    logger.warning("[Node 4C] KPI 집계 조회 실패 (원본 행만 사용): %s", e)
+                rows = _recent_rows(
+                    rds_config.get_kpi_trend,
+                    start_date=start_date, end_date=end_date, eqp_id=eqp_id,
+                    columns=KPI_COLUMNS, limit=RECENT_SAMPLE_LIMIT,
                 )
-                rows = rows[:DEFAULT_LIMIT]
-            print(f"   → {len(rows)}행 조회")
+            logger.debug("[Node 4C] kpi_daily %d행", len(rows))
             if rows:
-                sections.append(_format_kpi_daily(rows))
+                sections.append(ContextSection(
+                    'kpi_daily', _format_kpi_daily(rows),
+                    PRIORITY_ROWS if is_range else PRIORITY_SUMMARY))
 
         # ── eqp_state ──────────────────────────────────────────
         if 'eqp_state' in needed_tables:
-            print(f"\n   eqp_state 조회 중...")
-            time_start = f"{specific_date or start_date} 00:00:00" if (specific_date or start_date) else None
-            time_end   = f"{specific_date or end_date} 23:59:59"   if (specific_date or end_date)   else None
-            rows = rds_config.get_eqp_state(
-                start_time=time_start,
-                end_time=time_end,
-                eqp_id=eqp_id,
+            if is_range:
+                summary = rds_config.get_eqp_state_summary(
+                    start_time=time_start, end_time=time_end, eqp_id=eqp_id,
+                )
+                if summary:
+                    sections.append(ContextSection(
+                        'eqp_summary', _format_eqp_state_summary(summary), PRIORITY_SUMMARY))
+            rows = _recent_rows(
+                rds_config.get_eqp_state,
+                start_time=time_start, end_time=time_end, eqp_id=eqp_id,
+                columns=EQP_COLUMNS,
+                limit=RECENT_SAMPLE_LIMIT if is_range else DEFAULT_LIMIT,
             )
-            rows = rows[:DEFAULT_LIMIT]
-            print(f"   → {len(rows)}행 조회")
+            logger.debug("[Node 4C] eqp_state %d행", len(rows))
             if rows:
-                sections.append(_format_eqp_state(rows))
+                if not is_range:
+                    sections.append(ContextSection(
+                        'eqp_summary', _format_eqp_rows_summary(rows), PRIORITY_SUMMARY))
+                sections.append(ContextSection('eqp_state', _format_eqp_state(rows), PRIORITY_ROWS))
 
         # ── lot_state ──────────────────────────────────────────
         if 'lot_state' in needed_tables:
-            print(f"\n   lot_state 조회 중...")
-            time_start = f"{specific_date or start_date} 00:00:00" if (specific_date or start_date) else None
-            time_end   = f"{specific_date or end_date} 23:59:59"   if (specific_date or end_date)   else None
-            rows = rds_config.get_lot_state(
-                start_time=time_start,
-                end_time=time_end,
-                eqp_id=eqp_id,
+            if is_range:
+                summary = rds_config.get_lot_daily_counts(
+                    start_time=time_start, end_time=time_end, eqp_id=eqp_id,
+                    group_by_eqp=bool(eqp_id),
+                )
+                if summary:
+                    sections.append(ContextSection(
+                        'lot_daily_counts', _format_lot_daily_counts(summary), PRIORITY_SUMMARY))
+            rows = _recent_rows(
+                rds_config.get_lot_state,
+                start_time=time_start, end_time=time_end, eqp_id=eqp_id,
+                columns=LOT_COLUMNS,
+                limit=RECENT_SAMPLE_LIMIT if is_range else DEFAULT_LIMIT,
             )
-            rows = rows[:DEFAULT_LIMIT]
-            print(f"   → {len(rows)}행 조회")
+            logger.debug("[Node 4C] lot_state %d행", len(rows))
             if rows:
-                sections.append(_format_lot_state(rows))
+                if not is_range:
+                    sections.append(ContextSection(
+                        'lot_summary', _format_lot_rows_summary(rows), PRIORITY_SUMMARY))
+                sections.append(ContextSection('lot_state', _format_lot_state(rows), PRIORITY_ROWS))
 
         # ── rcp_state ──────────────────────────────────────────
         if 'rcp_state' in needed_tables:
-            print(f"\n   rcp_state 조회 중...")
-            rows = rds_config.get_rcp_state(eqp_id=eqp_id)
-            print(f"   → {len(rows)}행 조회")
+            rows = rds_config.get_rcp_state(eqp_id=eqp_id, columns=RCP_COLUMNS)
             if rows:
-                sections.append(_format_rcp_state(rows))
+                sections.append(ContextSection('rcp_state', _format_rcp_state(rows), PRIORITY_RCP))
 
     except Exception as e:
-        print(f"   [ERROR] DB 조회 실패: {e}")
-        print("=" * 60 + "\n")
+        logger.exception("[Node 4C] DB 조회 실패: %s", e)
         return {'db_context': f'[DB 조회 실패: {e}]'}
 
-    db_context = "\n\n".join(sections) if sections else ""
-    print(f"\n   DB 컨텍스트 생성 완료 ({len(db_context)}자)")
-    print("=" * 60 + "\n")
+    db_context, budget_info = build_budgeted_context(sections, DB_CONTEXT_MAX_TOKENS)
+    logger.info("[Node 4C] DB 컨텍스트 생성 완료 (%s, %d자, 약 %s토큰 / 예산 %s)",
+                ', '.join(needed_tables), len(db_context), budget_info['tokens'], budget_info['budget'])
+    if budget_info['dropped'] or budget_info['truncated']:
+        logger.warning("[Node 4C] 토큰 예산 초과로 제외: %s%s", budget_info['dropped'] or '-',
+                       ', 마지막 섹션 잘림' if budget_info['truncated'] else '')
 
-    return {'db_context': db_context}
+    metadata = state.get('metadata', {})
+    metadata['db_context_tokens'] = budget_info
+    return {'db_context': db_context, 'metadata': metadata}
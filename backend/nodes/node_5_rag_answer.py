@@ -3,6 +3,7 @@ Node 5: RAG Answer
 과거 리포트를 참고하여 사용자 질문에 답변합니다.
 """
 import sys
+import logging
 from pathlib import Path
 
 project_root = Path(__file__).parent.parent.parent
@@ -10,8 +11,11 @@ sys.path.insert(0, str(project_root))
 
 from backend.config.chroma_config import chroma_config
 from backend.config.aws_config import aws_config
+from backend.config.logging_config import get_logger
 from backend.utils.prompt_templates import get_question_answer_prompt
 
+logger = get_logger(__name__)
+
 
 def _get_kpi_filter(question: str) -> dict | None:
     """질문에서 KPI를 감지해 ChromaDB 메타데이터 필터를 반환합니다."""
@@ -39,7 +43,7 @@ def _get_search_count(question: str) -> int:
                     "전체적", "전반적", "요약", "총", "목록", "여태", "지금까지", "모두"]
     if any(kw in question_lower for kw in all_keywords):
         total = chroma_config.count_reports()
-        print(f"   전체 조회 모드: {total}개")
+        logger.debug("[Node 5] 전체 조회 모드: %d개", total)
         return total if total > 0 else 50
 
     # 다수 조회 키워드
@@ -52,30 +56,31 @@ def _get_search_count(question: str) -> int:
     return 10
 
 
-def node_5_rag_answer(state: dict) -> dict:
+def prepare_rag_answer(state: dict) -> dict:
     """
-    과거 리포트를 참고하여 사용자 질문에 답변합니다.
-    """
-    print("\n" + "=" * 60)
-    print("[Node 5] RAG Answer 실행")
-    print("=" * 60)
+    답변 생성에 필요한 리포트 검색과 프롬프트 생성을 수행합니다.
+    (node_5_rag_answer와 스트리밍 답변 경로에서 공통 사용)
+
+    Args:
+        state: 현재 Agent State
 
+    Returns:
+        dict: {question, prompt, similar_reports} 또는 {error}
+    """
     # 1. 질문 가져오기
     question = state.get('question_text') or state.get('input_data', '')
     if not question:
         return {'error': '질문이 없습니다'}
 
-    print(f"질문: {question}\n")
+    logger.debug("[Node 5] 질문: %s", question)
 
     # 2. 리포트 검색
-    print("유사 리포트 검색 중...")
-
     try:
         already_found = state.get('similar_reports', [])
         n = _get_search_count(question)
         kpi_filter = _get_kpi_filter(question)
         if kpi_filter:
-            print(f"   KPI 필터 적용: {kpi_filter}")
+            logger.debug("[Node 5] KPI 필터 적용: %s", kpi_filter)
 
         if already_found and kpi_filter:
             # Node 4 결과에 KPI 필터 후처리 적용
@@ -85,19 +90,18 @@ def node_5_rag_answer(state: dict) -> dict:
             allowed = {eq_val} if eq_val else set(in_val)
             filtered = [r for r in already_found if r.get('metadata', {}).get('kpi') in allowed]
             if filtered:
-                print(f"   Node 4 리포트 KPI 필터 후: {len(filtered)}개")
+                logger.debug("[Node 5] Node 4 리포트 KPI 필터 후: %d개", len(filtered))
                 similar_reports = filtered
             else:
                 # 필터 후 없으면 ChromaDB 직접 검색
-                print(f"   Node 4 결과 KPI 불일치 → ChromaDB 직접 검색")
+                logger.debug("[Node 5] Node 4 결과 KPI 불일치 → ChromaDB 직접 검색")
                 similar_reports = chroma_config.search_similar_reports(
                     query_text=question, n_results=n, filter_metadata=kpi_filter
                 )
         elif already_found:
-            print(f"   Node 4 전달 리포트 사용: {already_found[0]['id']}")
+            logger.debug("[Node 5] Node 4 전달 리포트 사용: %s", already_found[0]['id'])
             similar_reports = already_found
         else:
-            print(f"   검색 개수: {n}개")
             similar_reports = chroma_config.search_similar_reports(
                 query_text=question,
                 n_results=n,
@@ -105,26 +109,22 @@ def node_5_rag_answer(state: dict) -> dict:
             )
 
         if similar_reports:
-            print(f"   {len(similar_reports)}개 리포트 발견")
-            for i, r in enumerate(similar_reports, 1):
-                dist = r.get('distance', 0)
-                print(f"   {i}. {r['id']} (거리: {dist:.4f})")
+            logger.info("[Node 5] 참고 리포트 %d개 (검색 개수 %d)", len(similar_reports), n)
+            if logger.isEnabledFor(logging.DEBUG):
+                for i, r in enumerate(similar_reports, 1):
+                    logger.debug("[Node 5] %d. %s (거리: %.4f)", i, r['id'], r.get('distance', 0))
         else:
-            print(f"   [WARN] 유사 리포트 없음")
+            logger.warning("[Node 5] 유사 리포트 없음")
             similar_reports = []
 
     except Exception as e:
-        print(f"   [ERROR] 검색 실패: {e}")
+        logger.error("[Node 5] 검색 실패: %s", e)
         similar_reports = []
 
     # 3. 프롬프트 생성 및 LLM 호출
     live_context = state.get('live_context', '')
     db_context   = state.get('db_context', '')
-    if live_context:
-        print(f"   실시간 컨텍스트 포함 ({len(live_context)}자)")
-    if db_context:
-        print(f"   DB 컨텍스트 포함 ({len(db_context)}자)")
-    print(f"\n답변 생성 중...")
+    logger.debug("[Node 5] 실시간 컨텍스트 %d자, DB 컨텍스트 %d자", len(live_context), len(db_context))
     prompt = get_question_answer_prompt(
         question=question,
         similar_reports=similar_reports,
@@ -132,29 +132,37 @@ def node_5_rag_answer(state: dict) -> dict:
         db_context=db_context,
     )
 
-    print(f"Claude 호출 중...")
+    return {
+        'question': question,
+        'prompt': prompt,
+        'similar_reports': similar_reports,
+    }
+
+
+def node_5_rag_answer(state: dict) -> dict:
+    """
+    과거 리포트를 참고하여 사용자 질문에 답변합니다.
+    """
+    prepared = prepare_rag_answer(state)
+    if 'error' in prepared:
+        return {'error': prepared['error']}
+
+    prompt = prepared['prompt']
+    similar_reports = prepared['similar_reports']
+
     try:
+        # LLM 호출 횟수 / 토큰은 workflow의 추적 래퍼(traced_node)가 metadata에 기록
         metadata = state.get('metadata', {})
-        metadata['llm_calls'] = metadata.get('llm_calls', 0) + 1
         answer = aws_config.invoke_claude(prompt)
-        print(f"   답변 생성 완료 ({len(answer)}자)")
     except Exception as e:
         error_msg = f"LLM 호출 실패: {str(e)}"
-        print(f"   [ERROR] {error_msg}")
+        logger.error("[Node 5] %s", error_msg)
         return {'error': error_msg}
 
     # 4. 결과 미리보기
-    print(f"\n답변 미리보기:")
-    print("=" * 60)
-    for line in answer.split('\n')[:10]:
-        print(line)
-    print("=" * 60)
-
-    print(f"\n결과:")
-    print(f"   참고 리포트: {len(similar_reports)}개")
-    print(f"   답변 길이: {len(answer)}자")
-    print(f"   LLM 호출: {metadata['llm_calls']}회")
-    print("=" * 60 + "\n")
+    logger.info("[Node 5] 답변 생성 완료 (%d자, 참고 리포트 %d개)", len(answer), len(similar_reports))
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("[Node 5] 답변 미리보기:\n%s", '\n'.join(answer.split('\n')[:10]))
 
     return {
         'final_answer': answer,
@@ -11,6 +11,7 @@ LLM을 사용하여 알람의 근본 원인을 분석합니다.
 """
 
 import sys
+import logging
 from pathlib import Path
 import json
 
@@ -19,8 +20,11 @@ project_root = Path(__file__).parent.parent.parent
 sys.path.insert(0, str(project_root))
 
 from backend.config.aws_config import aws_config
+from backend.config.logging_config import get_logger
 from backend.utils.prompt_templates import get_root_cause_analysis_prompt
 
+logger = get_logger(__name__)
+
 
 def node_6_root_cause_analysis(state: dict) -> dict:
     """
@@ -45,49 +49,34 @@ def node_6_root_cause_analysis(state: dict) -> dict:
             - error: 에러 메시지 (실패 시)
     """
 
-    print("\n" + "=" * 60)
-    print("[Node 6] Root Cause Analysis 실행")
-    print("=" * 60)
-
     # 1. State에서 필요한 정보 가져오기
     context_text = state.get('context_text')
     alarm_kpi = state.get('alarm_kpi')
 
     if not context_text:
         error_msg = "컨텍스트 데이터가 없습니다"
-        print(f"[ERROR] {error_msg}")
+        logger.error("[Node 6] %s", error_msg)
         return {'error': error_msg}
 
-    print(f"KPI: {alarm_kpi}")
-    print(f"컨텍스트 크기: {len(context_text)}자")
-
     # 2. 프롬프트 생성
-    print(f"\n프롬프트 생성 중...")
     prompt = get_root_cause_analysis_prompt(context_text, alarm_kpi=alarm_kpi)
-    print(f"   프롬프트 생성 완료 ({len(prompt)}자)")
+    logger.debug("[Node 6] Root Cause Analysis 실행: KPI %s (컨텍스트 %d자, 프롬프트 %d자)",
+                 alarm_kpi, len(context_text), len(prompt))
 
     # 3. LLM 호출
-    print(f"\nClaude 호출 중... (이 작업은 몇 초 걸릴 수 있습니다)")
-
     try:
-        # metadata 업데이트 (LLM 호출 횟수)
+        # LLM 호출 횟수 / 토큰은 workflow의 추적 래퍼(traced_node)가 metadata에 기록
         metadata = state.get('metadata', {})
-        llm_calls = metadata.get('llm_calls', 0)
-        metadata['llm_calls'] = llm_calls + 1
 
         # Claude 호출
         response_text = aws_config.invoke_claude(prompt)
 
-        print(f"   Claude 응답 받음 ({len(response_text)}자)")
-
     except Exception as e:
         error_msg = f"LLM 호출 실패: {str(e)}"
-        print(f"   [ERROR] {error_msg}")
+        logger.error("[Node 6] %s", error_msg)
         return {'error': error_msg}
 
     # 4. 응답 파싱 (JSON 추출)
-    print(f"\n응답 파싱 중...")
-
     try:
         # JSON 블록 추출 (```json ... ``` 또는 {...})
         json_text = _extract_json(response_text)
@@ -106,25 +95,18 @@ def node_6_root_cause_analysis(state: dict) -> dict:
             if 'cause' not in cause or 'probability' not in cause or 'evidence' not in cause:
                 raise ValueError("원인 데이터 형식 오류")
 
-        print(f"   {len(root_causes)}개 근본 원인 후보 추출")
-
     except Exception as e:
         error_msg = f"응답 파싱 실패: {str(e)}"
-        print(f"   [ERROR] {error_msg}")
-        print(f"\n원본 응답:\n{response_text[:500]}...")
+        logger.error("[Node 6] %s (원본 응답 앞부분: %.500s)", error_msg, response_text)
         return {'error': error_msg}
 
     # 5. 결과 출력
-    print(f"\n근본 원인 분석 결과:")
-    print(f"\n문제 요약: {result.get('problem_summary', 'N/A')}")
-    print(f"\n근본 원인 후보:")
-
-    for i, cause in enumerate(root_causes, 1):
-        print(f"\n{i}. {cause['cause']}")
-        print(f"   확률: {cause['probability']}%")
-        print(f"   근거: {cause['evidence'][:100]}...")
-
-    print("\n" + "=" * 60 + "\n")
+    logger.info("[Node 6] 근본 원인 후보 %d개 추출 (KPI %s)", len(root_causes), alarm_kpi)
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("[Node 6] 문제 요약: %s", result.get('problem_summary', 'N/A'))
+        for i, cause in enumerate(root_causes, 1):
+            logger.debug("[Node 6] %d. %s (확률 %s%%) 근거: %.100s",
+                         i, cause['cause'], cause['probability'], cause['evidence'])
 
     # 6. State 업데이트
     return {
@@ -18,6 +18,10 @@ from pathlib import Path
 project_root = Path(__file__).parent.parent.parent
 sys.path.insert(0, str(project_root))
 
+from backend.config.logging_config import get_logger
+
+logger = get_logger(__name__)
+
 
 def node_7_human_choice(state: dict) -> dict:
     """
@@ -39,61 +43,38 @@ def node_7_human_choice(state: dict) -> dict:
             - error: 에러 메시지 (실패 시)
     """
 
-    print("\n" + "=" * 60)
-    print("[Node 7] Human Choice 실행")
-    print("=" * 60)
-
     # 1. State에서 원인 후보 가져오기
     root_causes = state.get('root_causes', [])
 
     if not root_causes:
         error_msg = "근본 원인 후보가 없습니다"
-        print(f"[ERROR] {error_msg}")
+        logger.error("[Node 7] %s", error_msg)
         return {'error': error_msg}
 
-    print(f"근본 원인 후보: {len(root_causes)}개")
-
-    # 2. 원인 목록 표시
-    print(f"\n근본 원인 후보:")
-    for i, cause in enumerate(root_causes):
-        print(f"\n{i+1}. {cause['cause']}")
-        print(f"   확률: {cause['probability']}%")
-        print(f"   근거: {cause['evidence'][:80]}...")
-
-    # 3. 사용자 선택 처리
+    # 2. 사용자 선택 처리
     selected_index = state.get('selected_cause_index')
 
-    # 3-1. 이미 선택된 경우
+    # 2-1. 이미 선택된 경우
     if selected_index is not None:
-        print(f"\n사용자가 선택: {selected_index + 1}번")
-
         # 인덱스 검증
         if not 0 <= selected_index < len(root_causes):
             error_msg = f"잘못된 선택 인덱스: {selected_index}"
-            print(f"[ERROR] {error_msg}")
+            logger.error("[Node 7] %s", error_msg)
             return {'error': error_msg}
 
         selected_cause = root_causes[selected_index]
 
-    # 3-2. 선택되지 않은 경우 (자동 선택)
+    # 2-2. 선택되지 않은 경우 (자동 선택: 가장 높은 확률의 원인)
     else:
-        print(f"\n자동 선택 모드: 가장 높은 확률의 원인 선택")
-
-        # 확률이 가장 높은 원인 선택
         selected_cause = max(root_causes, key=lambda x: x['probability'])
         selected_index = root_causes.index(selected_cause)
 
-        print(f"   → {selected_index + 1}번 선택됨")
-
-    # 4. 선택된 원인 출력
-    print(f"\n선택된 근본 원인:")
-    print(f"   원인: {selected_cause['cause']}")
-    print(f"   확률: {selected_cause['probability']}%")
-    print(f"   근거: {selected_cause['evidence'][:100]}...")
-
-    print("=" * 60 + "\n")
+    # 3. 선택된 원인 출력
+    logger.info("[Node 7] %s: %d/%d번 %s (확률 %s%%)",
+                '사용자 선택' if state.get('selected_cause_index') is not None else '자동 선택',
+                selected_index + 1, len(root_causes), selected_cause['cause'], selected_cause['probability'])
 
-    # 5. State 업데이트
+    # 4. State 업데이트
     return {
         'selected_cause': selected_cause,
         'selected_cause_index': selected_index
@@ -13,6 +13,7 @@ Node 8: Report Writer
 """
 
 import sys
+import logging
 from pathlib import Path
 from datetime import datetime
 
@@ -21,8 +22,11 @@ project_root = Path(__file__).parent.parent.parent
 sys.path.insert(0, str(project_root))
 
 from backend.config.aws_config import aws_config
+from backend.config.logging_config import get_logger
 from backend.utils.prompt_templates import get_report_writer_prompt
 
+logger = get_logger(__name__)
+
 
 def node_8_report_writer(state: dict) -> dict:
     """
@@ -44,10 +48,6 @@ def node_8_report_writer(state: dict) -> dict:
             - error: 에러 메시지 (실패 시)
     """
 
-    print("\n" + "=" * 60)
-    print("[Node 8] Report Writer 실행")
-    print("=" * 60)
-
     # 1. State에서 필요한 정보 가져오기
     selected_cause = state.get('selected_cause')
     context_text = state.get('context_text')
@@ -59,78 +59,53 @@ def node_8_report_writer(state: dict) -> dict:
     # 필수 정보 검증
     if not selected_cause:
         error_msg = "선택된 근본 원인이 없습니다"
-        print(f"[ERROR] {error_msg}")
+        logger.error("[Node 8] %s", error_msg)
         return {'error': error_msg}
 
     if not context_text or not kpi_data:
         error_msg = "컨텍스트 또는 KPI 데이터가 없습니다"
-        print(f"[ERROR] {error_msg}")
+        logger.error("[Node 8] %s", error_msg)
         return {'error': error_msg}
 
-    print(f"알람 정보:")
-    print(f"   날짜: {alarm_date}")
-    print(f"   장비: {alarm_eqp_id}")
-    print(f"   KPI: {alarm_kpi}")
-    print(f"\n선택된 근본 원인:")
-    print(f"   {selected_cause['cause']}")
-    print(f"   확률: {selected_cause['probability']}%")
-
     # 2. 문제 요약 결정 (Node 6 LLM 요약 우선, 없으면 템플릿 생성)
     problem_summary = state.get('problem_summary') or _generate_problem_summary(kpi_data, alarm_kpi)
-    print(f"   문제 요약 출처: {'Node 6 LLM' if state.get('problem_summary') else '템플릿 생성'}")
 
     # 3. 프롬프트 생성
-    print(f"\n프롬프트 생성 중...")
     prompt = get_report_writer_prompt(
         problem_summary=problem_summary,
         selected_cause=selected_cause['cause'],
         evidence=selected_cause['evidence'],
         context_data=context_text
     )
-    print(f"   프롬프트 생성 완료 ({len(prompt)}자)")
+    logger.debug("[Node 8] Report Writer 실행: %s %s %s, 원인 '%s' (문제 요약 출처: %s, 프롬프트 %d자)",
+                 alarm_date, alarm_eqp_id, alarm_kpi, selected_cause['cause'],
+                 'Node 6 LLM' if state.get('problem_summary') else '템플릿 생성', len(prompt))
 
     # 4. LLM 호출
-    print(f"\nClaude 호출 중... (이 작업은 몇 초 걸릴 수 있습니다)")
 
     try:
-        # metadata 업데이트
+        # LLM 호출 횟수 / 토큰은 workflow의 추적 래퍼(traced_node)가 metadata에 기록
         metadata = state.get('metadata', {})
-        llm_calls = metadata.get('llm_calls', 0)
-        metadata['llm_calls'] = llm_calls + 1
 
         # Claude 호출
         final_report = aws_config.invoke_claude(prompt)
 
-        print(f"   Claude 응답 받음 ({len(final_report)}자)")
-
     except Exception as e:
         error_msg = f"LLM 호출 실패: {str(e)}"
-        print(f"   [ERROR] {error_msg}")
+        logger.error("[Node 8] %s", error_msg)
         return {'error': error_msg}
 
     # 5. 리포트 ID 생성
     # 형식: report_YYYYMMDD_EQPXX_KPI
     report_id = f"report_{alarm_date}_{alarm_eqp_id}_{alarm_kpi}"
-    print(f"\n리포트 ID: {report_id}")
 
-    # 6. 리포트 미리보기
-    print(f"\n리포트 미리보기:")
-    print("=" * 60)
+    # 6. 리포트 통계 / 미리보기 (처음 15줄)
     lines = final_report.split('\n')
-    for line in lines[:15]:  # 처음 15줄만
-        print(line)
-    print("...")
-    print("=" * 60)
-
-    # 7. 통계
-    print(f"\n리포트 통계:")
-    print(f"   총 길이: {len(final_report)}자")
-    print(f"   줄 수: {len(lines)}줄")
-    print(f"   LLM 호출 횟수: {metadata['llm_calls']}회")
-
-    print("=" * 60 + "\n")
+    logger.info("[Node 8] 리포트 작성 완료: %s (%d자, %d줄)", report_id, len(final_report), len(lines))
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("[Node 8] 리포트 미리보기:\n%s\n...", '\n'.join(lines[:15]))
 
-    # 8. State 업데이트
+    # 7. State 업데이트
     return {
         'final_report': final_report,
         'report_id': report_id,
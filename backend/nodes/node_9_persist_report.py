@@ -14,6 +14,7 @@ Node 9: Persist Report
 """
 
 import sys
+import logging
 from pathlib import Path
 
 # 프로젝트 루트 경로 추가
@@ -21,6 +22,10 @@ project_root = Path(__file__).parent.parent.parent
 sys.path.insert(0, str(project_root))
 
 from backend.config.chroma_config import chroma_config
+from backend.config.logging_config import get_logger
+from backend.utils.semantic_cache import semantic_qa_cache
+
+logger = get_logger(__name__)
 
 
 def node_9_persist_report(state: dict) -> dict:
@@ -41,10 +46,6 @@ def node_9_persist_report(state: dict) -> dict:
             - error: 에러 메시지 (실패 시)
     """
 
-    print("\n" + "=" * 60)
-    print("[Node 9] Persist Report 실행")
-    print("=" * 60)
-
     # 1. State에서 필요한 정보 가져오기
     final_report = state.get('final_report')
     report_id = state.get('report_id')
@@ -58,12 +59,12 @@ def node_9_persist_report(state: dict) -> dict:
     # 필수 정보 검증
     if not final_report:
         error_msg = "저장할 리포트가 없습니다"
-        print(f"[ERROR] {error_msg}")
+        logger.error("[Node 9] %s", error_msg)
         return {'error': error_msg, 'rag_saved': False}
 
     if not report_id:
         error_msg = "리포트 ID가 없습니다"
-        print(f"[ERROR] {error_msg}")
+        logger.error("[Node 9] %s", error_msg)
         return {'error': error_msg, 'rag_saved': False}
 
     line_id = kpi_data.get('line_id', '')
@@ -71,14 +72,8 @@ def node_9_persist_report(state: dict) -> dict:
     cause_text = selected_cause.get('cause', '')
     cause_probability = selected_cause.get('probability', 0)
 
-    print(f"리포트 정보:")
-    print(f"   ID: {report_id}")
-    print(f"   날짜: {alarm_date}")
-    print(f"   장비: {alarm_eqp_id}")
-    print(f"   KPI: {alarm_kpi}")
-    print(f"   라인: {line_id} | 공정: {oper_id}")
-    print(f"   선택 원인: {cause_text[:50]}..." if cause_text else "   선택 원인: 없음")
-    print(f"   크기: {len(final_report)}자")
+    logger.debug("[Node 9] Persist Report 실행: %s (라인 %s, 공정 %s, 원인 '%.50s', %d자)",
+                 report_id, line_id, oper_id, cause_text or '없음', len(final_report))
 
     # 2. 메타데이터 생성
     metadata = {
@@ -94,8 +89,6 @@ def node_9_persist_report(state: dict) -> dict:
         "source": "ai_analysis"
     }
 
-    print(f"\nChromaDB에 저장 중...")
-
     # 3. ChromaDB에 저장
     try:
         success = chroma_config.add_report(
@@ -105,31 +98,26 @@ def node_9_persist_report(state: dict) -> dict:
         )
 
         if success:
-            print(f"   ChromaDB 저장 성공!")
-
-            # 4. 저장 확인
-            total_reports = chroma_config.count_reports()
-            print(f"   현재 총 리포트 개수: {total_reports}개")
+            logger.info("[Node 9] ChromaDB 저장 성공: %s", report_id)
 
-            # 5. 저장된 리포트 조회 확인
-            saved_report = chroma_config.get_report_by_id(report_id)
-            if saved_report:
-                print(f"   저장 검증 완료")
-            else:
-                print(f"   [WARN] 저장 검증 실패 (조회 안 됨)")
+            # 4. 저장 검증 (DEBUG일 때만 — 운영에서는 추가 ChromaDB 조회 생략)
+            if logger.isEnabledFor(logging.DEBUG):
+                saved_report = chroma_config.get_report_by_id(report_id)
+                logger.debug("[Node 9] 저장 검증 %s (현재 총 리포트 %d개)",
+                             '완료' if saved_report else '실패 (조회 안 됨)', chroma_config.count_reports())
 
-            print("=" * 60 + "\n")
+            # 5. 새 리포트가 반영되도록 의미 기반 질문 캐시 무효화
+            if semantic_qa_cache is not None:
+                semantic_qa_cache.invalidate(f"리포트 추가: {report_id}")
 
             return {'rag_saved': True}
 
         else:
             error_msg = "ChromaDB 저장 실패"
-            print(f"   [ERROR] {error_msg}")
-            print("=" * 60 + "\n")
+            logger.error("[Node 9] %s: %s", error_msg, report_id)
             return {'error': error_msg, 'rag_saved': False}
 
     except Exception as e:
         error_msg = f"저장 중 오류 발생: {str(e)}"
-        print(f"   [ERROR] {error_msg}")
-        print("=" * 60 + "\n")
+        logger.exception("[Node 9] %s", error_msg)
         return {'error': error_msg, 'rag_saved': False}
@@ -45,6 +45,7 @@ def test_full_context_fetch():
     assert state.get('eqp_data') is not None, "eqp_data 없음"
     assert state.get('rcp_data') is not None, "rcp_data 없음"
     assert state.get('context_text') is not None, "context_text 없음"
+    assert 'context_fetch' in state.get('metadata', {}), "소스별 조회 시간 없음"
     
     # 결과 출력
     print("\n모든 데이터 조회 성공!")
@@ -56,6 +57,8 @@ def test_full_context_fetch():
     print(f"   - eqp_data: {len(state.get('eqp_data', []))}개")
     print(f"   - rcp_data: {len(state.get('rcp_data', []))}개")
     print(f"   - context_text: {len(state.get('context_text', ''))}자")
+    for name, timing in state['metadata']['context_fetch'].items():
+        print(f"   - {name}: {timing['status']} ({timing['elapsed_ms']}ms)")
     
     # 컨텍스트 미리보기
     context = state.get('context_text', '')
@@ -0,0 +1,123 @@
+"""
+Node 4C (DB Query) 테스트
+(RDS 조회 메서드를 가짜로 바꿔 조회 전략과 포맷만 검증합니다)
+"""
+
+import sys
+from pathlib import Path
+
+# 프로젝트 루트를 경로에 추가
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from backend.config.rds_config import rds_config
+from backend.nodes import node_4c_db_query as node_4c_module
+from backend.nodes.node_4c_db_query import node_4c_db_query, RECENT_SAMPLE_LIMIT
+
+
+def test_node_4c_range_uses_aggregates():
+    """날짜 범위 질문은 집계 + 최근 원본 행으로 조회하는지 테스트"""
+
+    print("\n" + "=" * 60)
+    print("Node 4C 날짜 범위 조회 테스트")
+    print("=" * 60 + "\n")
+
+    calls = {}
+
+    def fake_lot_state(**kwargs):
+        calls['lot_state'] = kwargs
+        # DESC로 조회된 최근 행
+        return [
+            {'event_time': '2026-01-30 10:00:00', 'eqp_id': 'EQP01', 'lot_id': 'LOT2', 'lot_state': 'HOLD', 'rcp_id': 'R1'},
+            {'event_time': '2026-01-30 09:00:00', 'eqp_id': 'EQP01', 'lot_id': 'LOT1', 'lot_state': 'RUN', 'rcp_id': 'R1'},
+        ]
+
+    def fake_daily_counts(**kwargs):
+        calls['lot_daily_counts'] = kwargs
+        return [{'date': '2026-01-30', 'eqp_id': 'EQP01', 'events': 2, 'lots': 2,
+                 'hold_events': 1, 'in_cnt': 50, 'hold_cnt': 25, 'scrap_cnt': 0}]
+
+    originals = (rds_config.get_lot_state, rds_config.get_lot_daily_counts)
+    rds_config.get_lot_state = fake_lot_state
+    rds_config.get_lot_daily_counts = fake_daily_counts
+    try:
+        result = node_4c_db_query({
+            'needed_tables': ['lot_state'],
+            'query_filters': {'eqp_id': 'EQP01', 'start_date': '2026-01-24', 'end_date': '2026-01-31'},
+        })
+    finally:
+        rds_config.get_lot_state, rds_config.get_lot_daily_counts = originals
+
+    db_context = result['db_context']
+    print(db_context)
+
+    # LIMIT/정렬/컬럼이 조회 계층으로 전달됨
+    assert calls['lot_state']['limit'] == RECENT_SAMPLE_LIMIT
+    assert calls['lot_state']['order'] == 'desc'
+    assert 'lot_state' in calls['lot_state']['columns']
+    assert calls['lot_daily_counts']['group_by_eqp'] is True
+    # 집계 섹션 포함, 원본 행은 시간순
+    assert '[LOT_STATE 일별 집계]' in db_context
+    assert db_context.index('LOT1') < db_context.index('LOT2')
+
+    print("\nNode 4C 날짜 범위 조회 테스트 통과!\n")
+
+
+def test_node_4c_token_budget():
+    """특정 날짜 상태 이력은 요약을 붙이고, 예산 초과 시 원본 행부터 제외하는지 테스트"""
+
+    print("=" * 60)
+    print("Node 4C 토큰 예산 테스트")
+    print("=" * 60 + "\n")
+
+    def fake_eqp_state(**kwargs):
+        return [
+            {'event_time': f'2026-01-20 {h:02d}:00:00', 'end_time': f'2026-01-20 {h:02d}:30:00',
+             'eqp_id': 'EQP01', 'eqp_state': 'DOWN' if h % 5 == 0 else 'RUN', 'lot_id': f'LOT{h}'}
+            for h in range(23, -1, -1)
+        ]
+
+    def fake_rcp_state(**kwargs):
+        return [{'rcp_id': f'R{i}', 'eqp_id': 'EQP01', 'complex_level': i} for i in range(10)]
+
+    originals = (rds_config.get_eqp_state, rds_config.get_rcp_state, node_4c_module.DB_CONTEXT_MAX_TOKENS)
+    rds_config.get_eqp_state = fake_eqp_state
+    rds_config.get_rcp_state = fake_rcp_state
+    node_4c_module.DB_CONTEXT_MAX_TOKENS = 150
+    state = {
+        'needed_tables': ['eqp_state', 'rcp_state'],
+        'query_filters': {'date': '2026-01-20', 'eqp_id': 'EQP01'},
+        'metadata': {'llm_calls': 0},
+    }
+    try:
+        result = node_4c_db_query(state)
+    finally:
+        rds_config.get_eqp_state, rds_config.get_rcp_state, node_4c_module.DB_CONTEXT_MAX_TOKENS = originals
+
+    db_context = result['db_context']
+    info = result['metadata']['db_context_tokens']
+    print(db_context)
+
+    # 요약은 유지, 레시피 → 원본 행 순으로 제외
+    assert '[EQP_STATE 요약' in db_context and 'DOWN 5회/2.5h' in db_context
+    assert info['dropped'] == ['rcp_state', 'eqp_state']
+    assert info['tokens'] <= 150 < info['original_tokens']
+
+    print("\nNode 4C 토큰 예산 테스트 통과!\n")
+
+
+def main():
+    """모든 테스트 실행"""
+
+    print("\nNode 4C 테스트 시작\n")
+
+    test_node_4c_range_uses_aggregates()
+    test_node_4c_token_budget()
+
+    print("=" * 60)
+    print("모든 테스트 완료!")
+    print("=" * 60 + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,118 +1,295 @@
 """
-간단한 인메모리 캐시
+인메모리 LRU + TTL 캐시
 동일한 알람 분석 결과를 캐싱하여 LLM 비용 절감
+
+- 최대 항목 수 / 최대 메모리(추정 바이트) 초과 시 가장 오래 사용되지 않은 항목부터 삭제 (O(1))
+- 만료 항목은 조회 시점 외에도 백그라운드 스레드가 주기적으로 정리
+- 모든 연산은 락으로 보호 (워크플로우 스레드 풀에서 동시 접근)
+- 공유 백엔드(CACHE_BACKEND=sqlite|redis)가 설정되면 2차 저장소로 사용하여 여러 레플리카가 캐시를 공유
 """
 
-from typing import Optional, Dict, Any
-from datetime import datetime, timedelta
+import os
+import sys
 import json
+import time
+import weakref
+import threading
+from collections import OrderedDict
+from typing import Optional, Dict, Any
+
+from backend.config.logging_config import get_logger
+from backend.utils.cache_backends import (
+    CacheBackend,
+    create_cache_backend,
+    serialize_state,
+    deserialize_state,
+)
+
+logger = get_logger(__name__)
+
+# 만료 항목 정리 주기 (초)
+SWEEP_INTERVAL_SECONDS = float(os.getenv('CACHE_SWEEP_INTERVAL', '60'))
+
+
+def _estimate_size(data: Any) -> int:
+    """
+    캐시 항목의 대략적인 크기(바이트)를 계산합니다.
+    AgentState처럼 JSON으로 표현 가능한 dict를 기준으로 직렬화 길이를 사용합니다.
+    """
+    try:
+        return len(json.dumps(data, ensure_ascii=False, default=str).encode('utf-8'))
+    except (TypeError, ValueError):
+        return sys.getsizeof(data)
 
 
 class SimpleCache:
     """
-    간단한 인메모리 캐시
-    
+    LRU + TTL 인메모리 캐시
+
     알람 분석 결과를 메모리에 저장하여
     동일한 알람 재분석 시 LLM 호출을 방지합니다.
     """
-    
-    def __init__(self, ttl_seconds: int = 3600):
+
+    def __init__(
+        self,
+        ttl_seconds: int = 3600,
+        max_entries: int = 500,
+        max_bytes: int = 64 * 1024 * 1024,
+        name: str = 'cache',
+        backend: Optional[CacheBackend] = None,
+    ):
         """
         Args:
             ttl_seconds: 캐시 유효 시간 (초, 기본 1시간)
+            max_entries: 최대 저장 항목 수
+            max_bytes: 최대 저장 크기 (추정 바이트, 기본 64MB)
+            name: 통계/로그에 표시할 캐시 이름 (공유 백엔드의 네임스페이스로도 사용)
+            backend: 공유 캐시 백엔드 (None이면 이 프로세스 메모리에만 저장)
         """
-        self.cache: Dict[str, Dict[str, Any]] = {}
+        # key -> {'data', 'expires_at', 'created_at', 'size'} (앞쪽이 가장 오래 사용되지 않은 항목)
+        self.cache: 'OrderedDict[str, Dict[str, Any]]' = OrderedDict()
         self.ttl_seconds = ttl_seconds
-    
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.name = name
+        self.backend = backend
+
+        self._lock = threading.RLock()
+        self._total_bytes = 0
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.backend_hits = 0
+        self.backend_errors = 0
+
+        _register(self)
+
+    def _remove(self, key: str) -> None:
+        """항목 제거 (락 보유 상태에서 호출)"""
+        item = self.cache.pop(key)
+        self._total_bytes -= item['size']
+
     def get(self, key: str) -> Optional[Dict[str, Any]]:
         """
         캐시에서 데이터 조회
-        
+        (로컬 캐시 → 공유 백엔드 순서, 백엔드 히트는 로컬 캐시에 채워 넣음)
+
         Args:
             key: 캐시 키
-        
+
         Returns:
             캐시된 데이터 또는 None
         """
-        if key not in self.cache:
-            return None
-        
-        cached_item = self.cache[key]
-        
-        # TTL 확인
-        if datetime.now() > cached_item['expires_at']:
-            # 만료된 캐시 삭제
-            del self.cache[key]
-            return None
-        
-        print(f"캐시 히트: {key}")
-        return cached_item['data']
-    
+        with self._lock:
+            cached_item = self.cache.get(key)
+            if cached_item is not None and time.monotonic() > cached_item['expires_at']:
+                # 만료된 캐시 삭제
+                self._remove(key)
+                self.expirations += 1
+                cached_item = None
+
+            if cached_item is not None:
+                self.cache.move_to_end(key)
+                self.hits += 1
+                logger.debug("캐시 히트: %s", key)
+                return cached_item['data']
+
+        data = self._backend_get(key)
+
+        with self._lock:
+            if data is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self.backend_hits += 1
+
+        self._set_local(key, data)
+        logger.debug("캐시 히트 (공유 백엔드): %s", key)
+        return data
+
     def set(self, key: str, data: Dict[str, Any]) -> None:
         """
-        캐시에 데이터 저장
-        
+        캐시에 데이터 저장 (최대 항목 수/크기 초과 시 LRU 삭제, 공유 백엔드에도 저장)
+
         Args:
             key: 캐시 키
             data: 저장할 데이터
         """
-        expires_at = datetime.now() + timedelta(seconds=self.ttl_seconds)
-        
-        self.cache[key] = {
-            'data': data,
-            'expires_at': expires_at,
-            'created_at': datetime.now()
-        }
-        
-        print(f"캐시 저장: {key} (만료: {expires_at.strftime('%H:%M:%S')})")
-    
+        self._backend_set(key, data)
+        size = self._set_local(key, data)
+        if size is not None:
+            logger.debug("캐시 저장: %s (%.1fKB, 유효 %s초)", key, size / 1024, self.ttl_seconds)
+
+    def _set_local(self, key: str, data: Dict[str, Any]) -> Optional[int]:
+        """
+        로컬 LRU에 저장
+
+        Returns:
+            저장한 항목의 추정 크기 (최대 크기 초과로 저장하지 않았으면 None)
+        """
+        size = _estimate_size(data)
+        if size > self.max_bytes:
+            with self._lock:
+                if key in self.cache:
+                    self._remove(key)
+            logger.warning("캐시 저장 생략 (로컬): %s (크기 %dB > 최대 %dB)", key, size, self.max_bytes)
+            return None
+
+        with self._lock:
+            if key in self.cache:
+                self._remove(key)
+
+            self.cache[key] = {
+                'data': data,
+                'expires_at': time.monotonic() + self.ttl_seconds,
+                'created_at': time.time(),
+                'size': size,
+            }
+            self._total_bytes += size
+
+            while len(self.cache) > self.max_entries or self._total_bytes > self.max_bytes:
+                oldest_key = next(iter(self.cache))
+                self._remove(oldest_key)
+                self.evictions += 1
+        return size
+
     def delete(self, key: str) -> None:
         """
         캐시 삭제
-        
+
         Args:
             key: 캐시 키
         """
-        if key in self.cache:
-            del self.cache[key]
-            print(f"캐시 삭제: {key}")
-    
+        with self._lock:
+            found = key in self.cache
+            if found:
+                self._remove(key)
+        if self.backend is not None:
+            self._backend_call('delete', key)
+        elif not found:
+            return
+        logger.debug("캐시 삭제: %s", key)
+
     def clear(self) -> None:
         """모든 캐시 삭제"""
-        count = len(self.cache)
-        self.cache.clear()
-        print(f"전체 캐시 삭제: {count}개")
-    
+        with self._lock:
+            count = len(self.cache)
+            self.cache.clear()
+            self._total_bytes = 0
+        if self.backend is not None:
+            self._backend_call('clear')
+        logger.info("전체 캐시 삭제 (%s): %d개", self.name, count)
+
+    def purge_expired(self) -> int:
+        """
+        만료된 항목 정리
+
+        Returns:
+            int: 삭제된 항목 수
+        """
+        now = time.monotonic()
+        with self._lock:
+            expired_keys = [
+                key for key, item in self.cache.items()
+                if now > item['expires_at']
+            ]
+            for key in expired_keys:
+                self._remove(key)
+            self.expirations += len(expired_keys)
+        return len(expired_keys)
+
     def get_stats(self) -> Dict[str, Any]:
         """
         캐시 통계
-        
+
         Returns:
             캐시 통계 정보
         """
-        # 만료된 항목 정리
-        now = datetime.now()
-        expired_keys = [
-            key for key, item in self.cache.items()
-            if now > item['expires_at']
-        ]
-        
-        for key in expired_keys:
-            del self.cache[key]
-        
-        return {
-            'total_items': len(self.cache),
-            'ttl_seconds': self.ttl_seconds,
-            'expired_cleaned': len(expired_keys)
-        }
-    
+        expired_cleaned = self.purge_expired()
+
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                'name': self.name,
+                'total_items': len(self.cache),
+                'max_entries': self.max_entries,
+                'total_bytes': self._total_bytes,
+                'max_bytes': self.max_bytes,
+                'ttl_seconds': self.ttl_seconds,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': round(self.hits / total, 4) if total else 0.0,
+                'evictions': self.evictions,
+                'expirations': self.expirations,
+                'expired_cleaned': expired_cleaned,
+                'backend': self._backend_stats(),
+                'backend_hits': self.backend_hits,
+                'backend_errors': self.backend_errors,
+            }
+
+    # ========== 공유 백엔드 ==========
+    # 백엔드 오류는 경고만 남기고 로컬 캐시만으로 계속 동작합니다.
+
+    def _backend_call(self, method: str, *args) -> Any:
+        try:
+            return getattr(self.backend, method)(self.name, *args)
+        except Exception as e:
+            with self._lock:
+                self.backend_errors += 1
+            logger.warning("공유 캐시 %s 실패 (%s): %s", method, self.name, e)
+            return None
+
+    def _backend_get(self, key: str) -> Optional[Dict[str, Any]]:
+        if self.backend is None:
+            return None
+        blob = self._backend_call('get', key)
+        if blob is None:
+            return None
+        try:
+            return deserialize_state(blob)
+        except Exception as e:
+            logger.warning("공유 캐시 항목 복원 실패 (%s:%s): %s", self.name, key, e)
+            return None
+
+    def _backend_set(self, key: str, data: Dict[str, Any]) -> None:
+        if self.backend is None:
+            return
+        self._backend_call('set', key, serialize_state(data), self.ttl_seconds)
+
+    def _backend_stats(self) -> Optional[Dict[str, Any]]:
+        if self.backend is None:
+            return None
+        return self._backend_call('get_stats')
+
     def generate_key(self, *args) -> str:
         """
         캐시 키 생성
-        
+
         Args:
             *args: 키를 구성할 값들
-        
+
         Returns:
             생성된 캐시 키
         """
@@ -120,9 +297,60 @@ class SimpleCache:
         return ':'.join(key_parts)
 
 
+# 백그라운드 만료 정리 (모든 캐시 인스턴스를 하나의 데몬 스레드에서 처리)
+_caches: 'weakref.WeakSet[SimpleCache]' = weakref.WeakSet()
+_sweeper_lock = threading.Lock()
+_sweeper: Optional[threading.Thread] = None
+
+
+def _sweep_loop() -> None:
+    while True:
+        time.sleep(SWEEP_INTERVAL_SECONDS)
+        for cache in list(_caches):
+            try:
+                cache.purge_expired()
+            except Exception as e:
+                logger.warning("캐시 만료 정리 실패 (%s): %s", cache.name, e)
+
+
+def _register(cache: SimpleCache) -> None:
+    global _sweeper
+
+    _caches.add(cache)
+    with _sweeper_lock:
+        if _sweeper is None and SWEEP_INTERVAL_SECONDS > 0:
+            _sweeper = threading.Thread(target=_sweep_loop, name='cache-sweeper', daemon=True)
+            _sweeper.start()
+
+
 # 전역 캐시 인스턴스
+# 공유 백엔드 (CACHE_BACKEND 미설정 시 None → 프로세스 메모리에만 저장)
+shared_backend = create_cache_backend()
+
 # 알람 분석 결과 캐싱 (1시간 유효)
-analysis_cache = SimpleCache(ttl_seconds=3600)
+analysis_cache = SimpleCache(
+    ttl_seconds=3600,
+    max_entries=int(os.getenv('ANALYSIS_CACHE_MAX_ENTRIES', '200')),
+    max_bytes=int(os.getenv('ANALYSIS_CACHE_MAX_MB', '64')) * 1024 * 1024,
+    name='analysis',
+    backend=shared_backend,
+)
 
 # 질문 답변 캐싱 (30분 유효)
-qa_cache = SimpleCache(ttl_seconds=1800)
\ No newline at end of file
+qa_cache = SimpleCache(
+    ttl_seconds=1800,
+    max_entries=int(os.getenv('QA_CACHE_MAX_ENTRIES', '1000')),
+    max_bytes=int(os.getenv('QA_CACHE_MAX_MB', '32')) * 1024 * 1024,
+    name='qa',
+    backend=shared_backend,
+)
+
+# Phase 1 중간 상태 캐시 (30분 유효, Phase 2 실행 시 삭제)
+# 공유 백엔드를 쓰면 Phase 2 요청이 다른 파드로 가도 세션을 찾을 수 있음
+phase1_cache = SimpleCache(
+    ttl_seconds=1800,
+    max_entries=int(os.getenv('PHASE1_CACHE_MAX_ENTRIES', '200')),
+    max_bytes=int(os.getenv('PHASE1_CACHE_MAX_MB', '64')) * 1024 * 1024,
+    name='phase1',
+    backend=shared_backend,
+)
@@ -0,0 +1,270 @@
+"""
+공유 캐시 백엔드
+
+여러 백엔드 레플리카(파드)가 알람 분석 / 질문 답변 / Phase 1 세션 캐시를 공유하기 위한 저장소입니다.
+SimpleCache는 로컬 LRU를 1차 캐시로 쓰고, 백엔드가 설정되어 있으면 2차(공유) 저장소로 사용합니다.
+
+- SQLiteCacheBackend: 공유 볼륨의 SQLite 파일 (추가 인프라 불필요)
+- RedisCacheBackend: Redis 프로토콜 서버 (Redis, Valkey, KeyDB 등)
+
+환경 변수:
+    CACHE_BACKEND: 'memory'(기본, 공유 없음) | 'sqlite' | 'redis'
+    CACHE_SQLITE_PATH: SQLite 파일 경로 (기본: ChromaDB 폴더 옆 shared_cache.sqlite3)
+    REDIS_URL: Redis 접속 URL (기본: redis://localhost:6379/0)
+"""
+
+import os
+import json
+import time
+import zlib
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Optional, Dict, Any
+
+from backend.config.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+# 이 크기(바이트) 이상인 값만 압축 (작은 값은 압축 이득보다 CPU 비용이 큼)
+_COMPRESS_THRESHOLD = 1024
+_RAW_PREFIX = b'J'
+_ZLIB_PREFIX = b'Z'
+
+
+def serialize_state(data: Dict[str, Any]) -> bytes:
+    """
+    AgentState(dict)를 공유 캐시에 저장할 바이트로 변환합니다.
+    공백 없는 JSON으로 직렬화하고, 큰 값(lot_data/eqp_data 등 포함)은 zlib으로 압축합니다.
+
+    Args:
+        data: 저장할 상태 dict
+
+    Returns:
+        bytes: 1바이트 형식 표시('J' 또는 'Z') + 본문
+    """
+    raw = json.dumps(data, ensure_ascii=False, separators=(',', ':'), default=str).encode('utf-8')
+    if len(raw) < _COMPRESS_THRESHOLD:
+        return _RAW_PREFIX + raw
+    return _ZLIB_PREFIX + zlib.compress(raw, 6)
+
+
+def deserialize_state(blob: bytes) -> Dict[str, Any]:
+    """
+    serialize_state()로 저장한 바이트를 dict로 복원합니다.
+
+    Args:
+        blob: 저장된 바이트
+
+    Returns:
+        Dict: 복원된 상태 (datetime 등은 문자열로 복원됨)
+    """
+    prefix, body = blob[:1], blob[1:]
+    if prefix == _ZLIB_PREFIX:
+        body = zlib.decompress(body)
+    return json.loads(body.decode('utf-8'))
+
+
+class CacheBackend:
+    """
+    공유 캐시 백엔드 인터페이스
+
+    모든 키는 네임스페이스(캐시 이름)별로 구분됩니다.
+    구현체는 스레드 안전해야 하며, 저장소 오류는 예외로 전달합니다.
+    (SimpleCache가 경고를 남기고 로컬 캐시만으로 동작합니다)
+    """
+
+    name = 'base'
+
+    def get(self, namespace: str, key: str) -> Optional[bytes]:
+        raise NotImplementedError
+
+    def set(self, namespace: str, key: str, value: bytes, ttl_seconds: float) -> None:
+        raise NotImplementedError
+
+    def delete(self, namespace: str, key: str) -> None:
+        raise NotImplementedError
+
+    def clear(self, namespace: str) -> None:
+        raise NotImplementedError
+
+    def get_stats(self, namespace: str) -> Dict[str, Any]:
+        return {'type': self.name}
+
+
+def _default_sqlite_path() -> str:
+    """ChromaDB 데이터 폴더 옆에 캐시 파일을 둡니다 (같은 볼륨에 유지)."""
+    chroma_path = Path(os.getenv('CHROMA_DB_PATH', './data/chromadb'))
+    return str(chroma_path.parent / 'shared_cache.sqlite3')
+
+
+class SQLiteCacheBackend(CacheBackend):
+    """
+    SQLite 파일 기반 공유 캐시
+
+    여러 파드가 같은 볼륨(ReadWriteMany PVC 등)의 파일을 사용하면 캐시를 공유합니다.
+    만료 항목은 조회 시 무시하고, 저장 시 주기적으로 삭제합니다.
+    """
+
+    name = 'sqlite'
+
+    # 만료 항목 삭제 주기 (초)
+    PURGE_INTERVAL_SECONDS = 300
+
+    def __init__(self, db_path: str = None):
+        """
+        Args:
+            db_path: SQLite 파일 경로 (None이면 ChromaDB 폴더 옆)
+        """
+        self.db_path = db_path or _default_sqlite_path()
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._last_purge = 0.0
+
+    def _get_conn(self) -> sqlite3.Connection:
+        """SQLite 연결을 lazy 생성합니다. (락 보유 상태에서 호출)"""
+        if self._conn is None:
+            Path(self.db_path).parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(self.db_path, timeout=10, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS cache_entries (
+                    namespace TEXT NOT NULL,
+                    key TEXT NOT NULL,
+                    value BLOB NOT NULL,
+                    expires_at REAL NOT NULL,
+                    PRIMARY KEY (namespace, key)
+                )
+                """
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_cache_entries_expires ON cache_entries(expires_at)"
+            )
+            conn.commit()
+            self._conn = conn
+        return self._conn
+
+    def get(self, namespace: str, key: str) -> Optional[bytes]:
+        with self._lock:
+            row = self._get_conn().execute(
+                "SELECT value FROM cache_entries WHERE namespace = ? AND key = ? AND expires_at > ?",
+                (namespace, key, time.time()),
+            ).fetchone()
+        return row[0] if row else None
+
+    def set(self, namespace: str, key: str, value: bytes, ttl_seconds: float) -> None:
+        now = time.time()
+        with self._lock:
+            conn = self._get_conn()
+            conn.execute(
+                "INSERT OR REPLACE INTO cache_entries (namespace, key, value, expires_at) "
+                "VALUES (?, ?, ?, ?)",
+                (namespace, key, sqlite3.Binary(value), now + ttl_seconds),
+            )
+            if now - self._last_purge > self.PURGE_INTERVAL_SECONDS:
+                conn.execute("DELETE FROM cache_entries WHERE expires_at <= ?", (now,))
+                self._last_purge = now
+            conn.commit()
+
+    def delete(self, namespace: str, key: str) -> None:
+        with self._lock:
+            conn = self._get_conn()
+            conn.execute(
+                "DELETE FROM cache_entries WHERE namespace = ? AND key = ?", (namespace, key)
+            )
+            conn.commit()
+
+    def clear(self, namespace: str) -> None:
+        with self._lock:
+            conn = self._get_conn()
+            conn.execute("DELETE FROM cache_entries WHERE namespace = ?", (namespace,))
+            conn.commit()
+
+    def get_stats(self, namespace: str) -> Dict[str, Any]:
+        with self._lock:
+            row = self._get_conn().execute(
+                "SELECT COUNT(*), COALESCE(SUM(LENGTH(value)), 0) FROM cache_entries "
+                "WHERE namespace = ? AND expires_at > ?",
+                (namespace, time.time()),
+            ).fetchone()
+        return {'type': self.name, 'items': row[0], 'bytes': row[1], 'db_path': self.db_path}
+
+
+class RedisCacheBackend(CacheBackend):
+    """
+    Redis 프로토콜 기반 공유 캐시
+
+    키 형식: {prefix}{namespace}:{key}, 만료는 서버 TTL(SETEX)에 맡깁니다.
+    redis 패키지가 필요합니다. (pip install redis)
+    """
+
+    name = 'redis'
+
+    def __init__(self, url: str = None, prefix: str = 'kpi:'):
+        """
+        Args:
+            url: Redis 접속 URL (None이면 REDIS_URL 환경 변수)
+            prefix: 다른 서비스와 키가 겹치지 않도록 붙이는 접두사
+        """
+        try:
+            import redis
+        except ImportError as e:
+            raise ImportError("CACHE_BACKEND=redis 사용 시 redis 패키지가 필요합니다: pip install redis") from e
+
+        self.url = url or os.getenv('REDIS_URL', 'redis://localhost:6379/0')
+        self.prefix = prefix
+        self._client = redis.Redis.from_url(self.url, socket_timeout=2, socket_connect_timeout=2)
+
+    def _key(self, namespace: str, key: str) -> str:
+        return f"{self.prefix}{namespace}:{key}"
+
+    def get(self, namespace: str, key: str) -> Optional[bytes]:
+        return self._client.get(self._key(namespace, key))
+
+    def set(self, namespace: str, key: str, value: bytes, ttl_seconds: float) -> None:
+        self._client.set(self._key(namespace, key), value, px=max(int(ttl_seconds * 1000), 1))
+
+    def delete(self, namespace: str, key: str) -> None:
+        self._client.delete(self._key(namespace, key))
+
+    def clear(self, namespace: str) -> None:
+        pattern = self._key(namespace, '*')
+        batch = []
+        for redis_key in self._client.scan_iter(match=pattern, count=500):
+            batch.append(redis_key)
+            if len(batch) >= 500:
+                self._client.delete(*batch)
+                batch = []
+        if batch:
+            self._client.delete(*batch)
+
+    def get_stats(self, namespace: str) -> Dict[str, Any]:
+        # 키 전체 스캔은 비용이 크므로 접속 정보만 반환
+        return {'type': self.name, 'url': self.url.split('@')[-1]}
+
+
+def create_cache_backend(backend_type: str = None) -> Optional[CacheBackend]:
+    """
+    환경 변수(CACHE_BACKEND)에 맞는 공유 캐시 백엔드를 생성합니다.
+
+    Args:
+        backend_type: 'memory' | 'sqlite' | 'redis' (None이면 CACHE_BACKEND)
+
+    Returns:
+        CacheBackend 또는 None ('memory'이거나 생성 실패 시 → 로컬 캐시만 사용)
+    """
+    backend_type = (backend_type or os.getenv('CACHE_BACKEND', 'memory')).lower()
+    try:
+        if backend_type == 'sqlite':
+            return SQLiteCacheBackend(db_path=os.getenv('CACHE_SQLITE_PATH') or None)
+        if backend_type == 'redis':
+            return RedisCacheBackend()
+    except Exception as e:
+        logger.warning("공유 캐시 백엔드(%s) 생성 실패, 로컬 캐시만 사용: %s", backend_type, e)
+        return None
+
+    if backend_type != 'memory':
+        logger.warning("알 수 없는 CACHE_BACKEND: %s (로컬 캐시만 사용)", backend_type)
+    return None
@@ -3,11 +3,26 @@ ChromaDB ↔ S3 동기화 유틸리티
 
 파드 재시작 시 S3에서 ChromaDB 데이터를 복원하고,
 add/delete 이후 S3에 백업합니다.
+
+증분 동기화:
+- S3에 manifest(_manifest.json: 파일별 MD5/크기)를 함께 저장
+- 업로드/다운로드는 manifest와 해시가 다른 파일만 병렬로 전송 (대용량은 multipart)
+- add/delete 이후에는 schedule_sync_to_s3()로 디바운스된 백그라운드 백업
 """
 
 import os
+import json
+import hashlib
+import threading
 import boto3
+from boto3.s3.transfer import TransferConfig
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from typing import Dict, Any, Optional
+
+from backend.config.logging_config import get_logger
+
+logger = get_logger(__name__)
 
 # ChromaDB 로컬 경로 (chroma_config.py와 동일한 기본값)
 _LOCAL_DIR = Path(os.getenv("CHROMA_DB_PATH", "./data/chromadb"))
@@ -15,6 +30,27 @@ _LOCAL_DIR = Path(os.getenv("CHROMA_DB_PATH", "./data/chromadb"))
 # S3 위치: team4-bucket/chromadb/
 _S3_BUCKET = os.getenv("S3_BUCKET", "ag-prod-s3-bucket")
 _S3_PREFIX = os.getenv("S3_PREFIX", "team4-bucket/") + "chromadb/"
+_MANIFEST_KEY = _S3_PREFIX + "_manifest.json"
+
+# 병렬 전송 설정
+_MAX_WORKERS = int(os.getenv("S3_SYNC_MAX_WORKERS", "8"))
+_TRANSFER_CONFIG = TransferConfig(
+    multipart_threshold=8 * 1024 * 1024,
+    multipart_chunksize=8 * 1024 * 1024,
+    max_concurrency=4,
+)
+
+# 백업 디바운스 시간 (초): 이 시간 동안 추가 변경이 없으면 백업 실행
+_DEBOUNCE_SECONDS = float(os.getenv("S3_SYNC_DEBOUNCE_SECONDS", "5"))
+
+# 마지막으로 S3와 일치한 manifest ({상대경로: {md5, size}}), None이면 S3에서 로드
+_remote_manifest: Optional[Dict[str, Dict[str, Any]]] = None
+# 로컬 해시 캐시 ({상대경로: (size, mtime_ns, md5)}) — 변경 없는 파일 재해시 방지
+_hash_cache: Dict[str, tuple] = {}
+
+_sync_lock = threading.Lock()
+_timer_lock = threading.Lock()
+_pending_timer: Optional[threading.Timer] = None
 
 
 def _s3():
@@ -26,62 +62,199 @@ def _s3():
     )
 
 
+def _file_md5(path: Path) -> str:
+    digest = hashlib.md5()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _build_local_manifest() -> Dict[str, Dict[str, Any]]:
+    """
+    로컬 ChromaDB 폴더의 manifest를 생성합니다.
+    크기/수정 시각이 그대로인 파일은 이전 해시를 재사용합니다.
+    """
+    manifest = {}
+    for local_file in _LOCAL_DIR.rglob("*"):
+        if not local_file.is_file():
+            continue
+        rel = str(local_file.relative_to(_LOCAL_DIR)).replace("\\", "/")
+        stat = local_file.stat()
+        cached = _hash_cache.get(rel)
+        if cached and cached[0] == stat.st_size and cached[1] == stat.st_mtime_ns:
+            md5 = cached[2]
+        else:
+            md5 = _file_md5(local_file)
+            _hash_cache[rel] = (stat.st_size, stat.st_mtime_ns, md5)
+        manifest[rel] = {"md5": md5, "size": stat.st_size}
+    return manifest
+
+
+def _load_remote_manifest(client) -> Dict[str, Dict[str, Any]]:
+    """S3 manifest를 읽습니다. 없으면 빈 manifest."""
+    try:
+        body = client.get_object(Bucket=_S3_BUCKET, Key=_MANIFEST_KEY)["Body"].read()
+        return json.loads(body)
+    except client.exceptions.NoSuchKey:
+        return {}
+
+
 def sync_from_s3() -> int:
     """
     S3 → 로컬: 파드 시작 시 기존 ChromaDB 데이터 복원.
+    로컬 파일과 해시가 다른 파일만 병렬로 다운로드합니다.
 
     Returns:
-        int: 다운로드된 파일 수 (0 이면 S3에 데이터 없음 = 첫 실행)
+        int: 다운로드된 파일 수 (0 이면 S3에 데이터 없음 = 첫 실행, 또는 이미 최신)
     """
+    global _remote_manifest
+
     _LOCAL_DIR.mkdir(parents=True, exist_ok=True)
     try:
         client = _s3()
-        paginator = client.get_paginator("list_objects_v2")
-        count = 0
-        for page in paginator.paginate(Bucket=_S3_BUCKET, Prefix=_S3_PREFIX):
-            for obj in page.get("Contents", []):
-                key = obj["Key"]
-                rel = key[len(_S3_PREFIX):]
-                if not rel:  # prefix 자체는 건너뜀
-                    continue
-                local_path = _LOCAL_DIR / rel
-                local_path.parent.mkdir(parents=True, exist_ok=True)
-                client.download_file(_S3_BUCKET, key, str(local_path))
-                count += 1
-
-        if count:
-            print(f"[ChromaDB S3] ↓ S3에서 {count}개 파일 복원 완료")
+        remote = _load_remote_manifest(client)
+
+        if not remote:
+            # manifest가 없는 이전 방식 백업은 전체 다운로드
+            remote = {}
+            paginator = client.get_paginator("list_objects_v2")
+            for page in paginator.paginate(Bucket=_S3_BUCKET, Prefix=_S3_PREFIX):
+                for obj in page.get("Contents", []):
+                    rel = obj["Key"][len(_S3_PREFIX):]
+                    if rel and obj["Key"] != _MANIFEST_KEY:
+                        remote[rel] = {"md5": None, "size": obj["Size"]}
+
+        local = _build_local_manifest()
+        targets = [
+            rel for rel, info in remote.items()
+            if info.get("md5") is None or local.get(rel, {}).get("md5") != info["md5"]
+        ]
+
+        def _download(rel: str) -> None:
+            local_path = _LOCAL_DIR / rel
+            local_path.parent.mkdir(parents=True, exist_ok=True)
+            client.download_file(_S3_BUCKET, _S3_PREFIX + rel, str(local_path),
+                                 Config=_TRANSFER_CONFIG)
+
+        with ThreadPoolExecutor(max_workers=_MAX_WORKERS) as executor:
+            list(executor.map(_download, targets))
+
+        if any(info.get("md5") for info in remote.values()):
+            _remote_manifest = remote
+
+        if targets:
+            logger.info("[ChromaDB S3] ↓ S3에서 %d개 파일 복원 완료 (변경 없음 %d개)",
+                        len(targets), len(remote) - len(targets))
+        elif remote:
+            logger.info("[ChromaDB S3] 로컬 데이터가 S3와 동일 (다운로드 생략)")
         else:
-            print("[ChromaDB S3] S3에 기존 데이터 없음 (첫 실행)")
-        return count
+            logger.info("[ChromaDB S3] S3에 기존 데이터 없음 (첫 실행)")
+        return len(targets)
 
     except Exception as e:
-        print(f"[ChromaDB S3] 경고: S3 복원 실패 (무시하고 계속): {e}")
+        logger.warning("[ChromaDB S3] S3 복원 실패 (무시하고 계속): %s", e)
         return 0
 
 
 def sync_to_s3() -> int:
     """
-    로컬 → S3: add/delete 이후 ChromaDB 전체를 S3에 백업.
+    로컬 → S3: add/delete 이후 변경된 ChromaDB 파일만 S3에 백업.
+    로컬에서 사라진 파일은 S3에서도 삭제하고, 마지막에 manifest를 갱신합니다.
 
     Returns:
         int: 업로드된 파일 수
     """
+    global _remote_manifest
+
     if not _LOCAL_DIR.exists():
         return 0
-    try:
-        client = _s3()
-        count = 0
-        for local_file in _LOCAL_DIR.rglob("*"):
-            if local_file.is_file():
-                rel = local_file.relative_to(_LOCAL_DIR)
-                s3_key = _S3_PREFIX + str(rel).replace("\\", "/")
-                client.upload_file(str(local_file), _S3_BUCKET, s3_key)
-                count += 1
+    with _sync_lock:
+        try:
+            client = _s3()
+            if _remote_manifest is None:
+                _remote_manifest = _load_remote_manifest(client)
 
-        print(f"[ChromaDB S3] ↑ S3에 {count}개 파일 백업 완료")
-        return count
+            local = _build_local_manifest()
+            changed = [
+                rel for rel, info in local.items()
+                if _remote_manifest.get(rel, {}).get("md5") != info["md5"]
+            ]
+            removed = [rel for rel in _remote_manifest if rel not in local]
 
-    except Exception as e:
-        print(f"[ChromaDB S3] 경고: S3 백업 실패: {e}")
+            def _upload(rel: str) -> None:
+                client.upload_file(str(_LOCAL_DIR / rel), _S3_BUCKET, _S3_PREFIX + rel,
+                                   Config=_TRANSFER_CONFIG)
+
+            with ThreadPoolExecutor(max_workers=_MAX_WORKERS) as executor:
+                list(executor.map(_upload, changed))
+
+            for i in range(0, len(removed), 1000):
+                client.delete_objects(
+                    Bucket=_S3_BUCKET,
+                    Delete={"Objects": [{"Key": _S3_PREFIX + rel} for rel in removed[i:i + 1000]]},
+                )
+
+            if changed or removed or not _remote_manifest:
+                client.put_object(
+                    Bucket=_S3_BUCKET,
+                    Key=_MANIFEST_KEY,
+                    Body=json.dumps(local),
+                    ContentType="application/json",
+                )
+            _remote_manifest = local
+
+            uploaded_bytes = sum(local[rel]["size"] for rel in changed)
+            logger.info("[ChromaDB S3] ↑ S3에 %d개 파일 백업 완료 (%.1fKB, 삭제 %d개, 변경 없음 %d개)",
+                        len(changed), uploaded_bytes / 1024, len(removed), len(local) - len(changed))
+            return len(changed)
+
+        except Exception as e:
+            # manifest를 다시 읽도록 초기화 (다음 백업에서 전체 비교)
+            _remote_manifest = None
+            logger.warning("[ChromaDB S3] S3 백업 실패: %s", e)
+            return 0
+
+
+def schedule_sync_to_s3(delay: float = None) -> None:
+    """
+    S3 백업을 백그라운드로 예약합니다.
+    delay 안에 다시 호출되면 타이머를 다시 시작하여 연속 변경을 한 번에 백업합니다.
+
+    Args:
+        delay: 디바운스 시간 (초, 기본 S3_SYNC_DEBOUNCE_SECONDS)
+    """
+    global _pending_timer
+
+    if delay is None:
+        delay = _DEBOUNCE_SECONDS
+    with _timer_lock:
+        if _pending_timer is not None:
+            _pending_timer.cancel()
+        _pending_timer = threading.Timer(delay, _run_scheduled_sync)
+        _pending_timer.name = "chromadb-s3-sync"
+        _pending_timer.start()
+
+
+def _run_scheduled_sync() -> None:
+    global _pending_timer
+    with _timer_lock:
+        _pending_timer = None
+    sync_to_s3()
+
+
+def flush_pending_sync() -> int:
+    """
+    예약된 백업이 있으면 즉시 실행합니다. (서버 종료 시 호출)
+
+    Returns:
+        int: 업로드된 파일 수 (예약된 백업이 없으면 0)
+    """
+    global _pending_timer
+
+    with _timer_lock:
+        timer, _pending_timer = _pending_timer, None
+    if timer is None:
         return 0
+    timer.cancel()
+    return sync_to_s3()
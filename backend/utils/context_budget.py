@@ -0,0 +1,128 @@
+"""
+LLM 프롬프트 컨텍스트 토큰 예산
+
+Claude 입력 토큰 수에 비례해 비용과 지연이 늘어나므로, 컨텍스트를 섹션 단위로 만들고
+예산을 넘으면 중요도가 낮은 섹션부터 제외합니다.
+
+- 토큰 수는 tokenizer 없이 추정합니다 (한글 등 비ASCII 1자 ≈ 1토큰, ASCII 4자 ≈ 1토큰).
+  실제보다 약간 크게 잡히는 보수적인 값입니다.
+- 섹션 priority: 0(필수) < 1 < 2 < ... 숫자가 클수록 먼저 제외
+- 필수 섹션만으로도 예산을 넘으면 마지막 섹션을 줄 단위로 잘라 맞춥니다.
+
+예:
+    >>> text, info = build_budgeted_context([
+    ...     ContextSection('kpi', kpi_text, priority=0),
+    ...     ContextSection('trend', trend_text, priority=2),
+    ... ], max_tokens=1500)
+    >>> info['tokens'], info['dropped']
+"""
+
+import math
+from typing import List, Dict, Any, Tuple
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    텍스트의 대략적인 토큰 수
+
+    Args:
+        text: 프롬프트 텍스트
+
+    Returns:
+        int: 추정 토큰 수 (한글 1자 ≈ 1토큰, ASCII 4자 ≈ 1토큰)
+    """
+    if not text:
+        return 0
+    ascii_chars = sum(1 for ch in text if ord(ch) < 128)
+    return (len(text) - ascii_chars) + math.ceil(ascii_chars / 4)
+
+
+class ContextSection:
+    """
+    컨텍스트 섹션 하나 (이름, 본문, 중요도)
+    """
+
+    __slots__ = ('name', 'text', 'priority')
+
+    def __init__(self, name: str, text: str, priority: int = 1):
+        """
+        Args:
+            name: 섹션 이름 (제외 목록 / 로그에 사용)
+            text: 섹션 본문
+            priority: 0이면 필수, 클수록 예산 초과 시 먼저 제외
+        """
+        self.name = name
+        self.text = text
+        self.priority = priority
+
+
+def _truncate_lines(text: str, max_tokens: int) -> str:
+    """줄 단위로 앞에서부터 max_tokens 이내만 남김"""
+    kept, used = [], 0
+    for line in text.split('\n'):
+        cost = estimate_tokens(line) + 1
+        if used + cost > max_tokens:
+            kept.append('... (토큰 예산 초과로 이하 생략)')
+            break
+        kept.append(line)
+        used += cost
+    return '\n'.join(kept)
+
+
+def build_budgeted_context(
+    sections: List[ContextSection],
+    max_tokens: int,
+    separator: str = '\n\n',
+) -> Tuple[str, Dict[str, Any]]:
+    """
+    토큰 예산 안에서 섹션을 합칩니다. (원래 순서 유지, 중요도 낮은 섹션부터 제외)
+
+    Args:
+        sections: 출력 순서대로의 섹션 목록 (빈 섹션은 무시)
+        max_tokens: 토큰 예산 (0 이하면 제한 없음)
+        separator: 섹션 구분자
+
+    Returns:
+        Tuple:
+            - 합친 컨텍스트 텍스트
+            - {'tokens', 'budget', 'original_tokens', 'dropped': [섹션 이름], 'truncated': bool}
+    """
+    kept = [s for s in sections if s.text and s.text.strip()]
+    join = lambda items: separator.join(s.text for s in items)
+    original_tokens = estimate_tokens(join(kept))
+    dropped: List[str] = []
+    truncated = False
+
+    if max_tokens and max_tokens > 0:
+        # 중요도 낮은 섹션부터, 같은 중요도면 뒤쪽 섹션부터 제외
+        candidates = sorted(
+            (i for i, s in enumerate(kept) if s.priority > 0),
+            key=lambda i: (kept[i].priority, i), reverse=True,
+        )
+        removed = set()
+        for i in candidates:
+            if estimate_tokens(join(s for j, s in enumerate(kept) if j not in removed)) <= max_tokens:
+                break
+            removed.add(i)
+            dropped.append(kept[i].name)
+        kept = [s for j, s in enumerate(kept) if j not in removed]
+
+        if kept and estimate_tokens(join(kept)) > max_tokens:
+            head_tokens = estimate_tokens(join(kept[:-1] + [ContextSection('', '')]))
+            last = kept[-1]
+            kept[-1] = ContextSection(
+                last.name, _truncate_lines(last.text, max(max_tokens - head_tokens, 0)), last.priority,
+            )
+            truncated = True
+
+    text = join(kept)
+    if dropped:
+        text += f"{separator}(토큰 예산 초과로 생략된 섹션: {', '.join(dropped)})"
+
+    return text, {
+        'tokens': estimate_tokens(text),
+        'budget': max_tokens,
+        'original_tokens': original_tokens,
+        'dropped': dropped,
+        'truncated': truncated,
+    }
@@ -0,0 +1,269 @@
+"""
+대시보드 요약 엔진 (최신 KPI / 알람 건수)
+
+대시보드 상단 카드를 그릴 때마다 kpi_daily 전체를 읽어 정렬·집계하지 않도록,
+요약에 필요한 값만 메모리에 유지하고 조회는 딕셔너리 조회로 끝냅니다.
+
+- 장비별 최신 KPI 행, 전체 최신 행 (date 내림차순, 같은 날짜면 eqp_id 오름차순)
+- 전체 / 장비별 행 수와 알람(alarm_flag=1) 건수 누계
+- 증분 갱신: 마지막으로 반영한 날짜(워터마크)부터만 다시 읽고, 그 날짜들의 건수는 빼고 다시 더함
+- full_refresh_seconds마다 전체 재적재
+  (워터마크 이전 날짜에 나중에 채워지거나 수정된 행은 증분 갱신에 드러나지 않으므로)
+- 메모리 요약을 처음 만들지 못하면 DB 집계 조회로 대체
+  (ORDER BY date DESC LIMIT 1 + count(*) FILTER (WHERE alarm_flag = 1))
+
+소스(supabase_config / rds_config)는 다음 메서드를 제공합니다:
+    get_kpi_daily_since(since_date) → 요약 컬럼만의 kpi_daily 행
+    get_kpi_summary(eqp_id)         → {'latest', 'total_count', 'alarm_count'} (DB 집계)
+
+환경 변수:
+    DASHBOARD_SUMMARY_REFRESH_SECONDS: 조회 시 자동 증분 갱신 주기 (기본 60초)
+    DASHBOARD_SUMMARY_FULL_REFRESH_SECONDS: 전체 재적재 주기 (기본 3600초, 0이면 하지 않음)
+"""
+
+import os
+import time
+import threading
+from typing import Optional, Dict, Any, List, Tuple
+
+from backend.config.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+# 요약 카드에 필요한 kpi_daily 컬럼
+SUMMARY_FIELDS = ('date', 'eqp_id', 'oee_v', 'oee_t', 'thp_v', 'thp_t',
+                  'tat_v', 'tat_t', 'wip_v', 'wip_t', 'alarm_flag')
+
+
+def _is_newer(row: Dict[str, Any], current: Optional[Dict[str, Any]]) -> bool:
+    """
+    row가 current보다 앞서거나 같은 행인지 (date 내림차순, 같은 날짜면 eqp_id 오름차순)
+    같은 행을 다시 읽은 경우에도 True → 최신 값으로 교체
+    """
+    if current is None:
+        return True
+    if row['date'] != current['date']:
+        return row['date'] > current['date']
+    return row['eqp_id'] <= current['eqp_id']
+
+
+class DashboardSummaryEngine:
+    """
+    kpi_daily 요약 (장비별 / 전체 최신 행, 알람 건수 누계)
+    """
+
+    def __init__(self, source=None, backend: str = 'supabase', refresh_seconds: float = 60,
+                 full_refresh_seconds: float = 3600):
+        """
+        Args:
+            source: get_kpi_daily_since / get_kpi_summary를 제공하는 객체
+                    (None이면 첫 조회 시 backend의 전역 설정 객체 사용)
+            backend: 'supabase' 또는 'rds'
+            refresh_seconds: 조회 시 자동 증분 갱신 주기 (초, 0이면 수동 갱신만)
+            full_refresh_seconds: 조회 시 자동 전체 재적재 주기 (초, 0이면 하지 않음)
+        """
+        self._source = source
+        self.backend = backend
+        self.refresh_seconds = refresh_seconds
+        self.full_refresh_seconds = full_refresh_seconds
+
+        self._lock = threading.Lock()
+        self._latest_by_eqp: Dict[str, Dict[str, Any]] = {}
+        self._latest: Optional[Dict[str, Any]] = None
+        # (date, eqp_id) → [행 수, 알람 수]  (증분 갱신 시 다시 읽은 날짜만 교체)
+        self._day_counts: Dict[Tuple[str, str], List[int]] = {}
+        self._eqp_counts: Dict[str, List[int]] = {}
+        self._total = [0, 0]
+
+        self.watermark: Optional[str] = None
+        self.last_refresh: Optional[float] = None
+        self.last_full: Optional[float] = None
+        self.refreshes = 0
+        self.full_refreshes = 0
+        self.fallbacks = 0
+
+    @property
+    def source(self):
+        if self._source is None:
+            if self.backend == 'rds':
+                from backend.config.rds_config import rds_config
+                self._source = rds_config
+            else:
+                from backend.config.supabase_config import supabase_config
+                self._source = supabase_config
+        return self._source
+
+    # ──────────────────────────────────────────────────────────────
+    # 갱신
+    # ──────────────────────────────────────────────────────────────
+
+    def refresh(self, full: bool = False) -> Dict[str, Any]:
+        """
+        요약 갱신 (워터마크 날짜부터 다시 읽어 그 날짜들의 값 교체)
+
+        Args:
+            full: True면 전체 재적재
+
+        Returns:
+            Dict: {'mode', 'rows', 'eqps', 'elapsed_ms'}
+        """
+        with self._lock:
+            return self._refresh_locked(full)
+
+    def _refresh_locked(self, full: bool) -> Dict[str, Any]:
+        started = time.perf_counter()
+        full = full or self.watermark is None
+        since = None if full else self.watermark
+
+        rows = self.source.get_kpi_daily_since(since_date=since)
+
+        if full:
+            self._latest_by_eqp.clear()
+            self._latest = None
+            self._day_counts.clear()
+            self._eqp_counts.clear()
+            self._total = [0, 0]
+        else:
+            for key in [k for k in self._day_counts if k[0] >= since]:
+                self._add_counts(key, *(-n for n in self._day_counts.pop(key)))
+
+        for raw in rows:
+            row = {f: raw.get(f) for f in SUMMARY_FIELDS}
+            row['date'] = str(row['date'])[:10]
+            row['eqp_id'] = row['eqp_id'] or ''
+            self._add_counts((row['date'], row['eqp_id']), 1, 1 if row['alarm_flag'] == 1 else 0)
+            current = self._latest_by_eqp.get(row['eqp_id'])
+            if current is None or row['date'] >= current['date']:
+                self._latest_by_eqp[row['eqp_id']] = row
+            if _is_newer(row, self._latest):
+                self._latest = row
+
+        if self._latest is not None:
+            self.watermark = self._latest['date']
+        self.last_refresh = time.monotonic()
+        self.refreshes += 1
+        if full:
+            self.last_full = self.last_refresh
+            self.full_refreshes += 1
+
+        elapsed_ms = round((time.perf_counter() - started) * 1000, 1)
+        mode = 'full' if full else 'incremental'
+        logger.info("대시보드 요약 갱신(%s, %s): %d행 반영 (%sms)", mode, self.backend, len(rows), elapsed_ms)
+        return {'mode': mode, 'rows': len(rows), 'eqps': len(self._latest_by_eqp), 'elapsed_ms': elapsed_ms}
+
+    def _add_counts(self, key: Tuple[str, str], rows: int, alarms: int) -> None:
+        """(date, eqp_id) 버킷과 장비별 / 전체 누계에 함께 더함 (음수면 빼기)"""
+        day = self._day_counts.setdefault(key, [0, 0])
+        eqp = self._eqp_counts.setdefault(key[1], [0, 0])
+        for counts in (day, eqp, self._total):
+            counts[0] += rows
+            counts[1] += alarms
+
+    def _ensure_fresh(self) -> None:
+        """
+        처음 조회하거나 갱신 주기가 지났으면 갱신 (락 보유 상태에서 호출)
+        전체 재적재 주기가 지났으면 증분 대신 전체 재적재
+        """
+        now = time.monotonic()
+        if self.last_refresh is None:
+            self._refresh_locked(full=True)
+            return
+        full_due = (self.full_refresh_seconds and self.last_full is not None
+                    and now - self.last_full > self.full_refresh_seconds)
+        if full_due or (self.refresh_seconds and now - self.last_refresh > self.refresh_seconds):
+            try:
+                self._refresh_locked(full=bool(full_due))
+            except Exception as e:
+                # 이전 요약으로 응답 (다음 조회에서 다시 시도)
+                self.last_refresh = time.monotonic()
+                logger.warning("대시보드 요약 갱신 실패(%s), 이전 값 사용: %s", self.backend, e)
+
+    def invalidate(self, reason: str = '') -> None:
+        """
+        전체 무효화 (다음 조회 시 전체 재적재)
+
+        Args:
+            reason: 로그에 남길 사유
+        """
+        with self._lock:
+            self.watermark = None
+            self.last_refresh = None
+            self.last_full = None
+        logger.info("대시보드 요약 무효화(%s)%s", self.backend, f" ({reason})" if reason else "")
+
+    # ──────────────────────────────────────────────────────────────
+    # 조회
+    # ──────────────────────────────────────────────────────────────
+
+    def get_summary(self, eqp_id: str = None) -> Dict[str, Any]:
+        """
+        대시보드 요약
+
+        Args:
+            eqp_id: 지정하면 해당 장비의 최신 행 / 건수
+
+        Returns:
+            Dict: {'latest': 최신 행 또는 None, 'alarm_count', 'total_count',
+                   'eqp_count', 'watermark', 'source': 'memory' | 'database'}
+        """
+        with self._lock:
+            try:
+                self._ensure_fresh()
+            except Exception as e:
+                logger.warning("대시보드 요약 적재 실패(%s), DB 집계로 대체: %s", self.backend, e)
+            else:
+                if eqp_id:
+                    latest = self._latest_by_eqp.get(eqp_id)
+                    rows, alarms = self._eqp_counts.get(eqp_id, [0, 0])
+                else:
+                    latest = self._latest
+                    rows, alarms = self._total
+                return {
+                    'latest': dict(latest) if latest else None,
+                    'alarm_count': alarms,
+                    'total_count': rows,
+                    'eqp_count': len(self._latest_by_eqp),
+                    'watermark': self.watermark,
+                    'source': 'memory',
+                }
+
+        self.fallbacks += 1
+        summary = self.source.get_kpi_summary(eqp_id=eqp_id)
+        return {**summary, 'eqp_count': None, 'watermark': None, 'source': 'database'}
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        엔진 통계
+
+        Returns:
+            요약 상태 정보
+        """
+        with self._lock:
+            return {
+                'backend': self.backend,
+                'eqps': len(self._latest_by_eqp),
+                'day_buckets': len(self._day_counts),
+                'total_count': self._total[0],
+                'alarm_count': self._total[1],
+                'watermark': self.watermark,
+                'refresh_seconds': self.refresh_seconds,
+                'full_refresh_seconds': self.full_refresh_seconds,
+                'seconds_since_refresh': (
+                    round(time.monotonic() - self.last_refresh, 1) if self.last_refresh else None
+                ),
+                'refreshes': self.refreshes,
+                'full_refreshes': self.full_refreshes,
+                'fallbacks': self.fallbacks,
+            }
+
+
+_REFRESH_SECONDS = float(os.getenv('DASHBOARD_SUMMARY_REFRESH_SECONDS', '60'))
+_FULL_REFRESH_SECONDS = float(os.getenv('DASHBOARD_SUMMARY_FULL_REFRESH_SECONDS', '3600'))
+
+# 전역 대시보드 요약 엔진 (Supabase: /api/dashboard-summary, RDS: /api/rds/dashboard-summary)
+dashboard_summary = DashboardSummaryEngine(
+    backend='supabase', refresh_seconds=_REFRESH_SECONDS, full_refresh_seconds=_FULL_REFRESH_SECONDS,
+)
+rds_dashboard_summary = DashboardSummaryEngine(
+    backend='rds', refresh_seconds=_REFRESH_SECONDS, full_refresh_seconds=_FULL_REFRESH_SECONDS,
+)
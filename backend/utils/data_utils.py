@@ -1,7 +1,10 @@
 """
 데이터 처리 및 분석 유틸리티 함수
 """
+import os
+from datetime import datetime
 from backend.config.supabase_config import supabase_config
+from backend.utils.paging import encode_cursor
 from typing import Dict, List, Any, Tuple
 
 def get_latest_alarm():
@@ -35,6 +38,36 @@ def get_latest_alarm():
         'eqp_id': latest['eqp_id'],
     }
 
+def get_recent_alarms(
+    since_date: str = None,
+    limit: int = 20,
+    after: Tuple[str, str] = None
+) -> List[Dict[str, Any]]:
+    """
+    최근 알람 목록을 조회합니다. (알람 워처 폴링용)
+
+    kpi_daily 테이블에서 alarm_flag=1인 레코드를 (date, eqp_id) 내림차순으로 찾습니다.
+    순서가 고정되어 있으므로 after로 이어 읽으면 같은 날짜의 알람이 limit보다 많아도 모두 조회됩니다.
+
+    Args:
+        since_date: 이 날짜(YYYY-MM-DD, 포함) 이후만 조회 (None이면 전체)
+        limit: 최대 개수
+        after: 이전 페이지의 마지막 (date, eqp_id) (None이면 처음부터)
+
+    Returns:
+        List[dict]: [{date, eqp_id}] (최신순)
+    """
+    page = supabase_config.get_table_page(
+        'kpi_daily',
+        columns=['date', 'eqp_id'],
+        filters={'alarm_flag': 1, 'start_time': since_date},
+        cursor=encode_cursor(*after) if after else None,
+        limit=limit,
+        descending=True,
+    )
+    return [{'date': r['date'], 'eqp_id': r['eqp_id']} for r in page['rows']]
+
+
 def check_alarm_condition(
     kpi_name: str,
     target_value: float,
@@ -253,15 +286,109 @@ def get_downtime_info(eqp_data: List[Dict[str, Any]]) -> Dict[str, Any]:
     }
 
 
-def format_context_data(
+def _hours_between(start: Any, end: Any) -> float:
+    """event_time ~ end_time 시간(h), 계산할 수 없으면 0"""
+    try:
+        t0 = datetime.fromisoformat(str(start)[:19].replace('T', ' '))
+        t1 = datetime.fromisoformat(str(end)[:19].replace('T', ' '))
+        return max((t1 - t0).total_seconds() / 3600, 0.0)
+    except (TypeError, ValueError):
+        return 0.0
+
+
+def summarize_eqp_states(eqp_data: List[Dict[str, Any]], top_n: int = 3) -> Dict[str, Any]:
+    """
+    장비 상태 이벤트를 상태별 지속시간으로 요약합니다. (행 목록 대신 LLM 컨텍스트에 사용)
+
+    Args:
+        eqp_data: EQP_STATE 테이블 데이터 리스트
+        top_n: 포함할 가장 긴 DOWN 이벤트 수
+
+    Returns:
+        Dict:
+            - state_hours: {상태: {'count', 'hours'}}
+            - downtime_hours / downtime_count: DOWN 합계
+            - longest_down: 가장 긴 DOWN 이벤트 top_n [{start_time, end_time, hours, lot_id}]
+    """
+    state_hours: Dict[str, Dict[str, float]] = {}
+    downs = []
+    for event in eqp_data or []:
+        state = event.get('eqp_state') or 'UNKNOWN'
+        hours = _hours_between(event.get('event_time'), event.get('end_time'))
+        bucket = state_hours.setdefault(state, {'count': 0, 'hours': 0.0})
+        bucket['count'] += 1
+        bucket['hours'] += hours
+        if state == 'DOWN':
+            downs.append({
+                'start_time': str(event.get('event_time', ''))[:16].replace('T', ' '),
+                'end_time': str(event.get('end_time') or '')[:16].replace('T', ' '),
+                'hours': round(hours, 2),
+                'lot_id': event.get('lot_id'),
+            })
+
+    for bucket in state_hours.values():
+        bucket['hours'] = round(bucket['hours'], 2)
+    down = state_hours.get('DOWN', {'count': 0, 'hours': 0.0})
+    return {
+        'state_hours': state_hours,
+        'downtime_hours': down['hours'],
+        'downtime_count': down['count'],
+        'longest_down': sorted(downs, key=lambda d: d['hours'], reverse=True)[:top_n],
+    }
+
+
+def summarize_lot_events(lot_data: List[Dict[str, Any]], top_n: int = 5) -> Dict[str, Any]:
+    """
+    로트 이벤트를 상태 분포 / HOLD 로트 위주로 요약합니다.
+
+    Args:
+        lot_data: LOT_STATE 테이블 데이터 리스트
+        top_n: 포함할 HOLD 많은 로트 수
+
+    Returns:
+        Dict: aggregate_lot_states 결과 +
+            - unique_lots: 고유 로트 수
+            - hold_lots: HOLD 이벤트가 많은 로트 top_n [{lot_id, holds, rcp_id}]
+            - scrap_cnt: SCRAP 수량 합계
+    """
+    summary = aggregate_lot_states(lot_data or [])
+    holds: Dict[str, Dict[str, Any]] = {}
+    lots = set()
+    scrap = 0
+    for lot in lot_data or []:
+        lots.add(lot.get('lot_id'))
+        scrap += lot.get('scrap_cnt') or 0
+        if lot.get('lot_state') == 'HOLD':
+            entry = holds.setdefault(lot.get('lot_id'), {'lot_id': lot.get('lot_id'),
+                                                         'holds': 0, 'rcp_id': lot.get('rcp_id')})
+            entry['holds'] += 1
+
+    summary.update({
+        'unique_lots': len(lots),
+        'hold_lots': sorted(holds.values(), key=lambda h: h['holds'], reverse=True)[:top_n],
+        'scrap_cnt': scrap,
+    })
+    return summary
+
+
+# 알람 분석 컨텍스트 토큰 예산 (0이면 제한 없음)
+CONTEXT_MAX_TOKENS = int(os.getenv('CONTEXT_MAX_TOKENS', '2500'))
+
+
+def build_alarm_context(
     kpi_data: Dict[str, Any],
     lot_data: List[Dict[str, Any]],
     eqp_data: List[Dict[str, Any]],
     rcp_data: List[Dict[str, Any]],
-    trend_data: List[Dict[str, Any]] = None
-) -> str:
+    trend_data: List[Dict[str, Any]] = None,
+    max_tokens: int = None,
+    top_n: int = 5,
+) -> Tuple[str, Dict[str, Any]]:
     """
-    LLM에 제공할 컨텍스트 데이터를 포맷팅합니다.
+    알람 분석(Node 6) 컨텍스트를 토큰 예산 안에서 생성합니다.
+
+    로트/장비 이벤트는 행을 나열하지 않고 상태별 지속시간, HOLD 횟수, 상위 N개 이상 항목으로 요약합니다.
+    예산을 넘으면 레시피 → KPI 추세 → 로트 요약 순으로 제외합니다. (KPI 당일 수치는 항상 포함)
 
     Args:
         kpi_data: KPI 데이터
@@ -269,62 +396,121 @@ def format_context_data(
         eqp_data: 장비 데이터
         rcp_data: 레시피 데이터
         trend_data: 직전 N일 KPI 추세 데이터 (선택)
+        max_tokens: 토큰 예산 (None이면 CONTEXT_MAX_TOKENS)
+        top_n: 섹션별 상위 항목 수
 
     Returns:
-        str: 포맷팅된 컨텍스트 문자열
+        Tuple[str, Dict]: (컨텍스트 문자열, build_budgeted_context 예산 정보)
     """
-    # 로트 집계
-    lot_summary = aggregate_lot_states(lot_data)
-
-    # 다운타임 정보
-    downtime_info = get_downtime_info(eqp_data)
+    from backend.utils.context_budget import ContextSection, build_budgeted_context
 
-    # 텍스트로 포맷팅
-    context = f"""
-# 분석 컨텍스트 데이터
+    sections = [ContextSection('KPI', f"""# 분석 컨텍스트 데이터
 
-## 1. KPI 정보
+## KPI 정보
 - 날짜: {kpi_data.get('date')}
 - 장비: {kpi_data.get('eqp_id')}
 - 라인: {kpi_data.get('line_id')}
 - 공정: {kpi_data.get('oper_id')}
 
-## 2. KPI 수치 (알람 당일)
+## KPI 수치 (알람 당일)
 - OEE: {kpi_data.get('oee_v')}% (목표: {kpi_data.get('oee_t')}%)
 - Throughput: {kpi_data.get('thp_v')}개 (목표: {kpi_data.get('thp_t')}개)
 - TAT: {kpi_data.get('tat_v')}시간 (목표: {kpi_data.get('tat_t')}시간)
 - WIP: {kpi_data.get('wip_v')}개 (목표: {kpi_data.get('wip_t')}개)
-- 양품 출하: {kpi_data.get('good_out_qty')}개
+- 양품 출하: {kpi_data.get('good_out_qty')}개""", priority=0)]
 
-## 3. 로트 상태 요약
-- 총 로트 수: {lot_summary['total_lots']}개
-- 상태별 분포: {lot_summary['state_counts']}
-- HOLD 발생: {lot_summary['hold_count']}회
+    # 장비 상태: 상태별 누적 시간 + 가장 긴 다운타임
+    eqp_summary = summarize_eqp_states(eqp_data, top_n=3)
+    lines = ["## 장비 상태 / 다운타임",
+             f"- 총 다운타임: {eqp_summary['downtime_hours']:.2f}시간",
+             f"- 발생 횟수: {eqp_summary['downtime_count']}회"]
+    if eqp_summary['state_hours']:
+        lines.append("- 상태별 누적: " + ", ".join(
+            f"{state} {v['count']}회/{v['hours']}h"
+            for state, v in sorted(eqp_summary['state_hours'].items())
+        ))
+    for d in eqp_summary['longest_down']:
+        lines.append(f"  - DOWN {d['start_time']} ~ {d['end_time']} ({d['hours']}h"
+                     f"{', LOT ' + d['lot_id'] if d.get('lot_id') else ''})")
+    sections.append(ContextSection('장비 상태', "\n".join(lines), priority=1))
 
-## 4. 장비 다운타임
-- 총 다운타임: {downtime_info['total_downtime_hours']:.2f}시간
-- 발생 횟수: {downtime_info['downtime_count']}회
+    # 로트: 상태 분포 + HOLD 많은 로트
+    lot_summary = summarize_lot_events(lot_data, top_n=top_n)
+    lines = ["## 로트 상태 요약",
+             f"- 이벤트 수: {lot_summary['total_lots']}건 (고유 로트 {lot_summary['unique_lots']}개)",
+             f"- 상태별 분포: {lot_summary['state_counts']}",
+             f"- HOLD 발생: {lot_summary['hold_count']}회",
+             f"- SCRAP 수량: {lot_summary['scrap_cnt']}개"]
+    if lot_summary['hold_lots']:
+        lines.append("- HOLD 많은 로트: " + ", ".join(
+            f"{h['lot_id']}({h['holds']}회{', ' + h['rcp_id'] if h.get('rcp_id') else ''})"
+            for h in lot_summary['hold_lots']
+        ))
+    sections.append(ContextSection('로트 상태', "\n".join(lines), priority=2))
 
-## 5. 레시피 정보
-"""
-
-    for rcp in rcp_data:
-        context += f"- {rcp.get('rcp_id')}: 복잡도 {rcp.get('complex_level')}/10\n"
-
-    # 추세 데이터 섹션 (있는 경우만 추가)
+    # KPI 추세: 일별 표 + 이탈 큰 날 상위 N
     if trend_data:
-        context += "\n## 6. KPI 추세 (직전 7일)\n"
-        context += "| 날짜 | OEE(%) | THP(개) | TAT(h) | WIP(개) | 알람 |\n"
-        context += "|------|--------|---------|--------|---------|------|\n"
+        lines = ["## KPI 추세 (직전 7일)",
+                 "| 날짜 | OEE(%) | THP(개) | TAT(h) | WIP(개) | 알람 |",
+                 "|------|--------|---------|--------|---------|------|"]
         for row in trend_data:
             alarm_mark = "Y" if row.get('alarm_flag') == 1 else "-"
-            context += (
+            lines.append(
                 f"| {row.get('date', '-')} "
                 f"| {row.get('oee_v', '-')} "
                 f"| {row.get('thp_v', '-')} "
                 f"| {row.get('tat_v', '-')} "
                 f"| {row.get('wip_v', '-')} "
-                f"| {alarm_mark} |\n"
+                f"| {alarm_mark} |"
             )
+        from backend.utils.kpi_engine import detect_alarm_kpis
+        anomalies = sorted(
+            ((row, det) for row, det in zip(trend_data, detect_alarm_kpis(trend_data)) if det['alarm']),
+            key=lambda item: item[1]['deviation'], reverse=True,
+        )[:top_n]
+        if anomalies:
+            lines.append("- 목표 이탈 큰 날: " + ", ".join(
+                f"{row.get('date')} {det['dominant_kpi']} {det['deviation'] * 100:.1f}%"
+                for row, det in anomalies
+            ))
+        sections.append(ContextSection('KPI 추세', "\n".join(lines), priority=3))
+
+    # 레시피: 복잡도 상위 N
+    if rcp_data:
+        levels = [r.get('complex_level') or 0 for r in rcp_data]
+        lines = ["## 레시피 정보",
+                 f"- 레시피 {len(rcp_data)}개, 복잡도 평균 {sum(levels) / len(levels):.1f} / 최대 {max(levels)}"]
+        for rcp in sorted(rcp_data, key=lambda r: r.get('complex_level') or 0, reverse=True)[:top_n]:
+            lines.append(f"- {rcp.get('rcp_id')}: 복잡도 {rcp.get('complex_level')}/10")
+        sections.append(ContextSection('레시피', "\n".join(lines), priority=4))
+
+    return build_budgeted_context(
+        sections, CONTEXT_MAX_TOKENS if max_tokens is None else max_tokens,
+    )
+
+
+def format_context_data(
+    kpi_data: Dict[str, Any],
+    lot_data: List[Dict[str, Any]],
+    eqp_data: List[Dict[str, Any]],
+    rcp_data: List[Dict[str, Any]],
+    trend_data: List[Dict[str, Any]] = None,
+    max_tokens: int = None
+) -> str:
+    """
+    LLM에 제공할 컨텍스트 데이터를 포맷팅합니다.
+
+    Args:
+        kpi_data: KPI 데이터
+        lot_data: 로트 데이터
+        eqp_data: 장비 데이터
+        rcp_data: 레시피 데이터
+        trend_data: 직전 N일 KPI 추세 데이터 (선택)
+        max_tokens: 토큰 예산 (None이면 CONTEXT_MAX_TOKENS)
 
-    return context
\ No newline at end of file
+    Returns:
+        str: 포맷팅된 컨텍스트 문자열 (토큰 수 등은 build_alarm_context 사용)
+    """
+    return build_alarm_context(
+        kpi_data, lot_data, eqp_data, rcp_data, trend_data, max_tokens=max_tokens,
+    )[0]
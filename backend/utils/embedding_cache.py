@@ -0,0 +1,199 @@
+"""
+임베딩 디스크 캐시 (SQLite)
+
+동일한 텍스트를 다시 임베딩할 때 Bedrock 호출을 생략합니다.
+- 키: 임베딩 모델 ID + 텍스트 SHA-256 해시
+- 값: float32 벡터 (바이너리)
+- 최대 항목 수를 넘으면 가장 오래 사용되지 않은 항목부터 삭제 (LRU)
+"""
+
+import os
+import time
+import sqlite3
+import hashlib
+import threading
+from array import array
+from pathlib import Path
+from typing import Optional, List, Dict, Any
+
+from backend.config.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+
+def _default_cache_path() -> str:
+    """ChromaDB 데이터 폴더 옆에 캐시 파일을 둡니다 (같은 볼륨에 유지)."""
+    chroma_path = Path(os.getenv('CHROMA_DB_PATH', './data/chromadb'))
+    return str(chroma_path.parent / 'embedding_cache.sqlite3')
+
+
+class EmbeddingCache:
+    """
+    SQLite 기반 임베딩 캐시
+
+    파드 재시작 후에도 유지되므로, PDF가 바뀌지 않았다면
+    재인덱싱 시 Bedrock 임베딩 호출이 발생하지 않습니다.
+    """
+
+    def __init__(self, db_path: str = None, max_entries: int = 20000):
+        """
+        Args:
+            db_path: SQLite 파일 경로 (None이면 ChromaDB 폴더 옆)
+            max_entries: 최대 저장 항목 수
+        """
+        self.db_path = db_path or _default_cache_path()
+        self.max_entries = max_entries
+
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._entries = 0
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def _get_conn(self) -> sqlite3.Connection:
+        """SQLite 연결을 lazy 생성합니다. (락 보유 상태에서 호출)"""
+        if self._conn is None:
+            Path(self.db_path).parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(self.db_path, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS embeddings (
+                    key TEXT PRIMARY KEY,
+                    model_id TEXT NOT NULL,
+                    vector BLOB NOT NULL,
+                    last_access REAL NOT NULL
+                )
+                """
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_embeddings_last_access ON embeddings(last_access)"
+            )
+            conn.commit()
+            self._entries = conn.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]
+            self._conn = conn
+        return self._conn
+
+    @staticmethod
+    def make_key(model_id: str, text: str) -> str:
+        """
+        캐시 키 생성
+
+        Args:
+            model_id: 임베딩 모델 ID
+            text: 임베딩할 텍스트
+
+        Returns:
+            str: "모델ID:SHA256" 형식의 키
+        """
+        digest = hashlib.sha256(text.encode('utf-8')).hexdigest()
+        return f"{model_id}:{digest}"
+
+    def get(self, model_id: str, text: str) -> Optional[List[float]]:
+        """
+        캐시된 임베딩 조회
+
+        Args:
+            model_id: 임베딩 모델 ID
+            text: 임베딩할 텍스트
+
+        Returns:
+            List[float] 또는 None (캐시 미스)
+        """
+        key = self.make_key(model_id, text)
+        try:
+            with self._lock:
+                conn = self._get_conn()
+                row = conn.execute(
+                    "SELECT vector FROM embeddings WHERE key = ?", (key,)
+                ).fetchone()
+                if row is None:
+                    self.misses += 1
+                    return None
+                conn.execute(
+                    "UPDATE embeddings SET last_access = ? WHERE key = ?",
+                    (time.time(), key),
+                )
+                conn.commit()
+                self.hits += 1
+        except sqlite3.Error as e:
+            logger.warning("임베딩 캐시 조회 실패 (무시): %s", e)
+            return None
+
+        vector = array('f')
+        vector.frombytes(row[0])
+        return vector.tolist()
+
+    def set(self, model_id: str, text: str, embedding: List[float]) -> None:
+        """
+        임베딩 저장 (최대 항목 수 초과 시 LRU 삭제)
+
+        Args:
+            model_id: 임베딩 모델 ID
+            text: 임베딩한 텍스트
+            embedding: 임베딩 벡터
+        """
+        key = self.make_key(model_id, text)
+        blob = array('f', embedding).tobytes()
+        try:
+            with self._lock:
+                conn = self._get_conn()
+                exists = conn.execute(
+                    "SELECT 1 FROM embeddings WHERE key = ?", (key,)
+                ).fetchone()
+                conn.execute(
+                    "INSERT OR REPLACE INTO embeddings (key, model_id, vector, last_access) "
+                    "VALUES (?, ?, ?, ?)",
+                    (key, model_id, blob, time.time()),
+                )
+                if not exists:
+                    self._entries += 1
+                overflow = self._entries - self.max_entries
+                if overflow > 0:
+                    conn.execute(
+                        "DELETE FROM embeddings WHERE key IN ("
+                        "SELECT key FROM embeddings ORDER BY last_access ASC LIMIT ?)",
+                        (overflow,),
+                    )
+                    self._entries -= overflow
+                    self.evictions += overflow
+                conn.commit()
+        except sqlite3.Error as e:
+            logger.warning("임베딩 캐시 저장 실패 (무시): %s", e)
+
+    def clear(self) -> None:
+        """모든 캐시 삭제"""
+        with self._lock:
+            conn = self._get_conn()
+            conn.execute("DELETE FROM embeddings")
+            conn.commit()
+            logger.info("임베딩 캐시 삭제: %d개", self._entries)
+            self._entries = 0
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        캐시 통계
+
+        Returns:
+            캐시 통계 정보
+        """
+        total = self.hits + self.misses
+        return {
+            'total_items': self._entries,
+            'max_entries': self.max_entries,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': round(self.hits / total, 4) if total else 0.0,
+            'evictions': self.evictions,
+            'db_path': self.db_path,
+        }
+
+
+# 전역 임베딩 캐시 인스턴스
+embedding_cache = EmbeddingCache(
+    db_path=os.getenv('EMBEDDING_CACHE_PATH') or None,
+    max_entries=int(os.getenv('EMBEDDING_CACHE_MAX_ENTRIES', '20000')),
+)
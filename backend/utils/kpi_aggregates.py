@@ -0,0 +1,395 @@
+"""
+KPI 집계 저장소 (대시보드 / 챗봇용 사전 집계)
+
+대시보드 차트와 Node 4C가 kpi_daily 원본 행을 매번 다시 집계하지 않도록,
+RDS에서 날짜·장비·라인·공정 단위로 집계한 버킷을 메모리에 유지합니다.
+
+- 일별 KPI 버킷: (date, eqp_id, line_id, oper_id) → 행 수, KPI 합계, 목표 이탈/알람 건수
+- 일별 다운타임 버킷: (date, eqp_id) → DOWN 구간 수, 다운타임(분)
+- 주별 / 라인별 / 공정별 롤업은 일별 버킷을 합쳐서 계산 (조회 비용 O(버킷 수))
+- 증분 갱신: 마지막으로 반영한 날짜(워터마크)부터만 다시 집계해 해당 날짜 버킷을 교체
+- 목표값 변경 등 과거 행이 바뀌면 invalidate() 후 전체 재집계
+
+환경 변수:
+    KPI_AGG_REFRESH_SECONDS: 조회 시 자동 증분 갱신 주기 (기본 300초)
+"""
+
+import os
+import time
+import threading
+from datetime import date as date_cls, timedelta
+from typing import Optional, List, Dict, Any, Tuple
+
+from backend.config.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+KPI_NAMES = ('oee', 'thp', 'tat', 'wip')
+
+# 롤업 그룹 기준 → 버킷 키 인덱스 (date, eqp_id, line_id, oper_id)
+GROUP_FIELDS = {'eqp': 'eqp_id', 'line': 'line_id', 'oper': 'oper_id', 'all': None}
+_KEY_INDEX = {'eqp_id': 1, 'line_id': 2, 'oper_id': 3}
+
+_SUM_FIELDS = (('rows', 'alarm_rows')
+               + tuple(f"{k}_{s}_sum" for k in KPI_NAMES for s in ('v', 't'))
+               + tuple(f"{k}_breach" for k in KPI_NAMES)
+               + tuple(f"{k}_alarm" for k in KPI_NAMES))
+
+
+def _week_start(day: str) -> str:
+    """날짜(YYYY-MM-DD)가 속한 주의 월요일"""
+    d = date_cls.fromisoformat(day[:10])
+    return (d - timedelta(days=d.weekday())).isoformat()
+
+
+class KpiAggregateStore:
+    """
+    kpi_daily / eqp_state 사전 집계 저장소
+
+    조회 메서드는 갱신 주기가 지났으면 먼저 증분 갱신한 뒤 메모리 버킷으로 응답합니다.
+    같은 조건의 롤업 결과는 다음 데이터 변경까지 재사용합니다.
+    """
+
+    def __init__(self, rds=None, refresh_seconds: float = 300):
+        """
+        Args:
+            rds: RDSConfig 인스턴스 (None이면 첫 갱신 시 전역 rds_config 사용)
+            refresh_seconds: 조회 시 자동 증분 갱신 주기 (초, 0이면 수동 갱신만)
+        """
+        self._rds = rds
+        self.refresh_seconds = refresh_seconds
+
+        self._lock = threading.RLock()
+        self._kpi: Dict[Tuple[str, str, str, str], Dict[str, float]] = {}
+        self._downtime: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        # 롤업 결과 재사용 (버킷이 바뀌면 비움)
+        self._views: Dict[tuple, Any] = {}
+
+        self.kpi_watermark: Optional[str] = None       # 반영된 마지막 kpi_daily 날짜
+        self.downtime_watermark: Optional[str] = None  # 반영된 마지막 DOWN 시작 날짜
+        self.last_refresh: Optional[float] = None
+        self.refreshes = 0
+        self.full_refreshes = 0
+        self.view_hits = 0
+        self.view_misses = 0
+
+    @property
+    def rds(self):
+        if self._rds is None:
+            from backend.config.rds_config import rds_config
+            self._rds = rds_config
+        return self._rds
+
+    # ──────────────────────────────────────────────────────────────
+    # 갱신
+    # ──────────────────────────────────────────────────────────────
+
+    def refresh(self, full: bool = False) -> Dict[str, Any]:
+        """
+        집계 버킷 갱신
+
+        증분 갱신은 워터마크 날짜부터 다시 집계합니다. 워터마크 날짜 자체도 다시 읽어
+        그날 뒤늦게 적재된 행까지 반영하고, 다시 읽은 날짜의 버킷은 통째로 교체합니다.
+
+        Args:
+            full: True면 전체 재집계
+
+        Returns:
+            Dict: {'mode', 'kpi_buckets', 'downtime_buckets', 'elapsed_ms'}
+        """
+        with self._lock:
+            started = time.perf_counter()
+            full = full or self.kpi_watermark is None
+            kpi_since = None if full else self.kpi_watermark
+            downtime_since = None if full else self.downtime_watermark
+
+            kpi_rows = self.rds.get_kpi_daily_rollup(since_date=kpi_since)
+            downtime_rows = self.rds.get_downtime_daily(
+                since_time=f"{downtime_since} 00:00:00" if downtime_since else None
+            )
+
+            if full:
+                self._kpi.clear()
+                self._downtime.clear()
+            else:
+                self._kpi = {k: v for k, v in self._kpi.items() if k[0] < kpi_since}
+                if downtime_since:
+                    self._downtime = {k: v for k, v in self._downtime.items()
+                                      if k[0] < downtime_since}
+
+            for row in kpi_rows:
+                key = (str(row['date'])[:10], row.get('eqp_id') or '',
+                       row.get('line_id') or '', row.get('oper_id') or '')
+                self._kpi[key] = {f: float(row.get(f) or 0) for f in _SUM_FIELDS}
+            for row in downtime_rows:
+                key = (str(row['date'])[:10], row.get('eqp_id') or '')
+                self._downtime[key] = {
+                    'events': int(row.get('events') or 0),
+                    'minutes': float(row.get('minutes') or 0),
+                    'last_event_time': row.get('last_event_time'),
+                }
+
+            if self._kpi:
+                self.kpi_watermark = max(k[0] for k in self._kpi)
+            if self._downtime:
+                self.downtime_watermark = max(k[0] for k in self._downtime)
+
+            self._views.clear()
+            self.last_refresh = time.monotonic()
+            self.refreshes += 1
+            if full:
+                self.full_refreshes += 1
+
+            elapsed_ms = round((time.perf_counter() - started) * 1000, 1)
+            mode = 'full' if full else 'incremental'
+            logger.info("KPI 집계 갱신(%s): kpi 원천 %d버킷, 다운타임 원천 %d버킷 (%sms)",
+                        mode, len(kpi_rows), len(downtime_rows), elapsed_ms)
+            return {
+                'mode': mode,
+                'kpi_buckets': len(self._kpi),
+                'downtime_buckets': len(self._downtime),
+                'elapsed_ms': elapsed_ms,
+            }
+
+    def invalidate(self, reason: str = '') -> None:
+        """
+        전체 무효화 (다음 조회 시 전체 재집계)
+
+        Args:
+            reason: 로그에 남길 사유 (예: 목표값 변경)
+        """
+        with self._lock:
+            self.kpi_watermark = None
+            self.downtime_watermark = None
+            self.last_refresh = None
+            self._views.clear()
+        logger.info("KPI 집계 무효화%s", f" ({reason})" if reason else "")
+
+    def _ensure_fresh(self) -> None:
+        """처음 조회하거나 갱신 주기가 지났으면 증분 갱신"""
+        if self.last_refresh is None:
+            self.refresh()
+        elif self.refresh_seconds and time.monotonic() - self.last_refresh > self.refresh_seconds:
+            self.refresh()
+
+    def _cached_view(self, key: tuple, build):
+        """같은 조건의 롤업 결과 재사용 (락 보유 상태에서 호출)"""
+        if key in self._views:
+            self.view_hits += 1
+            return self._views[key]
+        self.view_misses += 1
+        result = build()
+        self._views[key] = result
+        return result
+
+    # ──────────────────────────────────────────────────────────────
+    # 조회
+    # ──────────────────────────────────────────────────────────────
+
+    def _resolve_range(self, start_date: Optional[str], end_date: Optional[str],
+                       last: Optional[int], period: str) -> Tuple[Optional[str], Optional[str]]:
+        """last(최근 N일/N주)를 워터마크 기준 날짜 범위로 변환"""
+        if not last or not self.kpi_watermark:
+            return start_date, end_date
+        end = date_cls.fromisoformat(end_date or self.kpi_watermark)
+        if period == 'week':
+            start = date_cls.fromisoformat(_week_start(end.isoformat())) - timedelta(weeks=last - 1)
+        else:
+            start = end - timedelta(days=last - 1)
+        return start.isoformat(), end.isoformat()
+
+    def kpi_rollup(
+        self,
+        period: str = 'day',
+        group_by: str = 'eqp',
+        start_date: str = None,
+        end_date: str = None,
+        last: int = None,
+        eqp_id: str = None,
+        line_id: str = None,
+        oper_id: str = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        일별/주별 KPI 롤업
+
+        Args:
+            period: 'day' | 'week' (주는 월요일 시작)
+            group_by: 'eqp' | 'line' | 'oper' | 'all'
+            start_date / end_date: 날짜 범위 (YYYY-MM-DD, 포함)
+            last: 최근 N개 기간 (start_date 대신 사용, 마지막 데이터 날짜 기준)
+            eqp_id / line_id / oper_id: 동등 필터
+
+        Returns:
+            List[Dict]: {period, group, rows, alarm_rows, {kpi}_v, {kpi}_t (평균),
+                         {kpi}_breach, {kpi}_alarm} (기간, 그룹 오름차순)
+
+        Raises:
+            ValueError: 지원하지 않는 period / group_by
+        """
+        if period not in ('day', 'week'):
+            raise ValueError(f"지원하지 않는 period: {period}")
+        if group_by not in GROUP_FIELDS:
+            raise ValueError(f"지원하지 않는 group_by: {group_by}")
+
+        with self._lock:
+            self._ensure_fresh()
+            start_date, end_date = self._resolve_range(start_date, end_date, last, period)
+            view_key = ('kpi', period, group_by, start_date, end_date, eqp_id, line_id, oper_id)
+            return self._cached_view(view_key, lambda: self._build_kpi_rollup(
+                period, group_by, start_date, end_date,
+                {'eqp_id': eqp_id, 'line_id': line_id, 'oper_id': oper_id},
+            ))
+
+    def _build_kpi_rollup(self, period: str, group_by: str, start_date: Optional[str],
+                          end_date: Optional[str], filters: Dict[str, Optional[str]]) -> List[Dict[str, Any]]:
+        group_field = GROUP_FIELDS[group_by]
+        merged: Dict[Tuple[str, str], Dict[str, float]] = {}
+        for key, bucket in self._kpi.items():
+            day = key[0]
+            if (start_date and day < start_date) or (end_date and day > end_date):
+                continue
+            if any(value and key[_KEY_INDEX[field]] != value for field, value in filters.items()):
+                continue
+            period_key = _week_start(day) if period == 'week' else day
+            group = key[_KEY_INDEX[group_field]] if group_field else 'ALL'
+            target = merged.setdefault((period_key, group), dict.fromkeys(_SUM_FIELDS, 0.0))
+            for f in _SUM_FIELDS:
+                target[f] += bucket[f]
+
+        result = []
+        for (period_key, group), sums in sorted(merged.items()):
+            rows = sums['rows'] or 1
+            item = {
+                'period': period_key,
+                'group': group,
+                'rows': int(sums['rows']),
+                'alarm_rows': int(sums['alarm_rows']),
+            }
+            for k in KPI_NAMES:
+                item[f"{k}_v"] = round(sums[f"{k}_v_sum"] / rows, 2)
+                item[f"{k}_t"] = round(sums[f"{k}_t_sum"] / rows, 2)
+                item[f"{k}_breach"] = int(sums[f"{k}_breach"])
+                item[f"{k}_alarm"] = int(sums[f"{k}_alarm"])
+            result.append(item)
+        return result
+
+    def alarm_counts(
+        self,
+        start_date: str = None,
+        end_date: str = None,
+        eqp_id: str = None,
+    ) -> Dict[str, Any]:
+        """
+        KPI별 알람 건수 (alarm_flag=1 행 중 해당 KPI가 목표를 이탈한 건수)
+
+        Args:
+            start_date / end_date: 날짜 범위 (YYYY-MM-DD, 포함)
+            eqp_id: 장비 ID
+
+        Returns:
+            Dict: {'total_alarms', 'counts': [{'kpi', 'count', 'breach_days'}]}
+        """
+        with self._lock:
+            self._ensure_fresh()
+            view_key = ('alarm', start_date, end_date, eqp_id)
+
+            def build():
+                totals = dict.fromkeys(_SUM_FIELDS, 0.0)
+                for key, bucket in self._kpi.items():
+                    if (start_date and key[0] < start_date) or (end_date and key[0] > end_date):
+                        continue
+                    if eqp_id and key[1] != eqp_id:
+                        continue
+                    for f in _SUM_FIELDS:
+                        totals[f] += bucket[f]
+                return {
+                    'total_alarms': int(totals['alarm_rows']),
+                    'counts': [
+                        {'kpi': k.upper(), 'count': int(totals[f"{k}_alarm"]),
+                         'breach_days': int(totals[f"{k}_breach"])}
+                        for k in KPI_NAMES
+                    ],
+                }
+
+            return self._cached_view(view_key, build)
+
+    def downtime(
+        self,
+        start_date: str = None,
+        end_date: str = None,
+        eqp_id: str = None,
+        period: str = 'total',
+    ) -> List[Dict[str, Any]]:
+        """
+        장비별 다운타임 (DOWN 구간 합계)
+
+        Args:
+            start_date / end_date: 날짜 범위 (YYYY-MM-DD, 포함)
+            eqp_id: 장비 ID
+            period: 'total' (장비별 합계) | 'day' (날짜·장비별)
+
+        Returns:
+            List[Dict]: {period, eqp_id, events, minutes, last_event_time}
+        """
+        if period not in ('total', 'day'):
+            raise ValueError(f"지원하지 않는 period: {period}")
+
+        with self._lock:
+            self._ensure_fresh()
+            view_key = ('downtime', start_date, end_date, eqp_id, period)
+
+            def build():
+                merged: Dict[Tuple[str, str], Dict[str, Any]] = {}
+                for (day, eqp), bucket in self._downtime.items():
+                    if (start_date and day < start_date) or (end_date and day > end_date):
+                        continue
+                    if eqp_id and eqp != eqp_id:
+                        continue
+                    period_key = day if period == 'day' else 'TOTAL'
+                    target = merged.setdefault((period_key, eqp), {
+                        'period': period_key, 'eqp_id': eqp, 'events': 0,
+                        'minutes': 0.0, 'last_event_time': None,
+                    })
+                    target['events'] += bucket['events']
+                    target['minutes'] += bucket['minutes']
+                    last = bucket['last_event_time']
+                    if last and (target['last_event_time'] is None or last > target['last_event_time']):
+                        target['last_event_time'] = last
+                result = [merged[k] for k in sorted(merged)]
+                for item in result:
+                    item['minutes'] = round(item['minutes'], 1)
+                return result
+
+            return self._cached_view(view_key, build)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        저장소 통계
+
+        Returns:
+            저장소 상태 정보
+        """
+        with self._lock:
+            total = self.view_hits + self.view_misses
+            return {
+                'kpi_buckets': len(self._kpi),
+                'downtime_buckets': len(self._downtime),
+                'kpi_watermark': self.kpi_watermark,
+                'downtime_watermark': self.downtime_watermark,
+                'refresh_seconds': self.refresh_seconds,
+                'seconds_since_refresh': (
+                    round(time.monotonic() - self.last_refresh, 1) if self.last_refresh else None
+                ),
+                'refreshes': self.refreshes,
+                'full_refreshes': self.full_refreshes,
+                'cached_views': len(self._views),
+                'view_hits': self.view_hits,
+                'view_misses': self.view_misses,
+                'view_hit_rate': round(self.view_hits / total, 4) if total else 0.0,
+            }
+
+
+# 전역 KPI 집계 저장소 인스턴스
+kpi_aggregates = KpiAggregateStore(
+    refresh_seconds=float(os.getenv('KPI_AGG_REFRESH_SECONDS', '300')),
+)
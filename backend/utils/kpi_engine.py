@@ -0,0 +1,205 @@
+"""
+KPI 이탈 / 알람 판단 배치 엔진 (NumPy)
+
+kpi_daily 행 묶음을 컬럼 배열로 바꿔 모든 행·KPI의 목표 대비 이탈률, 알람 여부,
+대표 알람 KPI를 한 번에 계산합니다. Node 2의 단건 판단과 같은 규칙을 사용합니다.
+
+- OEE, THP: 실적 < 목표 이면 이탈 (낮을수록 나쁨)
+- TAT, WIP: 실적 > 목표 이면 이탈 (높을수록 나쁨)
+- 이탈률 = |실적 - 목표| / 목표 (나쁜 방향일 때만 양수, 목표가 0/누락이면 0)
+- 대표 KPI = 이탈률이 가장 큰 KPI (이탈 없으면 OEE)
+- 상태: 이탈 없음 good / 이탈률 10% 미만 warning / 그 이상 alarm
+
+예: "1분기 전체 장비 알람 찾기"
+    >>> scan_kpi_alarms('2026-01-01', '2026-03-31')
+"""
+
+from typing import List, Dict, Any, Optional
+
+import numpy as np
+
+KPI_NAMES = ('OEE', 'THP', 'TAT', 'WIP')
+_VALUE_COLUMNS = ('oee_v', 'thp_v', 'tat_v', 'wip_v')
+_TARGET_COLUMNS = ('oee_t', 'thp_t', 'tat_t', 'wip_t')
+# +1: 높을수록 나쁨 (TAT, WIP), -1: 낮을수록 나쁨 (OEE, THP)
+_WORSE_DIRECTION = np.array([-1.0, -1.0, 1.0, 1.0])
+
+# 이 이탈률 미만이면 warning, 이상이면 alarm (calculate_kpi_gap과 동일한 10%)
+WARNING_RATIO = 0.1
+STATUS_NAMES = np.array(['good', 'warning', 'alarm'])
+
+# 스캔 조회 컬럼
+SCAN_COLUMNS = ['date', 'eqp_id', 'line_id', 'oper_id', 'alarm_flag',
+                'oee_t', 'oee_v', 'thp_t', 'thp_v', 'tat_t', 'tat_v', 'wip_t', 'wip_v']
+
+
+def to_kpi_matrix(rows: List[Dict[str, Any]]) -> tuple:
+    """
+    kpi_daily 행 목록을 (실적, 목표) 행렬로 변환합니다.
+
+    Args:
+        rows: kpi_daily 행 (dict)
+
+    Returns:
+        tuple: (values, targets) — 각각 (행 수, 4) float 배열, 누락값은 NaN
+    """
+    def column_block(columns):
+        return np.array(
+            [[np.nan if r.get(c) is None else float(r[c]) for c in columns] for r in rows],
+            dtype=np.float64,
+        ).reshape(len(rows), len(columns))
+
+    return column_block(_VALUE_COLUMNS), column_block(_TARGET_COLUMNS)
+
+
+def evaluate_kpi_block(values: np.ndarray, targets: np.ndarray) -> Dict[str, np.ndarray]:
+    """
+    KPI 행렬 전체의 이탈률 / 알람 여부 / 대표 KPI를 계산합니다.
+
+    Args:
+        values: (행 수, 4) 실적 배열 (OEE, THP, TAT, WIP 순)
+        targets: (행 수, 4) 목표 배열
+
+    Returns:
+        Dict[str, np.ndarray]:
+            - gap: 실적 - 목표 (행 수, 4)
+            - gap_percent: gap / 목표 * 100 (목표가 0이면 0)
+            - deviation: 나쁜 방향 이탈률 (이탈 없으면 0)
+            - breached: 이탈 여부 (bool)
+            - status: 0=good, 1=warning, 2=alarm
+            - alarm: 행별 이탈 KPI 존재 여부
+            - dominant: 행별 대표 KPI 인덱스 (이탈 없으면 0=OEE)
+    """
+    with np.errstate(invalid='ignore', divide='ignore'):
+        gap = values - targets
+        valid = np.isfinite(gap) & (targets != 0)
+        ratio = np.where(valid, gap / np.where(valid, targets, 1.0), 0.0)
+
+    deviation = np.maximum(ratio * _WORSE_DIRECTION, 0.0)
+    breached = deviation > 0
+    status = np.where(breached, np.where(deviation < WARNING_RATIO, 1, 2), 0)
+
+    return {
+        'gap': np.where(np.isfinite(gap), gap, 0.0),
+        'gap_percent': ratio * 100,
+        'deviation': deviation,
+        'breached': breached,
+        'status': status,
+        'alarm': breached.any(axis=1),
+        # 이탈 없는 행은 모두 0이므로 argmax가 0(OEE) — Node 2 fallback과 동일
+        'dominant': deviation.argmax(axis=1),
+    }
+
+
+def detect_alarm_kpis(rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    kpi_daily 행마다 알람 판단 결과를 반환합니다.
+
+    Args:
+        rows: kpi_daily 행 목록
+
+    Returns:
+        List[Dict]: 행 순서대로 {alarm, dominant_kpi, deviation, deviations, status}
+            - deviations: {KPI: 이탈률} (이탈한 KPI만)
+            - status: {KPI: good|warning|alarm}
+    """
+    if not rows:
+        return []
+    result = evaluate_kpi_block(*to_kpi_matrix(rows))
+    deviation = result['deviation']
+    output = []
+    for i in range(len(rows)):
+        dominant = int(result['dominant'][i])
+        output.append({
+            'alarm': bool(result['alarm'][i]),
+            'dominant_kpi': KPI_NAMES[dominant],
+            'deviation': round(float(deviation[i, dominant]), 4),
+            'deviations': {KPI_NAMES[k]: round(float(deviation[i, k]), 4)
+                           for k in range(len(KPI_NAMES)) if result['breached'][i, k]},
+            'status': dict(zip(KPI_NAMES, STATUS_NAMES[result['status'][i]].tolist())),
+        })
+    return output
+
+
+def scan_kpi_alarms(
+    start_date: str,
+    end_date: str,
+    eqp_id: str = None,
+    kpi: str = None,
+    min_deviation: float = 0.0,
+    include_normal: bool = False,
+    rds=None,
+) -> Dict[str, Any]:
+    """
+    날짜 범위의 kpi_daily 전체를 한 번에 판단하는 백필/스캔
+
+    Args:
+        start_date / end_date: 날짜 범위 (YYYY-MM-DD, 포함)
+        eqp_id: 장비 ID (None이면 전체 장비)
+        kpi: 대표 KPI 필터 (OEE, THP, TAT, WIP)
+        min_deviation: 대표 KPI 최소 이탈률 (예: 0.1 = 10%)
+        include_normal: True면 이탈 없는 행도 포함
+        rds: RDSConfig (None이면 전역 rds_config)
+
+    Returns:
+        Dict: {
+            'scanned': 조회 행 수,
+            'alarms': 판단된 알람 행 수,
+            'flag_mismatches': 저장된 alarm_flag와 판단이 다른 행 수,
+            'by_kpi': {KPI: 대표 KPI 건수}, 'by_eqp': {장비: 알람 건수},
+            'rows': 조건에 맞는 행 (날짜, 장비 순)
+        }
+
+    Raises:
+        ValueError: 지원하지 않는 KPI
+    """
+    if kpi and kpi not in KPI_NAMES:
+        raise ValueError(f"지원하지 않는 KPI: {kpi} (가능: {', '.join(KPI_NAMES)})")
+    if rds is None:
+        from backend.config.rds_config import rds_config as rds
+
+    rows = rds.get_kpi_trend(start_date=start_date, end_date=end_date,
+                             eqp_id=eqp_id, columns=SCAN_COLUMNS)
+    if not rows:
+        return {'scanned': 0, 'alarms': 0, 'flag_mismatches': 0,
+                'by_kpi': {}, 'by_eqp': {}, 'rows': []}
+
+    result = evaluate_kpi_block(*to_kpi_matrix(rows))
+    alarm, dominant, deviation = result['alarm'], result['dominant'], result['deviation']
+    dominant_deviation = deviation[np.arange(len(rows)), dominant]
+    flags = np.array([r.get('alarm_flag') == 1 for r in rows])
+
+    selected = alarm | include_normal
+    if kpi:
+        selected &= (dominant == KPI_NAMES.index(kpi)) & alarm
+    if min_deviation:
+        selected &= dominant_deviation >= min_deviation
+
+    by_kpi = np.bincount(dominant[alarm], minlength=len(KPI_NAMES))
+    eqp_ids = np.array([r.get('eqp_id') or '' for r in rows])
+    eqp_names, eqp_counts = np.unique(eqp_ids[alarm], return_counts=True)
+
+    matched = []
+    for i in np.flatnonzero(selected):
+        r = rows[i]
+        matched.append({
+            'date': str(r.get('date')),
+            'eqp_id': r.get('eqp_id'),
+            'line_id': r.get('line_id'),
+            'oper_id': r.get('oper_id'),
+            'alarm_flag': r.get('alarm_flag'),
+            'detected_alarm': bool(alarm[i]),
+            'dominant_kpi': KPI_NAMES[int(dominant[i])] if alarm[i] else None,
+            'deviation': round(float(dominant_deviation[i]), 4),
+            'deviations': {KPI_NAMES[k]: round(float(deviation[i, k]), 4)
+                           for k in range(len(KPI_NAMES)) if result['breached'][i, k]},
+        })
+
+    return {
+        'scanned': len(rows),
+        'alarms': int(alarm.sum()),
+        'flag_mismatches': int((alarm != flags).sum()),
+        'by_kpi': {KPI_NAMES[k]: int(c) for k, c in enumerate(by_kpi) if c},
+        'by_eqp': {str(name): int(c) for name, c in zip(eqp_names, eqp_counts)},
+        'rows': matched,
+    }
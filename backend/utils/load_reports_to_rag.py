@@ -5,6 +5,7 @@ PDF 보고서를 ChromaDB에 로드하는 스크립트
 ChromaDB Vector Database에 저장합니다.
 """
 
+import os
 import sys
 from pathlib import Path
 import re
@@ -78,12 +79,16 @@ def parse_report_filename(filename: str) -> dict:
     }
 
 
-def load_reports_to_rag(reports_dir: str = "backend/data/reports"):
+def load_reports_to_rag(reports_dir: str = "backend/data/reports", max_workers: int = None):
     """
     reports 폴더의 모든 PDF를 ChromaDB에 로드합니다.
+
+    PDF를 모두 읽은 뒤 chroma_config.add_reports_bulk로 한 번에 저장합니다.
+    (기존 ID 확인 1회, 임베딩 병렬 호출, collection.add 1회, S3 백업 1회)
     
     Args:
         reports_dir: PDF 파일들이 있는 폴더 경로
+        max_workers: 임베딩 동시 호출 수 (None이면 EMBEDDING_MAX_WORKERS 환경 변수, 기본 4)
     """
     
     print("\n" + "=" * 60)
@@ -108,25 +113,24 @@ def load_reports_to_rag(reports_dir: str = "backend/data/reports"):
     
     print(f"총 {len(pdf_files)}개의 PDF 발견\n")
     
-    # 각 PDF 처리
-    success_count = 0
+    # 1. 각 PDF에서 텍스트/메타데이터 추출
+    reports = []
+    pdf_by_id = {}
     
     for i, pdf_file in enumerate(pdf_files, 1):
         filename = pdf_file.name
         print(f"[{i}/{len(pdf_files)}] {filename}")
         
-        # 1. 파일명에서 메타데이터 추출
+        # 파일명에서 메타데이터 추출
         metadata_dict = parse_report_filename(filename)
         
         if not metadata_dict:
             print(f"  [WARN] 파일명 형식 오류, 스킵\n")
             continue
         
-        print(f"  날짜: {metadata_dict['date']}")
-        print(f"  장비: {metadata_dict['eqp_id']}")
-        print(f"  KPI: {metadata_dict['kpi']}")
+        print(f"  날짜: {metadata_dict['date']} | 장비: {metadata_dict['eqp_id']} | KPI: {metadata_dict['kpi']}")
         
-        # 2. PDF 텍스트 추출
+        # PDF 텍스트 추출
         text = extract_text_from_pdf(str(pdf_file))
         
         if not text or len(text) < 50:
@@ -135,44 +139,53 @@ def load_reports_to_rag(reports_dir: str = "backend/data/reports"):
         
         print(f"  텍스트 추출: {len(text)}자")
         
-        # 3. ChromaDB에 저장
         report_id = f"report_{metadata_dict['date']}_{metadata_dict['eqp_id']}_{metadata_dict['kpi']}"
         
-        metadata = {
-            "date": metadata_dict['date'],
-            "eqp_id": metadata_dict['eqp_id'],
-            "kpi": metadata_dict['kpi'],
-            "alarm_flag": 1,
-            "source": "pdf_report"
-        }
-        
-        success = chroma_config.add_report(
-            report_id=report_id,
-            report_text=text,
-            metadata=metadata
-        )
-
-        if success:
-            print(f"  ChromaDB 저장 완료")
-
-            # S3 업로드 (실패해도 계속 진행)
+        reports.append({
+            "report_id": report_id,
+            "report_text": text,
+            "metadata": {
+                "date": metadata_dict['date'],
+                "eqp_id": metadata_dict['eqp_id'],
+                "kpi": metadata_dict['kpi'],
+                "alarm_flag": 1,
+                "source": "pdf_report"
+            }
+        })
+        pdf_by_id[report_id] = pdf_file
+    
+    # 2. ChromaDB 일괄 저장
+    if max_workers is None:
+        max_workers = int(os.getenv('EMBEDDING_MAX_WORKERS', '4'))
+    
+    print(f"\nChromaDB 일괄 저장 중: {len(reports)}개")
+    result = chroma_config.add_reports_bulk(reports, max_workers=max_workers)
+    
+    for report_id in result['failed']:
+        print(f"  [ERROR] ChromaDB 저장 실패: {report_id}")
+    
+    # 3. S3 업로드 (실패해도 계속 진행)
+    stored_ids = result['added'] + result['skipped']
+    try:
+        from backend.config.aws_config import aws_config
+        for report_id in stored_ids:
+            pdf_file = pdf_by_id[report_id]
+            filename = pdf_file.name
             try:
-                from backend.config.aws_config import aws_config
                 if not aws_config.file_exists_in_s3(filename):
                     s3_uri = aws_config.upload_file_to_s3(str(pdf_file), filename)
-                    print(f"  S3 업로드 완료: {s3_uri}\n")
+                    print(f"  S3 업로드 완료: {s3_uri}")
                 else:
-                    print(f"  S3 이미 존재, 스킵: {filename}\n")
+                    print(f"  S3 이미 존재, 스킵: {filename}")
             except Exception as e:
-                print(f"  [WARN] S3 업로드 실패 (ChromaDB 저장은 완료): {e}\n")
-
-            success_count += 1
-        else:
-            print(f"  [ERROR] ChromaDB 저장 실패\n")
+                print(f"  [WARN] S3 업로드 실패 (ChromaDB 저장은 완료): {e}")
+    except Exception as e:
+        print(f"  [WARN] S3 클라이언트 초기화 실패: {e}")
     
     # 최종 결과
     print("=" * 60)
-    print(f"완료! {success_count}/{len(pdf_files)}개 성공")
+    print(f"완료! {len(stored_ids)}/{len(pdf_files)}개 성공 "
+          f"(신규 {len(result['added'])}개, 기존 {len(result['skipped'])}개)")
     print(f"ChromaDB 총 리포트: {chroma_config.count_reports()}개")
     print("=" * 60 + "\n")
 
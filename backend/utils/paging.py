@@ -0,0 +1,187 @@
+"""
+테이블 페이지 조회 공통 정의 (RDS / Supabase)
+
+- lot_state / eqp_state를 OFFSET 없이 (정렬 키, tiebreak) 키셋 커서로 읽기 위한
+  허용 컬럼 화이트리스트와 커서 인코딩 (두 DB 설정 모듈이 함께 사용)
+- PagedReader: 응답 행 수 상한이 있는 조회를 페이지 단위로 이어 읽는 리더 (다음 페이지 미리 읽기)
+
+환경 변수:
+    PAGED_READER_PREFETCH_WORKERS: 다음 페이지 미리 읽기 스레드 수 (기본 8)
+"""
+
+import os
+import json
+import base64
+import contextvars
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, Any, List, Callable, Iterator, Optional
+
+
+# 테이블별 컬럼 (프로젝션/필터에 허용되는 SQL 식별자 화이트리스트)
+TABLE_COLUMNS: Dict[str, tuple] = {
+    'kpi_daily': ('date', 'eqp_id', 'line_id', 'oper_id', 'oee_t', 'oee_v', 'thp_t', 'thp_v',
+                  'tat_t', 'tat_v', 'wip_t', 'wip_v', 'alarm_flag'),
+    'lot_state': ('event_time', 'lot_id', 'line_id', 'oper_id', 'eqp_id', 'rcp_id',
+                  'lot_state', 'in_cnt', 'hold_cnt', 'scrap_cnt'),
+    'eqp_state': ('event_time', 'end_time', 'eqp_id', 'line_id', 'oper_id',
+                  'lot_id', 'rcp_id', 'eqp_state'),
+    'rcp_state': ('rcp_id', 'eqp_id', 'complex_level'),
+}
+
+# 키셋 페이지네이션 대상 테이블
+#   sort_key / tiebreak: 정렬 및 커서 기준 (event_time이 같은 행은 tiebreak로 구분)
+#   kpi_daily는 알람 워처 폴링용 (start_time / end_time 필터는 date 범위)
+# 권장 인덱스: CREATE INDEX ON lot_state (event_time, lot_id); CREATE INDEX ON eqp_state (event_time, eqp_id);
+PAGED_TABLES: Dict[str, Dict[str, Any]] = {
+    'lot_state': {
+        'sort_key': 'event_time',
+        'tiebreak': 'lot_id',
+        'columns': TABLE_COLUMNS['lot_state'],
+    },
+    'eqp_state': {
+        'sort_key': 'event_time',
+        'tiebreak': 'eqp_id',
+        'columns': TABLE_COLUMNS['eqp_state'],
+    },
+    'kpi_daily': {
+        'sort_key': 'date',
+        'tiebreak': 'eqp_id',
+        'columns': TABLE_COLUMNS['kpi_daily'],
+    },
+}
+
+
+def encode_cursor(sort_value: Any, tiebreak_value: Any) -> str:
+    """
+    마지막 행의 (정렬 키, tiebreak) 값을 URL-safe 커서 문자열로 변환합니다.
+
+    Returns:
+        str: base64 인코딩된 커서
+    """
+    raw = json.dumps([str(sort_value), str(tiebreak_value)], ensure_ascii=False)
+    return base64.urlsafe_b64encode(raw.encode('utf-8')).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor: str) -> tuple:
+    """
+    encode_cursor()로 만든 커서를 (정렬 키, tiebreak) 값으로 복원합니다.
+
+    Raises:
+        ValueError: 커서 형식이 잘못된 경우
+    """
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')).decode('utf-8'))
+        if not isinstance(values, list) or len(values) != 2:
+            raise ValueError
+        return values[0], values[1]
+    except Exception:
+        raise ValueError(f"잘못된 커서입니다: {cursor}")
+
+
+# ──────────────────────────────────────────────────────────────
+# 페이지 단위 읽기 (PostgREST 응답 행 수 상한 대응)
+# ──────────────────────────────────────────────────────────────
+
+# 다음 페이지 미리 읽기 전용 스레드 풀 (조회 스레드 풀과 분리 → 서로 기다리며 막히지 않음)
+_prefetch_executor = ThreadPoolExecutor(
+    max_workers=int(os.getenv('PAGED_READER_PREFETCH_WORKERS', '8')),
+    thread_name_prefix='page_prefetch',
+)
+
+
+class PagedRows(list):
+    """
+    collect() 결과 (일반 list와 같이 사용, 상한에 걸렸는지 truncated로 확인)
+    """
+
+    truncated: bool = False
+    pages: int = 0
+
+
+class PagedReader:
+    """
+    페이지 단위로 이어 읽는 리더
+
+    한 번의 응답 행 수가 서버 상한(PostgREST db-max-rows)에 막혀 결과가 조용히 잘리지 않도록
+    페이지 크기만큼 꽉 찬 응답이 오면 다음 페이지를 계속 읽습니다.
+    현재 페이지를 소비하는 동안 다음 페이지를 백그라운드에서 미리 요청합니다.
+
+    사용 예:
+        >>> reader = PagedReader(lambda offset, limit: query(offset, limit), page_size=1000)
+        >>> for row in reader: ...              # 스트리밍
+        >>> rows = reader.collect(max_rows=20000)  # 상한까지 모으기
+        >>> rows.truncated
+    """
+
+    def __init__(
+        self,
+        fetch_page: Callable[[int, int], List[Dict[str, Any]]],
+        page_size: int = 1000,
+        prefetch: bool = True,
+    ):
+        """
+        Args:
+            fetch_page: (offset, limit) → 행 목록 (정렬 순서가 고정된 조회여야 함)
+            page_size: 페이지 크기 (서버 응답 상한 이하)
+            prefetch: 다음 페이지 미리 읽기 여부
+        """
+        self._fetch_page = fetch_page
+        self.page_size = page_size
+        self.prefetch = prefetch
+        self.pages = 0
+
+    def _request(self, offset: int) -> Future:
+        # 첫 페이지는 호출한 스레드에서 바로 조회 (미리 읽기 풀은 다음 페이지에만 사용)
+        if self.prefetch and offset > 0:
+            # 미리 읽는 스레드에도 요청의 로그 컨텍스트 전달
+            return _prefetch_executor.submit(
+                contextvars.copy_context().run, self._fetch_page, offset, self.page_size,
+            )
+        future: Future = Future()
+        try:
+            future.set_result(self._fetch_page(offset, self.page_size))
+        except Exception as e:
+            future.set_exception(e)
+        return future
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        offset = 0
+        pending: Optional[Future] = self._request(offset)
+        try:
+            while pending is not None:
+                page = pending.result() or []
+                pending = None
+                self.pages += 1
+                if len(page) >= self.page_size:
+                    # 꽉 찬 페이지 → 다음 페이지가 있을 수 있으므로 소비 전에 미리 요청
+                    offset += self.page_size
+                    pending = self._request(offset)
+                yield from page
+        finally:
+            # 소비를 중간에 멈추면 미리 요청한 페이지는 취소 (이미 실행 중이면 결과만 버림)
+            if pending is not None:
+                pending.cancel()
+
+    def collect(self, max_rows: Optional[int] = None) -> PagedRows:
+        """
+        max_rows까지 모아서 반환합니다.
+
+        Args:
+            max_rows: 최대 행 수 (None이면 끝까지)
+
+        Returns:
+            PagedRows: 행 목록 (상한을 넘는 행이 더 있으면 truncated=True)
+        """
+        rows = PagedRows()
+        iterator = iter(self)
+        try:
+            for row in iterator:
+                if max_rows is not None and len(rows) >= max_rows:
+                    rows.truncated = True
+                    break
+                rows.append(row)
+        finally:
+            iterator.close()
+        rows.pages = self.pages
+        return rows
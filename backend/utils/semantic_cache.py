@@ -0,0 +1,232 @@
+"""
+의미 기반 질문 캐시
+
+표현만 다른 같은 질문("EQP03 OEE 왜 떨어졌어" / "EQP03의 OEE 하락 원인")에
+이전 답변을 재사용하여 ChromaDB 검색과 Claude 호출을 생략합니다.
+
+- 질문 임베딩(정규화 벡터)을 메모리 인덱스에 저장하고 코사인 유사도로 조회
+- 장비 ID / KPI / 숫자(날짜 등)가 다른 질문은 비교하지 않음 (엔티티 서명별 버킷)
+- 항목별 TTL, 최대 항목 수 초과 시 LRU 삭제
+- 새 리포트가 저장되면(Node 9) 전체 무효화
+"""
+
+import os
+import re
+import time
+import threading
+from collections import OrderedDict
+from typing import Optional, List, Dict, Any, Tuple
+
+import numpy as np
+
+from backend.config.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+# 답변 재사용에 필요한 State 필드만 저장 (lot_data 등 대용량 필드 제외)
+_STORED_FIELDS = ('input_type', 'question_text', 'final_answer', 'similar_reports',
+                  'report_exists', 'metadata')
+
+# 엔티티 서명: 값이 다르면 의미가 비슷해도 다른 질문으로 취급
+_ENTITY_PATTERN = re.compile(r'EQP\d+|LOT\w+|OEE|THP|TAT|WIP|\d+')
+
+
+def question_signature(question: str) -> Tuple[str, ...]:
+    """
+    질문의 엔티티 서명 (장비 ID, 로트 ID, KPI, 숫자)
+
+    Args:
+        question: 질문 텍스트
+
+    Returns:
+        Tuple[str, ...]: 정렬된 엔티티 목록
+    """
+    return tuple(sorted(set(_ENTITY_PATTERN.findall(question.upper()))))
+
+
+class SemanticQuestionCache:
+    """
+    임베딩 유사도 기반 질문 답변 캐시
+
+    인덱스는 엔티티 서명별 버킷으로 나뉘며, 버킷 안에서는
+    정규화된 벡터 행렬과의 내적 한 번으로 가장 가까운 질문을 찾습니다.
+    """
+
+    def __init__(self, threshold: float = 0.92, ttl_seconds: int = 1800, max_entries: int = 500):
+        """
+        Args:
+            threshold: 답변을 재사용할 최소 코사인 유사도
+            ttl_seconds: 항목 유효 시간 (초)
+            max_entries: 최대 저장 항목 수
+        """
+        self.threshold = threshold
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+
+        self._lock = threading.Lock()
+        # entry_id -> {'question', 'signature', 'vector', 'state', 'expires_at'} (앞쪽이 LRU)
+        self._entries: 'OrderedDict[int, Dict[str, Any]]' = OrderedDict()
+        # signature -> (entry_id 목록, 벡터 행렬) — 조회 시 lazy 재구성
+        self._buckets: Dict[Tuple[str, ...], Tuple[List[int], Optional[np.ndarray]]] = {}
+        self._next_id = 0
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    @staticmethod
+    def _normalize(embedding: List[float]) -> Optional[np.ndarray]:
+        vector = np.asarray(embedding, dtype=np.float32)
+        norm = float(np.linalg.norm(vector))
+        if norm == 0.0:
+            return None
+        return vector / norm
+
+    def _remove(self, entry_id: int) -> None:
+        """항목 제거 (락 보유 상태에서 호출)"""
+        entry = self._entries.pop(entry_id)
+        ids, _ = self._buckets.get(entry['signature'], ([], None))
+        ids = [i for i in ids if i != entry_id]
+        if ids:
+            self._buckets[entry['signature']] = (ids, None)
+        else:
+            self._buckets.pop(entry['signature'], None)
+
+    def _bucket_matrix(self, signature: Tuple[str, ...]) -> Tuple[List[int], Optional[np.ndarray]]:
+        """버킷의 벡터 행렬 (변경 후 첫 조회 시 재구성, 락 보유 상태에서 호출)"""
+        ids, matrix = self._buckets.get(signature, ([], None))
+        if ids and matrix is None:
+            matrix = np.stack([self._entries[i]['vector'] for i in ids])
+            self._buckets[signature] = (ids, matrix)
+        return ids, matrix
+
+    def lookup(self, question: str, embedding: List[float]) -> Optional[Dict[str, Any]]:
+        """
+        유사한 이전 질문의 답변 조회
+
+        Args:
+            question: 질문 텍스트
+            embedding: 질문 임베딩 벡터
+
+        Returns:
+            캐시된 State (similarity 정보 포함) 또는 None
+        """
+        vector = self._normalize(embedding)
+        signature = question_signature(question)
+        now = time.monotonic()
+
+        with self._lock:
+            ids, matrix = self._bucket_matrix(signature)
+            if vector is None or matrix is None:
+                self.misses += 1
+                return None
+
+            scores = matrix @ vector
+            for idx in np.argsort(-scores):
+                entry_id = ids[int(idx)]
+                score = float(scores[idx])
+                if score < self.threshold:
+                    break
+                entry = self._entries[entry_id]
+                if now > entry['expires_at']:
+                    continue
+                self._entries.move_to_end(entry_id)
+                self.hits += 1
+                logger.info("의미 캐시 히트: '%.30s' ≈ '%.30s' (유사도 %.3f)",
+                            question, entry['question'], score)
+                state = dict(entry['state'])
+                state['semantic_cache'] = {'matched_question': entry['question'],
+                                           'similarity': round(score, 4)}
+                return state
+
+            self.misses += 1
+            return None
+
+    def add(self, question: str, embedding: List[float], state: Dict[str, Any]) -> None:
+        """
+        질문 답변 저장
+
+        Args:
+            question: 질문 텍스트
+            embedding: 질문 임베딩 벡터
+            state: 워크플로우 최종 State (답변 관련 필드만 저장)
+        """
+        vector = self._normalize(embedding)
+        if vector is None:
+            return
+        signature = question_signature(question)
+        stored = {k: state[k] for k in _STORED_FIELDS if k in state}
+
+        with self._lock:
+            # 만료 항목 정리 후 LRU 삭제
+            now = time.monotonic()
+            for entry_id in [i for i, e in self._entries.items() if now > e['expires_at']]:
+                self._remove(entry_id)
+            while len(self._entries) >= self.max_entries:
+                self._remove(next(iter(self._entries)))
+                self.evictions += 1
+
+            entry_id = self._next_id
+            self._next_id += 1
+            self._entries[entry_id] = {
+                'question': question,
+                'signature': signature,
+                'vector': vector,
+                'state': stored,
+                'expires_at': now + self.ttl_seconds,
+            }
+            ids, _ = self._buckets.get(signature, ([], None))
+            self._buckets[signature] = (ids + [entry_id], None)
+
+    def invalidate(self, reason: str = '') -> int:
+        """
+        전체 무효화 (새 리포트 저장 등으로 기존 답변이 오래된 경우)
+
+        Args:
+            reason: 로그에 남길 사유
+
+        Returns:
+            int: 삭제된 항목 수
+        """
+        with self._lock:
+            count = len(self._entries)
+            self._entries.clear()
+            self._buckets.clear()
+            self.invalidations += 1
+        logger.info("의미 캐시 무효화: %d개%s", count, f" ({reason})" if reason else "")
+        return count
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        캐시 통계
+
+        Returns:
+            캐시 통계 정보
+        """
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                'total_items': len(self._entries),
+                'buckets': len(self._buckets),
+                'max_entries': self.max_entries,
+                'threshold': self.threshold,
+                'ttl_seconds': self.ttl_seconds,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': round(self.hits / total, 4) if total else 0.0,
+                'evictions': self.evictions,
+                'invalidations': self.invalidations,
+            }
+
+
+# 전역 의미 캐시 인스턴스 (SEMANTIC_CACHE_ENABLED=false 이면 None)
+semantic_qa_cache: Optional[SemanticQuestionCache] = (
+    SemanticQuestionCache(
+        threshold=float(os.getenv('SEMANTIC_CACHE_THRESHOLD', '0.92')),
+        ttl_seconds=int(os.getenv('SEMANTIC_CACHE_TTL_SECONDS', '1800')),
+        max_entries=int(os.getenv('SEMANTIC_CACHE_MAX_ENTRIES', '500')),
+    )
+    if os.getenv('SEMANTIC_CACHE_ENABLED', 'true').lower() == 'true'
+    else None
+)
@@ -0,0 +1,274 @@
+"""
+테이블 카탈로그 (lot_state / eqp_state 메타데이터)
+
+Database 페이지의 날짜·장비 필터 목록(/lot-state/meta, /eqp-state/meta)을 열 때마다
+eqp_id 컬럼 전체를 읽지 않도록, 날짜·장비별 행 수 버킷을 메모리에 유지하고 여기서 응답합니다.
+
+- 버킷: (date, eqp_id) → 행 수, 첫/마지막 event_time
+  (집계는 Supabase SQL 함수의 GROUP BY, 함수가 없으면 두 컬럼만 스캔 — supabase_config 참고)
+- 변경 감지: probe_seconds마다 테이블 서명(최신 event_time + 추정 행 수)을 한 번 조회해
+  바뀐 경우에만 워터마크 날짜부터 증분 갱신 (그날 버킷은 통째로 교체)
+- 최신 event_time이 줄었거나 full_refresh_seconds가 지나면 전체 재집계
+  (과거 행 삭제/수정은 서명에 드러나지 않으므로 주기적 전체 재집계로 반영)
+
+환경 변수:
+    CATALOG_PROBE_SECONDS: 변경 확인 주기 (기본 30초)
+    CATALOG_FULL_REFRESH_SECONDS: 전체 재집계 주기 (기본 3600초, 0이면 변경 시에만)
+"""
+
+import os
+import time
+import threading
+from datetime import datetime
+from typing import Optional, List, Dict, Any, Tuple
+
+from backend.config.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+CATALOG_TABLES = ('lot_state', 'eqp_state')
+
+
+class _TableEntry:
+    """테이블 하나의 버킷 / 워터마크 / 서명"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.buckets: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        self.watermark: Optional[str] = None      # 반영된 마지막 날짜
+        self.signature: Optional[Dict[str, Any]] = None
+        self.last_probe: Optional[float] = None
+        self.last_full: Optional[float] = None
+        self.refreshed_at: Optional[str] = None
+        self.views: Dict[Optional[str], Dict[str, Any]] = {}
+
+
+class TableCatalog:
+    """
+    lot_state / eqp_state 날짜·장비 카탈로그
+
+    테이블마다 락이 따로 있어 한 테이블을 갱신하는 동안 다른 테이블 조회는 막지 않습니다.
+    같은 테이블에 동시에 들어온 요청은 갱신 한 번을 기다려 같은 결과를 받습니다.
+    """
+
+    def __init__(self, source=None, probe_seconds: float = 30, full_refresh_seconds: float = 3600):
+        """
+        Args:
+            source: get_table_daily_catalog / get_table_signature를 제공하는 객체
+                    (None이면 첫 조회 시 전역 supabase_config 사용)
+            probe_seconds: 변경 확인 주기 (초, 0이면 조회마다 확인)
+            full_refresh_seconds: 전체 재집계 주기 (초, 0이면 변경 감지 시에만 증분 갱신)
+        """
+        self._source = source
+        self.probe_seconds = probe_seconds
+        self.full_refresh_seconds = full_refresh_seconds
+        self._tables = {table: _TableEntry() for table in CATALOG_TABLES}
+
+        self.probes = 0
+        self.refreshes = 0
+        self.full_refreshes = 0
+        self.probe_errors = 0
+
+    @property
+    def source(self):
+        if self._source is None:
+            from backend.config.supabase_config import supabase_config
+            self._source = supabase_config
+        return self._source
+
+    def _entry(self, table: str) -> _TableEntry:
+        if table not in self._tables:
+            raise ValueError(f"카탈로그를 지원하지 않는 테이블: {table}")
+        return self._tables[table]
+
+    # ──────────────────────────────────────────────────────────────
+    # 갱신
+    # ──────────────────────────────────────────────────────────────
+
+    def refresh(self, table: str, full: bool = False) -> Dict[str, Any]:
+        """
+        카탈로그 갱신
+
+        Args:
+            table: 'lot_state' 또는 'eqp_state'
+            full: True면 전체 재집계 (False면 워터마크 날짜부터 증분)
+
+        Returns:
+            Dict: {'mode', 'buckets', 'elapsed_ms'}
+        """
+        entry = self._entry(table)
+        with entry.lock:
+            return self._refresh_locked(table, entry, full)
+
+    def _refresh_locked(self, table: str, entry: _TableEntry, full: bool,
+                        signature: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        started = time.perf_counter()
+        full = full or entry.watermark is None
+        since = None if full else entry.watermark
+
+        # 서명을 집계보다 먼저 읽어, 집계 중에 들어온 행은 다음 확인에서 다시 반영
+        if signature is None:
+            signature = self.source.get_table_signature(table)
+        rows = self.source.get_table_daily_catalog(table, since_date=since)
+
+        if full:
+            entry.buckets = {}
+        else:
+            entry.buckets = {k: v for k, v in entry.buckets.items() if k[0] < since}
+        for row in rows:
+            key = (str(row['date'])[:10], row.get('eqp_id') or '')
+            entry.buckets[key] = {
+                'rows': int(row.get('rows') or 0),
+                'first_event_time': row.get('first_event_time'),
+                'last_event_time': row.get('last_event_time'),
+            }
+
+        if entry.buckets:
+            entry.watermark = max(k[0] for k in entry.buckets)
+        entry.signature = signature
+        entry.views.clear()
+        now = time.monotonic()
+        entry.last_probe = now
+        if full:
+            entry.last_full = now
+            self.full_refreshes += 1
+        self.refreshes += 1
+        entry.refreshed_at = datetime.now().isoformat(timespec='seconds')
+
+        elapsed_ms = round((time.perf_counter() - started) * 1000, 1)
+        mode = 'full' if full else 'incremental'
+        logger.info("테이블 카탈로그 갱신(%s): %s 원천 %d버킷 (%sms)", mode, table, len(rows), elapsed_ms)
+        return {'mode': mode, 'buckets': len(entry.buckets), 'elapsed_ms': elapsed_ms}
+
+    def _ensure_fresh(self, table: str, entry: _TableEntry) -> None:
+        """확인 주기가 지났으면 서명을 비교해 바뀐 경우에만 갱신 (락 보유 상태에서 호출)"""
+        now = time.monotonic()
+        if entry.last_full is None:
+            self._refresh_locked(table, entry, full=True)
+            return
+        if self.full_refresh_seconds and now - entry.last_full > self.full_refresh_seconds:
+            self._refresh_locked(table, entry, full=True)
+            return
+        if entry.last_probe is not None and now - entry.last_probe < self.probe_seconds:
+            return
+
+        try:
+            signature = self.source.get_table_signature(table)
+            self.probes += 1
+        except Exception as e:
+            # 확인 실패 시 이전 카탈로그로 응답 (다음 확인 주기에 다시 시도)
+            self.probe_errors += 1
+            entry.last_probe = now
+            logger.warning("테이블 카탈로그 변경 확인 실패(%s), 이전 목록 사용: %s", table, e)
+            return
+
+        entry.last_probe = now
+        if signature == entry.signature:
+            return
+        previous_max = (entry.signature or {}).get('max_event_time')
+        current_max = signature.get('max_event_time')
+        shrunk = previous_max is not None and (current_max is None or current_max < previous_max)
+        self._refresh_locked(table, entry, full=shrunk, signature=signature)
+
+    def invalidate(self, table: str = None) -> None:
+        """
+        카탈로그 무효화 (다음 조회 시 전체 재집계)
+
+        Args:
+            table: 대상 테이블 (None이면 전체)
+        """
+        for name in ([table] if table else CATALOG_TABLES):
+            entry = self._entry(name)
+            with entry.lock:
+                entry.watermark = None
+                entry.last_full = None
+                entry.signature = None
+                entry.views.clear()
+        logger.info("테이블 카탈로그 무효화: %s", table or '전체')
+
+    # ──────────────────────────────────────────────────────────────
+    # 조회
+    # ──────────────────────────────────────────────────────────────
+
+    def get_meta(self, table: str, eqp_id: str = None) -> Dict[str, Any]:
+        """
+        테이블 메타데이터 (Database 페이지 필터 목록)
+
+        Args:
+            table: 'lot_state' 또는 'eqp_state'
+            eqp_id: 지정하면 해당 장비의 데이터가 있는 날짜만
+
+        Returns:
+            Dict: {
+                'dates': 데이터가 있는 날짜 목록 (오름차순),
+                'eqps': 장비 ID 목록 (오름차순),
+                'daily_rows': {date: 행 수},
+                'total_rows', 'min_event_time', 'max_event_time', 'refreshed_at'
+            }
+        """
+        entry = self._entry(table)
+        with entry.lock:
+            self._ensure_fresh(table, entry)
+            if eqp_id not in entry.views:
+                entry.views[eqp_id] = self._build_meta(entry, eqp_id)
+            return entry.views[eqp_id]
+
+    @staticmethod
+    def _build_meta(entry: _TableEntry, eqp_id: Optional[str]) -> Dict[str, Any]:
+        daily: Dict[str, int] = {}
+        first: List[str] = []
+        last: List[str] = []
+        for (day, eqp), bucket in entry.buckets.items():
+            if eqp_id and eqp != eqp_id:
+                continue
+            daily[day] = daily.get(day, 0) + bucket['rows']
+            if bucket.get('first_event_time'):
+                first.append(bucket['first_event_time'])
+            if bucket.get('last_event_time'):
+                last.append(bucket['last_event_time'])
+        dates = sorted(daily)
+        return {
+            'dates': dates,
+            'eqps': sorted({eqp for _, eqp in entry.buckets if eqp}),
+            'daily_rows': {day: daily[day] for day in dates},
+            'total_rows': sum(daily.values()),
+            'min_event_time': min(first) if first else None,
+            'max_event_time': max(last) if last else None,
+            'refreshed_at': entry.refreshed_at,
+        }
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        카탈로그 통계
+
+        Returns:
+            테이블별 버킷 수 / 워터마크 / 서명과 갱신·확인 횟수
+        """
+        now = time.monotonic()
+        return {
+            'probe_seconds': self.probe_seconds,
+            'full_refresh_seconds': self.full_refresh_seconds,
+            'probes': self.probes,
+            'probe_errors': self.probe_errors,
+            'refreshes': self.refreshes,
+            'full_refreshes': self.full_refreshes,
+            'tables': {
+                name: {
+                    'buckets': len(entry.buckets),
+                    'watermark': entry.watermark,
+                    'signature': entry.signature,
+                    'refreshed_at': entry.refreshed_at,
+                    'seconds_since_probe': (
+                        round(now - entry.last_probe, 1) if entry.last_probe else None
+                    ),
+                }
+                for name, entry in self._tables.items()
+            },
+        }
+
+
+# 전역 테이블 카탈로그 인스턴스
+table_catalog = TableCatalog(
+    probe_seconds=float(os.getenv('CATALOG_PROBE_SECONDS', '30')),
+    full_refresh_seconds=float(os.getenv('CATALOG_FULL_REFRESH_SECONDS', '3600')),
+)
@@ -3,6 +3,7 @@
 """
 
 import sys
+import time
 from pathlib import Path
 
 # 프로젝트 루트를 경로에 추가
@@ -23,6 +24,18 @@ from backend.utils.data_utils import (
     get_downtime_info
 )
 
+from backend.utils.embedding_cache import EmbeddingCache
+from backend.utils.cache import SimpleCache
+from backend.utils.cache_backends import SQLiteCacheBackend, serialize_state, deserialize_state
+from backend.utils.semantic_cache import SemanticQuestionCache, question_signature
+from backend.utils.kpi_aggregates import KpiAggregateStore
+from backend.utils.table_catalog import TableCatalog
+from backend.utils.dashboard_summary import DashboardSummaryEngine
+from backend.utils.kpi_engine import detect_alarm_kpis, scan_kpi_alarms
+from backend.utils.context_budget import ContextSection, build_budgeted_context, estimate_tokens
+from backend.utils.data_utils import build_alarm_context
+from backend.utils.tracing import traced_node, record_llm_call, metrics, summarize_trace
+
 
 def test_date_utils():
     """날짜 유틸리티 함수 테스트"""
@@ -115,6 +128,613 @@ def test_data_utils():
     print("데이터 유틸리티 테스트 완료!\n")
 
 
+def test_embedding_cache():
+    """임베딩 디스크 캐시 테스트"""
+    
+    import tempfile
+    
+    print("=" * 60)
+    print("임베딩 캐시 테스트")
+    print("=" * 60 + "\n")
+    
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        cache = EmbeddingCache(db_path=f"{tmp_dir}/cache.sqlite3", max_entries=2)
+        
+        # 1. 미스 → 저장 → 히트
+        print("1. 저장/조회 테스트")
+        assert cache.get("titan", "EQP01 OEE") is None
+        cache.set("titan", "EQP01 OEE", [0.5, 1.0])
+        assert cache.get("titan", "EQP01 OEE") == [0.5, 1.0]
+        # 모델이 다르면 별도 키
+        assert cache.get("titan-v2", "EQP01 OEE") is None
+        print(f"   통계: {cache.get_stats()}\n")
+        
+        # 2. LRU 삭제 (최근 사용한 항목은 유지)
+        print("2. LRU 삭제 테스트")
+        cache.set("titan", "EQP02 THP", [2.0])
+        cache.get("titan", "EQP01 OEE")
+        cache.set("titan", "EQP03 TAT", [3.0])
+        assert cache.get("titan", "EQP02 THP") is None
+        assert cache.get("titan", "EQP01 OEE") == [0.5, 1.0]
+        stats = cache.get_stats()
+        print(f"   통계: {stats}\n")
+        assert stats['total_items'] == 2
+        assert stats['evictions'] == 1
+    
+    print("임베딩 캐시 테스트 완료!\n")
+
+
+def test_simple_cache():
+    """LRU + TTL 인메모리 캐시 테스트"""
+    
+    import time
+    
+    print("=" * 60)
+    print("인메모리 캐시 테스트")
+    print("=" * 60 + "\n")
+    
+    # 1. 최대 항목 수 초과 시 LRU 삭제
+    print("1. LRU 삭제 테스트")
+    cache = SimpleCache(ttl_seconds=60, max_entries=2, name='test')
+    cache.set("a", {"value": 1})
+    cache.set("b", {"value": 2})
+    cache.get("a")
+    cache.set("c", {"value": 3})
+    assert cache.get("b") is None
+    assert cache.get("a") == {"value": 1}
+    stats = cache.get_stats()
+    print(f"   통계: {stats}\n")
+    assert stats['total_items'] == 2
+    assert stats['evictions'] == 1
+    
+    # 2. 최대 크기 초과 시 LRU 삭제
+    print("2. 크기 제한 테스트")
+    cache = SimpleCache(ttl_seconds=60, max_entries=100, max_bytes=300, name='test')
+    cache.set("lot_1", {"lot_data": ["x" * 100]})
+    cache.set("lot_2", {"lot_data": ["y" * 100]})
+    cache.set("lot_3", {"lot_data": ["z" * 100]})
+    stats = cache.get_stats()
+    print(f"   통계: {stats}\n")
+    assert cache.get("lot_1") is None
+    assert stats['total_bytes'] <= 300
+    # 최대 크기보다 큰 항목은 저장하지 않음
+    cache.set("huge", {"lot_data": ["h" * 1000]})
+    assert cache.get("huge") is None
+    
+    # 3. TTL 만료
+    print("3. TTL 만료 테스트")
+    cache = SimpleCache(ttl_seconds=0.05, name='test')
+    cache.set("a", {"value": 1})
+    time.sleep(0.1)
+    assert cache.purge_expired() == 1
+    assert cache.get("a") is None
+    print(f"   통계: {cache.get_stats()}\n")
+    
+    print("인메모리 캐시 테스트 완료!\n")
+
+
+def test_shared_cache_backend():
+    """공유 캐시 백엔드 테스트 (두 레플리카가 같은 SQLite 파일을 공유)"""
+    
+    import tempfile
+    
+    print("=" * 60)
+    print("공유 캐시 백엔드 테스트")
+    print("=" * 60 + "\n")
+    
+    # 1. 직렬화 (큰 상태는 압축)
+    print("1. AgentState 직렬화 테스트")
+    state = {'alarm_eqp_id': 'EQP01', 'lot_data': [{'lot_id': f'LOT{i:03d}', 'in_cnt': i} for i in range(200)]}
+    blob = serialize_state(state)
+    assert deserialize_state(blob) == state
+    assert blob[:1] == b'Z'
+    print(f"   JSON {len(str(state))}자 → {len(blob)}B\n")
+    
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        backend = SQLiteCacheBackend(db_path=f"{tmp_dir}/shared.sqlite3")
+        pod_a = SimpleCache(ttl_seconds=60, name='phase1', backend=backend)
+        pod_b = SimpleCache(ttl_seconds=60, name='phase1', backend=backend)
+        
+        # 2. 다른 파드에서 저장한 세션 조회
+        print("2. 레플리카 간 공유 테스트")
+        pod_a.set("session-1", state)
+        assert pod_b.get("session-1") == state
+        assert pod_b.get_stats()['backend_hits'] == 1
+        
+        # 3. 삭제는 공유 저장소에도 반영
+        print("3. 삭제 전파 테스트")
+        pod_b.delete("session-1")
+        assert SimpleCache(ttl_seconds=60, name='phase1', backend=backend).get("session-1") is None
+        # 네임스페이스가 다르면 별도 키
+        pod_a.set("session-2", {'a': 1})
+        assert SimpleCache(ttl_seconds=60, name='qa', backend=backend).get("session-2") is None
+        print(f"   통계: {pod_a.get_stats()}\n")
+    
+    print("공유 캐시 백엔드 테스트 완료!\n")
+
+
+def test_semantic_cache():
+    """의미 기반 질문 캐시 테스트 (임베딩 대신 고정 벡터 사용)"""
+    
+    print("=" * 60)
+    print("의미 캐시 테스트")
+    print("=" * 60 + "\n")
+    
+    cache = SemanticQuestionCache(threshold=0.9, ttl_seconds=60, max_entries=10)
+    state = {'final_answer': 'EQP03 OEE 하락 원인: 설비 다운', 'lot_data': [{'lot_id': 'LOT001'}]}
+    
+    # 1. 유사한 질문은 답변 재사용 (대용량 필드는 저장하지 않음)
+    print("1. 유사 질문 조회 테스트")
+    cache.add("EQP03 OEE 왜 떨어졌어", [1.0, 0.0, 0.1], state)
+    hit = cache.lookup("EQP03의 OEE 하락 원인", [0.98, 0.05, 0.12])
+    assert hit is not None and hit['final_answer'] == state['final_answer']
+    assert 'lot_data' not in hit
+    print(f"   유사도: {hit['semantic_cache']['similarity']}")
+    
+    # 2. 유사도가 낮거나 장비 ID가 다르면 미스
+    print("2. 미스 조건 테스트")
+    assert cache.lookup("EQP03 OEE 하락 원인", [0.0, 1.0, 0.0]) is None
+    assert question_signature("EQP04 OEE 하락 원인") != question_signature("EQP03 OEE 왜 떨어졌어")
+    assert cache.lookup("EQP04 OEE 하락 원인", [1.0, 0.0, 0.1]) is None
+    
+    # 3. 리포트 추가 시 무효화
+    print("3. 무효화 테스트")
+    assert cache.invalidate("테스트") == 1
+    assert cache.lookup("EQP03의 OEE 하락 원인", [0.98, 0.05, 0.12]) is None
+    print(f"   통계: {cache.get_stats()}\n")
+    
+    print("의미 캐시 테스트 완료!\n")
+
+
+def _kpi_bucket(date, eqp_id, oee_v, alarm=0, oee_breach=0):
+    """get_kpi_daily_rollup() 형식의 버킷 1개 (장비당 하루 1행)"""
+    row = {'date': date, 'eqp_id': eqp_id, 'line_id': 'L1', 'oper_id': 'OP1',
+           'rows': 1, 'alarm_rows': alarm}
+    for k, (v, t) in {'oee': (oee_v, 70), 'thp': (250, 250), 'tat': (2.0, 3.5), 'wip': (250, 250)}.items():
+        row[f"{k}_v_sum"], row[f"{k}_t_sum"] = v, t
+        row[f"{k}_breach"] = oee_breach if k == 'oee' else 0
+        row[f"{k}_alarm"] = alarm if k == 'oee' else 0
+    return row
+
+
+class FakeAggregateRDS:
+    """KpiAggregateStore용 가짜 RDS: since 인자를 기록하고 해당 날짜 이후 버킷만 반환"""
+
+    def __init__(self, kpi_rows, downtime_rows):
+        self.kpi_rows = kpi_rows
+        self.downtime_rows = downtime_rows
+        self.since = []
+
+    def get_kpi_daily_rollup(self, since_date=None):
+        self.since.append(since_date)
+        return [r for r in self.kpi_rows if not since_date or r['date'] >= since_date]
+
+    def get_downtime_daily(self, since_time=None):
+        return [r for r in self.downtime_rows if not since_time or r['date'] >= since_time[:10]]
+
+
+class FakeCatalogSource:
+    """TableCatalog용 가짜 소스: event_time 목록을 날짜·장비별로 집계하고 호출 인자를 기록"""
+
+    def __init__(self, events):
+        self.events = events  # [(event_time, eqp_id)]
+        self.since = []
+        self.signature_calls = 0
+
+    def get_table_signature(self, table):
+        self.signature_calls += 1
+        return {'max_event_time': max(t for t, _ in self.events), 'row_estimate': len(self.events)}
+
+    def get_table_daily_catalog(self, table, since_date=None):
+        self.since.append(since_date)
+        buckets = {}
+        for event_time, eqp_id in sorted(self.events):
+            if since_date and event_time[:10] < since_date:
+                continue
+            bucket = buckets.setdefault((event_time[:10], eqp_id), {
+                'date': event_time[:10], 'eqp_id': eqp_id, 'rows': 0,
+                'first_event_time': event_time, 'last_event_time': event_time})
+            bucket['rows'] += 1
+            bucket['last_event_time'] = event_time
+        return list(buckets.values())
+
+
+def test_table_catalog():
+    """테이블 카탈로그(메타데이터) 테스트"""
+
+    print("=" * 60)
+    print("테이블 카탈로그 테스트")
+    print("=" * 60 + "\n")
+
+    source = FakeCatalogSource([
+        ('2026-01-20 08:00:00', 'EQP01'),
+        ('2026-01-20 09:00:00', 'EQP02'),
+        ('2026-01-22 10:00:00', 'EQP01'),
+    ])
+    catalog = TableCatalog(source=source, probe_seconds=0, full_refresh_seconds=0)
+
+    # 1. 첫 조회: 전체 집계, 데이터가 있는 날짜만 (빈 날짜 01-21 제외)
+    meta = catalog.get_meta('lot_state')
+    print(f"   메타: {meta}")
+    assert meta['dates'] == ['2026-01-20', '2026-01-22']
+    assert meta['eqps'] == ['EQP01', 'EQP02']
+    assert meta['total_rows'] == 3
+    assert meta['max_event_time'] == '2026-01-22 10:00:00'
+    assert catalog.get_meta('lot_state', eqp_id='EQP02')['dates'] == ['2026-01-20']
+    assert source.since == [None]
+
+    # 2. 변경 없음: 서명만 확인하고 재집계하지 않음
+    catalog.get_meta('lot_state')
+    assert source.since == [None]
+
+    # 3. 새 행 적재: 워터마크 날짜부터 증분 갱신
+    source.events.append(('2026-01-23 07:00:00', 'EQP03'))
+    meta = catalog.get_meta('lot_state')
+    assert source.since == [None, '2026-01-22']
+    assert meta['dates'][-1] == '2026-01-23' and 'EQP03' in meta['eqps']
+    assert meta['total_rows'] == 4
+
+    # 4. 최신 행 삭제(최신 event_time 감소): 전체 재집계
+    source.events.pop()
+    meta = catalog.get_meta('lot_state')
+    assert source.since[-1] is None
+    assert meta['dates'] == ['2026-01-20', '2026-01-22']
+
+    stats = catalog.get_stats()
+    print(f"   통계: {stats}")
+    assert stats['full_refreshes'] == 2 and stats['refreshes'] == 3
+
+    print("\n테이블 카탈로그 테스트 통과!\n")
+
+
+def test_dashboard_summary():
+    """대시보드 요약 엔진 테스트"""
+
+    print("=" * 60)
+    print("대시보드 요약 엔진 테스트")
+    print("=" * 60 + "\n")
+
+    class FakeSummarySource:
+        def __init__(self, rows):
+            self.rows = rows
+            self.since = []
+
+        def get_kpi_daily_since(self, since_date=None):
+            self.since.append(since_date)
+            return [dict(r) for r in self.rows if not since_date or r['date'] >= since_date]
+
+        def get_kpi_summary(self, eqp_id=None):
+            return {'latest': None, 'total_count': 0, 'alarm_count': 0}
+
+    source = FakeSummarySource([
+        {'date': '2026-01-30', 'eqp_id': 'EQP01', 'oee_v': 70, 'alarm_flag': 1},
+        {'date': '2026-01-31', 'eqp_id': 'EQP02', 'oee_v': 82, 'alarm_flag': 0},
+        {'date': '2026-01-31', 'eqp_id': 'EQP01', 'oee_v': 75, 'alarm_flag': 1},
+    ])
+    engine = DashboardSummaryEngine(source=source, refresh_seconds=0)
+
+    # 1. 전체 최신 행 (같은 날짜면 eqp_id 오름차순) / 알람 건수
+    summary = engine.get_summary()
+    print(f"   요약: {summary}")
+    assert summary['latest']['eqp_id'] == 'EQP01' and summary['latest']['date'] == '2026-01-31'
+    assert summary['alarm_count'] == 2 and summary['total_count'] == 3
+    assert engine.get_summary(eqp_id='EQP02')['alarm_count'] == 0
+
+    # 2. 증분 갱신: 워터마크 날짜를 다시 읽어도 건수는 중복되지 않음
+    source.rows[2]['alarm_flag'] = 0
+    source.rows.append({'date': '2026-02-01', 'eqp_id': 'EQP02', 'oee_v': 90, 'alarm_flag': 1})
+    engine.refresh()
+    summary = engine.get_summary()
+    assert source.since == [None, '2026-01-31']
+    assert summary['latest']['date'] == '2026-02-01'
+    assert summary['alarm_count'] == 2 and summary['total_count'] == 4
+    assert engine.get_summary(eqp_id='EQP01')['latest']['oee_v'] == 75
+
+    # 3. 처음 적재에 실패하면 DB 집계로 대체
+    class BrokenSource(FakeSummarySource):
+        def get_kpi_daily_since(self, since_date=None):
+            raise ConnectionError("DB 연결 실패")
+
+    fallback = DashboardSummaryEngine(source=BrokenSource([]), refresh_seconds=0).get_summary()
+    assert fallback['source'] == 'database'
+
+    # 4. 워터마크 이전 날짜의 보정은 전체 재적재 주기에 반영
+    source.rows[0]['alarm_flag'] = 0
+    engine.refresh()
+    assert engine.get_summary()['alarm_count'] == 2
+    engine.full_refresh_seconds = 0.01
+    time.sleep(0.02)
+    summary = engine.get_summary()
+    assert source.since[-1] is None and engine.full_refreshes == 2
+    assert summary['alarm_count'] == 1
+
+    print("\n대시보드 요약 엔진 테스트 통과!\n")
+
+
+def test_kpi_aggregates():
+    """KPI 사전 집계 저장소 테스트"""
+
+    print("=" * 60)
+    print("KPI 집계 저장소 테스트")
+    print("=" * 60 + "\n")
+
+    rds = FakeAggregateRDS(
+        kpi_rows=[
+            _kpi_bucket('2026-01-26', 'EQP01', 60, alarm=1, oee_breach=1),  # 월요일
+            _kpi_bucket('2026-01-26', 'EQP02', 80),
+            _kpi_bucket('2026-01-27', 'EQP01', 72),
+        ],
+        downtime_rows=[
+            {'date': '2026-01-26', 'eqp_id': 'EQP01', 'events': 2, 'minutes': 90.0,
+             'last_event_time': '2026-01-26 15:00:00'},
+            {'date': '2026-01-27', 'eqp_id': 'EQP01', 'events': 1, 'minutes': 30.0,
+             'last_event_time': '2026-01-27 09:00:00'},
+        ],
+    )
+    store = KpiAggregateStore(rds=rds, refresh_seconds=0)
+
+    # 1. 첫 조회 시 전체 집계, 주별/전체 롤업
+    print("1. 롤업 테스트")
+    weekly = store.kpi_rollup(period='week', group_by='all')
+    assert rds.since == [None]
+    assert len(weekly) == 1 and weekly[0]['period'] == '2026-01-26'
+    assert weekly[0]['rows'] == 3 and weekly[0]['oee_v'] == round((60 + 80 + 72) / 3, 2)
+    daily = store.kpi_rollup(period='day', group_by='eqp', last=1)
+    assert [(r['period'], r['group']) for r in daily] == [('2026-01-27', 'EQP01')]
+    print(f"   주별: {weekly}")
+
+    # 2. 같은 조건은 재사용, 알람/다운타임 집계
+    print("2. 알람 / 다운타임 테스트")
+    store.kpi_rollup(period='week', group_by='all')
+    assert store.get_stats()['view_hits'] == 1
+    alarms = store.alarm_counts()
+    assert alarms['total_alarms'] == 1 and alarms['counts'][0] == {'kpi': 'OEE', 'count': 1, 'breach_days': 1}
+    downtime = store.downtime(eqp_id='EQP01')
+    assert downtime[0]['minutes'] == 120.0 and downtime[0]['events'] == 3
+
+    # 3. 증분 갱신: 워터마크 날짜부터 다시 읽고 해당 날짜 버킷만 교체
+    print("3. 증분 갱신 테스트")
+    rds.kpi_rows[2] = _kpi_bucket('2026-01-27', 'EQP01', 74)
+    rds.kpi_rows.append(_kpi_bucket('2026-01-28', 'EQP02', 65, alarm=1, oee_breach=1))
+    result = store.refresh()
+    assert result['mode'] == 'incremental' and rds.since[-1] == '2026-01-27'
+    assert store.kpi_watermark == '2026-01-28'
+    assert store.alarm_counts()['total_alarms'] == 2
+    day27 = store.kpi_rollup(period='day', group_by='eqp', start_date='2026-01-27', end_date='2026-01-27')
+    assert day27[0]['oee_v'] == 74.0
+
+    # 4. 무효화 후에는 전체 재집계
+    store.invalidate("테스트")
+    store.kpi_rollup()
+    assert rds.since[-1] is None and store.full_refreshes == 2
+    print(f"   통계: {store.get_stats()}\n")
+
+    print("KPI 집계 저장소 테스트 완료!\n")
+
+
+def test_kpi_engine():
+    """KPI 이탈 / 알람 배치 엔진 테스트"""
+
+    print("=" * 60)
+    print("KPI 배치 엔진 테스트")
+    print("=" * 60 + "\n")
+
+    base = {'oee_t': 70, 'thp_t': 250, 'tat_t': 3.5, 'wip_t': 250}
+    rows = [
+        # OEE 23.6% 미달 + TAT 14% 초과 → 대표 OEE
+        dict(base, date='2026-01-20', eqp_id='EQP01', alarm_flag=1,
+             oee_v=53.51, thp_v=250, tat_v=4.0, wip_v=240),
+        # WIP 20% 초과 → 대표 WIP
+        dict(base, date='2026-01-21', eqp_id='EQP02', alarm_flag=0,
+             oee_v=75, thp_v=260, tat_v=3.0, wip_v=300),
+        # 정상 (목표 누락 KPI는 판단 제외)
+        dict(base, date='2026-01-22', eqp_id='EQP01', alarm_flag=0,
+             oee_v=80, thp_v=None, tat_v=3.4, wip_v=250, tat_t=None),
+    ]
+
+    # 1. 행별 판단 (Node 2 단건 판단과 같은 규칙)
+    print("1. 행별 판단 테스트")
+    results = detect_alarm_kpis(rows)
+    for r in results:
+        print(f"   {r}")
+    assert [r['alarm'] for r in results] == [True, True, False]
+    assert [r['dominant_kpi'] for r in results] == ['OEE', 'WIP', 'OEE']
+    assert set(results[0]['deviations']) == {'OEE', 'TAT'}
+    assert results[0]['status'] == {'OEE': 'alarm', 'THP': 'good', 'TAT': 'alarm', 'WIP': 'good'}
+
+    # 2. 범위 스캔: 필터 / 집계 / alarm_flag 불일치
+    print("2. 범위 스캔 테스트")
+
+    class FakeRDS:
+        def get_kpi_trend(self, **kwargs):
+            self.kwargs = kwargs
+            return rows
+
+    fake = FakeRDS()
+    scan = scan_kpi_alarms('2026-01-01', '2026-03-31', rds=fake)
+    assert 'alarm_flag' in fake.kwargs['columns']
+    assert scan['scanned'] == 3 and scan['alarms'] == 2 and scan['flag_mismatches'] == 1
+    assert scan['by_kpi'] == {'OEE': 1, 'WIP': 1} and scan['by_eqp'] == {'EQP01': 1, 'EQP02': 1}
+    assert [r['eqp_id'] for r in scan_kpi_alarms('2026-01-01', '2026-03-31', kpi='WIP', rds=fake)['rows']] == ['EQP02']
+    assert len(scan_kpi_alarms('2026-01-01', '2026-03-31', min_deviation=0.21, rds=fake)['rows']) == 1
+    assert len(scan_kpi_alarms('2026-01-01', '2026-03-31', include_normal=True, rds=fake)['rows']) == 3
+    print(f"   스캔 요약: { {k: v for k, v in scan.items() if k != 'rows'} }\n")
+
+    print("KPI 배치 엔진 테스트 완료!\n")
+
+
+def test_context_budget():
+    """토큰 예산 컨텍스트 생성 테스트 (이벤트 요약, 낮은 중요도 섹션부터 제외)"""
+
+    print("=" * 60)
+    print("컨텍스트 토큰 예산 테스트")
+    print("=" * 60 + "\n")
+
+    # 1. 토큰 추정: ASCII 4자 ≈ 1토큰, 한글 1자 ≈ 1토큰
+    assert estimate_tokens("") == 0
+    assert estimate_tokens("abcdefgh") == 2
+    assert estimate_tokens("다운타임") == 4
+
+    # 2. 예산 초과 시 priority 큰 섹션부터 제외, 필수 섹션은 유지
+    sections = [
+        ContextSection('kpi', 'KPI ' * 40, priority=0),
+        ContextSection('lot', '로트' * 30, priority=2),
+        ContextSection('rcp', '레시피' * 30, priority=3),
+    ]
+    text, info = build_budgeted_context(sections, max_tokens=120)
+    assert info['dropped'] == ['rcp'] and not info['truncated']
+    assert info['original_tokens'] > 120 and '로트' in text and '레시피레시피' not in text
+
+    # 3. 필수 섹션만으로도 넘으면 줄 단위로 자름
+    text, info = build_budgeted_context([ContextSection('kpi', '\n'.join(['행 데이터'] * 100), 0)], 50)
+    assert info['truncated'] and info['tokens'] <= 60
+
+    # 4. 알람 컨텍스트: 이벤트는 요약, 메타데이터용 토큰 정보 반환
+    kpi = {'date': '2026-01-20', 'eqp_id': 'EQP01', 'oee_t': 70, 'oee_v': 53.5}
+    lot_data = [{'lot_id': f'LOT{i % 3}', 'lot_state': 'HOLD' if i % 4 == 0 else 'RUN',
+                 'in_cnt': 25, 'rcp_id': 'R1'} for i in range(200)]
+    eqp_data = [
+        {'eqp_state': 'DOWN', 'event_time': '2026-01-20T01:00:00', 'end_time': '2026-01-20T04:30:00'},
+        {'eqp_state': 'RUN', 'event_time': '2026-01-20 04:30:00', 'end_time': '2026-01-20 10:00:00'},
+    ]
+    rcp_data = [{'rcp_id': f'R{i}', 'complex_level': i % 10} for i in range(50)]
+    text, info = build_alarm_context(kpi, lot_data, eqp_data, rcp_data, [], max_tokens=0)
+    assert 'DOWN 1회/3.5h' in text and 'LOT0' in text and text.count('/10') == 5
+    assert info['dropped'] == []
+
+    small, small_info = build_alarm_context(kpi, lot_data, eqp_data, rcp_data, [], max_tokens=250)
+    assert small_info['dropped'][0] == '레시피' and '## KPI 수치' in small
+    print(f"   전체 {info['tokens']}토큰 → 예산 250: {small_info['tokens']}토큰, 제외 {small_info['dropped']}")
+
+    print("\n컨텍스트 토큰 예산 테스트 통과!\n")
+
+
+def test_tracing():
+    """노드 / Bedrock 호출 추적 테스트 (가짜 Bedrock 클라이언트)"""
+
+    import io
+    import json
+    from backend.config.aws_config import aws_config
+
+    print("=" * 60)
+    print("노드 / LLM 추적 테스트")
+    print("=" * 60 + "\n")
+
+    class FakeBedrock:
+        def invoke_model(self, modelId, body):
+            payload = {'content': [{'text': '원인 분석 결과'}],
+                       'usage': {'input_tokens': 1200, 'output_tokens': 300}}
+            return {'body': io.BytesIO(json.dumps(payload).encode()),
+                    'ResponseMetadata': {'RetryAttempts': 2}}
+
+    def fake_node(state):
+        metadata = state.get('metadata', {})
+        return {'answer': aws_config.invoke_claude('프롬프트'), 'metadata': metadata}
+
+    original = aws_config.get_bedrock_runtime_client
+    aws_config.get_bedrock_runtime_client = lambda: FakeBedrock()
+    try:
+        cached_metadata = {'llm_calls': 1, 'trace': [{'name': 'node_6', 'wall_ms': 10.0, 'llm': []}]}
+        result = traced_node('node_test', fake_node)({'metadata': cached_metadata})
+    finally:
+        aws_config.get_bedrock_runtime_client = original
+
+    # 1. 실제 호출 수 / 토큰 / 재시도가 metadata에 반영, 원본 metadata는 그대로
+    metadata = result['metadata']
+    assert metadata['llm_calls'] == 2
+    assert metadata['llm_tokens'] == {'input': 1200, 'output': 300}
+    span = metadata['trace'][-1]
+    assert span['name'] == 'node_test' and span['status'] == 'ok'
+    assert span['llm'][0]['retries'] == 2 and span['llm'][0]['model'] == aws_config.model_id
+    assert len(cached_metadata['trace']) == 1 and cached_metadata['llm_calls'] == 1
+
+    # 2. 캐시 적중은 호출 수에 포함하지 않음, 에러 결과는 status=error
+    def cached_node(state):
+        record_llm_call('embedding', 'titan', 0.001, cache_hit=True)
+        return {'error': '데이터 없음'}
+
+    failed = traced_node('node_cached', cached_node)({'metadata': {'llm_calls': 0}})
+    assert failed['metadata']['llm_calls'] == 0
+    assert failed['metadata']['trace'][-1]['status'] == 'error'
+
+    # 3. Prometheus text format
+    text = metrics.render({'cache_items': [({'cache': 'qa'}, 3)]})
+    assert '# TYPE kpi_agent_node_duration_seconds histogram' in text
+    assert 'kpi_agent_node_runs_total{node="node_test",status="ok"}' in text
+    assert 'kpi_agent_llm_retries_total{model="' + aws_config.model_id + '"}' in text
+    assert 'kpi_agent_llm_cache_hits_total{model="titan",operation="embedding"}' in text
+    assert 'kpi_agent_cache_items{cache="qa"} 3' in text
+    print(f"   요약: {summarize_trace(metadata)}")
+
+    print("\n노드 / LLM 추적 테스트 통과!\n")
+
+
+def test_structured_logging():
+    """구조화 로깅 테스트 (JSON 출력, 상관관계 ID, DEBUG 샘플링)"""
+
+    import io
+    import json
+    import contextvars
+    import threading
+    from backend.config import logging_config
+    from backend.config.logging_config import setup_logging, flush_logging, get_logger, log_context
+
+    print("=" * 60)
+    print("구조화 로깅 테스트")
+    print("=" * 60 + "\n")
+
+    class Expensive:
+        formatted = 0
+
+        def __str__(self):
+            Expensive.formatted += 1
+            return 'expensive'
+
+    stream = io.StringIO()
+    logger = get_logger('backend.test_logging')
+    original_rate = logging_config.LOG_DEBUG_SAMPLE_RATE
+    try:
+        # 1. DEBUG 꺼짐 → 인자 포맷팅 없이 버림
+        setup_logging(level='INFO', fmt='json', stream=stream)
+        logger.debug("비싼 값: %s", Expensive())
+        flush_logging()
+        assert stream.getvalue() == '' and Expensive.formatted == 0
+
+        # 2. JSON 한 줄 + request_id / session_id, 다른 스레드에도 컨텍스트 복사로 전달
+        setup_logging(level='DEBUG', fmt='json', stream=stream)
+        with log_context(request_id='req-1'):
+            with log_context(session_id='sess-1'):
+                logger.info("Phase 2 시작 (선택: %s번)", 0)
+            ctx = contextvars.copy_context()
+            worker = threading.Thread(target=ctx.run, args=(logger.warning, "스레드 로그"))
+            worker.start()
+            worker.join()
+        logger.info("컨텍스트 밖")
+        flush_logging()
+        lines = [json.loads(line) for line in stream.getvalue().splitlines()]
+        assert lines[0]['msg'] == 'Phase 2 시작 (선택: 0번)' and lines[0]['level'] == 'INFO'
+        assert lines[0]['request_id'] == 'req-1' and lines[0]['session_id'] == 'sess-1'
+        assert lines[1]['request_id'] == 'req-1' and 'session_id' not in lines[1]
+        assert 'request_id' not in lines[2]
+
+        # 3. DEBUG 샘플링: 샘플되지 않은 요청은 DEBUG만 제외
+        logging_config.LOG_DEBUG_SAMPLE_RATE = 0.0
+        stream.truncate(0)
+        stream.seek(0)
+        with log_context(request_id='req-2'):
+            logger.debug("샘플 제외")
+            logger.info("항상 출력")
+        flush_logging()
+        msgs = [json.loads(line)['msg'] for line in stream.getvalue().splitlines()]
+        assert msgs == ['항상 출력']
+        print(f"   로깅 상태: {logging_config.get_logging_stats()}")
+    finally:
+        logging_config.LOG_DEBUG_SAMPLE_RATE = original_rate
+        setup_logging(level=logging_config.LOG_LEVEL, fmt=logging_config.LOG_FORMAT, stream=sys.stdout)
+
+    print("\n구조화 로깅 테스트 통과!\n")
+
+
 def main():
     """모든 테스트 실행"""
     
@@ -122,6 +742,17 @@ def main():
     
     test_date_utils()
     test_data_utils()
+    test_embedding_cache()
+    test_simple_cache()
+    test_shared_cache_backend()
+    test_semantic_cache()
+    test_kpi_aggregates()
+    test_table_catalog()
+    test_dashboard_summary()
+    test_kpi_engine()
+    test_context_budget()
+    test_tracing()
+    test_structured_logging()
     
     print("=" * 60)
     print("모든 테스트 완료!")
@@ -0,0 +1,318 @@
+"""
+워크플로우 노드 / Bedrock 호출 추적 (span) 및 Prometheus 지표
+
+알람 분석 20~40초가 어디서 쓰이는지 보기 위해 노드 실행과 Bedrock 호출을 span으로 기록합니다.
+
+- traced_node(name, fn): 노드 함수를 감싸 실행 시간, 상태, 노드 안에서 일어난 LLM 호출을 기록하고
+  state['metadata']에 반영합니다.
+    - metadata['trace']: 노드 span 목록 (각 span의 'llm'에 Bedrock 호출 span 포함)
+    - metadata['llm_calls']: 실제 Claude 호출 수 (노드가 직접 세지 않음)
+    - metadata['llm_tokens']: {'input', 'output'} 누적 토큰
+- record_llm_call(...): AWSConfig의 Bedrock 호출마다 호출 (모델, 토큰, 재시도, 캐시 적중)
+- metrics: 프로세스 전역 카운터/히스토그램 → GET /metrics (Prometheus text format)
+
+span은 contextvars로 현재 실행 중인 노드에 연결되므로, 노드 밖(서버 시작 시 RAG 적재 등)의
+Bedrock 호출은 /metrics에만 집계됩니다.
+"""
+
+import time
+import threading
+import functools
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Optional, Dict, Any, List, Callable, Iterator, Tuple
+
+from backend.config.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+# 지연 시간 히스토그램 구간 (초) — 노드/LLM 모두 수백 ms ~ 수십 초
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 20, 40, 80)
+
+
+# ──────────────────────────────────────────────────────────────
+# Prometheus 지표
+# ──────────────────────────────────────────────────────────────
+
+class MetricsRegistry:
+    """
+    외부 의존성 없는 최소 Prometheus 지표 저장소 (counter / histogram)
+    """
+
+    def __init__(self, prefix: str = 'kpi_agent'):
+        self.prefix = prefix
+        self._lock = threading.Lock()
+        self._counters: Dict[str, Dict[Tuple, float]] = {}
+        self._histograms: Dict[str, Dict[Tuple, Dict[str, Any]]] = {}
+        self._help: Dict[str, str] = {}
+
+    def describe(self, name: str, help_text: str) -> None:
+        self._help[name] = help_text
+
+    def inc(self, name: str, value: float = 1.0, **labels) -> None:
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            series = self._counters.setdefault(name, {})
+            series[key] = series.get(key, 0.0) + value
+
+    def observe(self, name: str, value: float, **labels) -> None:
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            series = self._histograms.setdefault(name, {})
+            hist = series.get(key)
+            if hist is None:
+                hist = series[key] = {'buckets': [0] * len(LATENCY_BUCKETS), 'sum': 0.0, 'count': 0}
+            for i, bound in enumerate(LATENCY_BUCKETS):
+                if value <= bound:
+                    hist['buckets'][i] += 1
+            hist['sum'] += value
+            hist['count'] += 1
+
+    def reset(self) -> None:
+        with self._lock:
+            self._counters.clear()
+            self._histograms.clear()
+
+    @staticmethod
+    def _labels(key: Tuple, extra: Tuple = ()) -> str:
+        items = list(key) + list(extra)
+        if not items:
+            return ''
+        escaped = (str(v).replace('\\', '\\\\').replace('"', '\\"') for _, v in items)
+        return '{' + ','.join(f'{k}="{v}"' for (k, _), v in zip(items, escaped)) + '}'
+
+    def render(self, gauges: Dict[str, List[Tuple[Dict[str, Any], float]]] = None) -> str:
+        """
+        Prometheus text exposition format (0.0.4)
+
+        Args:
+            gauges: 수집 시점에 계산하는 gauge {이름: [(라벨, 값)]} (캐시 통계 등)
+        """
+        lines: List[str] = []
+        with self._lock:
+            for name, series in sorted(self._counters.items()):
+                full = f"{self.prefix}_{name}"
+                if name in self._help:
+                    lines.append(f"# HELP {full} {self._help[name]}")
+                lines.append(f"# TYPE {full} counter")
+                for key, value in sorted(series.items()):
+                    lines.append(f"{full}{self._labels(key)} {value:g}")
+            for name, series in sorted(self._histograms.items()):
+                full = f"{self.prefix}_{name}"
+                if name in self._help:
+                    lines.append(f"# HELP {full} {self._help[name]}")
+                lines.append(f"# TYPE {full} histogram")
+                for key, hist in sorted(series.items()):
+                    for bound, count in zip(LATENCY_BUCKETS, hist['buckets']):
+                        lines.append(f"{full}_bucket{self._labels(key, (('le', f'{bound:g}'),))} {count}")
+                    lines.append(f"{full}_bucket{self._labels(key, (('le', '+Inf'),))} {hist['count']}")
+                    lines.append(f"{full}_sum{self._labels(key)} {hist['sum']:.6f}")
+                    lines.append(f"{full}_count{self._labels(key)} {hist['count']}")
+        for name, samples in sorted((gauges or {}).items()):
+            full = f"{self.prefix}_{name}"
+            lines.append(f"# TYPE {full} gauge")
+            for labels, value in samples:
+                lines.append(f"{full}{self._labels(tuple(sorted(labels.items())))} {value:g}")
+        return '\n'.join(lines) + '\n'
+
+
+# 전역 지표 저장소
+metrics = MetricsRegistry()
+metrics.describe('node_duration_seconds', '워크플로우 노드 실행 시간')
+metrics.describe('node_runs_total', '워크플로우 노드 실행 수 (status=ok|error)')
+metrics.describe('llm_duration_seconds', 'Bedrock 호출 시간')
+metrics.describe('llm_calls_total', 'Bedrock 호출 수 (operation=completion|stream|embedding)')
+metrics.describe('llm_tokens_total', 'Bedrock 토큰 수 (direction=input|output)')
+metrics.describe('llm_retries_total', 'botocore 재시도 횟수')
+metrics.describe('llm_cache_hits_total', 'Bedrock 호출 대신 캐시에서 반환한 횟수')
+
+
+# ──────────────────────────────────────────────────────────────
+# span
+# ──────────────────────────────────────────────────────────────
+
+_current_span: ContextVar[Optional['Span']] = ContextVar('kpi_agent_span', default=None)
+
+
+class Span:
+    """
+    노드 실행 하나의 span (안에서 일어난 Bedrock 호출 목록 포함)
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self.started_at = time.time()
+        self._t0 = time.perf_counter()
+        self.llm: List[Dict[str, Any]] = []
+        self._lock = threading.Lock()
+
+    def add_llm(self, record: Dict[str, Any]) -> None:
+        with self._lock:
+            self.llm.append(record)
+
+    @contextmanager
+    def activate(self) -> Iterator['Span']:
+        """이 블록 안의 Bedrock 호출을 이 span에 기록"""
+        token = _current_span.set(self)
+        try:
+            yield self
+        finally:
+            _current_span.reset(token)
+
+    def finish(self, status: str = 'ok', error: str = None) -> Dict[str, Any]:
+        """
+        span 종료 → 지표 기록 후 state에 남길 dict 반환
+
+        Returns:
+            Dict: {name, started_at, wall_ms, status, llm_calls, input_tokens, output_tokens, llm[, error]}
+        """
+        elapsed = time.perf_counter() - self._t0
+        metrics.observe('node_duration_seconds', elapsed, node=self.name)
+        metrics.inc('node_runs_total', node=self.name, status=status)
+
+        calls = [c for c in self.llm if c['operation'] != 'embedding' and not c['cache_hit']]
+        record = {
+            'name': self.name,
+            'started_at': round(self.started_at, 3),
+            'wall_ms': round(elapsed * 1000, 1),
+            'status': status,
+            'llm_calls': len(calls),
+            'input_tokens': sum(c['input_tokens'] for c in self.llm),
+            'output_tokens': sum(c['output_tokens'] for c in self.llm),
+            'llm': list(self.llm),
+        }
+        if error:
+            record['error'] = error
+        return record
+
+
+def current_span() -> Optional[Span]:
+    return _current_span.get()
+
+
+def attach_span(metadata: Optional[Dict[str, Any]], record: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    노드 span을 metadata에 반영한 새 dict를 반환합니다.
+    (캐시된 Phase 1 상태와 trace 목록을 공유하지 않도록 원본을 수정하지 않음)
+    """
+    metadata = dict(metadata or {})
+    tokens = metadata.get('llm_tokens') or {'input': 0, 'output': 0}
+    metadata['llm_calls'] = metadata.get('llm_calls', 0) + record['llm_calls']
+    metadata['llm_tokens'] = {
+        'input': tokens['input'] + record['input_tokens'],
+        'output': tokens['output'] + record['output_tokens'],
+    }
+    metadata['trace'] = list(metadata.get('trace') or []) + [record]
+    return metadata
+
+
+def traced_node(name: str, fn: Callable[[dict], dict]) -> Callable[[dict], dict]:
+    """
+    노드 함수를 span으로 감쌉니다. (LangGraph add_node / Phase 1·2 수동 실행 공통)
+
+    Args:
+        name: 노드 이름 (예: 'node_6')
+        fn: node_x(state) -> dict
+
+    Returns:
+        같은 시그니처의 함수 (반환 dict에 갱신된 metadata 포함)
+    """
+    @functools.wraps(fn)
+    def wrapper(state: dict) -> dict:
+        span = Span(name)
+        try:
+            with span.activate():
+                result = fn(state) or {}
+        except Exception as e:
+            span.finish('error', str(e))
+            raise
+        status = 'error' if 'error' in result else 'ok'
+        record = span.finish(status, result.get('error'))
+        if record['llm']:
+            logger.info("[Trace] %s %.0fms (%s, LLM %d회, 토큰 %d/%d)", name, record['wall_ms'], status,
+                        record['llm_calls'], record['input_tokens'], record['output_tokens'])
+        else:
+            logger.info("[Trace] %s %.0fms (%s)", name, record['wall_ms'], status)
+        base = result.get('metadata') if 'metadata' in result else state.get('metadata')
+        return {**result, 'metadata': attach_span(base, record)}
+
+    return wrapper
+
+
+def record_llm_call(
+    operation: str,
+    model_id: str,
+    elapsed_seconds: float,
+    input_tokens: int = 0,
+    output_tokens: int = 0,
+    retries: int = 0,
+    cache_hit: bool = False,
+    status: str = 'ok',
+    cache_read_tokens: int = 0,
+    span: Optional[Span] = None,
+) -> Dict[str, Any]:
+    """
+    Bedrock 호출 하나를 지표와 현재 노드 span에 기록합니다.
+
+    Args:
+        operation: completion | stream | embedding
+        model_id: Bedrock 모델 ID
+        elapsed_seconds: 호출 시간
+        input_tokens / output_tokens: usage 블록의 토큰 수
+        retries: botocore 재시도 횟수 (ResponseMetadata.RetryAttempts)
+        cache_hit: Bedrock 대신 캐시에서 반환했는지 여부
+        status: ok | error
+        cache_read_tokens: 프롬프트 캐시에서 읽은 입력 토큰 (지원 모델만)
+        span: 기록할 span (None이면 현재 노드 span — 스레드를 옮겨 다니는 스트리밍은 명시적으로 전달)
+
+    Returns:
+        Dict: 기록된 LLM span
+    """
+    record = {
+        'operation': operation,
+        'model': model_id,
+        'wall_ms': round(elapsed_seconds * 1000, 1),
+        'input_tokens': int(input_tokens or 0),
+        'output_tokens': int(output_tokens or 0),
+        'retries': int(retries or 0),
+        'cache_hit': cache_hit,
+        'status': status,
+    }
+    if cache_read_tokens:
+        record['cache_read_tokens'] = int(cache_read_tokens)
+
+    if cache_hit:
+        metrics.inc('llm_cache_hits_total', model=model_id, operation=operation)
+    else:
+        metrics.inc('llm_calls_total', model=model_id, operation=operation, status=status)
+        metrics.observe('llm_duration_seconds', elapsed_seconds, model=model_id, operation=operation)
+        if record['input_tokens']:
+            metrics.inc('llm_tokens_total', record['input_tokens'], model=model_id, direction='input')
+        if record['output_tokens']:
+            metrics.inc('llm_tokens_total', record['output_tokens'], model=model_id, direction='output')
+        if record['retries']:
+            metrics.inc('llm_retries_total', record['retries'], model=model_id)
+
+    span = span or current_span()
+    if span is not None:
+        span.add_llm(record)
+    return record
+
+
+def summarize_trace(metadata: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    metadata['trace']의 노드별 소요 시간 요약 (응답/로그용)
+
+    Returns:
+        Dict: {'total_ms', 'llm_ms', 'nodes': {노드: wall_ms}}
+    """
+    trace = (metadata or {}).get('trace') or []
+    nodes: Dict[str, float] = {}
+    for record in trace:
+        nodes[record['name']] = round(nodes.get(record['name'], 0.0) + record['wall_ms'], 1)
+    return {
+        'total_ms': round(sum(r['wall_ms'] for r in trace), 1),
+        'llm_ms': round(sum(c['wall_ms'] for r in trace for c in r.get('llm', [])
+                            if not c['cache_hit']), 1),
+        'nodes': nodes,
+    }
@@ -179,9 +179,14 @@ OEE ≥ 70% · THP ≥ 250 · TAT ≤ 3.5h · WIP 200~300EA
 // ────────────────────────── Anthropic API 호출 ──────────────────────────
 // .env에 REACT_APP_ANTHROPIC_API_KEY=sk-ant-... 설정 필요
 // CORS 이슈 시: 백엔드 FastAPI /api/chat 경유 (main.py 실행 후 사용)
-async function callLLM(messages:{role:string;content:string}[], liveContext:string=""):Promise<{text:string;source:"llm"|"rag"|"error"}> {
+async function callLLM(
+  messages:{role:string;content:string}[],
+  liveContext:string="",
+  onToken?:(partial:string)=>void,
+):Promise<{text:string;source:"llm"|"rag"|"error"}> {
   // 백엔드 FastAPI 서버 경유 (AWS Bedrock 사용)
   // 백엔드: backend/api/main.py 실행 필요
+  // onToken 지정 시 SSE 스트리밍으로 받아 누적 텍스트를 전달
   try {
     const res = await fetch("/api/chat", {
       method: "POST",
@@ -191,9 +196,34 @@ async function callLLM(messages:{role:string;content:string}[], liveContext:stri
         system: SYSTEM_PROMPT,
         mode: "question",
         live_context: liveContext,
+        stream: !!onToken,
       }),
     });
     if (!res.ok) throw new Error(`서버 오류: ${res.status}`);
+
+    // 스트리밍 응답 (text/event-stream)
+    if (onToken && res.body && (res.headers.get("content-type") || "").includes("text/event-stream")) {
+      const reader = res.body.getReader();
+      const decoder = new TextDecoder();
+      let buffer = "";
+      let text = "";
+      for (;;) {
+        const { value, done } = await reader.read();
+        if (done) break;
+        buffer += decoder.decode(value, { stream: true });
+        const events = buffer.split("\n\n");
+        buffer = events.pop() || "";
+        for (const ev of events) {
+          if (!ev.startsWith("data: ")) continue;
+          const data = JSON.parse(ev.slice(6));
+          if (data.type === "token") { text += data.text; onToken(text); }
+          else if (data.type === "done") { text = data.final_answer || text; }
+          else if (data.type === "error") { return { text: `응답 오류: ${data.error}`, source: "error" }; }
+        }
+      }
+      return { text: text || "답변을 생성하지 못했습니다.", source: "llm" };
+    }
+
     const data = await res.json();
     // 백엔드 응답 형식에 맞게 파싱
     const text = data.content || data.message || data.response || JSON.stringify(data);
@@ -406,6 +436,8 @@ function ReportPanel({report,onClose,startRaw=false}:{report:Report;onClose:()=>
   );
 }
 const API_BASE = "";
+// RDS 이력 테이블(eqp_state, lot_state) 한 번에 가져오는 행 수 (키셋 커서로 이어서 로드)
+const DB_FETCH_SIZE = 1000;
 
 // 백엔드에서 PDF 목록 가져오기
 async function fetchReportList(): Promise<{filename:string;size:number;created_at:string}[]> {
@@ -1011,6 +1043,10 @@ export default function App() {
   const [dbPage,       setDbPage]       = useState<number>(1);
   const [dbEqpTotal,   setDbEqpTotal]   = useState<number>(0);
   const [dbLotTotal,   setDbLotTotal]   = useState<number>(0);
+  // 키셋 페이지네이션: 다음 페이지 커서 (null이면 마지막 페이지)
+  const [dbEqpCursor,  setDbEqpCursor]  = useState<string|null>(null);
+  const [dbLotCursor,  setDbLotCursor]  = useState<string|null>(null);
+  const [dbLoadingMore,setDbLoadingMore]= useState(false);
   const [dbLoading,    setDbLoading]    = useState<boolean>(false);
   const [dbError,      setDbError]      = useState<string|null>(null);
   const [showContactModal, setShowContactModal] = useState(false);
@@ -1025,14 +1061,11 @@ useEffect(()=>{
   }, 5000);  // 5초마다 폴더 스캔
   return () => clearInterval(interval);
 }, []);
-// 대시보드 요약 로드 (마운트 시 1회)
+// 대시보드 요약 로드 (마운트 시 1회, 서버에서 최신 행만 받음)
 useEffect(()=>{
-  fetch("/api/rds/kpi-daily")
+  fetch("/api/rds/dashboard-summary")
     .then(r=>r.json())
-    .then(d=>{ if(d.success && d.data?.length>0) {
-      const sorted=[...d.data].sort((a:any,b:any)=>b.date?.localeCompare(a.date));
-      setDashboardSummary(sorted[0]);
-    }})
+    .then(d=>{ if(d.success && d.latest) setDashboardSummary(d.latest); })
     .catch(()=>{});
 }, []);
 
@@ -1044,6 +1077,7 @@ useEffect(()=>{
   }]);
   const [input,     setInput]     = useState("");
   const [typing,    setTyping]    = useState(false);
+  const [streaming, setStreaming] = useState(false);   // 스트리밍 답변 표시 중 (타이핑 표시 숨김)
   const [history,   setHistory]   = useState<{role:string;content:string}[]>([]);
   const chatEnd = useRef<HTMLDivElement>(null);
 
@@ -1097,8 +1131,8 @@ useEffect(()=>{
     ["/api/rds/kpi-daily",    (r)=>setDbKpiData(r)],
     ["/api/rds/scenario-map", (r)=>setDbScenarioData(r)],
     ["/api/rds/rcp-state",    (r)=>setDbRcpData(r)],
-    ["/api/rds/eqp-state",    (r,d)=>{setDbEqpData(r);setDbEqpTotal(d.count||r.length);}],
-    ["/api/rds/lot-state",    (r,d)=>{setDbLotData(r);setDbLotTotal(d.count||r.length);}],
+    [`/api/rds/eqp-state?limit=${DB_FETCH_SIZE}`, (r,d)=>{setDbEqpData(r);setDbEqpTotal(d.total_estimate??r.length);setDbEqpCursor(d.next_cursor??null);}],
+    [`/api/rds/lot-state?limit=${DB_FETCH_SIZE}`, (r,d)=>{setDbLotData(r);setDbLotTotal(d.total_estimate??r.length);setDbLotCursor(d.next_cursor??null);}],
   ];
   init.forEach(([url,cb])=>{
     fetch(url).then(r=>r.json()).then(d=>{if(d.success)cb(d.data||[],d);}).catch(()=>{});
@@ -1127,8 +1161,8 @@ useEffect(()=>{
     kpi_daily:    "/api/rds/kpi-daily",
     scenario_map: "/api/rds/scenario-map",
     rcp_state:    "/api/rds/rcp-state",
-    eqp_state:    "/api/rds/eqp-state",
-    lot_state:    "/api/rds/lot-state",
+    eqp_state:    `/api/rds/eqp-state?limit=${DB_FETCH_SIZE}`,
+    lot_state:    `/api/rds/lot-state?limit=${DB_FETCH_SIZE}`,
   };
 
   fetch(endpoints[dbTable])
@@ -1139,13 +1173,31 @@ useEffect(()=>{
       if      (dbTable==="kpi_daily")    { setDbKpiData(rows); }
       else if (dbTable==="scenario_map") { setDbScenarioData(rows); }
       else if (dbTable==="rcp_state")    { setDbRcpData(rows); }
-      else if (dbTable==="eqp_state")    { setDbEqpData(rows); setDbEqpTotal(d.count||rows.length); }
-      else if (dbTable==="lot_state")    { setDbLotData(rows); setDbLotTotal(d.count||rows.length); }
+      else if (dbTable==="eqp_state")    { setDbEqpData(rows); setDbEqpTotal(d.total_estimate??rows.length); setDbEqpCursor(d.next_cursor??null); }
+      else if (dbTable==="lot_state")    { setDbLotData(rows); setDbLotTotal(d.total_estimate??rows.length); setDbLotCursor(d.next_cursor??null); }
     })
     .catch(e=>{ setDbError(e.message||"백엔드 연결 실패"); })
     .finally(()=>{ setDbLoading(false); });
 }, [dbTable]);
 
+  // EQP_STATE / LOT_STATE 다음 페이지 이어서 로드 (커서 기반)
+  const loadMoreDb = () => {
+    const cursor = dbTable==="eqp_state" ? dbEqpCursor : dbTable==="lot_state" ? dbLotCursor : null;
+    if (!cursor || dbLoadingMore) return;
+    const path = dbTable==="eqp_state" ? "/api/rds/eqp-state" : "/api/rds/lot-state";
+    setDbLoadingMore(true);
+    fetch(`${path}?limit=${DB_FETCH_SIZE}&include_count=false&cursor=${encodeURIComponent(cursor)}`)
+      .then(r=>r.json())
+      .then(d=>{
+        if(!d.success) throw new Error(d.error||d.detail||"조회 실패");
+        const rows = d.data || [];
+        if (dbTable==="eqp_state") { setDbEqpData(p=>[...p,...rows]); setDbEqpCursor(d.next_cursor??null); }
+        else                       { setDbLotData(p=>[...p,...rows]); setDbLotCursor(d.next_cursor??null); }
+      })
+      .catch(e=>{ setDbError(e.message||"백엔드 연결 실패"); })
+      .finally(()=>{ setDbLoadingMore(false); });
+  };
+
   // 질문/답변 키워드로 관련 탭 감지
   const detectTab = (question: string, answer: string): string|null => {
     const text = (question + ' ' + answer).toLowerCase();
@@ -1286,7 +1338,19 @@ useEffect(()=>{
         `- TAT: ${kpi.tat.toFixed(2)}h (목표: ${thresholds.tat_max}h)`,
         `- WIP: ${kpi.wip}개 (목표 범위: ${thresholds.wip_min}~${thresholds.wip_max}개)`,
       ].join('\n');
-      const {text,source}=await callLLM(newH, liveContext);
+      // 첫 토큰이 오면 답변 말풍선을 추가하고 이후 토큰마다 갱신
+      let streamed=false;
+      const onToken=(partial:string)=>{
+        const shown=partial.replace(/\[탭:\w+\]\s*/g,'');
+        if(!streamed){
+          streamed=true;
+          setStreaming(true);
+          setMsgs(p=>[...p,{role:"assistant",content:shown,timestamp:nowTime(),source:"llm"}]);
+        } else {
+          setMsgs(p=>[...p.slice(0,-1),{...p[p.length-1],content:shown}]);
+        }
+      };
+      const {text,source}=await callLLM(newH, liveContext, onToken);
       // LLM이 반환한 [탭:xxx] 태그 추출 후 제거
       const tabMatch = text.match(/\[탭:(\w+)\]/);
       const llmTab = tabMatch ? tabMatch[1] : null;
@@ -1299,10 +1363,11 @@ useEffect(()=>{
         : false;
       const highlightedDate: string | undefined = (hasReport && extractedDate !== null) ? extractedDate : undefined;
       setHistory(h=>[...h,{role:"assistant",content:cleanText}]);
-      setMsgs(p=>[...p,{role:"assistant",content:cleanText,timestamp:nowTime(),source,suggestedTab,highlightedDate}]);
+      const finalMsg:ChatMessage={role:"assistant",content:cleanText,timestamp:nowTime(),source,suggestedTab,highlightedDate};
+      setMsgs(p=>streamed?[...p.slice(0,-1),finalMsg]:[...p,finalMsg]);
     }catch(e){
       setMsgs(p=>[...p,{role:"assistant",content:"오류가 발생했습니다. 잠시 후 다시 시도해주세요.",timestamp:nowTime(),source:"error"}]);
-    }finally{ setTyping(false); }
+    }finally{ setTyping(false); setStreaming(false); }
   },[input,history,typing,kpi,thresholds,msgs,saveChatLog]);
 
   const delta=(cur:number,prev:number,inv=false)=>{
@@ -1335,6 +1400,7 @@ useEffect(()=>{
   const filterDates = dbUniqDates;
   const filterEqps  = dbUniqEqps;
   const DB_PAGE_SIZE = 200;
+  const dbNextCursor = dbTable==="eqp_state" ? dbEqpCursor : dbTable==="lot_state" ? dbLotCursor : null;
   const dbTotalCount = dbTable==="eqp_state" ? dbEqpTotal : dbTable==="lot_state" ? dbLotTotal : filteredDbData.length;
   const dbTotalPages = isPaged ? Math.max(1, Math.ceil(filteredDbData.length / DB_PAGE_SIZE)) : 1;
   const pagedDbData  = isPaged ? filteredDbData.slice((dbPage-1)*DB_PAGE_SIZE, dbPage*DB_PAGE_SIZE) : filteredDbData;
@@ -1856,7 +1922,7 @@ useEffect(()=>{
                   </div>
                   );
                 })}
-                {typing&&(
+                {typing&&!streaming&&(
                   <div style={{display:"flex",alignItems:"flex-end",gap:8}}>
                     <div style={{width:30,height:30,borderRadius:8,background:"#0f172a",color:"#fff",display:"flex",alignItems:"center",justifyContent:"center",fontSize:10,fontWeight:700,fontFamily:"Pretendard, sans-serif"}}>AI</div>
                     <div style={S.aiBubble}><div style={{display:"flex",gap:4}}>{[0,0.2,0.4].map((d,i)=><div key={i} style={{width:7,height:7,borderRadius:"50%",background:"#94a3b8",animation:`bounce ${d}s infinite`}}/>)}</div></div>
@@ -1984,6 +2050,12 @@ useEffect(()=>{
                       style={{fontSize:11,padding:"3px 10px",borderRadius:5,border:"1px solid #e5e7eb",background:dbPage>=dbTotalPages?"#f3f4f6":"#fff",cursor:dbPage>=dbTotalPages?"default":"pointer",color:dbPage>=dbTotalPages?"#9ca3af":"#374151"}}>
                       다음
                     </button>
+                    {dbNextCursor&&(
+                      <button disabled={dbLoadingMore} onClick={loadMoreDb}
+                        style={{fontSize:11,padding:"3px 10px",borderRadius:5,border:"1px solid #e5e7eb",background:"#fff",cursor:dbLoadingMore?"default":"pointer",color:"#374151"}}>
+                        {dbLoadingMore?"불러오는 중...":`${DB_FETCH_SIZE.toLocaleString()}행 더 불러오기`}
+                      </button>
+                    )}
                   </div>
                 )}
               </div>
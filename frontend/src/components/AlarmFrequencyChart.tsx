@@ -27,6 +27,7 @@ const AlarmFrequencyChart: React.FC<AlarmFrequencyChartProps> = ({ data }) => {
     OEE: '#00ff41',
     THP: '#00d9ff',
     TAT: '#ffff00',
+    WIP: '#ff0051',
     WIP_EXCEED: '#ff0051',
     WIP_SHORTAGE: '#ff00ff',
   };
@@ -2,29 +2,39 @@
  * 대시보드 개요 페이지
  */
 
-import React from 'react';
+import React, { useEffect, useState } from 'react';
 import RealtimeKpiMonitor from '../components/RealtimeKpiMonitor';
 import KpiTrendChart from '../components/KpiTrendChart';
 import AlarmFrequencyChart from '../components/AlarmFrequencyChart';
 
+type KpiTrendPoint = { date: string; oee_v: number; oee_t: number; thp_v: number; thp_t: number };
+type AlarmFrequency = { kpi: string; count: number };
+
 const DashboardOverview: React.FC = () => {
-  const kpiTrendData = [
-    { date: '01-25', oee_v: 72.5, oee_t: 70, thp_v: 245, thp_t: 250 },
-    { date: '01-26', oee_v: 74.1, oee_t: 70, thp_v: 240, thp_t: 250 },
-    { date: '01-27', oee_v: 71.6, oee_t: 70, thp_v: 235, thp_t: 250 },
-    { date: '01-28', oee_v: 73.8, oee_t: 70, thp_v: 240, thp_t: 250 },
-    { date: '01-29', oee_v: 72.2, oee_t: 70, thp_v: 230, thp_t: 250 },
-    { date: '01-30', oee_v: 71.0, oee_t: 70, thp_v: 245, thp_t: 250 },
-    { date: '01-31', oee_v: 76.4, oee_t: 70, thp_v: 227, thp_t: 250 },
-  ];
+  // 백엔드 사전 집계(/api/rds/aggregates/*)에서 버킷 단위로 로드
+  const [kpiTrendData, setKpiTrendData] = useState<KpiTrendPoint[]>([]);
+  const [alarmFrequencyData, setAlarmFrequencyData] = useState<AlarmFrequency[]>([]);
+
+  useEffect(() => {
+    fetch('/api/rds/aggregates/kpi?period=day&group_by=all&last=7')
+      .then(r => r.json())
+      .then(d => {
+        if (!d.success) return;
+        setKpiTrendData(d.data.map((r: any) => ({
+          date: String(r.period).slice(5),
+          oee_v: r.oee_v, oee_t: r.oee_t, thp_v: r.thp_v, thp_t: r.thp_t,
+        })));
+      })
+      .catch(() => {});
 
-  const alarmFrequencyData = [
-    { kpi: 'OEE', count: 3 },
-    { kpi: 'THP', count: 4 },
-    { kpi: 'TAT', count: 2 },
-    { kpi: 'WIP_EXCEED', count: 2 },
-    { kpi: 'WIP_SHORTAGE', count: 1 },
-  ];
+    fetch('/api/rds/aggregates/alarm-counts')
+      .then(r => r.json())
+      .then(d => {
+        if (!d.success) return;
+        setAlarmFrequencyData(d.data.map((r: any) => ({ kpi: r.kpi, count: r.count })));
+      })
+      .catch(() => {});
+  }, []);
 
   return (
     <div>
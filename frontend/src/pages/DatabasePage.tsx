@@ -2,11 +2,11 @@
  * 데이터베이스 조회 페이지 (Supabase 기반)
  */
 
-import React, { useState, useEffect, useCallback } from 'react';
+import React, { useState, useEffect, useCallback, useRef } from 'react';
 import CacheStats from '../components/CacheStats';
 
 // ── 테이블별 API 설정 ────────────────────────────────────────────
-// paginated: true → 서버사이드 페이지네이션 (page, page_size 파라미터 지원)
+// paginated: true → 서버사이드 키셋 페이지네이션 (cursor, limit 파라미터 / NDJSON 내보내기 지원)
 // paginated: false → 전체 데이터 한번에 반환
 const TABLE_CONFIG: Record<string, { endpoint: string; paginated: boolean; hasDateFilter: boolean; hasEqpFilter: boolean }> = {
   KPI_DAILY:    { endpoint: '/api/kpi-daily',   paginated: false, hasDateFilter: true,  hasEqpFilter: true  },
@@ -35,7 +35,10 @@ const DatabasePage: React.FC = () => {
   const [data, setData]           = useState<Record<string, any>[]>([]);
   const [totalCount, setTotalCount] = useState<number>(0);
   const [totalPages, setTotalPages] = useState<number>(1);
+  const [hasMore, setHasMore]     = useState<boolean>(false);
   const [loading, setLoading]     = useState<boolean>(false);
+  // 페이지별 시작 커서 (cursors[0] = 첫 페이지 = null, 다음 페이지 커서는 응답의 next_cursor)
+  const cursors = useRef<(string | null)[]>([null]);
   const [error, setError]         = useState<string | null>(null);
 
   const cfg = TABLE_CONFIG[selectedTable];
@@ -53,8 +56,11 @@ const DatabasePage: React.FC = () => {
       if (date) params.set('date', date);
       if (eqp)  params.set('eqp_id', eqp);
       if (config.paginated) {
-        params.set('page', String(pg));
-        params.set('page_size', String(PAGE_SIZE));
+        params.set('limit', String(PAGE_SIZE));
+        const cursor = cursors.current[pg - 1];
+        if (cursor) params.set('cursor', cursor);
+        // 전체 건수는 첫 페이지에서만 추정치로 (정확한 COUNT는 매 페이지 전체 스캔)
+        if (pg === 1) params.set('count', 'estimated');
       }
 
       const url = `${config.endpoint}${params.toString() ? '?' + params.toString() : ''}`;
@@ -65,22 +71,37 @@ const DatabasePage: React.FC = () => {
       if (!json.success) throw new Error(json.error || '조회 실패');
 
       const rows: Record<string, any>[] = json.data || [];
-      const tc: number = json.total_count ?? json.count ?? rows.length;
-      const tp: number = json.total_pages ?? 1;
-
       setData(rows);
-      setTotalCount(tc);
-      setTotalPages(tp);
+
+      if (config.paginated) {
+        cursors.current[pg] = json.next_cursor ?? null;
+        setHasMore(!!json.has_more);
+        if (pg === 1) {
+          const tc: number = json.total_count ?? rows.length;
+          setTotalCount(tc);
+          setTotalPages(Math.max(1, Math.ceil(tc / PAGE_SIZE)));
+        }
+      } else {
+        setHasMore(false);
+        setTotalCount(json.count ?? rows.length);
+        setTotalPages(1);
+      }
     } catch (e: any) {
       setError(e.message || '데이터 조회 실패');
       setData([]);
       setTotalCount(0);
       setTotalPages(1);
+      setHasMore(false);
     } finally {
       setLoading(false);
     }
   }, []);
 
+  // 테이블·필터 변경 시 커서 초기화
+  useEffect(() => {
+    cursors.current = [null];
+  }, [selectedTable, filterDate, filterEqp]);
+
   // 테이블·필터·페이지 변경 시 fetch
   useEffect(() => {
     fetchData(selectedTable, page, filterDate, filterEqp);
@@ -201,12 +222,26 @@ const DatabasePage: React.FC = () => {
             {/* 건수 표시 */}
             {!loading && !error && (
               <div style={{ color: '#94a3b8', fontSize: 13, alignSelf: 'flex-end', marginLeft: 'auto' }}>
-                총 <strong style={{ color: '#e2e8f0' }}>{totalCount.toLocaleString()}</strong>건
+                {cfg.paginated ? '약 ' : '총 '}
+                <strong style={{ color: '#e2e8f0' }}>{totalCount.toLocaleString()}</strong>건
                 {cfg.paginated && totalPages > 1 && (
-                  <span> · {page} / {totalPages} 페이지 ({PAGE_SIZE}건씩)</span>
+                  <span> · {page} / 약 {totalPages} 페이지 ({PAGE_SIZE}건씩)</span>
                 )}
               </div>
             )}
+
+            {/* NDJSON 내보내기 (현재 필터 전체, 서버에서 스트리밍) */}
+            {cfg.paginated && (
+              <a
+                href={`${cfg.endpoint}/export?${new URLSearchParams({
+                  ...(filterDate ? { date: filterDate } : {}),
+                  ...(filterEqp ? { eqp_id: filterEqp } : {}),
+                }).toString()}`}
+                style={{ ...btnStyle(false), textDecoration: 'none', alignSelf: 'flex-end' }}
+              >
+                내보내기 (NDJSON)
+              </a>
+            )}
           </div>
 
           {/* 테이블 */}
@@ -214,14 +249,13 @@ const DatabasePage: React.FC = () => {
             {renderTable()}
           </div>
 
-          {/* 페이지 네비게이션 (paginated 테이블만) */}
-          {!loading && !error && cfg.paginated && totalPages > 1 && (
+          {/* 페이지 네비게이션 (paginated 테이블만, 커서 방식이라 앞뒤로만 이동) */}
+          {!loading && !error && cfg.paginated && (page > 1 || hasMore) && (
             <div style={{ display: 'flex', gap: 8, marginTop: 16, justifyContent: 'center', alignItems: 'center' }}>
-              <button onClick={() => setPage(1)}                         disabled={page === 1}          style={btnStyle(page === 1)}>처음</button>
-              <button onClick={() => setPage(p => Math.max(1, p - 1))}  disabled={page === 1}          style={btnStyle(page === 1)}>이전</button>
-              <span style={{ color: '#94a3b8', fontSize: 13, padding: '0 8px' }}>{page} / {totalPages}</span>
-              <button onClick={() => setPage(p => Math.min(totalPages, p + 1))} disabled={page === totalPages} style={btnStyle(page === totalPages)}>다음</button>
-              <button onClick={() => setPage(totalPages)}                disabled={page === totalPages} style={btnStyle(page === totalPages)}>마지막</button>
+              <button onClick={() => setPage(1)}                         disabled={page === 1}  style={btnStyle(page === 1)}>처음</button>
+              <button onClick={() => setPage(p => Math.max(1, p - 1))}  disabled={page === 1}  style={btnStyle(page === 1)}>이전</button>
+              <span style={{ color: '#94a3b8', fontSize: 13, padding: '0 8px' }}>{page} 페이지</span>
+              <button onClick={() => setPage(p => p + 1)}                disabled={!hasMore}    style={btnStyle(!hasMore)}>다음</button>
             </div>
           )}
 